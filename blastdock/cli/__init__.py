@@ -2,15 +2,28 @@
 BlastDock CLI module
 """
 
-# Import all command groups
-from .deploy import deploy_group as deploy
-from .marketplace import marketplace_group as marketplace
-from .monitoring import monitoring
-from .templates import templates
-from .diagnostics import diagnostics
-from .security import security
-from .performance import performance
-from .config_commands import config_group
+import importlib
+
+# Command groups, imported on first access so that loading one command
+# does not load them all: name -> (module, attribute)
+_COMMAND_GROUPS = {
+    "deploy": (".deploy", "deploy_group"),
+    "marketplace": (".marketplace", "marketplace_group"),
+    "monitoring": (".monitoring", "monitoring"),
+    "templates": (".templates", "templates"),
+    "diagnostics": (".diagnostics", "diagnostics"),
+    "security": (".security", "security"),
+    "performance": (".performance", "performance"),
+    "config_group": (".config_commands", "config_group"),
+}
+
+
+def __getattr__(name):
+    if name in _COMMAND_GROUPS:
+        module_name, attribute = _COMMAND_GROUPS[name]
+        return getattr(importlib.import_module(module_name, __name__), attribute)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "deploy",
@@ -0,0 +1,73 @@
+"""
+Lazily loaded click command groups
+"""
+
+import importlib
+from typing import Dict, List, Optional, Tuple
+
+import click
+
+
+class LazyGroup(click.Group):
+    """Click group whose subcommands are imported only when used
+
+    ``lazy_subcommands`` maps a command name to ``("module:attribute",
+    short_help)``. The module is imported the first time the command is
+    resolved; ``short_help`` lets ``--help`` list the command without
+    importing it.
+    """
+
+    def __init__(
+        self,
+        *args,
+        lazy_subcommands: Optional[Dict[str, Tuple[str, str]]] = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = dict(lazy_subcommands or {})
+        self._loaded: Dict[str, click.Command] = {}
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        # Lazy entries take precedence, as ``add_command`` after a decorator would
+        if cmd_name in self.lazy_subcommands:
+            return self.load_command(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def load_command(self, cmd_name: str) -> click.Command:
+        """Import a lazy subcommand (once)"""
+        command = self._loaded.get(cmd_name)
+        if command is None:
+            import_path, _ = self.lazy_subcommands[cmd_name]
+            module_name, attribute = import_path.split(":")
+            command = getattr(importlib.import_module(module_name), attribute)
+            if not isinstance(command, click.Command):
+                raise TypeError(f"{import_path} is not a click command")
+            self._loaded[cmd_name] = command
+        return command
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter):
+        """List commands using the stored help of those not yet imported"""
+        rows = []
+        for name in self.list_commands(ctx):
+            if name in self.lazy_subcommands and name not in self._loaded:
+                # Placeholder carrying the stored help, so the module stays unloaded
+                short_help = self.lazy_subcommands[name][1]
+                rows.append((name, click.Command(name, short_help=short_help)))
+                continue
+            command = self.get_command(ctx, name)
+            if command is None or command.hidden:
+                continue
+            rows.append((name, command))
+
+        if rows:
+            limit = formatter.width - 6 - max(len(name) for name, _ in rows)
+            with formatter.section("Commands"):
+                formatter.write_dl(
+                    [
+                        (name, command.get_short_help_str(limit))
+                        for name, command in rows
+                    ]
+                )
@@ -414,10 +414,17 @@ def alerts(output_format, active_only):
     default="summary",
     help="Output format",
 )
-def logs(project_name, tail, window, output_format):
+@click.option(
+    "--archive",
+    is_flag=True,
+    help="Keep analyzed lines in the local log archive and analyze from it",
+)
+def logs(project_name, tail, window, output_format, archive):
     """Analyze logs for a project"""
 
     log_analyzer = get_log_analyzer()
+    if archive and log_analyzer.archive is None:
+        log_analyzer.enable_archive()
 
     try:
         console.print(f"\n[bold blue]📋 Log Analysis: {project_name}[/bold blue]\n")
@@ -553,7 +560,12 @@ def dashboard(project_name, refresh):
 @click.option("--stop", is_flag=True, help="Stop background monitoring")
 @click.option("--status", is_flag=True, help="Show monitoring status")
 @click.option("--interval", default=30, help="Monitoring interval in seconds")
-def background(start, stop, status, interval):
+@click.option(
+    "--events",
+    is_flag=True,
+    help="Track container state from Docker events instead of polling",
+)
+def background(start, stop, status, interval, events):
     """Control background monitoring services"""
 
     health_checker = get_health_checker()
@@ -567,7 +579,7 @@ def background(start, stop, status, interval):
             )
 
             # Start all monitoring services
-            health_checker.start_background_monitoring(interval)
+            health_checker.start_background_monitoring(interval, event_driven=events)
             metrics_collector.start_collection(interval)
             alert_manager.start_evaluation(interval)
 
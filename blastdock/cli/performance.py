@@ -12,8 +12,6 @@ from rich.progress import (
     Progress,
     SpinnerColumn,
     TextColumn,
-    BarColumn,
-    TaskProgressColumn,
 )
 
 from ..performance import (
@@ -230,76 +228,169 @@ def optimize(component, aggressive):
     default="quick",
     help="Benchmark suite to run",
 )
+@click.option("--only", multiple=True, help="Run only the named benchmark(s)")
+@click.option("--iterations", type=int, help="Timed iterations per benchmark")
+@click.option("--warmup", type=int, help="Warm-up iterations per benchmark")
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["table", "json"]),
+    default="table",
+    help="Output format",
+)
 @click.option("--export", help="Export results to file")
-def benchmark(suite, export):
+@click.option(
+    "--save-baseline", is_flag=True, help="Save results as the suite's baseline"
+)
+@click.option("--compare", is_flag=True, help="Compare results with the baseline")
+@click.option("--baseline", "baseline_file", help="Baseline file to save or compare")
+@click.option(
+    "--tolerance",
+    default=0.10,
+    help="Median slowdown (fraction) reported as a regression",
+)
+@click.option(
+    "--fail-on-regression", is_flag=True, help="Exit with status 1 on regressions"
+)
+def benchmark(
+    suite,
+    only,
+    iterations,
+    warmup,
+    output_format,
+    export,
+    save_baseline,
+    compare,
+    baseline_file,
+    tolerance,
+    fail_on_regression,
+):
     """Run performance benchmarks"""
 
-    console.print(
-        f"\\n[bold blue]🏃 Running {suite.title()} Benchmark Suite[/bold blue]\\n"
-    )
-
     benchmarks = get_performance_benchmarks()
+    baseline_file = baseline_file or benchmarks.baseline_path(suite)
+    quiet = output_format == "json"
 
-    if suite == "system":
-        # Run comprehensive system benchmark
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            TaskProgressColumn(),
-            console=console,
-        ) as progress:
-            task = progress.add_task("Running system benchmarks...", total=5)
-
-            results = benchmarks.run_system_benchmark()
-
-            for i, (name, result) in enumerate(results.items()):
-                progress.update(task, advance=1, description=f"Completed {name}")
-
-        # Display results
-        _display_benchmark_results(results)
+    if not quiet:
+        console.print(
+            f"\n[bold blue]🏃 Running {suite.title()} Benchmark Suite[/bold blue]\n"
+        )
 
-        if export:
-            benchmarks.export_benchmark_data(export)
-            console.print(f"\\n[green]📁 Results exported to: {export}[/green]")
+    try:
+        if quiet:
+            results = benchmarks.run_suite(suite, iterations, warmup, only)
+        else:
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                console=console,
+                transient=True,
+            ) as progress:
+                task = progress.add_task("Preparing benchmarks...", total=None)
+                results = benchmarks.run_suite(
+                    suite,
+                    iterations,
+                    warmup,
+                    only,
+                    progress=lambda name: progress.update(
+                        task, description=f"Running {name}..."
+                    ),
+                )
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--only")
+
+    comparison = None
+    if compare or fail_on_regression:
+        try:
+            baseline = benchmarks.load_baseline(baseline_file)
+        except (OSError, ValueError, TypeError) as e:
+            raise click.ClickException(f"Cannot read baseline {baseline_file}: {e}")
+        comparison = benchmarks.compare_with_baseline(results, baseline, tolerance)
+
+    if quiet:
+        output = {
+            "suite": suite,
+            "results": {name: result.to_dict() for name, result in results.items()},
+        }
+        if comparison is not None:
+            output["comparison"] = comparison
+        click.echo(json.dumps(output, indent=2))
+    else:
+        _display_benchmark_results(results, comparison)
 
-    elif suite == "quick":
-        # Quick benchmarks
-        console.print("Running quick performance tests...")
+    if export:
+        benchmarks.export_benchmark_data(export, results)
+        if not quiet:
+            console.print(f"\n[green]📁 Results exported to: {export}[/green]")
 
-        # Cache benchmark
-        with benchmarks.benchmark("quick_cache_test", iterations=100) as ctx:
-            cache_manager = get_cache_manager()
-            for i in range(100):
-                cache_manager.set(f"test_key_{i}", f"test_value_{i}")
-                cache_manager.get(f"test_key_{i}")
+    if save_baseline:
+        benchmarks.save_baseline(results, baseline_file)
+        if not quiet:
+            console.print(f"[green]📌 Baseline saved to: {baseline_file}[/green]")
 
-        # Memory benchmark
-        with benchmarks.benchmark("quick_memory_test", iterations=1000) as ctx:
-            data = []
-            for i in range(1000):
-                data.append({"id": i, "value": list(range(10))})
-            data.clear()
+    regressions = [
+        name
+        for name, change in (comparison or {}).items()
+        if change["status"] == "regressed"
+    ]
+    if regressions and fail_on_regression:
+        if not quiet:
+            console.print(f"\n[red]❌ Regressions: {', '.join(regressions)}[/red]")
+        raise SystemExit(1)
 
-        console.print("[green]✅ Quick benchmarks completed[/green]")
 
-    elif suite == "full":
-        console.print("Running comprehensive benchmarks...")
+@performance.command()
+@click.option(
+    "--command",
+    "commands",
+    multiple=True,
+    help="Measure only the named startup command(s)",
+)
+@click.option("--runs", default=3, help="Runs per command (the fastest is kept)")
+@click.option("--top", default=5, help="Slowest modules to show per command")
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["table", "json"]),
+    default="table",
+    help="Output format",
+)
+def startup(commands, runs, top, output_format):
+    """Measure CLI startup and import time per command"""
+    from ..performance.startup import HEAVY_MODULES, measure_startup
 
-        # Template loading benchmark
-        from ..core.template_manager import TemplateManager
+    try:
+        with console.status("[bold green]Starting CLI commands..."):
+            results = measure_startup(commands or None, runs, top=top)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--command")
 
-        with benchmarks.benchmark("template_manager_test", iterations=10) as ctx:
-            template_manager = TemplateManager()
-            for i in range(10):
-                try:
-                    templates = template_manager.list_templates()
-                    for template in templates[:5]:  # Test first 5 templates
-                        template_manager.template_exists(template)
-                except Exception:
-                    ctx.record_error()
+    if output_format == "json":
+        click.echo(
+            json.dumps({name: m.to_dict() for name, m in results.items()}, indent=2)
+        )
+        return
 
-        console.print("[green]✅ Full benchmarks completed[/green]")
+    table = Table(title="CLI Startup")
+    table.add_column("Command", style="cyan")
+    table.add_column("Exit", style="blue")
+    table.add_column("Wall", style="magenta")
+    table.add_column("Imports", style="yellow")
+    table.add_column("Modules", style="blue")
+    table.add_column("Slowest Modules", style="white")
+    for name, measurement in results.items():
+        heavy = measurement.loaded(HEAVY_MODULES)
+        table.add_row(
+            f"{name} ({' '.join(measurement.argv)})",
+            str(measurement.exit_code),
+            _format_ms(measurement.wall_ms),
+            _format_ms(measurement.import_ms),
+            f"{len(measurement.modules)}" + (f" ({len(heavy)} heavy)" if heavy else ""),
+            ", ".join(
+                f"{module} {ms:.1f}ms" for module, ms in measurement.slowest[:top]
+            ),
+        )
+    console.print(table)
 
 
 @performance.command()
@@ -318,7 +409,8 @@ def trends(operation, window):
 
         if trend_data["trend"] == "insufficient_data":
             console.print(
-                f"[yellow]Insufficient data for {operation} (need at least {window} samples)[/yellow]"
+                f"[yellow]Insufficient data for {operation} "
+                f"({trend_data['sample_size']} samples)[/yellow]"
             )
             return
 
@@ -558,51 +650,70 @@ def _show_detailed_metrics(
     )
 
 
-def _display_benchmark_results(results):
+def _display_benchmark_results(results, comparison=None):
     """Display benchmark results in a formatted table"""
 
     results_table = Table(
         title="Benchmark Results", show_header=True, header_style="bold magenta"
     )
     results_table.add_column("Benchmark", style="cyan")
-    results_table.add_column("Duration", style="green")
+    results_table.add_column("p50", style="green")
+    results_table.add_column("p95", style="green")
+    results_table.add_column("p99", style="green")
     results_table.add_column("Throughput", style="blue")
-    results_table.add_column("Memory Usage", style="yellow")
+    results_table.add_column("Memory", style="yellow")
+    if comparison is not None:
+        results_table.add_column("vs Baseline", style="white")
     results_table.add_column("Status", style="white")
 
     for name, result in results.items():
-        # Format duration
-        if result.duration < 1:
-            duration_str = f"{result.duration * 1000:.1f}ms"
-        else:
-            duration_str = f"{result.duration:.2f}s"
+        label = name.replace("_", " ").title()
+        if result.skipped:
+            row = [label, "-", "-", "-", "-", "-"]
+            if comparison is not None:
+                row.append("-")
+            results_table.add_row(*row, f"⏭️ Skipped: {result.skipped}")
+            continue
 
         # Format throughput
-        if result.throughput:
-            if result.throughput > 1000:
-                throughput_str = f"{result.throughput / 1000:.1f}K/s"
-            else:
-                throughput_str = f"{result.throughput:.1f}/s"
+        if result.throughput > 1000:
+            throughput_str = f"{result.throughput / 1000:.1f}K ops/s"
         else:
-            throughput_str = "N/A"
-
-        # Format memory
-        memory_str = f"{result.memory_usage_mb:.1f}MB"
+            throughput_str = f"{result.throughput:.1f} ops/s"
 
         # Determine status
         if result.error_rate > 0.1:
             status = "🔴 Failed"
-        elif result.duration > 10:
+        elif result.errors:
+            status = f"🟡 {result.errors} errors"
+        elif result.p95_ms > 1000:
             status = "🟡 Slow"
         else:
             status = "🟢 Good"
 
-        results_table.add_row(
-            name.replace("_", " ").title(),
-            duration_str,
+        row = [
+            label,
+            _format_ms(result.p50_ms),
+            _format_ms(result.p95_ms),
+            _format_ms(result.p99_ms),
             throughput_str,
-            memory_str,
-            status,
-        )
+            f"{result.memory_usage_mb:.1f}MB",
+        ]
+        if comparison is not None:
+            change = comparison.get(name, {})
+            if "p50_change_percent" in change:
+                color = {"regressed": "red", "improved": "green"}.get(
+                    change["status"], "white"
+                )
+                row.append(f"[{color}]{change['p50_change_percent']:+.1f}%[/{color}]")
+            else:
+                row.append("n/a")
+        results_table.add_row(*row, status)
 
     console.print(results_table)
+
+
+def _format_ms(value):
+    if value < 1000:
+        return f"{value:.2f}ms"
+    return f"{value / 1000:.2f}s"
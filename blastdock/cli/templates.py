@@ -15,13 +15,13 @@ from rich.progress import (
     TimeElapsedColumn,
 )
 
+from ..core.template_catalog import TemplateCatalog
 from ..utils.template_validator import (
     TemplateValidator,
     ValidationLevel,
     TraefikCompatibility,
 )
 
-
 console = Console()
 
 
@@ -47,13 +47,19 @@ def templates():
     help="Filter results",
 )
 @click.option("--save-report", help="Save detailed report to file")
-def validate(templates_dir, output, filter, save_report):
+@click.option(
+    "--no-cache", is_flag=True, help="Re-validate every template, ignoring the cache"
+)
+@click.option("--timings", is_flag=True, help="Show time spent in each check")
+def validate(templates_dir, output, filter, save_report, no_cache, timings):
     """Validate all templates for structure, security, and Traefik compatibility"""
 
     if templates_dir:
-        validator = TemplateValidator(templates_dir)
+        validator = TemplateValidator(templates_dir, persist=True)
     else:
-        validator = TemplateValidator()
+        validator = TemplateValidator(persist=True)
+    if no_cache:
+        validator.clear_cache()
 
     console.print("\n[bold blue]🔍 Validating BlastDock Templates[/bold blue]\n")
 
@@ -68,9 +74,8 @@ def validate(templates_dir, output, filter, save_report):
 
         task = progress.add_task("Validating templates...", total=100)
 
-        # Get list of templates
-        template_files = list(validator.templates_dir.glob("*.yml"))
-        total_templates = len(template_files)
+        # Count templates (the module's ``list`` command shadows the builtin)
+        total_templates = sum(1 for _ in validator.templates_dir.glob("*.yml"))
 
         if total_templates == 0:
             console.print("[red]❌ No template files found[/red]")
@@ -78,16 +83,13 @@ def validate(templates_dir, output, filter, save_report):
 
         progress.update(task, total=total_templates)
 
-        # Validate all templates
-        analyses = {}
-        for i, template_file in enumerate(template_files):
-            template_name = template_file.stem
+        # Validate all templates; unchanged ones come from the cache
+        def advance(template_name, done, total):
             progress.update(
-                task, description=f"Validating {template_name}...", completed=i
+                task, description=f"Validated {template_name}...", completed=done
             )
 
-            analysis = validator.validate_template(str(template_file))
-            analyses[template_name] = analysis
+        analyses = validator.validate_all_templates(progress=advance)
 
         progress.update(
             task, completed=total_templates, description="Validation complete!"
@@ -112,6 +114,7 @@ def validate(templates_dir, output, filter, save_report):
 
     # Summary
     _display_summary(analyses)
+    _display_validation_stats(validator.get_validation_stats(), timings)
 
 
 @templates.command()
@@ -281,16 +284,54 @@ def list(templates_dir, output):
     else:
         validator = TemplateValidator()
 
-    template_files = list(validator.templates_dir.glob("*.yml"))
+    entries = TemplateCatalog(str(validator.templates_dir)).entries()
 
-    if not template_files:
+    if not entries:
         console.print("[red]❌ No template files found[/red]")
         return
 
     console.print(
-        f"\n[bold blue]📋 BlastDock Templates ({len(template_files)} found)[/bold blue]\n"
+        f"\n[bold blue]📋 BlastDock Templates ({len(entries)} found)[/bold blue]\n"
+    )
+    _display_catalog_entries(entries, output)
+
+
+@templates.command()
+@click.argument("query", required=False, default="")
+@click.option("--templates-dir", help="Custom templates directory")
+@click.option(
+    "--traefik/--no-traefik", default=None, help="Only Traefik (in)compatible templates"
+)
+@click.option("--category", help="Only templates in this category")
+@click.option(
+    "--output",
+    "-o",
+    type=click.Choice(["table", "json"]),
+    default="table",
+    help="Output format",
+)
+def search(query, templates_dir, traefik, category, output):
+    """Search templates by name, description, service or image"""
+
+    if templates_dir:
+        validator = TemplateValidator(templates_dir)
+    else:
+        validator = TemplateValidator()
+
+    entries = TemplateCatalog(str(validator.templates_dir)).search(
+        query, category=category, traefik_compatible=traefik
     )
 
+    if not entries:
+        console.print("[yellow]No matching templates[/yellow]")
+        return
+
+    console.print(f"\n[bold blue]🔍 {len(entries)} matching templates[/bold blue]\n")
+    _display_catalog_entries(entries, output)
+
+
+def _display_catalog_entries(entries, output):
+    """Display catalog entries as a table or JSON"""
     if output == "table":
         table = Table(title="Available Templates")
         table.add_column("Template", style="cyan")
@@ -299,51 +340,24 @@ def list(templates_dir, output):
         table.add_column("Traefik", style="yellow")
         table.add_column("Services", style="blue")
 
-        for template_file in sorted(template_files):
-            try:
-                import yaml
-
-                with open(template_file, "r") as f:
-                    template_data = yaml.safe_load(f)
-
-                template_info = template_data.get("template_info", {})
-                name = template_file.stem
-                description = template_info.get("description", "No description")[:50]
-                version = template_info.get("version", "Unknown")
-                traefik = "✅" if template_info.get("traefik_compatible") else "❌"
-                services = ", ".join(template_info.get("services", []))[:30]
+        for entry in entries:
+            template_info = entry.get("template_info") or {}
+            description = str(template_info.get("description", "No description"))[:50]
+            version = str(template_info.get("version", "Unknown"))
+            traefik = "✅" if template_info.get("traefik_compatible") else "❌"
+            services = ", ".join(template_info.get("services", []))[:30]
 
-                table.add_row(name, description, version, traefik, services)
-
-            except Exception:
-                table.add_row(
-                    template_file.stem, "Error loading template", "-", "-", "-"
-                )
+            table.add_row(entry["name"], description, version, traefik, services)
 
         console.print(table)
 
     elif output == "json":
         import json
 
-        templates_data = []
-
-        for template_file in sorted(template_files):
-            try:
-                import yaml
-
-                with open(template_file, "r") as f:
-                    template_data = yaml.safe_load(f)
-
-                templates_data.append(
-                    {
-                        "name": template_file.stem,
-                        "info": template_data.get("template_info", {}),
-                    }
-                )
-
-            except Exception as e:
-                templates_data.append({"name": template_file.stem, "error": str(e)})
-
+        templates_data = [
+            {"name": entry["name"], "info": entry.get("template_info") or {}}
+            for entry in entries
+        ]
         console.print(json.dumps(templates_data, indent=2))
 
 
@@ -492,6 +506,36 @@ def _display_template_analysis(analysis):
                 console.print(f"    [dim]💡 {result.suggestion}[/dim]")
 
 
+def _display_validation_stats(stats, show_timings=False):
+    """Display cache effectiveness and, optionally, per-check timings"""
+    if stats["cache_enabled"]:
+        console.print(
+            f"\n[dim]Cache: {stats['cache_hits']} hit(s), "
+            f"{stats['cache_misses']} re-validated "
+            f"({stats['hit_rate']:.0f}% hit rate)[/dim]"
+        )
+
+    if not show_timings:
+        return
+    if not stats["checks"]:
+        console.print("[dim]No checks ran: every result came from the cache[/dim]")
+        return
+
+    table = Table(title="Check Timings (slowest first)")
+    table.add_column("Check", style="cyan")
+    table.add_column("Runs", style="blue")
+    table.add_column("Total", style="magenta")
+    table.add_column("Average", style="green")
+    for check in stats["checks"]:
+        table.add_row(
+            check["check"],
+            str(check["runs"]),
+            f"{check['total_ms']:.1f}ms",
+            f"{check['avg_ms']:.2f}ms",
+        )
+    console.print(table)
+
+
 def _display_summary(analyses):
     """Display validation summary"""
     total = len(analyses)
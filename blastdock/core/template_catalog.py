@@ -0,0 +1,232 @@
+"""
+Template catalog index
+
+Keeps one compact JSON index of every template's ``template_info``, fields,
+images and exposed ports, keyed by content hash. Listing, filtering and
+searching the catalog is a single file read; only templates whose file
+changed since the index was written are re-parsed.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional
+
+from ..utils.logging import get_logger
+from ..performance.template_cache import build_field_schema, get_template_cache
+
+logger = get_logger(__name__)
+
+CATALOG_VERSION = 1
+TEMPLATE_SUFFIXES = (".yml", ".yaml")
+
+
+def _template_name(file_name: str) -> str:
+    return os.path.splitext(file_name)[0]
+
+
+def _extract_ports(service: Dict[str, Any]) -> List[str]:
+    ports = []
+    for port in (service.get("ports") or []) + (service.get("expose") or []):
+        if isinstance(port, dict):
+            port = port.get("target") or port.get("published")
+        if port is not None:
+            ports.append(str(port))
+    return ports
+
+
+def build_catalog_entry(
+    name: str, data: Dict[str, Any], content_hash: str, stat: os.stat_result
+) -> Dict[str, Any]:
+    """Catalog record for one parsed template"""
+    template_info = data.get("template_info") or {}
+    services = ((data.get("compose") or {}).get("services")) or {}
+
+    images = []
+    ports = []
+    for service in services.values():
+        if not isinstance(service, dict):
+            continue
+        if service.get("image"):
+            images.append(str(service["image"]))
+        ports.extend(_extract_ports(service))
+
+    return {
+        "name": name,
+        "hash": content_hash,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "template_info": template_info,
+        "category": template_info.get("category"),
+        "fields": build_field_schema(data.get("fields")),
+        "services": list(services),
+        "images": images,
+        "ports": ports,
+    }
+
+
+class TemplateCatalog:
+    """Lazily refreshed index of a templates directory"""
+
+    def __init__(self, templates_dir: str, index_path: Optional[str] = None):
+        self.logger = get_logger(__name__)
+        self.templates_dir = os.path.abspath(templates_dir)
+        if index_path is None:
+            from ..utils.filesystem import paths
+
+            dir_hash = hashlib.sha1(self.templates_dir.encode("utf-8")).hexdigest()
+            index_path = os.path.join(
+                str(paths.cache_dir), "templates", f"catalog-{dir_hash[:12]}.json"
+            )
+        self.index_path = index_path
+
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.RLock()
+        self.reparsed = 0
+
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if index.get("version") != CATALOG_VERSION:
+            return {}
+        return index.get("templates") or {}
+
+    def _write_index(self, entries: Dict[str, Dict[str, Any]]):
+        directory = os.path.dirname(self.index_path) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "version": CATALOG_VERSION,
+                        "templates_dir": self.templates_dir,
+                        "templates": entries,
+                    },
+                    f,
+                    separators=(",", ":"),
+                    default=str,
+                )
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            self.logger.debug(f"Could not write template catalog: {e}")
+
+    def _scan_template(
+        self, path: str, stat: os.stat_result, previous: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """Entry for one file, re-parsing only if its content hash changed"""
+        if (
+            previous is not None
+            and previous.get("mtime_ns") == stat.st_mtime_ns
+            and previous.get("size") == stat.st_size
+        ):
+            return previous
+
+        with open(path, "rb") as f:
+            content_hash = hashlib.sha256(f.read()).hexdigest()
+        if previous is not None and previous.get("hash") == content_hash:
+            return dict(previous, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+
+        self.reparsed += 1
+        entry = get_template_cache().get(path)
+        if entry.parse_error:
+            self.logger.debug(entry.parse_error)
+        return build_catalog_entry(
+            _template_name(os.path.basename(path)),
+            entry.data,
+            entry.content_hash,
+            stat,
+        )
+
+    def refresh(self, force: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Bring the index up to date with the templates directory"""
+        with self._lock:
+            previous = {} if force else self._read_index()
+            entries: Dict[str, Dict[str, Any]] = {}
+            try:
+                file_names = sorted(os.listdir(self.templates_dir))
+            except OSError:
+                file_names = []
+
+            for file_name in file_names:
+                if not file_name.endswith(TEMPLATE_SUFFIXES):
+                    continue
+                name = _template_name(file_name)
+                if name in entries:
+                    continue
+                path = os.path.join(self.templates_dir, file_name)
+                try:
+                    stat = os.stat(path)
+                    entry = self._scan_template(path, stat, previous.get(name))
+                except OSError as e:
+                    self.logger.debug(f"Skipping template {file_name}: {e}")
+                    continue
+                if entry is not None:
+                    entries[name] = entry
+
+            if entries != previous:
+                self._write_index(entries)
+            self._entries = entries
+            return entries
+
+    def _ensure(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            return self.refresh()
+        return self._entries
+
+    def names(self) -> List[str]:
+        return sorted(self._ensure())
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        return self._ensure().get(name)
+
+    def entries(self) -> List[Dict[str, Any]]:
+        entries = self._ensure()
+        return [entries[name] for name in sorted(entries)]
+
+    def search(
+        self,
+        query: str = "",
+        category: Optional[str] = None,
+        traefik_compatible: Optional[bool] = None,
+        field_type: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Templates matching every query term and filter
+
+        Terms are matched case-insensitively against name, description,
+        services and images.
+        """
+        terms = query.lower().split()
+        results = []
+        for entry in self.entries():
+            info = entry.get("template_info") or {}
+            if category is not None and entry.get("category") != category:
+                continue
+            if traefik_compatible is not None and bool(
+                info.get("traefik_compatible")
+            ) != bool(traefik_compatible):
+                continue
+            if field_type is not None and not any(
+                f.get("type") == field_type for f in entry["fields"].values()
+            ):
+                continue
+            if terms:
+                haystack = " ".join(
+                    [entry["name"], str(info.get("description", ""))]
+                    + entry["services"]
+                    + entry["images"]
+                ).lower()
+                if not all(term in haystack for term in terms):
+                    continue
+            results.append(entry)
+        return results
+
+    def invalidate(self):
+        """Forget the in-memory copy; the next read re-validates the index"""
+        with self._lock:
+            self._entries = None
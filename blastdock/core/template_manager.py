@@ -4,13 +4,15 @@ Template management system
 
 import os
 import re
-import yaml
-from jinja2 import FileSystemLoader, TemplateNotFound, select_autoescape
+import copy
+from jinja2 import FileSystemLoader, select_autoescape
 from jinja2.sandbox import SandboxedEnvironment
 from rich.console import Console
 from rich.prompt import Prompt, Confirm
 
-from ..utils.helpers import load_yaml, generate_password
+from ..utils.helpers import generate_password
+from ..performance.template_cache import get_template_cache
+from .template_catalog import TemplateCatalog
 from ..utils.validators import (
     validate_project_name,
     validate_domain,
@@ -58,6 +60,14 @@ class TemplateManager:
         # BUG-NEW-001 FIX: Pattern for validating template names (alphanumeric, hyphens, underscores only)
         self.TEMPLATE_NAME_PATTERN = re.compile(r"^[a-zA-Z0-9_-]+$")
 
+        # Parsed, compiled and rendered templates, shared across managers
+        self.template_cache = get_template_cache()
+        self._catalog = None
+
+    def _load_template(self, template_file):
+        """Parsed template data, served from the template cache"""
+        return copy.deepcopy(self.template_cache.get_data(template_file))
+
     def _validate_template_name(self, template_name):
         """Validate template name to prevent path traversal attacks (BUG-NEW-001 FIX)
 
@@ -92,6 +102,17 @@ class TemplateManager:
                     templates.append(file.replace(".yml", "").replace(".yaml", ""))
         return sorted(templates)
 
+    @property
+    def catalog(self):
+        """Catalog index of the templates directory (created on first use)"""
+        if self._catalog is None:
+            self._catalog = TemplateCatalog(self.templates_dir)
+        return self._catalog
+
+    def search_templates(self, query="", **filters):
+        """Search the template catalog (see TemplateCatalog.search)"""
+        return self.catalog.search(query, **filters)
+
     def template_exists(self, template_name):
         """Check if template exists"""
         # BUG-NEW-001 FIX: Validate template name to prevent path traversal
@@ -108,7 +129,7 @@ class TemplateManager:
             return {}
 
         try:
-            template_data = load_yaml(template_file)
+            template_data = self._load_template(template_file)
             return template_data.get("template_info", {})
         except Exception as e:
             console.print(f"[red]Error loading template info: {e}[/red]")
@@ -123,7 +144,7 @@ class TemplateManager:
             raise TemplateNotFoundError(template_name)
 
         try:
-            template_data = load_yaml(template_file)
+            template_data = self._load_template(template_file)
             config = {}
 
             # Extract default values from template
@@ -151,7 +172,7 @@ class TemplateManager:
             raise TemplateNotFoundError(template_name)
 
         try:
-            template_data = load_yaml(template_file)
+            template_data = self._load_template(template_file)
             config = {}
 
             console.print(f"\n[bold blue]Configuring {template_name}[/bold blue]")
@@ -295,11 +316,15 @@ class TemplateManager:
             # Sanitize config before rendering to prevent template injection
             sanitized_config = self._sanitize_config(config)
 
-            template = self.jinja_env.get_template(f"{template_name}.yml")
-            rendered = template.render(**sanitized_config)
-            return yaml.safe_load(rendered)
-        except TemplateNotFound:
-            raise TemplateNotFoundError(template_name)
+            template_file = os.path.join(self.templates_dir, f"{template_name}.yml")
+            if not os.path.exists(template_file):
+                raise TemplateNotFoundError(template_name)
+
+            return self.template_cache.render(
+                template_file, self.jinja_env, sanitized_config
+            )
+        except TemplateNotFoundError:
+            raise
         except TemplateValidationError:
             # Re-raise validation errors
             raise
@@ -2,10 +2,12 @@
 Enhanced Docker client with robust error handling and connection management
 """
 
+import re
+import json
 import time
 import subprocess
 import shlex
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 from ..utils.logging import get_logger
 from .errors import (
@@ -15,6 +17,7 @@ from .errors import (
     DockerConnectionError,
     create_docker_error,
 )
+from .transport import EndpointMetrics, EngineAPITransport, TransportUnavailable
 
 logger = get_logger(__name__)
 
@@ -22,12 +25,25 @@ logger = get_logger(__name__)
 class DockerClient:
     """Enhanced Docker client with comprehensive error handling"""
 
-    def __init__(self, timeout: int = 300, max_retries: int = 3):
-        """Initialize Docker client with configuration"""
+    def __init__(self, timeout: int = 300, max_retries: int = 3, use_api: bool = True):
+        """Initialize Docker client with configuration
+
+        With ``use_api`` enabled, status/inspect/logs/info/prune calls go
+        through a pooled Engine API session and only the remaining commands
+        (compose, builds, ...) fork the docker CLI.
+        """
         self.timeout = timeout
         self.max_retries = max_retries
         self.logger = get_logger(__name__)
 
+        # Per-endpoint latency and call counts (API endpoints and CLI commands)
+        self.endpoint_metrics = EndpointMetrics()
+        self.transport = (
+            EngineAPITransport(timeout=timeout, metrics=self.endpoint_metrics)
+            if use_api
+            else None
+        )
+
         # Connection state
         self._connection_verified = False
         self._docker_version = None
@@ -42,6 +58,27 @@ class DockerClient:
         capture_output: bool = True,
         check: bool = True,
         timeout: Optional[int] = None,
+    ) -> subprocess.CompletedProcess:
+        """Run Docker command, recording its latency under the CLI subcommand"""
+        endpoint = "cli:" + " ".join(
+            [arg for arg in cmd if not arg.startswith("-")][:2]
+        )
+        start = time.time()
+        failed = True
+        try:
+            result = self._run_cli_command(cmd, cwd, capture_output, check, timeout)
+            failed = result.returncode != 0
+            return result
+        finally:
+            self.endpoint_metrics.record(endpoint, time.time() - start, error=failed)
+
+    def _run_cli_command(
+        self,
+        cmd: List[str],
+        cwd: Optional[str] = None,
+        capture_output: bool = True,
+        check: bool = True,
+        timeout: Optional[int] = None,
     ) -> subprocess.CompletedProcess:
         """Run Docker command with error handling and retries"""
         timeout = timeout or self.timeout
@@ -134,6 +171,30 @@ class DockerClient:
             "warnings": [],
         }
 
+        # Prefer the Engine API: one pooled request instead of two CLI forks
+        if self._api_available():
+            try:
+                version_info = self.transport.version()
+                availability["docker_available"] = True
+                availability["docker_running"] = True
+                self._docker_version = version_info.get("Version")
+                availability["docker_version"] = self._docker_version
+            except Exception as e:
+                self.logger.debug(f"Engine API version check failed: {e}")
+
+        if not availability["docker_running"]:
+            self._check_docker_cli(availability)
+
+        self._check_docker_compose(availability)
+
+        # Update connection state
+        self._connection_verified = availability["docker_running"]
+
+        self.logger.info(f"Docker availability check completed: {availability}")
+        return availability
+
+    def _check_docker_cli(self, availability: Dict[str, Any]):
+        """Check Docker CLI and daemon through the docker binary"""
         # Check Docker CLI
         try:
             result = self._run_command(["docker", "--version"], check=False)
@@ -177,7 +238,8 @@ class DockerClient:
             except Exception as e:
                 availability["errors"].append(f"Docker daemon check failed: {str(e)}")
 
-        # Check Docker Compose
+    def _check_docker_compose(self, availability: Dict[str, Any]):
+        """Check Docker Compose (always CLI; the Engine API has no compose)"""
         try:
             # Try docker compose (newer plugin)
             result = self._run_command(["docker", "compose", "version"], check=False)
@@ -219,12 +281,6 @@ class DockerClient:
         except Exception as e:
             availability["errors"].append(f"Docker Compose check failed: {str(e)}")
 
-        # Update connection state
-        self._connection_verified = availability["docker_running"]
-
-        self.logger.info(f"Docker availability check completed: {availability}")
-        return availability
-
     def ensure_connection(self):
         """Ensure Docker connection is available, raise error if not"""
         if not self._connection_verified:
@@ -257,10 +313,92 @@ class DockerClient:
         check: bool = True,
         timeout: Optional[int] = None,
     ) -> subprocess.CompletedProcess:
-        """Execute a Docker command with error handling"""
+        """Execute a Docker command with error handling
+
+        Commands the Engine API can answer are served from the pooled
+        session with CLI-compatible output; everything else runs the CLI.
+        """
         self.ensure_connection()
+        result = self._execute_via_api(cmd, check)
+        if result is not None:
+            return result
         return self._run_command(cmd, cwd, capture_output, check, timeout)
 
+    def _api_available(self) -> bool:
+        """Check whether the Engine API transport can be used"""
+        return self.transport is not None and self.transport.is_available()
+
+    def _execute_via_api(
+        self, cmd: List[str], check: bool
+    ) -> Optional[subprocess.CompletedProcess]:
+        """Serve a docker CLI command from the Engine API, if supported
+
+        Returns None when the command has no API equivalent here or the
+        API is unreachable, so the caller falls back to the CLI.
+        """
+        if self.transport is None or len(cmd) < 2 or cmd[0] != "docker":
+            return None
+
+        from docker.errors import APIError, DockerException, NotFound
+
+        subcommand = cmd[1]
+        parsed = _parse_cli_args(cmd[2:], value_flags={"--format", "--tail", "--since"})
+        if parsed is None:
+            return None
+        positional, flags = parsed
+
+        try:
+            if subcommand == "info" and not positional:
+                if flags.get("--format") != "{{json .}}":
+                    return None
+                stdout = json.dumps(self.transport.info())
+
+            elif subcommand == "inspect" and len(positional) == 1:
+                if flags.get("--format") != "{{json .}}":
+                    return None
+                try:
+                    stdout = json.dumps(self.transport.inspect_container(positional[0]))
+                except NotFound:
+                    # May be an image/network/volume: let the CLI resolve it
+                    return None
+
+            elif subcommand == "logs" and len(positional) == 1:
+                if "--format" in flags:
+                    return None
+                tail = flags.get("--tail", "all")
+                since = None
+                if "--since" in flags:
+                    since = _since_to_timestamp(flags["--since"])
+                    if since is None:
+                        return None
+                stdout = self.transport.container_logs(
+                    positional[0],
+                    tail=int(tail) if str(tail).isdigit() else "all",
+                    since=since,
+                )
+            else:
+                return None
+
+        except TransportUnavailable:
+            return None
+        except APIError as e:
+            if check:
+                error = subprocess.CalledProcessError(1, cmd, output="", stderr=str(e))
+                raise create_docker_error(
+                    error, "Docker command", {"command": " ".join(cmd)}
+                )
+            return subprocess.CompletedProcess(cmd, 1, stdout="", stderr=str(e))
+        except DockerException as e:
+            # Arguments the SDK rejects client-side; the CLI may accept them
+            self.logger.debug(f"Engine API cannot serve {' '.join(cmd)}: {e}")
+            return None
+
+        return subprocess.CompletedProcess(cmd, 0, stdout=stdout, stderr="")
+
+    def get_endpoint_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Latency and call counts per API endpoint and CLI subcommand"""
+        return self.endpoint_metrics.snapshot()
+
     def execute_compose_command(
         self,
         cmd: List[str],
@@ -317,8 +455,6 @@ class DockerClient:
         try:
             # Get docker info
             result = self.execute_command(["docker", "info", "--format", "{{json .}}"])
-            import json
-
             docker_info = json.loads(result.stdout)
 
             info["system"] = {
@@ -350,6 +486,68 @@ class DockerClient:
         """Clean up Docker resources to free space"""
         self.ensure_connection()
 
+        if self._api_available():
+            try:
+                return self._cleanup_resources_api(aggressive)
+            except TransportUnavailable as e:
+                self.logger.debug(f"Falling back to CLI cleanup: {e}")
+
+        return self._cleanup_resources_cli(aggressive)
+
+    def _cleanup_resources_api(self, aggressive: bool) -> Dict[str, Any]:
+        """Prune resources through the Engine API prune endpoints"""
+        from docker.errors import APIError
+
+        cleanup_results = {
+            "containers_removed": 0,
+            "images_removed": 0,
+            "volumes_removed": 0,
+            "networks_removed": 0,
+            "space_reclaimed": "0B",
+            "errors": [],
+        }
+        reclaimed = 0
+        steps = [
+            (
+                "Container",
+                "containers_removed",
+                "ContainersDeleted",
+                self.transport.prune_containers,
+            ),
+            (
+                "Image",
+                "images_removed",
+                "ImagesDeleted",
+                lambda: self.transport.prune_images(all_images=aggressive),
+            ),
+            (
+                "Volume",
+                "volumes_removed",
+                "VolumesDeleted",
+                self.transport.prune_volumes,
+            ),
+            (
+                "Network",
+                "networks_removed",
+                "NetworksDeleted",
+                self.transport.prune_networks,
+            ),
+        ]
+
+        for label, result_key, response_key, prune in steps:
+            try:
+                response = prune() or {}
+                cleanup_results[result_key] = len(response.get(response_key) or [])
+                reclaimed += response.get("SpaceReclaimed") or 0
+            except APIError as e:
+                cleanup_results["errors"].append(f"{label} cleanup failed: {str(e)}")
+
+        cleanup_results["space_reclaimed"] = _format_size(reclaimed)
+        self.logger.info(f"Docker cleanup completed: {cleanup_results}")
+        return cleanup_results
+
+    def _cleanup_resources_cli(self, aggressive: bool) -> Dict[str, Any]:
+        """Prune resources through the docker CLI"""
         cleanup_results = {
             "containers_removed": 0,
             "images_removed": 0,
@@ -361,11 +559,9 @@ class DockerClient:
 
         try:
             # Remove stopped containers
-            result = self.execute_command(["docker", "container", "prune", "-"])
+            result = self.execute_command(["docker", "container", "prune", "-f"])
             if "Total reclaimed space" in result.stdout:
                 # Parse space reclaimed
-                import re
-
                 space_match = re.search(
                     r"Total reclaimed space: ([\d.]+\w+)", result.stdout
                 )
@@ -387,9 +583,9 @@ class DockerClient:
         try:
             # Remove dangling images
             if aggressive:
-                result = self.execute_command(["docker", "image", "prune", "-a", "-"])
+                result = self.execute_command(["docker", "image", "prune", "-a", "-f"])
             else:
-                result = self.execute_command(["docker", "image", "prune", "-"])
+                result = self.execute_command(["docker", "image", "prune", "-f"])
 
             # Count removed images
             image_match = re.search(
@@ -405,7 +601,7 @@ class DockerClient:
 
         try:
             # Remove unused volumes
-            result = self.execute_command(["docker", "volume", "prune", "-"])
+            result = self.execute_command(["docker", "volume", "prune", "-f"])
 
             # Count removed volumes
             volume_match = re.search(
@@ -421,7 +617,7 @@ class DockerClient:
 
         try:
             # Remove unused networks
-            result = self.execute_command(["docker", "network", "prune", "-"])
+            result = self.execute_command(["docker", "network", "prune", "-f"])
 
             # Count removed networks
             network_match = re.search(
@@ -439,6 +635,62 @@ class DockerClient:
         return cleanup_results
 
 
+def _parse_cli_args(
+    args: List[str], value_flags: set
+) -> Optional[Tuple[List[str], Dict[str, str]]]:
+    """Split CLI args into positionals and ``value_flags`` options
+
+    Returns None if any other flag is present, since the command then
+    needs behaviour only the CLI provides.
+    """
+    positional: List[str] = []
+    flags: Dict[str, str] = {}
+    index = 0
+    while index < len(args):
+        arg = args[index]
+        if arg.startswith("-"):
+            name, _, value = arg.partition("=")
+            if name not in value_flags:
+                return None
+            if not value:
+                if index + 1 >= len(args):
+                    return None
+                index += 1
+                value = args[index]
+            flags[name] = value
+        else:
+            positional.append(arg)
+        index += 1
+    return positional, flags
+
+
+_SINCE_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def _since_to_timestamp(value: str) -> Optional[int]:
+    """Convert a ``docker logs --since`` value to a unix timestamp
+
+    Handles unix timestamps and relative durations ("10m", "2h"); returns
+    None for anything else so the CLI can interpret it. That includes 0,
+    which the CLI reads as "no limit" but the SDK rejects.
+    """
+    if value.isdigit():
+        return int(value) or None
+    match = re.fullmatch(r"(\d+)([smhd])", value)
+    if match:
+        return int(time.time() - int(match.group(1)) * _SINCE_UNITS[match.group(2)])
+    return None
+
+
+def _format_size(size: float) -> str:
+    """Format bytes like the docker CLI (decimal units)"""
+    for unit in ["B", "kB", "MB", "GB", "TB"]:
+        if size < 1000 or unit == "TB":
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.3g}{unit}"
+        size /= 1000
+    return f"{size:.3g}TB"
+
+
 # Global client instance
 _docker_client: Optional[DockerClient] = None
 
@@ -0,0 +1,219 @@
+"""
+Pooled Docker Engine API transport
+
+Talks to the daemon over a keep-alive HTTP session (unix socket by default,
+or whatever DOCKER_HOST points at) instead of forking the docker CLI for
+every call, and keeps per-endpoint call counts and latencies for both the
+API and any CLI fallbacks.
+"""
+
+import time
+import threading
+from typing import Any, Callable, Dict, Optional
+from dataclasses import dataclass
+
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class EndpointStats:
+    """Call statistics for one API endpoint or CLI subcommand"""
+
+    calls: int = 0
+    errors: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    last_time: float = 0.0
+
+    @property
+    def avg_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "avg_ms": self.avg_time * 1000,
+            "max_ms": self.max_time * 1000,
+            "last_ms": self.last_time * 1000,
+            "total_s": self.total_time,
+        }
+
+
+class EndpointMetrics:
+    """Thread-safe per-endpoint latency and call-count registry"""
+
+    def __init__(self):
+        self._stats: Dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, duration: float, error: bool = False):
+        with self._lock:
+            stats = self._stats.get(endpoint)
+            if stats is None:
+                stats = self._stats[endpoint] = EndpointStats()
+            stats.calls += 1
+            stats.total_time += duration
+            stats.last_time = duration
+            stats.max_time = max(stats.max_time, duration)
+            if error:
+                stats.errors += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self._stats.items()}
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+class TransportUnavailable(Exception):
+    """The Engine API cannot be reached; callers should fall back to the CLI"""
+
+
+class EngineAPITransport:
+    """Keep-alive, connection-pooled Docker Engine API session
+
+    Wraps the docker SDK's low-level ``APIClient``, whose requests session
+    keeps up to ``max_pool_size`` sockets open to the daemon. If the daemon
+    is unreachable the transport backs off for ``retry_interval`` seconds
+    before trying again, raising ``TransportUnavailable`` in the meantime.
+    """
+
+    def __init__(
+        self,
+        timeout: int = 60,
+        max_pool_size: int = 10,
+        retry_interval: float = 30.0,
+        metrics: Optional[EndpointMetrics] = None,
+    ):
+        self.logger = get_logger(__name__)
+        self.timeout = timeout
+        self.max_pool_size = max_pool_size
+        self.retry_interval = retry_interval
+        self.metrics = metrics or EndpointMetrics()
+
+        self._api = None
+        self._lock = threading.Lock()
+        self._unavailable_until = 0.0
+
+    def _connect(self):
+        """Create the pooled API session (lazily, once)"""
+        with self._lock:
+            if self._api is not None:
+                return self._api
+            if time.time() < self._unavailable_until:
+                raise TransportUnavailable("Docker Engine API recently unreachable")
+
+            try:
+                import docker
+                from docker.utils import kwargs_from_env
+
+                api = docker.APIClient(
+                    timeout=self.timeout,
+                    max_pool_size=self.max_pool_size,
+                    **kwargs_from_env(),
+                )
+                start = time.time()
+                api.ping()
+                self.metrics.record("GET /_ping", time.time() - start)
+            except Exception as e:
+                self._unavailable_until = time.time() + self.retry_interval
+                self.logger.debug(f"Docker Engine API unavailable: {e}")
+                raise TransportUnavailable(str(e))
+
+            self._api = api
+            return api
+
+    def is_available(self) -> bool:
+        """Check whether the Engine API can be used right now"""
+        try:
+            self._connect()
+            return True
+        except TransportUnavailable:
+            return False
+
+    def _mark_down(self, error: Exception):
+        with self._lock:
+            if self._api is not None:
+                try:
+                    self._api.close()
+                except Exception as close_err:
+                    self.logger.debug(f"Error closing API session: {close_err}")
+            self._api = None
+            self._unavailable_until = time.time() + self.retry_interval
+        self.logger.warning(f"Docker Engine API connection lost: {error}")
+
+    def call(self, endpoint: str, operation: Callable[[Any], Any]) -> Any:
+        """Run ``operation(api_client)`` and record it under ``endpoint``
+
+        Connection-level failures raise ``TransportUnavailable``; API errors
+        (404, 409, ...) propagate as ``docker.errors.APIError`` and arguments
+        the SDK rejects as other ``docker.errors.DockerException``s.
+        """
+        from docker.errors import DockerException
+        from requests.exceptions import ConnectionError as RequestsConnectionError
+
+        api = self._connect()
+        start = time.time()
+        try:
+            result = operation(api)
+        except DockerException:
+            self.metrics.record(endpoint, time.time() - start, error=True)
+            raise
+        except (RequestsConnectionError, OSError) as e:
+            self.metrics.record(endpoint, time.time() - start, error=True)
+            self._mark_down(e)
+            raise TransportUnavailable(str(e))
+        self.metrics.record(endpoint, time.time() - start)
+        return result
+
+    def ping(self) -> bool:
+        return bool(self.call("GET /_ping", lambda api: api.ping()))
+
+    def version(self) -> Dict[str, Any]:
+        return self.call("GET /version", lambda api: api.version())
+
+    def info(self) -> Dict[str, Any]:
+        return self.call("GET /info", lambda api: api.info())
+
+    def inspect_container(self, container: str) -> Dict[str, Any]:
+        return self.call(
+            "GET /containers/{id}/json", lambda api: api.inspect_container(container)
+        )
+
+    def container_logs(
+        self, container: str, tail: Any = "all", since: Optional[int] = None
+    ) -> str:
+        output = self.call(
+            "GET /containers/{id}/logs",
+            lambda api: api.logs(container, tail=tail, since=since),
+        )
+        return output.decode("utf-8", errors="replace")
+
+    def prune_containers(self) -> Dict[str, Any]:
+        return self.call("POST /containers/prune", lambda api: api.prune_containers())
+
+    def prune_images(self, all_images: bool = False) -> Dict[str, Any]:
+        filters = {"dangling": False} if all_images else None
+        return self.call(
+            "POST /images/prune", lambda api: api.prune_images(filters=filters)
+        )
+
+    def prune_volumes(self) -> Dict[str, Any]:
+        return self.call("POST /volumes/prune", lambda api: api.prune_volumes())
+
+    def prune_networks(self) -> Dict[str, Any]:
+        return self.call("POST /networks/prune", lambda api: api.prune_networks())
+
+    def close(self):
+        with self._lock:
+            if self._api is not None:
+                try:
+                    self._api.close()
+                except Exception as e:
+                    self.logger.debug(f"Error closing API session: {e}")
+                self._api = None
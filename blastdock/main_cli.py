@@ -12,23 +12,45 @@ from rich.console import Console
 # Import version and system info
 from ._version import __version__, check_python_version
 
-# Import core modules
-from .core.config import get_config_manager
-from .core.domain import DomainManager
-
 # Import utilities
 from .utils.logging import get_logger, initialize_logging
 from .utils.filesystem import initialize_directories
 
-# Import CLI command groups
-from .cli.deploy import deploy_group
-from .cli.marketplace import marketplace_group
-from .cli.monitoring import monitoring as monitoring_group
-from .cli.templates import templates as templates_group
-from .cli.diagnostics import diagnostics as diagnostics_group
-from .cli.security import security as security_group
-from .cli.performance import performance as performance_group
-from .cli.config_commands import config_group
+# CLI command groups are imported only when invoked, so that e.g.
+# ``blastdock --version`` does not load docker, jinja2 or the monitoring stack
+from .cli.lazy import LazyGroup
+
+COMMAND_GROUPS = {
+    "deploy": ("blastdock.cli.deploy:deploy_group", "Deployment management commands"),
+    "marketplace": (
+        "blastdock.cli.marketplace:marketplace_group",
+        "Template marketplace commands",
+    ),
+    "monitoring": (
+        "blastdock.cli.monitoring:monitoring",
+        "Advanced monitoring and health check commands",
+    ),
+    "templates": (
+        "blastdock.cli.templates:templates",
+        "Template management and validation commands",
+    ),
+    "diagnostics": (
+        "blastdock.cli.diagnostics:diagnostics",
+        "System diagnostics and error reporting commands",
+    ),
+    "security": (
+        "blastdock.cli.security:security",
+        "Security validation and management commands",
+    ),
+    "performance": (
+        "blastdock.cli.performance:performance",
+        "Performance monitoring and optimization commands",
+    ),
+    "config": (
+        "blastdock.cli.config_commands:config_group",
+        "Configuration management commands",
+    ),
+}
 
 # Initialize console
 console = Console()
@@ -86,6 +108,8 @@ def setup_cli_environment(
 
     # Load configuration
     try:
+        from .core.config import get_config_manager
+
         config_manager = get_config_manager(profile)
         config_manager.config
         logger.debug(f"Loaded configuration for profile '{profile}'")
@@ -97,7 +121,7 @@ def setup_cli_environment(
             )
 
 
-@click.group()
+@click.group(cls=LazyGroup, lazy_subcommands=COMMAND_GROUPS)
 @click.option("--verbose", "-v", is_flag=True, help="Enable verbose output")
 @click.option("--quiet", "-q", is_flag=True, help="Suppress non-error output")
 @click.option(
@@ -143,6 +167,8 @@ def cli(ctx, verbose, quiet, log_level, profile):
 @click.pass_context
 def init(ctx, template_name, interactive, name, traefik):
     """Initialize a new deployment (legacy - use 'deploy create' instead)"""
+    from .cli.deploy import deploy_group
+
     console.print(
         "[yellow]Note: 'init' is deprecated. Use 'blastdock deploy create' instead[/yellow]"
     )
@@ -164,6 +190,8 @@ def init(ctx, template_name, interactive, name, traefik):
 )
 def list(output_format):
     """List all deployments (legacy - use 'deploy list' instead)"""
+    from .cli.deploy import deploy_group
+
     console.print(
         "[yellow]Note: 'list' is deprecated. Use 'blastdock deploy list' instead[/yellow]"
     )
@@ -175,6 +203,8 @@ def list(output_format):
 @click.pass_context
 def templates(ctx):
     """List available templates (legacy - use 'marketplace search' instead)"""
+    from .cli.marketplace import marketplace_group
+
     console.print(
         "[yellow]Note: 'templates' is deprecated. Use 'blastdock marketplace search' instead[/yellow]"
     )
@@ -252,6 +282,9 @@ def domain():
 @click.argument("domain_name")
 def set_default(domain_name):
     """Set the default domain for new deployments"""
+    from .core.config import get_config_manager
+    from .core.domain import DomainManager
+
     DomainManager()
     config_manager = get_config_manager()
     config_manager.set_value("default_domain", domain_name)
@@ -276,6 +309,8 @@ def list_domains(output_format):
 @click.argument("domain_name")
 def check(domain_name):
     """Check domain availability and DNS status"""
+    from .core.domain import DomainManager
+
     domain_manager = DomainManager()
     result = domain_manager.validate_domain_availability(domain_name)
     if result["available"]:
@@ -375,17 +410,6 @@ def rollback(project_name):
     console.print("[yellow]Migration rollback command coming soon[/yellow]")
 
 
-# Add all command groups
-cli.add_command(deploy_group)
-cli.add_command(marketplace_group)
-cli.add_command(monitoring_group)
-cli.add_command(templates_group)
-cli.add_command(diagnostics_group)
-cli.add_command(security_group)
-cli.add_command(performance_group)
-cli.add_command(config_group)
-
-
 def main():
     """Main entry point with global exception handling"""
     try:
@@ -8,21 +8,25 @@ import threading
 import json
 import shlex
 import subprocess
-from typing import Dict, List, Any, Optional
+import dataclasses
+from collections import deque
+from typing import Deque, Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
 # Optional email imports (for notifications)
 try:
     import smtplib
-    from email.mime.text import MimeText
-    from email.mime.multipart import MimeMultipart
+    from email.mime.text import MIMEText as MimeText
+    from email.mime.multipart import MIMEMultipart as MimeMultipart
 
     EMAIL_AVAILABLE = True
 except ImportError:
     EMAIL_AVAILABLE = False
 
 from ..utils.logging import get_logger
+from .history_store import ALERT_ROLLUP, HistoryStore, open_history_store
+from .notification_dispatch import Notification, NotificationDispatcher
 
 logger = get_logger(__name__)
 
@@ -71,6 +75,29 @@ class Alert:
     notification_sent: bool = False
 
 
+# Sorted (label, value) pairs identifying one metric series
+SeriesKey = Tuple[Tuple[str, str], ...]
+
+
+class ConditionSlot:
+    """Condition tracking for one (rule, series) pair"""
+
+    __slots__ = ("first_time", "last_time", "consecutive_count")
+
+    def __init__(self):
+        self.first_time: Optional[float] = None
+        self.last_time: Optional[float] = None
+        self.consecutive_count = 0
+
+
+def series_metric_key(metric_name: str, series_key: SeriesKey) -> str:
+    """Alert key of a series, e.g. ``container_cpu_percent{container=web}``"""
+    if not series_key:
+        return metric_name
+    labels = ",".join(f"{name}={value}" for name, value in series_key)
+    return f"{metric_name}{{{labels}}}"
+
+
 @dataclass
 class NotificationChannel:
     """Notification channel configuration"""
@@ -85,26 +112,47 @@ class NotificationChannel:
 class AlertManager:
     """Comprehensive alert management system"""
 
-    def __init__(self):
-        """Initialize alert manager"""
+    def __init__(self, persist: bool = False, history_dir: Optional[str] = None):
+        """Initialize alert manager
+
+        With ``persist`` fired and resolved alerts are also appended to the
+        history store under ``<data_dir>/history`` (or ``history_dir``).
+        """
         self.logger = get_logger(__name__)
 
         # Alert rules and active alerts
         self._rules: Dict[str, AlertRule] = {}
         self._active_alerts: Dict[str, Alert] = {}
-        self._alert_history: List[Alert] = []
+        self._alert_history: Deque[Alert] = deque(maxlen=1000)
+        # Running per-rule rollups in the ALERT_ROLLUP layout
+        self._rule_totals: Dict[str, List[float]] = {}
         self._alerts_lock = threading.RLock()
+        self.history_store: Optional[HistoryStore] = None
+        if persist:
+            try:
+                self.history_store = open_history_store(history_dir)
+            except OSError as e:
+                self.logger.warning(f"Alert history persistence disabled: {e}")
 
         # Notification channels
         self._notification_channels: Dict[str, NotificationChannel] = {}
 
+        # Delivery runs on per-channel workers, off the evaluation path
+        self._notifier = NotificationDispatcher(self._deliver_notifications)
+        self._http = None
+        self._smtp_connections: Dict[Tuple, Any] = {}
+        self._smtp_locks: Dict[Tuple, threading.Lock] = {}
+        self._connections_lock = threading.Lock()
+
         # Alert evaluation
         self._evaluation_active = False
         self._evaluation_thread = None
         self._evaluation_interval = 30.0  # 30 seconds
 
-        # Metric conditions tracking
-        self._condition_state: Dict[str, Dict[str, Any]] = {}
+        # Metric name -> rules reading it, and per-(rule, series) state
+        self._rules_by_metric: Dict[str, List[AlertRule]] = {}
+        self._condition_slots: Dict[str, Dict[SeriesKey, ConditionSlot]] = {}
+        self._metrics_collector = None
 
         # Alert statistics
         self.stats = {
@@ -217,11 +265,23 @@ class AlertManager:
 
         for rule in default_rules:
             self._rules[rule.name] = rule
+        self._rebuild_rule_index()
+
+    def _rebuild_rule_index(self):
+        """Index rules by the metric they read"""
+        index: Dict[str, List[AlertRule]] = {}
+        for rule in self._rules.values():
+            index.setdefault(rule.metric_name, []).append(rule)
+        self._rules_by_metric = index
 
     def add_rule(self, rule: AlertRule):
         """Add or update an alert rule"""
         with self._alerts_lock:
+            previous = self._rules.get(rule.name)
+            if previous is not None and previous.metric_name != rule.metric_name:
+                self._condition_slots.pop(rule.name, None)
             self._rules[rule.name] = rule
+            self._rebuild_rule_index()
 
         self.logger.info(f"Added alert rule: {rule.name}")
 
@@ -230,10 +290,10 @@ class AlertManager:
         with self._alerts_lock:
             if rule_name in self._rules:
                 del self._rules[rule_name]
+                self._rebuild_rule_index()
 
                 # Clear any related condition state
-                if rule_name in self._condition_state:
-                    del self._condition_state[rule_name]
+                self._condition_slots.pop(rule_name, None)
 
                 self.logger.info(f"Removed alert rule: {rule_name}")
                 return True
@@ -277,19 +337,49 @@ class AlertManager:
         return False
 
     def evaluate_rules(self, metrics_data: Dict[str, Any]):
-        """Evaluate alert rules against metrics"""
+        """Evaluate alert rules against a metrics snapshot
+
+        Only rules indexed under the snapshot's metric names are evaluated.
+        """
         current_time = time.time()
 
         with self._alerts_lock:
-            for rule_name, rule in self._rules.items():
+            for metric_name in metrics_data:
+                for rule in self._rules_by_metric.get(metric_name, ()):
+                    if not rule.enabled:
+                        continue
+
+                    try:
+                        self._evaluate_rule(rule, metrics_data, current_time)
+                        self.stats["rules_evaluated"] += 1
+                    except Exception as e:
+                        self.logger.error(f"Error evaluating rule {rule.name}: {e}")
+
+    def observe_sample(
+        self,
+        metric_name: str,
+        value: float,
+        timestamp: float,
+        labels: Dict[str, str],
+    ):
+        """Evaluate the rules that read ``metric_name`` against one new sample"""
+        rules = self._rules_by_metric.get(metric_name)
+        if not rules:
+            return
+
+        series_key = tuple(sorted(labels.items()))
+        with self._alerts_lock:
+            for rule in rules:
                 if not rule.enabled:
                     continue
 
                 try:
-                    self._evaluate_rule(rule, metrics_data, current_time)
+                    self._evaluate_series(
+                        rule, series_key, dict(series_key), value, timestamp
+                    )
                     self.stats["rules_evaluated"] += 1
                 except Exception as e:
-                    self.logger.error(f"Error evaluating rule {rule_name}: {e}")
+                    self.logger.error(f"Error evaluating rule {rule.name}: {e}")
 
     def _evaluate_rule(
         self, rule: AlertRule, metrics_data: Dict[str, Any], current_time: float
@@ -299,44 +389,59 @@ class AlertManager:
         metric_values = self._get_metric_values_for_rule(rule, metrics_data)
 
         for metric_key, value in metric_values.items():
-            # Check if condition is met
-            condition_met = self._evaluate_condition(
-                rule.condition, value, rule.threshold
+            self._evaluate_series(
+                rule, (("metric_key", metric_key),), {}, value, current_time
             )
 
-            # Track condition state for duration-based alerts
-            state_key = f"{rule.name}:{metric_key}"
-
-            if state_key not in self._condition_state:
-                self._condition_state[state_key] = {
-                    "first_time": None,
-                    "last_time": None,
-                    "consecutive_count": 0,
-                }
-
-            state = self._condition_state[state_key]
-
-            if condition_met:
-                if state["first_time"] is None:
-                    state["first_time"] = current_time
-                state["last_time"] = current_time
-                state["consecutive_count"] += 1
-
-                # Check if duration threshold is met
-                duration_met = (
-                    current_time - state["first_time"]
-                ) >= rule.duration_seconds
-
-                if duration_met:
-                    self._fire_alert(rule, metric_key, value, current_time)
-            else:
-                # Condition not met, reset state and resolve any active alerts
-                if state["first_time"] is not None:
-                    self._resolve_alert(rule, metric_key, current_time)
+    def _evaluate_series(
+        self,
+        rule: AlertRule,
+        series_key: SeriesKey,
+        labels: Dict[str, str],
+        value: float,
+        current_time: float,
+    ):
+        """Advance the condition state of one series and fire or resolve"""
+        # Check if condition is met
+        condition_met = self._evaluate_condition(rule.condition, value, rule.threshold)
+
+        # Track condition state for duration-based alerts
+        slots = self._condition_slots.setdefault(rule.name, {})
+        state = slots.get(series_key)
+
+        if condition_met:
+            if state is None:
+                state = slots[series_key] = ConditionSlot()
+            if state.first_time is None:
+                state.first_time = current_time
+            state.last_time = current_time
+            state.consecutive_count += 1
+
+            # Check if duration threshold is met
+            duration_met = (current_time - state.first_time) >= rule.duration_seconds
+
+            if duration_met:
+                self._fire_alert(
+                    rule,
+                    self._metric_key(rule, series_key),
+                    value,
+                    current_time,
+                    labels,
+                )
+        elif state is not None:
+            # Condition not met, reset state and resolve any active alerts
+            if state.first_time is not None:
+                self._resolve_alert(
+                    rule, self._metric_key(rule, series_key), current_time
+                )
+            del slots[series_key]
 
-                state["first_time"] = None
-                state["last_time"] = None
-                state["consecutive_count"] = 0
+    @staticmethod
+    def _metric_key(rule: AlertRule, series_key: SeriesKey) -> str:
+        if len(series_key) == 1 and series_key[0][0] == "metric_key":
+            # Snapshot evaluation already names its values
+            return series_key[0][1]
+        return series_metric_key(rule.metric_name, series_key)
 
     def _get_metric_values_for_rule(
         self, rule: AlertRule, metrics_data: Dict[str, Any]
@@ -387,7 +492,12 @@ class AlertManager:
             return False
 
     def _fire_alert(
-        self, rule: AlertRule, metric_key: str, value: float, current_time: float
+        self,
+        rule: AlertRule,
+        metric_key: str,
+        value: float,
+        current_time: float,
+        series_labels: Optional[Dict[str, str]] = None,
     ):
         """Fire an alert"""
         alert_id = f"{rule.name}:{metric_key}"
@@ -402,9 +512,12 @@ class AlertManager:
         alert = Alert(
             rule_name=rule.name,
             severity=rule.severity,
-            message=self._format_alert_message(rule, value),
-            labels=rule.labels.copy(),
-            annotations=rule.annotations.copy(),
+            message=self._format_alert_message(rule, value, series_labels),
+            labels={**(series_labels or {}), **rule.labels},
+            annotations={
+                name: self._render_template(text, value, series_labels)
+                for name, text in rule.annotations.items()
+            },
             status=AlertStatus.FIRING,
             fired_at=current_time,
         )
@@ -415,6 +528,7 @@ class AlertManager:
 
         self._active_alerts[alert_id] = alert
         self._alert_history.append(alert)
+        self._record_history(alert, metric_key)
 
         # Update statistics
         self.stats["total_alerts"] += 1
@@ -439,6 +553,7 @@ class AlertManager:
                 # Update statistics
                 self.stats["active_alerts"] -= 1
                 self.stats["resolved_alerts"] += 1
+                self._record_history(alert, metric_key)
 
                 # Send resolution notifications
                 self._send_resolution_notifications(alert)
@@ -448,21 +563,72 @@ class AlertManager:
             # Remove from active alerts
             del self._active_alerts[alert_id]
 
-    def _format_alert_message(self, rule: AlertRule, value: float) -> str:
-        """Format alert message with template substitution"""
-        message = rule.description
+    def _record_history(self, alert: Alert, metric_key: str):
+        """Update the rule's rollup and persist the alert's new state"""
+        with self._alerts_lock:
+            totals = self._rule_totals.setdefault(
+                alert.rule_name, [0.0] * len(ALERT_ROLLUP)
+            )
+            totals[0] += 1
+            if alert.status == AlertStatus.RESOLVED:
+                totals[2] += 1
+                totals[3] += max(0.0, alert.resolved_at - alert.fired_at)
+            else:
+                totals[1] += 1
 
+        if self.history_store is not None:
+            try:
+                self.history_store.record_alert(
+                    alert.rule_name,
+                    metric_key,
+                    alert.severity.value,
+                    alert.status.value,
+                    alert.message,
+                    alert.fired_at,
+                    alert.resolved_at,
+                )
+            except OSError as e:
+                self.logger.debug(f"Failed to persist alert: {e}")
+
+    def _format_alert_message(
+        self,
+        rule: AlertRule,
+        value: float,
+        series_labels: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """Format alert message with template substitution"""
+        return self._render_template(rule.description, value, series_labels, rule)
+
+    @staticmethod
+    def _render_template(
+        text: str,
+        value: float,
+        series_labels: Optional[Dict[str, str]] = None,
+        rule: Optional[AlertRule] = None,
+    ) -> str:
         # Simple template substitution
-        message = message.replace("{{ $value }}", str(value))
+        text = text.replace("{{ $value }}", str(value))
 
-        # Add labels if available (simplified)
-        for key, val in rule.labels.items():
-            message = message.replace(f"{{{{ $labels.{key} }}}}", val)
+        # Series labels, then rule labels (simplified)
+        labels = {**(series_labels or {}), **(rule.labels if rule else {})}
+        for key, val in labels.items():
+            text = text.replace(f"{{{{ $labels.{key} }}}}", val)
 
-        return message
+        return text
 
     def _send_notifications(self, alert: Alert):
-        """Send alert notifications to configured channels"""
+        """Queue alert notifications for configured channels"""
+        self._queue_notifications("alert", alert)
+
+    def _send_resolution_notifications(self, alert: Alert):
+        """Queue alert resolution notifications"""
+        self._queue_notifications("resolution", alert)
+
+    def _queue_notifications(self, kind: str, alert: Alert):
+        # Snapshot: the alert keeps changing after it is queued
+        snapshot = dataclasses.replace(
+            alert, labels=dict(alert.labels), annotations=dict(alert.annotations)
+        )
         for channel_name, channel in self._notification_channels.items():
             if not channel.enabled:
                 continue
@@ -470,26 +636,144 @@ class AlertManager:
             if alert.severity not in channel.severities:
                 continue
 
-            try:
-                self._send_notification_to_channel(alert, channel)
-                alert.notification_sent = True
-                self.stats["notifications_sent"] += 1
-            except Exception as e:
-                self.logger.error(f"Failed to send notification to {channel_name}: {e}")
+            self._notifier.submit(channel_name, kind, snapshot, source=alert)
 
-    def _send_resolution_notifications(self, alert: Alert):
-        """Send alert resolution notifications"""
-        for channel_name, channel in self._notification_channels.items():
-            if not channel.enabled:
-                continue
+    def _deliver_notifications(
+        self, channel_name: str, notifications: List[Notification]
+    ):
+        """Deliver queued notifications; runs on the channel's worker threads"""
+        channel = self._notification_channels.get(channel_name)
+        if channel is None or not channel.enabled:
+            notifications.clear()
+            return
 
-            if alert.severity not in channel.severities:
-                continue
+        if len(notifications) > 1 and channel.type in ("email", "webhook"):
+            self._send_digest_to_channel(notifications, channel)
+            delivered = list(notifications)
+            notifications.clear()
+        else:
+            delivered = []
+            while notifications:
+                notification = notifications[0]
+                if notification.kind == "alert":
+                    self._send_notification_to_channel(notification.alert, channel)
+                else:
+                    self._send_resolution_to_channel(notification.alert, channel)
+                delivered.append(notifications.pop(0))
+
+        sent = 0
+        for notification in delivered:
+            if notification.kind == "alert":
+                if notification.source is not None:
+                    notification.source.notification_sent = True
+                sent += 1
+        with self._alerts_lock:
+            self.stats["notifications_sent"] += sent
 
-            try:
-                self._send_resolution_to_channel(alert, channel)
-            except Exception as e:
-                self.logger.error(f"Failed to send resolution to {channel_name}: {e}")
+    def flush_notifications(self, timeout: float = 10.0) -> bool:
+        """Wait until queued notifications have been delivered or dropped"""
+        return self._notifier.flush(timeout)
+
+    def _http_session(self):
+        """Shared HTTP session so webhook deliveries reuse connections"""
+        import requests
+
+        with self._connections_lock:
+            if self._http is None:
+                self._http = requests.Session()
+            return self._http
+
+    def _smtp_send(self, config: Dict[str, Any], msg):
+        """Send over a cached SMTP connection, reconnecting once if it dropped"""
+        key = (
+            config.get("smtp_server"),
+            config.get("smtp_port", 587),
+            config.get("username"),
+        )
+        with self._connections_lock:
+            lock = self._smtp_locks.setdefault(key, threading.Lock())
+        with lock:
+            for attempt in range(2):
+                server = self._smtp_connections.get(key)
+                if server is None:
+                    server = smtplib.SMTP(key[0], key[1], timeout=30)
+                    server.starttls()
+                    server.login(config.get("username"), config.get("password"))
+                    self._smtp_connections[key] = server
+                try:
+                    server.send_message(msg)
+                    return
+                except smtplib.SMTPServerDisconnected:
+                    self._smtp_connections.pop(key, None)
+                    if attempt:
+                        raise
+
+    def _send_digest_to_channel(
+        self, notifications: List[Notification], channel: NotificationChannel
+    ):
+        """Send a burst of notifications as one message"""
+        entries = [
+            {
+                "rule_name": n.alert.rule_name,
+                "severity": n.alert.severity.value,
+                "message": n.alert.message,
+                "status": (
+                    "resolved" if n.kind == "resolution" else n.alert.status.value
+                ),
+                "fired_at": n.alert.fired_at,
+                "resolved_at": n.alert.resolved_at,
+                "labels": n.alert.labels,
+                "annotations": n.alert.annotations,
+            }
+            for n in notifications
+        ]
+        config = channel.config
+
+        if channel.type == "webhook":
+            url = config.get("url")
+            if not url:
+                raise ValueError("Webhook URL not configured")
+            # BUG-024 FIX: Add explicit SSL verification
+            response = self._http_session().post(
+                url,
+                json={"alerts": entries, "count": len(entries)},
+                headers=config.get("headers", {}),
+                timeout=config.get("timeout", 10),
+                verify=True,
+            )
+            response.raise_for_status()
+            return
+
+        if not EMAIL_AVAILABLE:
+            raise ValueError(
+                "Email functionality not available - missing email modules"
+            )
+        from_email = config.get("from_email")
+        to_emails = config.get("to_emails", [])
+        if not all(
+            [
+                config.get("smtp_server"),
+                config.get("username"),
+                config.get("password"),
+                from_email,
+                to_emails,
+            ]
+        ):
+            raise ValueError("Email configuration incomplete")
+
+        msg = MimeMultipart()
+        msg["From"] = from_email
+        msg["To"] = ", ".join(to_emails)
+        msg["Subject"] = f"BlastDock Alerts: {len(entries)} notifications"
+        lines = ["BlastDock Alert Digest", ""]
+        for entry in entries:
+            lines.append(
+                f"[{entry['status'].upper()}] {entry['severity'].upper()} "
+                f"{entry['rule_name']}: {entry['message']}"
+            )
+        lines += ["", "--", "BlastDock Monitoring System"]
+        msg.attach(MimeText("\n".join(lines), "plain"))
+        self._smtp_send(config, msg)
 
     def _send_notification_to_channel(self, alert: Alert, channel: NotificationChannel):
         """Send notification to specific channel"""
@@ -524,7 +808,6 @@ class AlertManager:
         config = channel.config
 
         smtp_server = config.get("smtp_server")
-        smtp_port = config.get("smtp_port", 587)
         username = config.get("username")
         password = config.get("password")
         from_email = config.get("from_email")
@@ -542,7 +825,7 @@ class AlertManager:
         )
 
         # Create email body
-        body = """
+        body = f"""
 BlastDock Alert Notification
 
 Severity: {alert.severity.value.upper()}
@@ -562,11 +845,8 @@ BlastDock Monitoring System
 
         msg.attach(MimeText(body, "plain"))
 
-        # Send email
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls()
-            server.login(username, password)
-            server.send_message(msg)
+        # Send email over the channel's reused SMTP connection
+        self._smtp_send(config, msg)
 
     def _send_email_resolution(self, alert: Alert, channel: NotificationChannel):
         """Send email resolution notification"""
@@ -580,7 +860,6 @@ BlastDock Monitoring System
         config = channel.config
 
         smtp_server = config.get("smtp_server")
-        smtp_port = config.get("smtp_port", 587)
         username = config.get("username")
         password = config.get("password")
         from_email = config.get("from_email")
@@ -600,8 +879,8 @@ BlastDock Monitoring System
         msg["Subject"] = f"[RESOLVED] BlastDock Alert: {alert.rule_name}"
 
         # Create email body
-        alert.resolved_at - alert.fired_at if alert.resolved_at else 0
-        body = """
+        duration = alert.resolved_at - alert.fired_at if alert.resolved_at else 0
+        body = f"""
 BlastDock Alert Resolution
 
 Rule: {alert.rule_name}
@@ -616,16 +895,11 @@ BlastDock Monitoring System
 
         msg.attach(MimeText(body, "plain"))
 
-        # Send email
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls()
-            server.login(username, password)
-            server.send_message(msg)
+        # Send email over the channel's reused SMTP connection
+        self._smtp_send(config, msg)
 
     def _send_webhook_notification(self, alert: Alert, channel: NotificationChannel):
         """Send webhook notification"""
-        import requests
-
         config = channel.config
         url = config.get("url")
 
@@ -648,15 +922,13 @@ BlastDock Monitoring System
         timeout = config.get("timeout", 10)
 
         # BUG-024 FIX: Add explicit SSL verification
-        response = requests.post(
+        response = self._http_session().post(
             url, json=payload, headers=headers, timeout=timeout, verify=True
         )
         response.raise_for_status()
 
     def _send_webhook_resolution(self, alert: Alert, channel: NotificationChannel):
         """Send webhook resolution notification"""
-        import requests
-
         config = channel.config
         url = config.get("url")
 
@@ -680,7 +952,7 @@ BlastDock Monitoring System
         timeout = config.get("timeout", 10)
 
         # BUG-024 FIX: Add explicit SSL verification
-        response = requests.post(
+        response = self._http_session().post(
             url, json=payload, headers=headers, timeout=timeout, verify=True
         )
         response.raise_for_status()
@@ -769,10 +1041,71 @@ BlastDock Monitoring System
                 if alert.status == AlertStatus.FIRING
             ]
 
-    def get_alert_history(self, limit: int = 100) -> List[Alert]:
-        """Get alert history"""
+    def get_alert_history(
+        self, limit: int = 100, rule_name: Optional[str] = None
+    ) -> List[Alert]:
+        """Get the latest alerts, oldest first
+
+        With persistence, alerts older than the in-memory window are read
+        back from the history store (labels only carry the metric key).
+        """
         with self._alerts_lock:
-            return self._alert_history[-limit:]
+            history = [
+                alert
+                for alert in self._alert_history
+                if rule_name is None or alert.rule_name == rule_name
+            ][-limit:]
+        if len(history) >= limit or self.history_store is None:
+            return history
+
+        oldest = history[0].fired_at if history else float("inf")
+        older = [
+            Alert(
+                rule_name=entry["rule_name"],
+                severity=AlertSeverity(entry["severity"]),
+                message=entry["message"],
+                labels={"metric_key": entry["metric_key"]},
+                annotations={},
+                status=AlertStatus(entry["status"]),
+                fired_at=entry["fired_at"],
+                resolved_at=entry["resolved_at"],
+            )
+            for entry in self.history_store.alert_history(limit, rule_name)
+            if entry["fired_at"] < oldest
+        ]
+        return (older + history)[-limit:]
+
+    def get_alert_statistics(
+        self, rule_name: Optional[str] = None, since: Optional[float] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fired and resolved counts and mean time to resolve, per rule
+
+        Summed from the persisted hourly rollups when the history store is
+        enabled (optionally only those since ``since``), otherwise from the
+        running totals of this process.
+        """
+        if self.history_store is not None:
+            rollups = self.history_store.alert_rollup(rule_name, since)
+        else:
+            with self._alerts_lock:
+                rollups = {
+                    name: dict(zip(ALERT_ROLLUP, values))
+                    for name, values in self._rule_totals.items()
+                    if rule_name is None or name == rule_name
+                }
+
+        return {
+            name: {
+                "fired": int(rollup["fired"]),
+                "resolved": int(rollup["resolved"]),
+                "mean_time_to_resolve_seconds": (
+                    rollup["resolve_seconds"] / rollup["resolved"]
+                    if rollup["resolved"]
+                    else 0
+                ),
+            }
+            for name, rollup in rollups.items()
+        }
 
     def silence_alert(self, rule_name: str, metric_key: str, duration_seconds: int):
         """Silence an alert for specified duration"""
@@ -815,6 +1148,7 @@ BlastDock Monitoring System
                 "rules_count": len(self._rules),
                 "enabled_rules": len([r for r in self._rules.values() if r.enabled]),
                 "notification_channels": len(self._notification_channels),
+                "notification_queue": self._notifier.get_stats(),
                 "active_alerts_current": len(
                     [
                         a
@@ -824,11 +1158,33 @@ BlastDock Monitoring System
                 ),
             }
 
-    def start_evaluation(self, interval: float = 30.0):
-        """Start background alert evaluation"""
+    def attach_metrics_collector(self, collector):
+        """Evaluate rules as the collector records each sample"""
+        self.detach_metrics_collector()
+        collector.add_sample_listener(self.observe_sample)
+        self._metrics_collector = collector
+
+    def detach_metrics_collector(self):
+        if self._metrics_collector is not None:
+            self._metrics_collector.remove_sample_listener(self.observe_sample)
+            self._metrics_collector = None
+
+    def start_evaluation(self, interval: float = 30.0, metrics_collector=None):
+        """Start background alert evaluation
+
+        Rules are evaluated against the global metrics collector's samples
+        (or ``metrics_collector``'s) as they are recorded; the background
+        thread only expires silences.
+        """
         if self._evaluation_active:
             return
 
+        if metrics_collector is None:
+            from .metrics_collector import get_metrics_collector
+
+            metrics_collector = get_metrics_collector()
+        self.attach_metrics_collector(metrics_collector)
+
         self._evaluation_interval = interval
         self._evaluation_active = True
 
@@ -845,6 +1201,10 @@ BlastDock Monitoring System
             return
 
         self._evaluation_active = False
+        self.detach_metrics_collector()
+        self.flush_notifications(timeout=5)
+        if self.history_store is not None:
+            self.history_store.flush()
 
         if self._evaluation_thread and self._evaluation_thread.is_alive():
             self._evaluation_thread.join(timeout=5)
@@ -855,10 +1215,6 @@ BlastDock Monitoring System
         """Background evaluation loop"""
         while self._evaluation_active:
             try:
-                # This would integrate with metrics collector
-                # For now, skip actual evaluation
-                self.logger.debug("Alert evaluation cycle (metrics integration needed)")
-
                 # Check for silenced alerts that should be unsilenced
                 current_time = time.time()
                 with self._alerts_lock:
@@ -886,5 +1242,5 @@ def get_alert_manager() -> AlertManager:
     """Get global alert manager instance"""
     global _alert_manager
     if _alert_manager is None:
-        _alert_manager = AlertManager()
+        _alert_manager = AlertManager(persist=True)
     return _alert_manager
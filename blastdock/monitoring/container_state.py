@@ -0,0 +1,404 @@
+"""
+Event-driven container state for BlastDock monitoring
+
+One subscription to the Docker events stream keeps an in-memory table of
+every compose project's containers up to date: start, die, OOM, pause and
+health status changes are applied as they happen. Health checks, metrics
+collection and the dashboards read project and container state from the
+table instead of listing and inspecting containers on every cycle. A slow
+reconciliation loop re-lists all containers to repair anything missed
+while the stream was disconnected.
+"""
+
+import time
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from ..utils.logging import get_logger
+from ..utils.docker_utils import DockerClient
+from .log_stream import parse_docker_timestamp
+
+logger = get_logger(__name__)
+
+COMPOSE_PROJECT_LABEL = "com.docker.compose.project"
+COMPOSE_SERVICE_LABEL = "com.docker.compose.service"
+
+# Events that change a container's status, health or presence
+TRACKED_ACTIONS = (
+    "create",
+    "start",
+    "restart",
+    "die",
+    "oom",
+    "pause",
+    "unpause",
+    "rename",
+    "destroy",
+    "health_status",
+)
+
+# project, container state (None once destroyed), event action
+StateListener = Callable[[str, Optional["ContainerState"], str], None]
+
+
+@dataclass
+class ContainerState:
+    """Last known state of one compose container"""
+
+    id: str
+    name: str
+    project: str
+    service: str
+    image: str
+    status: str
+    health: Optional[str] = None
+    started_at: Optional[float] = None
+    exit_code: Optional[int] = None
+    oom_killed: bool = False
+    ports: Dict[str, Any] = field(default_factory=dict)
+    # Docker time (ns) of the last event or inspect applied
+    updated_ns: int = 0
+
+    def to_info(self) -> Dict[str, Any]:
+        """Container info in the shape the monitoring modules consume"""
+        info = {
+            "id": self.id,
+            "name": self.name,
+            "service": self.service,
+            "image": self.image,
+            "status": self.status,
+            "health": self.health,
+            "ports": self.ports,
+            "exit_code": self.exit_code,
+            "oom_killed": self.oom_killed,
+        }
+        if self.started_at is not None:
+            info["started_at"] = self.started_at
+        return info
+
+
+def _docker_seconds(value: Optional[str]) -> Optional[float]:
+    ts_ns = parse_docker_timestamp(value or "")
+    # Never-started containers report year 1
+    if ts_ns is None or ts_ns <= 0:
+        return None
+    return ts_ns / 1e9
+
+
+def state_from_attrs(
+    attrs: Dict[str, Any], observed_ns: int
+) -> Optional[ContainerState]:
+    """Build a container's state from its inspect data"""
+    config = attrs.get("Config") or {}
+    labels = config.get("Labels") or {}
+    project = labels.get(COMPOSE_PROJECT_LABEL)
+    if not project:
+        return None
+    state = attrs.get("State") or {}
+    health = (state.get("Health") or {}).get("Status")
+    return ContainerState(
+        id=attrs["Id"],
+        name=attrs.get("Name", "").lstrip("/"),
+        project=project,
+        service=labels.get(COMPOSE_SERVICE_LABEL, ""),
+        image=config.get("Image", ""),
+        status=state.get("Status", "unknown"),
+        health=health,
+        started_at=_docker_seconds(state.get("StartedAt")),
+        exit_code=state.get("ExitCode"),
+        oom_killed=bool(state.get("OOMKilled")),
+        ports=(attrs.get("NetworkSettings") or {}).get("Ports") or {},
+        updated_ns=observed_ns,
+    )
+
+
+class ContainerStateTable:
+    """In-memory container state per project, fed by Docker events"""
+
+    def __init__(self, docker_client=None, reconcile_interval: float = 300.0):
+        self.logger = get_logger(__name__)
+        self.docker_client = docker_client or DockerClient()
+        self.reconcile_interval = reconcile_interval
+
+        self._lock = threading.RLock()
+        self._containers: Dict[str, ContainerState] = {}
+        self._projects: Dict[str, Dict[str, ContainerState]] = {}
+        self._listeners: List[StateListener] = []
+
+        self._users = 0
+        self._stop_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._stream = None
+
+        self.stats = {
+            "events_applied": 0,
+            "events_ignored": 0,
+            "reconciles": 0,
+            "last_event_at": None,
+            "last_reconcile_at": None,
+        }
+
+    # Reads
+
+    @property
+    def is_running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def list_projects(self) -> List[str]:
+        with self._lock:
+            return sorted(self._projects)
+
+    def get_container_status(self, project_name: str) -> List[Dict[str, Any]]:
+        """Info for every container of a project, ordered by name"""
+        with self._lock:
+            containers = self._projects.get(project_name, {})
+            return [
+                state.to_info()
+                for state in sorted(containers.values(), key=lambda s: s.name)
+            ]
+
+    def get_container(self, container_name: str) -> Optional[ContainerState]:
+        with self._lock:
+            for state in self._containers.values():
+                if state.name == container_name:
+                    return state
+        return None
+
+    def project_summary(self, project_name: str) -> Dict[str, int]:
+        """Container counts of a project by status and health"""
+        with self._lock:
+            containers = list(self._projects.get(project_name, {}).values())
+        return {
+            "containers": len(containers),
+            "running": sum(1 for s in containers if s.status == "running"),
+            "unhealthy": sum(1 for s in containers if s.health == "unhealthy"),
+            "oom_killed": sum(1 for s in containers if s.oom_killed),
+        }
+
+    # Updates
+
+    def subscribe(self, listener: StateListener):
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def unsubscribe(self, listener: StateListener):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def _notify(self, project: str, state: Optional[ContainerState], action: str):
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(project, state, action)
+            except Exception as e:
+                self.logger.debug(f"Container state listener failed: {e}")
+
+    def _put(self, state: ContainerState):
+        previous = self._containers.get(state.id)
+        if previous is not None and previous.project != state.project:
+            self._projects.get(previous.project, {}).pop(state.id, None)
+        self._containers[state.id] = state
+        self._projects.setdefault(state.project, {})[state.id] = state
+
+    def _remove(self, container_id: str) -> Optional[ContainerState]:
+        state = self._containers.pop(container_id, None)
+        if state is not None:
+            project = self._projects.get(state.project, {})
+            project.pop(container_id, None)
+            if not project:
+                self._projects.pop(state.project, None)
+        return state
+
+    def reconcile(self) -> int:
+        """Replace the table with a full listing of compose containers"""
+        observed_ns = time.time_ns()
+        containers = self.docker_client.client.containers.list(
+            all=True, filters={"label": COMPOSE_PROJECT_LABEL}
+        )
+        fresh = {}
+        for container in containers:
+            state = state_from_attrs(container.attrs, observed_ns)
+            if state is not None:
+                fresh[state.id] = state
+
+        with self._lock:
+            for container_id in list(self._containers):
+                existing = self._containers[container_id]
+                # Keep entries an event updated after the listing started
+                if container_id not in fresh and existing.updated_ns <= observed_ns:
+                    self._remove(container_id)
+            for state in fresh.values():
+                existing = self._containers.get(state.id)
+                if existing is None or existing.updated_ns <= observed_ns:
+                    self._put(state)
+            self.stats["reconciles"] += 1
+            self.stats["last_reconcile_at"] = time.time()
+        return len(fresh)
+
+    def _inspect(self, container_id: str, observed_ns: int) -> Optional[ContainerState]:
+        try:
+            container = self.docker_client.client.containers.get(container_id)
+        except Exception as e:
+            self.logger.debug(f"Could not inspect container {container_id}: {e}")
+            return None
+        return state_from_attrs(container.attrs, observed_ns)
+
+    def apply_event(self, event: Dict[str, Any]) -> Optional[str]:
+        """Apply one Docker container event; returns the affected project"""
+        if event.get("Type") != "container":
+            return None
+        action = event.get("Action", "")
+        # "health_status: healthy", "exec_start: sh -c ..."
+        action, _, argument = action.partition(":")
+        if action not in TRACKED_ACTIONS:
+            return None
+
+        actor = event.get("Actor") or {}
+        attributes = actor.get("Attributes") or {}
+        container_id = actor.get("ID") or event.get("id")
+        event_ns = int(event.get("timeNano") or event.get("time", 0) * 1_000_000_000)
+
+        with self._lock:
+            state = self._containers.get(container_id)
+            if state is not None and event_ns < state.updated_ns:
+                # Already reflected in a newer inspect
+                self.stats["events_ignored"] += 1
+                return None
+            project = state.project if state else attributes.get(COMPOSE_PROJECT_LABEL)
+        if not project:
+            return None
+
+        if action in ("create", "start", "restart", "rename") or state is None:
+            # Ports, start time and health come from one targeted inspect
+            if action != "destroy":
+                inspected = self._inspect(container_id, event_ns)
+                if inspected is not None:
+                    state = inspected
+
+        with self._lock:
+            if action == "destroy":
+                state = self._remove(container_id)
+            elif state is None:
+                self.stats["events_ignored"] += 1
+                return None
+            else:
+                if action == "die":
+                    state.status = "exited"
+                    exit_code = attributes.get("exitCode")
+                    if exit_code is not None and str(exit_code).lstrip("-").isdigit():
+                        state.exit_code = int(exit_code)
+                elif action == "oom":
+                    state.oom_killed = True
+                elif action == "pause":
+                    state.status = "paused"
+                elif action == "unpause":
+                    state.status = "running"
+                elif action == "health_status":
+                    state.health = argument.strip() or state.health
+                state.updated_ns = event_ns
+                self._put(state)
+            self.stats["events_applied"] += 1
+            self.stats["last_event_at"] = time.time()
+
+        self._notify(project, state, action)
+        return project
+
+    # Background threads
+
+    def start(self):
+        """Start following events; each call must be paired with ``stop``"""
+        with self._lock:
+            self._users += 1
+            if self.is_running:
+                return
+            self._stop_event.clear()
+            self._threads = [
+                threading.Thread(
+                    target=self._event_loop, name="container-events", daemon=True
+                ),
+                threading.Thread(
+                    target=self._reconcile_loop,
+                    name="container-reconcile",
+                    daemon=True,
+                ),
+            ]
+            for thread in self._threads:
+                thread.start()
+        self.logger.info("Following Docker container events")
+
+    def stop(self):
+        """Stop following events once every ``start`` has been paired"""
+        with self._lock:
+            self._users = max(0, self._users - 1)
+            if self._users or not self._threads:
+                return
+            self._stop_event.set()
+            stream, threads = self._stream, self._threads
+            self._threads = []
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception:
+                pass
+        for thread in threads:
+            thread.join(timeout=5)
+        self.logger.info("Stopped following Docker container events")
+
+    def _event_loop(self):
+        backoff = 1.0
+        while not self._stop_event.is_set():
+            # Events from before the listing are replayed, then skipped by time
+            since = int(time.time())
+            try:
+                self.reconcile()
+                stream = self.docker_client.client.events(
+                    decode=True, filters={"type": "container"}, since=since
+                )
+                with self._lock:
+                    self._stream = stream
+                if self._stop_event.is_set():
+                    break
+                backoff = 1.0
+                for event in stream:
+                    self.apply_event(event)
+                    if self._stop_event.is_set():
+                        break
+            except Exception as e:
+                if not self._stop_event.is_set():
+                    self.logger.warning(f"Docker events stream interrupted: {e}")
+            finally:
+                with self._lock:
+                    self._stream = None
+            self._stop_event.wait(backoff)
+            backoff = min(backoff * 2, 60.0)
+
+    def _reconcile_loop(self):
+        while not self._stop_event.wait(self.reconcile_interval):
+            try:
+                self.reconcile()
+            except Exception as e:
+                self.logger.warning(f"Container state reconciliation failed: {e}")
+
+
+# Global container state table
+_container_state_table = None
+
+
+def get_container_state_table() -> ContainerStateTable:
+    """Get global container state table"""
+    global _container_state_table
+    if _container_state_table is None:
+        _container_state_table = ContainerStateTable()
+    return _container_state_table
+
+
+def container_source(docker_client):
+    """The live state table while it is following events, else the client"""
+    table = _container_state_table
+    if table is not None and table.is_running:
+        return table
+    return docker_client
@@ -6,17 +6,26 @@ import time
 import threading
 import requests
 import socket
-from typing import Dict, List, Any, Optional
+from collections import deque
+from typing import Deque, Dict, List, Any, Optional
 from dataclasses import dataclass, field
 from enum import Enum
 import subprocess
 import json
+from functools import partial
 
 from ..utils.logging import get_logger
 from ..utils.docker_utils import DockerClient
+from .container_state import container_source, get_container_state_table
+from .health_scheduler import CheckOutcome, HealthCheckScheduler
+from .history_store import HEALTH_ROLLUP, HistoryStore, open_history_store
+from .http_probe import HttpProbeClient
 
 logger = get_logger(__name__)
 
+# Seconds a check may overrun its configured timeout before it is abandoned
+DEADLINE_GRACE = 1.0
+
 
 class HealthStatus(Enum):
     HEALTHY = "healthy"
@@ -52,27 +61,60 @@ class ServiceHealthConfig:
     expected_content: Optional[str] = None
     headers: Dict[str, str] = field(default_factory=dict)
     command: Optional[List[str]] = None
+    # 'GET' streams the body, 'HEAD' skips it (GET is used for content checks)
+    method: str = "GET"
 
 
 class HealthChecker:
     """Advanced health checking system"""
 
-    def __init__(self):
-        """Initialize health checker"""
+    def __init__(
+        self,
+        max_workers: int = 16,
+        container_check_timeout: float = 10.0,
+        persist: bool = False,
+        history_dir: Optional[str] = None,
+    ):
+        """Initialize health checker
+
+        With ``persist`` every result is also appended to the history store
+        under ``<data_dir>/history`` (or ``history_dir``), so history and
+        statistics survive restarts.
+        """
         self.logger = get_logger(__name__)
         self.docker_client = DockerClient()
+        self._lock = threading.RLock()
 
-        # Health check history
-        self._health_history: Dict[str, List[HealthCheckResult]] = {}
+        # Recent results per service, and running per-service rollups in
+        # the HEALTH_ROLLUP layout so statistics never scan the history
         self._max_history = 100
+        self._health_history: Dict[str, Deque[HealthCheckResult]] = {}
+        self._health_totals: Dict[str, List[float]] = {}
+        self.history_store: Optional[HistoryStore] = None
+        if persist:
+            try:
+                self.history_store = open_history_store(history_dir)
+            except OSError as e:
+                self.logger.warning(f"Health history persistence disabled: {e}")
 
         # Service configurations
         self._service_configs: Dict[str, ServiceHealthConfig] = {}
 
+        # Concurrent checks: per-container and per-service, then per-project
+        self.container_check_timeout = container_check_timeout
+        self._scheduler = HealthCheckScheduler(max_workers=max_workers)
+        self._project_scheduler = HealthCheckScheduler(
+            max_workers=4, thread_name_prefix="health-project"
+        )
+        self._last_service_results: Dict[str, HealthCheckResult] = {}
+        self._http_probe: Optional[HttpProbeClient] = None
+
         # Background monitoring
         self._monitoring_active = False
         self._monitoring_thread = None
         self._monitoring_interval = 30.0
+        self._wake_event = threading.Event()
+        self._state_table = None
 
         # Health check statistics
         self.stats = {
@@ -91,15 +133,25 @@ class HealthChecker:
         """Register health check configuration for a service"""
         key = f"{project_name}:{service_name}"
         self._service_configs[key] = config
+        self._scheduler.forget(key)
         self.logger.info(f"Registered health config for {key}")
 
-    def check_project_health(self, project_name: str) -> Dict[str, Any]:
-        """Perform comprehensive health check on a project"""
+    def check_project_health(
+        self, project_name: str, due_only: bool = False
+    ) -> Dict[str, Any]:
+        """Perform comprehensive health check on a project
+
+        Container and service checks run concurrently, each bounded by its
+        own timeout. With ``due_only``, service checks whose interval has
+        not elapsed reuse their previous result.
+        """
         start_time = time.time()
 
         try:
             # Get container information
-            containers = self.docker_client.get_container_status(project_name)
+            containers = container_source(self.docker_client).get_container_status(
+                project_name
+            )
             if not containers:
                 return {
                     "overall_status": HealthStatus.UNHEALTHY,
@@ -108,10 +160,8 @@ class HealthChecker:
                     "duration_ms": (time.time() - start_time) * 1000,
                 }
 
-            service_results = {}
-            overall_healthy = True
-            messages = []
-
+            services = []
+            checks = {}
             for container in containers:
                 service_name = (
                     container["name"]
@@ -119,17 +169,52 @@ class HealthChecker:
                     .replace(f"{project_name}-", "")
                 )
                 service_key = f"{project_name}:{service_name}"
+                services.append((service_name, service_key, container))
 
                 # Check container health
-                container_result = self._check_container_health(container)
+                checks[f"{service_key}#container"] = (
+                    partial(self._check_container_health, container),
+                    self.container_check_timeout,
+                )
+
+                # Check service-specific health if configured and due
+                config = self._service_configs.get(service_key)
+                if config is not None and (
+                    not due_only or self._scheduler.is_due(service_key)
+                ):
+                    checks[service_key] = (
+                        partial(self._check_service_health, config, container),
+                        self._check_deadline(config),
+                    )
+
+            outcomes = self._scheduler.run(checks)
+
+            service_results = {}
+            overall_healthy = True
+            messages = []
 
-                # Check service-specific health if configured
-                if service_key in self._service_configs:
-                    config = self._service_configs[service_key]
-                    service_result = self._check_service_health(config, container)
+            for service_name, service_key, container in services:
+                container_result = self._outcome_result(
+                    outcomes[f"{service_key}#container"],
+                    self.container_check_timeout,
+                )
+
+                config = self._service_configs.get(service_key)
+                if config is not None:
+                    if service_key in outcomes:
+                        service_result = self._outcome_result(
+                            outcomes[service_key], self._check_deadline(config)
+                        )
+                        self._last_service_results[service_key] = service_result
+                        self._scheduler.schedule(service_key, config.interval)
+                    else:
+                        service_result = self._last_service_results.get(service_key)
 
                     # Combine results
-                    if service_result.status != HealthStatus.HEALTHY:
+                    if (
+                        service_result is not None
+                        and service_result.status != HealthStatus.HEALTHY
+                    ):
                         container_result = service_result
 
                 service_results[service_name] = {
@@ -172,11 +257,12 @@ class HealthChecker:
                     overall_message = f"Unhealthy: {'; '.join(messages)}"
 
             # Update statistics
-            self.stats["total_checks"] += 1
-            if overall_healthy:
-                self.stats["successful_checks"] += 1
-            else:
-                self.stats["failed_checks"] += 1
+            with self._lock:
+                self.stats["total_checks"] += 1
+                if overall_healthy:
+                    self.stats["successful_checks"] += 1
+                else:
+                    self.stats["failed_checks"] += 1
 
             return {
                 "overall_status": overall_status.value,
@@ -198,6 +284,36 @@ class HealthChecker:
                 "project_name": project_name,
             }
 
+    @staticmethod
+    def _check_deadline(config: ServiceHealthConfig) -> float:
+        """Seconds a service check may run before it is reported as timed out"""
+        timeout = config.timeout if config.timeout > 0 else 10.0
+        return timeout + DEADLINE_GRACE
+
+    @staticmethod
+    def _outcome_result(outcome: CheckOutcome, deadline: float) -> HealthCheckResult:
+        """Health result of a scheduled check, including missed deadlines"""
+        if outcome.error is None:
+            return outcome.value
+        if isinstance(outcome.error, TimeoutError):
+            return HealthCheckResult(
+                status=HealthStatus.UNHEALTHY,
+                message=f"Health check timed out after {deadline:g}s",
+                response_time_ms=outcome.elapsed * 1000,
+                timestamp=time.time(),
+                suggestions=[
+                    "Check if service is responding",
+                    "Increase timeout if service is slow",
+                ],
+            )
+        return HealthCheckResult(
+            status=HealthStatus.UNKNOWN,
+            message=f"Health check error: {str(outcome.error)}",
+            response_time_ms=outcome.elapsed * 1000,
+            timestamp=time.time(),
+            details={"error": str(outcome.error)},
+        )
+
     def _check_container_health(
         self, container_info: Dict[str, Any]
     ) -> HealthCheckResult:
@@ -385,33 +501,40 @@ class HealthChecker:
 
                 url = f"http://localhost:{port}/"
 
-            # BUG-011 FIX: Validate timeout is positive and add max_redirects
+            # BUG-011 FIX: Validate timeout is positive; redirects are capped
+            # by the probe session
             timeout = config.timeout if config.timeout > 0 else 10.0
+            method = config.method.upper()
+            if config.expected_content and method == "HEAD":
+                method = "GET"
 
             # VUL-001 FIX: Perform HTTP request with SSL verification and proper validation
-            response = requests.get(
+            probe = self._get_http_probe().probe(
                 url,
                 timeout=timeout,
+                method=method,
                 headers=config.headers,
-                allow_redirects=True,
-                max_redirects=5,  # Limit redirects to prevent infinite loops
+                expected_content=config.expected_content,
                 verify=True,  # VUL-001 FIX: Enforce SSL/TLS certificate verification
             )
 
-            response_time = (time.time() - start_time) * 1000
+            response_time = probe.total_ms
+            details = {
+                "url": url,
+                "status_code": probe.status_code,
+                "timings": probe.timings,
+                "connection_reused": probe.connection_reused,
+            }
 
             # Check status code
-            if response.status_code != config.expected_status:
+            if probe.status_code != config.expected_status:
+                details["expected_status"] = config.expected_status
                 return HealthCheckResult(
                     status=HealthStatus.UNHEALTHY,
-                    message=f"HTTP {response.status_code} (expected {config.expected_status})",
+                    message=f"HTTP {probe.status_code} (expected {config.expected_status})",
                     response_time_ms=response_time,
                     timestamp=time.time(),
-                    details={
-                        "url": url,
-                        "status_code": response.status_code,
-                        "expected_status": config.expected_status,
-                    },
+                    details=details,
                     suggestions=[
                         "Check service logs",
                         f"Verify service is responding at {url}",
@@ -419,31 +542,25 @@ class HealthChecker:
                 )
 
             # Check content if specified
-            if config.expected_content:
-                if config.expected_content not in response.text:
-                    return HealthCheckResult(
-                        status=HealthStatus.DEGRADED,
-                        message="HTTP response missing expected content",
-                        response_time_ms=response_time,
-                        timestamp=time.time(),
-                        details={
-                            "url": url,
-                            "expected_content": config.expected_content,
-                            "response_length": len(response.text),
-                        },
-                    )
+            if config.expected_content and not probe.content_found:
+                details["expected_content"] = config.expected_content
+                details["bytes_read"] = probe.bytes_read
+                return HealthCheckResult(
+                    status=HealthStatus.DEGRADED,
+                    message="HTTP response missing expected content",
+                    response_time_ms=response_time,
+                    timestamp=time.time(),
+                    details=details,
+                )
 
             # Successful HTTP check
+            details["bytes_read"] = probe.bytes_read
             return HealthCheckResult(
                 status=HealthStatus.HEALTHY,
-                message=f"HTTP {response.status_code} OK",
+                message=f"HTTP {probe.status_code} OK",
                 response_time_ms=response_time,
                 timestamp=time.time(),
-                details={
-                    "url": url,
-                    "status_code": response.status_code,
-                    "response_length": len(response.text),
-                },
+                details=details,
             )
 
         except requests.exceptions.Timeout:
@@ -474,6 +591,13 @@ class HealthChecker:
                 details={"error": str(e)},
             )
 
+    def _get_http_probe(self) -> HttpProbeClient:
+        """Shared keep-alive probe client, created on first HTTP check"""
+        with self._lock:
+            if self._http_probe is None:
+                self._http_probe = HttpProbeClient()
+            return self._http_probe
+
     def _check_tcp_health(
         self,
         config: ServiceHealthConfig,
@@ -726,34 +850,55 @@ class HealthChecker:
 
     def _store_health_result(self, service_key: str, result: HealthCheckResult):
         """Store health check result in history"""
-        if service_key not in self._health_history:
-            self._health_history[service_key] = []
+        with self._lock:
+            history = self._health_history.get(service_key)
+            if history is None:
+                history = self._health_history[service_key] = deque(
+                    maxlen=self._max_history
+                )
+            history.append(result)
 
-        self._health_history[service_key].append(result)
+            totals = self._health_totals.get(service_key)
+            if totals is None:
+                totals = self._health_totals[service_key] = [0.0] * len(HEALTH_ROLLUP)
+            totals[0] += 1
+            totals[1 + list(HealthStatus).index(result.status)] += 1
+            totals[-1] += result.response_time_ms
 
-        # Limit history size
-        if len(self._health_history[service_key]) > self._max_history:
-            self._health_history[service_key].pop(0)
+        if self.history_store is not None:
+            try:
+                self.history_store.record_health(
+                    service_key,
+                    result.status.value,
+                    result.message,
+                    result.response_time_ms,
+                    result.timestamp,
+                )
+            except OSError as e:
+                self.logger.debug(f"Failed to persist health result: {e}")
 
     def get_health_history(
         self, project_name: str, service_name: str = None, limit: int = 10
     ) -> List[Dict[str, Any]]:
-        """Get health check history for a service or project"""
-        if service_name:
-            service_key = f"{project_name}:{service_name}"
-            history = self._health_history.get(service_key, [])
-        else:
-            # Get history for all services in project
-            history = []
-            for key, results in self._health_history.items():
-                if key.startswith(f"{project_name}:"):
-                    history.extend(results)
-
-            # Sort by timestamp
-            history.sort(key=lambda r: r.timestamp, reverse=True)
-
-        # Convert to dict format and limit results
-        return [
+        """Get the latest health check results for a service or project
+
+        Results are oldest first. With persistence, results older than the
+        in-memory window are read back from the history store (without
+        details or suggestions).
+        """
+        with self._lock:
+            if service_name:
+                service_key = f"{project_name}:{service_name}"
+                history = list(self._health_history.get(service_key, ()))
+            else:
+                # Get history for all services in project
+                history = []
+                for key, results in self._health_history.items():
+                    if key.startswith(f"{project_name}:"):
+                        history.extend(results)
+                history.sort(key=lambda r: r.timestamp)
+
+        recent = [
             {
                 "status": result.status.value,
                 "message": result.message,
@@ -764,22 +909,56 @@ class HealthChecker:
             }
             for result in history[-limit:]
         ]
+        if len(recent) >= limit or self.history_store is None:
+            return recent
 
-    def get_health_statistics(self, project_name: str = None) -> Dict[str, Any]:
-        """Get health check statistics"""
-        if project_name:
-            # Filter history for specific project
-            project_history = []
-            for key, results in self._health_history.items():
-                if key.startswith(f"{project_name}:"):
-                    project_history.extend(results)
+        if service_name:
+            stored = self.history_store.health_history(
+                [f"{project_name}:{service_name}"], limit=limit
+            )
         else:
-            # All history
-            project_history = []
-            for results in self._health_history.values():
-                project_history.extend(results)
-
-        if not project_history:
+            stored = self.history_store.health_history(
+                prefix=f"{project_name}:", limit=limit
+            )
+        oldest = recent[0]["timestamp"] if recent else float("inf")
+        older = [
+            {
+                "status": entry["status"],
+                "message": entry["message"],
+                "response_time_ms": entry["response_time_ms"],
+                "timestamp": entry["timestamp"],
+                "details": {},
+                "suggestions": [],
+            }
+            for entry in stored
+            if entry["timestamp"] < oldest
+        ]
+        return (older + recent)[-limit:]
+
+    def get_health_statistics(
+        self, project_name: str = None, since: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Get health check statistics
+
+        Summed from per-service rollups: the persisted hourly rollups when
+        the history store is enabled (optionally only those since
+        ``since``), otherwise the running totals of this process.
+        """
+        if self.history_store is not None:
+            prefix = f"{project_name}:" if project_name else None
+            rollup = self.history_store.health_rollup(prefix, since)
+        else:
+            prefix = f"{project_name}:" if project_name else ""
+            totals = [0.0] * len(HEALTH_ROLLUP)
+            with self._lock:
+                for key, values in self._health_totals.items():
+                    if key.startswith(prefix):
+                        for i, value in enumerate(values):
+                            totals[i] += value
+            rollup = dict(zip(HEALTH_ROLLUP, totals))
+
+        total_checks = int(rollup["checks"])
+        if not total_checks:
             return {
                 "total_checks": 0,
                 "healthy_checks": 0,
@@ -790,45 +969,36 @@ class HealthChecker:
                 "average_response_time_ms": 0,
             }
 
-        # Calculate statistics
-        total_checks = len(project_history)
-        healthy_checks = sum(
-            1 for r in project_history if r.status == HealthStatus.HEALTHY
-        )
-        unhealthy_checks = sum(
-            1 for r in project_history if r.status == HealthStatus.UNHEALTHY
-        )
-        degraded_checks = sum(
-            1 for r in project_history if r.status == HealthStatus.DEGRADED
-        )
-        unknown_checks = sum(
-            1 for r in project_history if r.status == HealthStatus.UNKNOWN
-        )
-
-        uptime_percentage = (
-            (healthy_checks / total_checks * 100) if total_checks > 0 else 0
-        )
-        avg_response_time = (
-            sum(r.response_time_ms for r in project_history) / total_checks
-        )
-
         return {
             "total_checks": total_checks,
-            "healthy_checks": healthy_checks,
-            "unhealthy_checks": unhealthy_checks,
-            "degraded_checks": degraded_checks,
-            "unknown_checks": unknown_checks,
-            "uptime_percentage": uptime_percentage,
-            "average_response_time_ms": avg_response_time,
+            "healthy_checks": int(rollup["healthy"]),
+            "unhealthy_checks": int(rollup["unhealthy"]),
+            "degraded_checks": int(rollup["degraded"]),
+            "unknown_checks": int(rollup["unknown"]),
+            "uptime_percentage": rollup["healthy"] / total_checks * 100,
+            "average_response_time_ms": rollup["response_time_ms"] / total_checks,
         }
 
-    def start_background_monitoring(self, interval: float = 30.0):
-        """Start background health monitoring"""
+    def start_background_monitoring(
+        self, interval: float = 30.0, event_driven: bool = False
+    ):
+        """Start background health monitoring
+
+        With ``event_driven``, container state comes from the Docker events
+        stream and a project is re-checked as soon as one of its containers
+        starts, dies or changes health status.
+        """
         if self._monitoring_active:
             return
 
         self._monitoring_interval = interval
         self._monitoring_active = True
+        self._wake_event.clear()
+
+        if event_driven:
+            self._state_table = get_container_state_table()
+            self._state_table.subscribe(self._on_container_event)
+            self._state_table.start()
 
         self._monitoring_thread = threading.Thread(
             target=self._monitoring_loop, name="health-monitor", daemon=True
@@ -836,7 +1006,8 @@ class HealthChecker:
         self._monitoring_thread.start()
 
         self.logger.info(
-            f"Started background health monitoring (interval: {interval}s)"
+            f"Started background health monitoring (interval: {interval}s"
+            f"{', event-driven' if event_driven else ''})"
         )
 
     def stop_background_monitoring(self):
@@ -845,29 +1016,78 @@ class HealthChecker:
             return
 
         self._monitoring_active = False
+        self._wake_event.set()
 
         if self._monitoring_thread and self._monitoring_thread.is_alive():
             self._monitoring_thread.join(timeout=5)
+        self._project_scheduler.shutdown()
+
+        if self._state_table is not None:
+            self._state_table.unsubscribe(self._on_container_event)
+            self._state_table.stop()
+            self._state_table = None
+
+        if self.history_store is not None:
+            self.history_store.flush()
 
         self.logger.info("Stopped background health monitoring")
 
+    def _on_container_event(self, project_name: str, state, action: str):
+        """Make a project due immediately when its containers change"""
+        self._project_scheduler.forget(project_name)
+        self._wake_event.set()
+
     def _monitoring_loop(self):
         """Background monitoring loop"""
         while self._monitoring_active:
+            self._wake_event.clear()
             try:
-                # Get all active projects
-                projects = self.docker_client.list_projects()
-
-                for project in projects:
-                    if self._monitoring_active:  # Check if still active
-                        self.check_project_health(project)
-
-                # Sleep for interval
-                time.sleep(self._monitoring_interval)
-
+                self._run_due_checks()
             except Exception as e:
                 self.logger.error(f"Error in monitoring loop: {e}")
-                time.sleep(self._monitoring_interval)
+
+            # Sleep until the next project or service check is due
+            wait = self._monitoring_interval
+            for scheduler in (self._project_scheduler, self._scheduler):
+                due_in = scheduler.seconds_until_due()
+                if due_in is not None:
+                    wait = min(wait, due_in)
+            self._wake_event.wait(max(wait, 1.0))
+
+    def _run_due_checks(self):
+        """Check every project that is due, all projects concurrently
+
+        A project is due once per monitoring interval, or sooner when one
+        of its services has a shorter configured interval.
+        """
+        projects = container_source(self.docker_client).list_projects()
+        now = time.time()
+        due = []
+        for project in projects:
+            prefix = f"{project}:"
+            if self._project_scheduler.is_due(project, now) or any(
+                key.startswith(prefix) and self._scheduler.is_due(key, now)
+                for key in list(self._service_configs)
+            ):
+                due.append(project)
+        if not due:
+            return
+
+        outcomes = self._project_scheduler.run(
+            {
+                project: (
+                    partial(self.check_project_health, project, due_only=True),
+                    self._monitoring_interval,
+                )
+                for project in due
+            }
+        )
+        for project, outcome in outcomes.items():
+            if outcome.error is not None:
+                self.logger.warning(
+                    f"Background health check for {project} failed: {outcome.error}"
+                )
+            self._project_scheduler.schedule(project, self._monitoring_interval)
 
 
 # Global health checker instance
@@ -878,5 +1098,5 @@ def get_health_checker() -> HealthChecker:
     """Get global health checker instance"""
     global _health_checker
     if _health_checker is None:
-        _health_checker = HealthChecker()
+        _health_checker = HealthChecker(persist=True)
     return _health_checker
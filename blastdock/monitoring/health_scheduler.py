@@ -0,0 +1,136 @@
+"""
+Concurrent health check scheduling for BlastDock
+
+Health checks run on a bounded thread pool and each one is waited on with
+its own deadline, so a sweep takes as long as its slowest check rather than
+the sum of all of them. A check that misses its deadline is reported as
+timed out; while it is still running it is not submitted again, so a hung
+service occupies at most one worker. Each check key has its own interval,
+spread with random jitter so services registered together do not keep
+firing in lockstep.
+"""
+
+import time
+import random
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# key -> (check callable, deadline in seconds or None to wait for it)
+CheckSpec = Tuple[Callable[[], Any], Optional[float]]
+
+
+class CheckOutcome(NamedTuple):
+    """Result of one scheduled check; ``error`` is set when it failed"""
+
+    value: Any
+    error: Optional[BaseException]
+    elapsed: float
+
+
+class HealthCheckScheduler:
+    """Bounded worker pool running checks with per-check deadlines"""
+
+    def __init__(
+        self,
+        max_workers: int = 16,
+        jitter: float = 0.1,
+        thread_name_prefix: str = "health-check",
+    ):
+        self.max_workers = max_workers
+        self.jitter = jitter
+        self.thread_name_prefix = thread_name_prefix
+        self.timed_out = 0
+
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Tuple[Future, float]] = {}
+        self._next_due: Dict[str, float] = {}
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=self.thread_name_prefix,
+                )
+            return self._pool
+
+    # Scheduling
+
+    def is_due(self, key: str, now: Optional[float] = None) -> bool:
+        """Whether ``key`` has never run or its next run time has passed"""
+        now = time.time() if now is None else now
+        with self._lock:
+            return self._next_due.get(key, 0.0) <= now
+
+    def schedule(self, key: str, interval: float, now: Optional[float] = None):
+        """Make ``key`` due again one jittered ``interval`` from now"""
+        now = time.time() if now is None else now
+        spread = interval * self.jitter
+        with self._lock:
+            self._next_due[key] = now + interval + random.uniform(-spread, spread)
+
+    def seconds_until_due(self, now: Optional[float] = None) -> Optional[float]:
+        """Time until the earliest scheduled key is due, None if none are"""
+        now = time.time() if now is None else now
+        with self._lock:
+            if not self._next_due:
+                return None
+            return max(0.0, min(self._next_due.values()) - now)
+
+    def forget(self, key: str):
+        with self._lock:
+            self._next_due.pop(key, None)
+
+    # Running
+
+    def run(self, checks: Dict[str, CheckSpec]) -> Dict[str, CheckOutcome]:
+        """Run every check concurrently and collect each by its deadline
+
+        A check still running from an earlier call is waited on again
+        instead of being submitted a second time.
+        """
+        executor = self._executor()
+        submitted: Dict[str, Tuple[Future, float, Optional[float]]] = {}
+        for key, (check, timeout) in checks.items():
+            with self._lock:
+                running = self._in_flight.get(key)
+                if running is None or running[0].done():
+                    running = (executor.submit(check), time.time())
+                    self._in_flight[key] = running
+            future, started = running
+            deadline = None if timeout is None else time.time() + timeout
+            submitted[key] = (future, started, deadline)
+
+        outcomes: Dict[str, CheckOutcome] = {}
+        for key, (future, started, deadline) in submitted.items():
+            remaining = None if deadline is None else max(0.0, deadline - time.time())
+            try:
+                value = future.result(timeout=remaining)
+            except Exception as e:
+                if not future.done():
+                    self.timed_out += 1
+                    e = TimeoutError(f"check did not finish within {checks[key][1]:g}s")
+                    logger.debug(f"Health check {key} missed its deadline")
+                outcomes[key] = CheckOutcome(None, e, time.time() - started)
+                continue
+            outcomes[key] = CheckOutcome(value, None, time.time() - started)
+
+        with self._lock:
+            for key, (future, _, _) in submitted.items():
+                if future.done() and self._in_flight.get(key, (None,))[0] is future:
+                    del self._in_flight[key]
+        return outcomes
+
+    def shutdown(self):
+        """Stop the worker threads; checks still running are abandoned"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+            self._in_flight.clear()
+        if pool is not None:
+            pool.shutdown(wait=False)
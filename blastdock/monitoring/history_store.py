@@ -0,0 +1,711 @@
+"""
+Persistent health check and alert history for BlastDock monitoring
+
+Results are appended as fixed-size binary records to daily files under
+``<data_dir>/history``. Service keys and rule names are interned to integer
+ids in a registry shared by the whole directory; messages are interned per
+daily file, so they expire with it. Every daily file has a small JSON index
+listing the keys it holds with hourly rollups (check counts per status,
+summed response times, alert counts), so statistics are summed from the
+indexes and history queries only scan the files that hold the requested
+keys, newest first.
+
+Several processes (the CLI and the background monitor) may share a
+directory: ids are handed out and indexes merged under a file lock, and
+buffered records are flushed when the process exits.
+"""
+
+import os
+import json
+import mmap
+import atexit
+import struct
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+HEALTH_STATUSES = ("healthy", "unhealthy", "degraded", "unknown")
+ALERT_SEVERITIES = ("critical", "warning", "info")
+ALERT_STATUSES = ("firing", "resolved", "silenced")
+
+# timestamp, service key id, status, response time (ms), message id
+HEALTH_RECORD = struct.Struct("<dIBfI")
+# event time, fired at, resolved at (0 while firing), rule id, metric key id,
+# severity, status, message id
+ALERT_RECORD = struct.Struct("<dddIIBBI")
+
+# Hourly rollup layouts, the first slot is always the record count
+HEALTH_ROLLUP = ("checks",) + HEALTH_STATUSES + ("response_time_ms",)
+ALERT_ROLLUP = ("events", "fired", "resolved", "resolve_seconds")
+
+FILE_SECONDS = 86400
+ROLLUP_SECONDS = 3600
+RECORD_SUFFIX = ".rec"
+INDEX_SUFFIX = ".idx"
+MESSAGE_SUFFIX = ".msg"
+
+
+def _write_json(path: str, data: Any):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+class _FileLock:
+    """Exclusive lock across threads and processes (re-entrant per instance)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._handle = None
+
+    def __enter__(self):
+        self._lock.acquire()
+        if self._depth == 0 and fcntl is not None:
+            try:
+                handle = open(self.path, "a+")
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            except BaseException:
+                self._lock.release()
+                raise
+            self._handle = handle
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        try:
+            if self._depth == 0 and self._handle is not None:
+                handle, self._handle = self._handle, None
+                try:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+                finally:
+                    handle.close()
+        finally:
+            self._lock.release()
+
+
+class StringTable:
+    """Append-only registry of interned strings, persisted as JSON lines
+
+    A string's id is its line number, so every process reading the file
+    agrees on the ids; new strings are added under ``lock`` after reading
+    what other processes appended.
+    """
+
+    def __init__(self, path: str, lock: _FileLock):
+        self.path = path
+        self._lock = lock
+        self._ids: Dict[str, int] = {}
+        self._values: List[str] = [""]  # id 0 is the empty string
+        self._offset = 0
+        with self._lock:
+            self._refresh()
+
+    def _refresh(self):
+        """Read complete lines appended since the last read"""
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            try:
+                value = json.loads(line)
+            except ValueError:
+                value = None
+            string_id = len(self._values)
+            if isinstance(value, str):
+                self._values.append(value)
+                self._ids.setdefault(value, string_id)
+            else:
+                # Keep the numbering of the lines that follow
+                self._values.append("")
+        self._offset += end
+
+    def id_for(self, value: str) -> int:
+        if not value:
+            return 0
+        string_id = self._ids.get(value)
+        if string_id is not None:
+            return string_id
+        with self._lock:
+            self._refresh()
+            string_id = self._ids.get(value)
+            if string_id is None:
+                line = json.dumps(value).encode("utf-8") + b"\n"
+                with open(self.path, "ab") as f:
+                    if os.fstat(f.fileno()).st_size > self._offset:
+                        # Terminate a line left partial by a crashed writer
+                        line = b"\n" + line
+                    f.write(line)
+                self._refresh()
+                string_id = self._ids[value]
+        return string_id
+
+    def get_id(self, value: str) -> Optional[int]:
+        string_id = self._ids.get(value)
+        if string_id is None:
+            with self._lock:
+                self._refresh()
+                string_id = self._ids.get(value)
+        return string_id
+
+    def value(self, string_id: int) -> str:
+        if string_id >= len(self._values):
+            with self._lock:
+                self._refresh()
+        if 0 <= string_id < len(self._values):
+            return self._values[string_id]
+        return ""
+
+    def values(self) -> Dict[str, int]:
+        with self._lock:
+            self._refresh()
+            return dict(self._ids)
+
+
+class RecordLog:
+    """Fixed-size records in daily files, indexed by key with hourly rollups
+
+    Each daily file has its own message table; records are appended with
+    the message as a string in ``message_field`` and read back the same way.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        record: struct.Struct,
+        key_field: int,
+        message_field: int,
+        rollup: Callable[[tuple], List[float]],
+        retention_days: int = 30,
+        flush_threshold: int = 256,
+        flush_interval: float = 5.0,
+    ):
+        self.logger = get_logger(__name__)
+        self.directory = directory
+        self.record = record
+        self.key_field = key_field
+        self.message_field = message_field
+        self.rollup = rollup
+        self.retention_days = retention_days
+        self.flush_threshold = flush_threshold
+        self.flush_interval = flush_interval
+        os.makedirs(directory, exist_ok=True)
+
+        # Guards the files and the index; buffered records have their own lock
+        self._lock = _FileLock(os.path.join(directory, ".lock"))
+        self._pending_lock = threading.Lock()
+        self._pending: Dict[int, List[tuple]] = {}
+        self._pending_records = 0
+        self._last_flush = time.time()
+        # Rollups of the buffered records: file start -> key id -> hour -> values
+        self._delta: Dict[int, Dict[int, Dict[int, List[float]]]] = {}
+        # Indexes as last read from disk, and the file stamp they were read at
+        self._index: Dict[int, Dict[int, Dict[int, List[float]]]] = {}
+        self._stamps: Dict[int, tuple] = {}
+        self._messages: Dict[int, StringTable] = {}
+        with self._lock:
+            self._refresh_indexes()
+
+    def _paths(self, file_start: int) -> Tuple[str, str]:
+        base = os.path.join(self.directory, str(file_start))
+        return base + RECORD_SUFFIX, base + INDEX_SUFFIX
+
+    def _message_table(self, file_start: int) -> StringTable:
+        table = self._messages.get(file_start)
+        if table is None:
+            path = os.path.join(self.directory, str(file_start) + MESSAGE_SUFFIX)
+            table = self._messages[file_start] = StringTable(path, self._lock)
+        return table
+
+    def _read_index(self, file_start: int) -> Dict[int, Dict[int, List[float]]]:
+        _, index_path = self._paths(file_start)
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                keys = json.load(f)["keys"]
+            return {
+                int(key_id): {int(hour): values for hour, values in hours.items()}
+                for key_id, hours in keys.items()
+            }
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, KeyError, AttributeError) as e:
+            self.logger.warning(f"Ignoring corrupt history index {index_path}: {e}")
+            return {}
+
+    def _refresh_indexes(self):
+        """Reload indexes other processes changed, and forget deleted days"""
+        present = set()
+        for name in os.listdir(self.directory):
+            stem, suffix = os.path.splitext(name)
+            if suffix != INDEX_SUFFIX or not stem.isdigit():
+                continue
+            file_start = int(stem)
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            present.add(file_start)
+            stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if self._stamps.get(file_start) != stamp:
+                self._index[file_start] = self._read_index(file_start)
+                self._stamps[file_start] = stamp
+        for file_start in set(self._index) - present:
+            del self._index[file_start]
+            self._stamps.pop(file_start, None)
+            self._messages.pop(file_start, None)
+
+    # Writing
+
+    def append(self, entry: tuple):
+        timestamp = entry[0]
+        file_start = int(timestamp // FILE_SECONDS) * FILE_SECONDS
+        hour = int(timestamp // ROLLUP_SECONDS) * ROLLUP_SECONDS
+        with self._pending_lock:
+            self._pending.setdefault(file_start, []).append(entry)
+            self._pending_records += 1
+
+            hours = self._delta.setdefault(file_start, {}).setdefault(
+                entry[self.key_field], {}
+            )
+            values = self.rollup(entry)
+            bucket = hours.get(hour)
+            if bucket is None:
+                hours[hour] = values
+            else:
+                for i, value in enumerate(values):
+                    bucket[i] += value
+
+            due = (
+                self._pending_records >= self.flush_threshold
+                or time.time() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Write buffered records and merge their rollups into the indexes"""
+        with self._lock:
+            with self._pending_lock:
+                pending, self._pending = self._pending, {}
+                delta, self._delta = self._delta, {}
+                self._pending_records = 0
+                self._last_flush = time.time()
+
+            message_field = self.message_field
+            for file_start, entries in pending.items():
+                record_path, index_path = self._paths(file_start)
+                try:
+                    messages = self._message_table(file_start)
+                    data = bytearray()
+                    for entry in entries:
+                        entry = list(entry)
+                        entry[message_field] = messages.id_for(entry[message_field])
+                        data.extend(self.record.pack(*entry))
+                    with open(record_path, "ab") as f:
+                        f.write(data)
+                except OSError as e:
+                    self.logger.error(f"Failed to write history {record_path}: {e}")
+                    continue
+
+                # Merge into what is on disk, which other processes may have
+                # changed since it was read
+                keys = self._read_index(file_start)
+                for key_id, hours in delta.get(file_start, {}).items():
+                    stored = keys.setdefault(key_id, {})
+                    for hour, values in hours.items():
+                        bucket = stored.get(hour)
+                        if bucket is None:
+                            stored[hour] = values
+                        else:
+                            for i, value in enumerate(values):
+                                bucket[i] += value
+                try:
+                    _write_json(
+                        index_path,
+                        {
+                            "keys": {
+                                str(key_id): {
+                                    str(hour): values for hour, values in hours.items()
+                                }
+                                for key_id, hours in keys.items()
+                            }
+                        },
+                    )
+                    stat = os.stat(index_path)
+                except OSError as e:
+                    self.logger.error(f"Failed to write history index: {e}")
+                    continue
+                self._index[file_start] = keys
+                self._stamps[file_start] = (
+                    stat.st_ino,
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                )
+
+    # Reading
+
+    def rollups(
+        self, key_ids: Optional[Iterable[int]] = None, since: Optional[float] = None
+    ) -> Dict[int, List[float]]:
+        """Rollup values per key, summed over the hours since ``since``"""
+        wanted = set(key_ids) if key_ids is not None else None
+        totals: Dict[int, List[float]] = {}
+        self.flush()
+        with self._lock:
+            self._refresh_indexes()
+            for file_start, keys in self._index.items():
+                if since is not None and file_start + FILE_SECONDS <= since:
+                    continue
+                for key_id, hours in keys.items():
+                    if wanted is not None and key_id not in wanted:
+                        continue
+                    for hour, values in hours.items():
+                        if since is not None and hour + ROLLUP_SECONDS <= since:
+                            continue
+                        total = totals.get(key_id)
+                        if total is None:
+                            totals[key_id] = list(values)
+                        else:
+                            for i, value in enumerate(values):
+                                total[i] += value
+        return totals
+
+    def newest(
+        self,
+        key_ids: Optional[Iterable[int]] = None,
+        limit: int = 10,
+        accept: Optional[Callable[[tuple], bool]] = None,
+    ) -> List[tuple]:
+        """Up to ``limit`` newest records of the given keys, newest first"""
+        self.flush()
+        wanted = set(key_ids) if key_ids is not None else None
+        with self._lock:
+            self._refresh_indexes()
+            files = sorted(
+                (
+                    file_start
+                    for file_start, keys in self._index.items()
+                    if wanted is None or not wanted.isdisjoint(keys)
+                ),
+                reverse=True,
+            )
+
+        found: List[tuple] = []
+        for file_start in files:
+            record_path, _ = self._paths(file_start)
+            file_records = []
+            for entry in self._scan_backwards(record_path):
+                if wanted is not None and entry[self.key_field] not in wanted:
+                    continue
+                if accept is not None and not accept(entry):
+                    continue
+                file_records.append(entry)
+                if len(found) + len(file_records) >= limit:
+                    break
+            # Records are appended roughly, not strictly, in time order
+            file_records.sort(key=lambda e: e[0], reverse=True)
+            with self._lock:
+                messages = self._message_table(file_start)
+            field_index = self.message_field
+            for entry in file_records:
+                entry = list(entry)
+                entry[field_index] = messages.value(entry[field_index])
+                found.append(tuple(entry))
+            if len(found) >= limit:
+                break
+        return found[:limit]
+
+    def _scan_backwards(self, path: str):
+        size = self.record.size
+        try:
+            f = open(path, "rb")
+        except OSError:
+            return
+        with f:
+            count = os.fstat(f.fileno()).st_size // size
+            if not count:
+                return
+            with mmap.mmap(f.fileno(), count * size, access=mmap.ACCESS_READ) as data:
+                for position in range(count - 1, -1, -1):
+                    yield self.record.unpack_from(data, position * size)
+
+    # Maintenance
+
+    def enforce_retention(self) -> int:
+        """Delete daily files older than the retention period"""
+        cutoff = time.time() - self.retention_days * 86400
+        removed = 0
+        with self._lock:
+            self.flush()
+            self._refresh_indexes()
+            for file_start in sorted(self._index):
+                if file_start + FILE_SECONDS > cutoff:
+                    continue
+                record_path, index_path = self._paths(file_start)
+                message_path = os.path.join(
+                    self.directory, str(file_start) + MESSAGE_SUFFIX
+                )
+                for path in (index_path, record_path, message_path):
+                    try:
+                        os.unlink(path)
+                    except FileNotFoundError:
+                        pass
+                    except OSError as e:
+                        self.logger.debug(f"Could not remove {path}: {e}")
+                removed += 1
+            self._refresh_indexes()
+        return removed
+
+
+def _health_rollup(entry: tuple) -> List[float]:
+    _, _, status, response_time_ms, _ = entry
+    values = [1.0, 0.0, 0.0, 0.0, 0.0, float(response_time_ms)]
+    values[1 + status] = 1.0
+    return values
+
+
+def _alert_rollup(entry: tuple) -> List[float]:
+    _, fired_at, resolved_at, _, _, _, status, _ = entry
+    if ALERT_STATUSES[status] == "resolved":
+        return [1.0, 0.0, 1.0, max(0.0, resolved_at - fired_at)]
+    return [1.0, 1.0, 0.0, 0.0]
+
+
+# Stores flushed when the interpreter exits, so short CLI runs keep what
+# they recorded; ``close()`` removes a store
+_open_stores: Set["HistoryStore"] = set()
+
+
+@atexit.register
+def _flush_open_stores():
+    for store in list(_open_stores):
+        try:
+            store.flush()
+        except Exception as e:
+            logger.debug(f"Failed to flush history at exit: {e}")
+
+
+class HistoryStore:
+    """Health check and alert history with hourly rollups"""
+
+    def __init__(self, base_dir: str, retention_days: int = 30):
+        self.logger = get_logger(__name__)
+        self.base_dir = base_dir
+        os.makedirs(base_dir, exist_ok=True)
+        self.strings = StringTable(
+            os.path.join(base_dir, "strings.jsonl"),
+            _FileLock(os.path.join(base_dir, ".lock")),
+        )
+        self.health = RecordLog(
+            os.path.join(base_dir, "health"),
+            HEALTH_RECORD,
+            key_field=1,
+            message_field=4,
+            rollup=_health_rollup,
+            retention_days=retention_days,
+        )
+        self.alerts = RecordLog(
+            os.path.join(base_dir, "alerts"),
+            ALERT_RECORD,
+            key_field=3,
+            message_field=7,
+            rollup=_alert_rollup,
+            retention_days=retention_days,
+        )
+        _open_stores.add(self)
+
+    def _key_ids(self, names: Iterable[str]) -> List[int]:
+        ids = (self.strings.get_id(name) for name in names)
+        return [string_id for string_id in ids if string_id is not None]
+
+    def _prefixed_ids(self, prefix: str) -> List[int]:
+        return [
+            string_id
+            for value, string_id in self.strings.values().items()
+            if value.startswith(prefix)
+        ]
+
+    # Health
+
+    def record_health(
+        self,
+        service_key: str,
+        status: str,
+        message: str,
+        response_time_ms: float,
+        timestamp: float,
+    ):
+        key_id = self.strings.id_for(service_key)
+        status_index = HEALTH_STATUSES.index(status) if status in HEALTH_STATUSES else 3
+        self.health.append(
+            (timestamp, key_id, status_index, response_time_ms, message or "")
+        )
+
+    def health_history(
+        self,
+        service_keys: Optional[List[str]] = None,
+        prefix: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """Newest ``limit`` results, oldest first"""
+        key_ids = self._prefixed_ids(prefix) if prefix else self._key_ids(service_keys)
+        if not key_ids:
+            return []
+        records = self.health.newest(key_ids, limit)
+        return [
+            {
+                "status": HEALTH_STATUSES[status],
+                "message": message,
+                "response_time_ms": response_time_ms,
+                "timestamp": timestamp,
+                "service_key": self.strings.value(key_id),
+            }
+            for timestamp, key_id, status, response_time_ms, message in reversed(
+                records
+            )
+        ]
+
+    def health_rollup(
+        self, prefix: Optional[str] = None, since: Optional[float] = None
+    ) -> Dict[str, float]:
+        """Check counts per status and summed response time"""
+        key_ids = self._prefixed_ids(prefix) if prefix else None
+        totals = [0.0] * len(HEALTH_ROLLUP)
+        if key_ids is not None and not key_ids:
+            return dict(zip(HEALTH_ROLLUP, totals))
+        for values in self.health.rollups(key_ids, since).values():
+            for i, value in enumerate(values):
+                totals[i] += value
+        return dict(zip(HEALTH_ROLLUP, totals))
+
+    # Alerts
+
+    def record_alert(
+        self,
+        rule_name: str,
+        metric_key: str,
+        severity: str,
+        status: str,
+        message: str,
+        fired_at: float,
+        resolved_at: Optional[float] = None,
+    ):
+        rule_id = self.strings.id_for(rule_name)
+        key_id = self.strings.id_for(metric_key)
+        self.alerts.append(
+            (
+                resolved_at or fired_at,
+                fired_at,
+                resolved_at or 0.0,
+                rule_id,
+                key_id,
+                ALERT_SEVERITIES.index(severity),
+                ALERT_STATUSES.index(status),
+                message or "",
+            )
+        )
+
+    def alert_history(
+        self, limit: int = 100, rule_name: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Newest ``limit`` alerts in their latest state, oldest first"""
+        key_ids = self._key_ids([rule_name]) if rule_name else None
+        if key_ids is not None and not key_ids:
+            return []
+
+        # A resolution record supersedes the alert's earlier firing record
+        seen: Set[Tuple[int, int, float]] = set()
+
+        def latest_state(entry: tuple) -> bool:
+            identity = (entry[3], entry[4], entry[1])
+            if identity in seen:
+                return False
+            seen.add(identity)
+            return True
+
+        records = self.alerts.newest(key_ids, limit, accept=latest_state)
+        return [
+            {
+                "rule_name": self.strings.value(rule_id),
+                "metric_key": self.strings.value(key_id),
+                "severity": ALERT_SEVERITIES[severity],
+                "status": ALERT_STATUSES[status],
+                "message": message,
+                "fired_at": fired_at,
+                "resolved_at": resolved_at or None,
+            }
+            for (
+                _,
+                fired_at,
+                resolved_at,
+                rule_id,
+                key_id,
+                severity,
+                status,
+                message,
+            ) in reversed(records)
+        ]
+
+    def alert_rollup(
+        self, rule_name: Optional[str] = None, since: Optional[float] = None
+    ) -> Dict[str, Dict[str, float]]:
+        """Fired/resolved counts and total time to resolve per rule"""
+        key_ids = self._key_ids([rule_name]) if rule_name else None
+        if key_ids is not None and not key_ids:
+            return {}
+        return {
+            self.strings.value(rule_id): dict(zip(ALERT_ROLLUP, values))
+            for rule_id, values in self.alerts.rollups(key_ids, since).items()
+        }
+
+    # Maintenance
+
+    def flush(self):
+        self.health.flush()
+        self.alerts.flush()
+
+    def enforce_retention(self) -> int:
+        return self.health.enforce_retention() + self.alerts.enforce_retention()
+
+    def close(self):
+        self.flush()
+        _open_stores.discard(self)
+
+
+_stores: Dict[str, HistoryStore] = {}
+_stores_lock = threading.Lock()
+
+
+def open_history_store(base_dir: Optional[str] = None) -> HistoryStore:
+    """Shared store for ``base_dir`` (default ``<data_dir>/history``)
+
+    Health checkers and alert managers in one process share an instance,
+    so their records are buffered and flushed together.
+    """
+    if base_dir is None:
+        from ..utils.filesystem import paths
+
+        base_dir = os.path.join(str(paths.data_dir), "history")
+    key = os.path.realpath(base_dir)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = HistoryStore(base_dir)
+        return store
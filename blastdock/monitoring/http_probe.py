@@ -0,0 +1,211 @@
+"""
+Pooled HTTP probing for BlastDock health checks
+
+Probes share one ``requests`` session whose per-host connection pools keep
+connections alive between checks, so a service monitored every few seconds
+pays the TCP and TLS handshake once instead of on every probe. Bodies are
+streamed: a probe reads only until the expected content is found or a byte
+limit is reached, and HEAD probes read no body at all. A small unread
+remainder is drained afterwards so the connection can go back to the pool.
+Each probe reports connect, time-to-first-byte and total timings.
+"""
+
+import time
+import threading
+from typing import Dict, Iterator, NamedTuple, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Per-thread time spent opening connections during the current probe
+_connect_timing = threading.local()
+
+
+def _record_connect(seconds: float):
+    _connect_timing.seconds = getattr(_connect_timing, "seconds", 0.0) + seconds
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _record_connect(time.perf_counter() - started)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        # Includes the TLS handshake
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _record_connect(time.perf_counter() - started)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedAdapter(HTTPAdapter):
+    """Adapter whose connections record how long they took to open"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+class ProbeResult(NamedTuple):
+    """Outcome and timings of one HTTP probe"""
+
+    url: str
+    status_code: int
+    connect_ms: float
+    ttfb_ms: float
+    total_ms: float
+    bytes_read: int
+    # None when no expected content was given
+    content_found: Optional[bool]
+    connection_reused: bool
+
+    @property
+    def timings(self) -> Dict[str, float]:
+        return {
+            "connect_ms": self.connect_ms,
+            "ttfb_ms": self.ttfb_ms,
+            "total_ms": self.total_ms,
+        }
+
+
+class HttpProbeClient:
+    """Keep-alive HTTP client for health probes"""
+
+    def __init__(
+        self,
+        pool_connections: int = 32,
+        pool_maxsize: int = 4,
+        max_body_bytes: int = 64 * 1024,
+        max_redirects: int = 5,
+        chunk_size: int = 8192,
+        max_drain_bytes: int = 64 * 1024,
+    ):
+        self.max_body_bytes = max_body_bytes
+        self.chunk_size = chunk_size
+        # Unread body worth reading to keep the connection; beyond it the
+        # connection is closed instead
+        self.max_drain_bytes = max_drain_bytes
+
+        self.session = requests.Session()
+        self.session.max_redirects = max_redirects
+        adapter = _TimedAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def probe(
+        self,
+        url: str,
+        timeout: float,
+        method: str = "GET",
+        headers: Optional[Dict[str, str]] = None,
+        expected_content: Optional[str] = None,
+        verify: bool = True,
+    ) -> ProbeResult:
+        """Request ``url`` and read as little of the body as the check needs
+
+        Raises the usual ``requests`` exceptions on timeouts and connection
+        failures.
+        """
+        _connect_timing.seconds = 0.0
+        started = time.perf_counter()
+        response = self.session.request(
+            method,
+            url,
+            headers=headers,
+            timeout=timeout,
+            allow_redirects=True,
+            stream=True,
+            verify=verify,
+        )
+        ttfb = time.perf_counter() - started
+
+        chunks = response.iter_content(chunk_size=self.chunk_size)
+        try:
+            bytes_read, content_found = self._read_body(
+                chunks, method, expected_content
+            )
+            total = time.perf_counter() - started
+        finally:
+            self._release(response, chunks)
+
+        connect = _connect_timing.seconds
+        return ProbeResult(
+            url=url,
+            status_code=response.status_code,
+            connect_ms=connect * 1000,
+            ttfb_ms=ttfb * 1000,
+            total_ms=total * 1000,
+            bytes_read=bytes_read,
+            content_found=content_found,
+            connection_reused=connect == 0.0,
+        )
+
+    def _read_body(
+        self,
+        chunks: Iterator[bytes],
+        method: str,
+        expected_content: Optional[str],
+    ):
+        if method.upper() == "HEAD":
+            return 0, None if expected_content is None else False
+
+        needle = expected_content.encode("utf-8") if expected_content else None
+        # Bytes kept from the previous chunk to match across chunk boundaries
+        keep = len(needle) - 1 if needle else 0
+        window = b""
+        bytes_read = 0
+        for chunk in chunks:
+            bytes_read += len(chunk)
+            if needle is not None:
+                window = (window[-keep:] if keep else b"") + chunk
+                if needle in window:
+                    return bytes_read, True
+            if bytes_read >= self.max_body_bytes:
+                break
+        return bytes_read, None if needle is None else False
+
+    def _release(self, response: requests.Response, chunks: Iterator[bytes]):
+        """Hand the connection back to the pool, or close it
+
+        Closing a response whose body was not fully read closes its socket,
+        so the rest of the body (none for HEAD) is read first, up to
+        ``max_drain_bytes``.
+        """
+        drained = 0
+        try:
+            for chunk in chunks:
+                drained += len(chunk)
+                if drained > self.max_drain_bytes:
+                    break
+        except requests.RequestException as e:
+            logger.debug(f"Could not drain probe response: {e}")
+        # Releases the connection when the body was consumed, else closes it
+        response.close()
+
+    def close(self):
+        self.session.close()
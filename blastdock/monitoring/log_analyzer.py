@@ -2,16 +2,24 @@
 Log analysis system for BlastDock deployments
 """
 
+import os
 import re
 import time
 import json
+import threading
+from functools import partial
 from typing import Dict, List, Any, Optional, Tuple, Pattern
 from dataclasses import dataclass, field
-from collections import defaultdict, Counter
+from collections import Counter
 from enum import Enum
 
 from ..utils.logging import get_logger
 from ..utils.docker_utils import DockerClient
+from .container_state import container_source
+from .log_archive import LogArchive
+from .log_matcher import PatternMatcher, classify_line
+from .log_pipeline import LogPipeline, merge_by_timestamp
+from .log_stream import LogAggregates, LogBucket, ProjectLogStream
 
 logger = get_logger(__name__)
 
@@ -70,18 +78,37 @@ class LogAnalysisResult:
 class LogAnalyzer:
     """Advanced log analysis system"""
 
-    def __init__(self):
-        """Initialize log analyzer"""
+    def __init__(self, archive: bool = False, archive_dir: Optional[str] = None):
+        """Initialize log analyzer
+
+        With ``archive`` parsed lines are also kept in the on-disk log
+        archive under ``<data_dir>/logs`` (or ``archive_dir``), which seeds
+        later analyses and answers queries over past time ranges.
+        """
         self.logger = get_logger(__name__)
         self.docker_client = DockerClient()
 
         # Predefined log patterns
         self._patterns = self._initialize_patterns()
+        self._pattern_matcher = PatternMatcher(self._patterns)
 
         # Analysis cache
         self._analysis_cache: Dict[str, LogAnalysisResult] = {}
         self._cache_ttl = 300  # 5 minutes
 
+        # Incremental per-project log streams
+        self._streams: Dict[str, ProjectLogStream] = {}
+        self._streams_lock = threading.Lock()
+
+        # Concurrent fetch / sharded parse of container logs
+        self._pipeline = LogPipeline()
+
+        # Optional persistent log archive
+        self.archive: Optional[LogArchive] = None
+        self._archive_retention_at = 0.0
+        if archive:
+            self.enable_archive(archive_dir)
+
         self.logger.debug("Log analyzer initialized")
 
     def _initialize_patterns(self) -> List[LogPattern]:
@@ -230,7 +257,11 @@ class LogAnalyzer:
     def analyze_project_logs(
         self, project_name: str, tail_lines: int = 1000, time_window_hours: int = 24
     ) -> LogAnalysisResult:
-        """Analyze logs for a project"""
+        """Analyze logs for a project
+
+        The first analysis of a project reads up to ``tail_lines`` lines;
+        later ones only read and parse what the containers logged since.
+        """
         cache_key = f"{project_name}:{tail_lines}:{time_window_hours}"
 
         # Check cache
@@ -242,8 +273,9 @@ class LogAnalyzer:
         start_time = time.time()
 
         try:
-            # Get container logs
-            containers = self.docker_client.get_container_status(project_name)
+            containers = container_source(self.docker_client).get_container_status(
+                project_name
+            )
             if not containers:
                 return LogAnalysisResult(
                     project_name=project_name,
@@ -258,47 +290,25 @@ class LogAnalyzer:
                     timeline=[],
                 )
 
-            all_logs = []
-            total_lines = 0
-
-            # Collect logs from all containers
-            for container in containers:
-                container_name = container["name"]
-                try:
-                    # Get logs for container
-                    logs = self.docker_client.get_container_logs(
-                        container_name,
-                        tail=tail_lines
-                        // len(containers),  # Distribute lines across containers
-                    )
-
-                    if logs:
-                        log_lines = logs.strip().split("\n")
-                        for line in log_lines:
-                            if line.strip():
-                                parsed_entry = self._parse_log_line(
-                                    line, container_name, project_name
-                                )
-                                if parsed_entry:
-                                    all_logs.append(parsed_entry)
-                                total_lines += 1
-
-                except Exception as e:
-                    self.logger.warning(
-                        f"Failed to get logs for container {container_name}: {e}"
-                    )
-
-            # Sort logs by timestamp
-            all_logs.sort(key=lambda x: x.timestamp)
+            stream = self._get_stream(project_name, time_window_hours)
+            with stream.lock:
+                stream.update(
+                    self._pipeline,
+                    self.docker_client,
+                    [container["name"] for container in containers],
+                    tail_lines,
+                    time_window_hours,
+                    list(self._patterns),
+                    self.archive,
+                )
+                cutoff_time = start_time - (time_window_hours * 3600)
+                analysis_result = self._build_result(
+                    project_name,
+                    start_time,
+                    stream.aggregates.window(cutoff_time),
+                )
 
-            # Filter by time window
-            cutoff_time = time.time() - (time_window_hours * 3600)
-            filtered_logs = [log for log in all_logs if log.timestamp >= cutoff_time]
-
-            # Analyze logs
-            analysis_result = self._analyze_log_entries(
-                filtered_logs, project_name, start_time, total_lines
-            )
+            self._maintain_archive()
 
             # Cache result
             self._analysis_cache[cache_key] = analysis_result
@@ -320,30 +330,131 @@ class LogAnalyzer:
                 timeline=[],
             )
 
+    def _get_stream(self, project_name: str, window_hours: int) -> ProjectLogStream:
+        """Log stream of a project, created on first use
+
+        With the archive enabled a new stream is seeded from it, and it is
+        re-seeded when a wider window than it covers is requested.
+        """
+        with self._streams_lock:
+            stream = self._streams.get(project_name)
+            if stream is not None and not (
+                self.archive is not None
+                and window_hours > stream.aggregates.retention_hours
+            ):
+                return stream
+
+            stream = ProjectLogStream(project_name, window_hours)
+            if self.archive is not None:
+                try:
+                    stream.seed(self.archive, self._patterns)
+                except OSError as e:
+                    self.logger.warning(f"Could not read log archive: {e}")
+            self._streams[project_name] = stream
+            return stream
+
+    def enable_archive(self, archive_dir: Optional[str] = None) -> bool:
+        """Persist analyzed log lines to the on-disk log archive"""
+        if archive_dir is None:
+            from ..utils.filesystem import paths
+
+            archive_dir = os.path.join(str(paths.data_dir), "logs")
+        try:
+            self.archive = LogArchive(archive_dir)
+        except OSError as e:
+            self.logger.warning(f"Log archive disabled: {e}")
+            return False
+        self.reset_streams()
+        return True
+
+    def _maintain_archive(self):
+        """Drop expired archive segments at most once an hour"""
+        if self.archive is None or time.time() - self._archive_retention_at < 3600:
+            return
+        self._archive_retention_at = time.time()
+        try:
+            self.archive.enforce_retention()
+        except OSError as e:
+            self.logger.debug(f"Log archive retention failed: {e}")
+
+    def search_archived_logs(
+        self,
+        project_name: str,
+        hours: float = 24,
+        levels: Optional[List[str]] = None,
+        containers: Optional[List[str]] = None,
+        patterns: Optional[List[str]] = None,
+        limit: int = 1000,
+    ) -> List[Dict[str, Any]]:
+        """Archived lines of the last ``hours`` matching the filters"""
+        if self.archive is None:
+            return []
+        return [
+            line._asdict()
+            for line in self.archive.query(
+                project_name,
+                start=time.time() - hours * 3600,
+                levels=levels,
+                containers=containers,
+                patterns=patterns,
+                limit=limit,
+            )
+        ]
+
+    def analyze_archived_logs(
+        self, project_name: str, start: float, end: Optional[float] = None
+    ) -> LogAnalysisResult:
+        """Analysis of an arbitrary archived time range, e.g. the past week"""
+        aggregates = LogAggregates()
+        if self.archive is not None:
+            by_name = {pattern.name: pattern for pattern in self._patterns}
+            for line in self.archive.query(project_name, start=start, end=end):
+                aggregates.add_fields(
+                    line.timestamp,
+                    line.level,
+                    line.message,
+                    line.container,
+                    [by_name[name] for name in line.patterns if name in by_name],
+                )
+        result = self._build_result(
+            project_name, time.time(), aggregates.window(float("-inf"))
+        )
+        # The timeline covers the whole range, not only its last day
+        result.timeline = self._create_timeline(
+            aggregates.window(float("-inf")), limit=None
+        )
+        return result
+
+    def reset_streams(self, project_name: Optional[str] = None):
+        """Forget stream cursors and aggregates (all projects by default)"""
+        with self._streams_lock:
+            if project_name is None:
+                self._streams.clear()
+            else:
+                self._streams.pop(project_name, None)
+        self._analysis_cache.clear()
+
     def _parse_log_line(
-        self, line: str, container_name: str, project_name: str
+        self,
+        line: str,
+        container_name: str,
+        project_name: str,
+        fallback_timestamp: Optional[float] = None,
     ) -> Optional[LogEntry]:
         """Parse a single log line"""
         try:
-            # Try to extract timestamp
-            timestamp = self._extract_timestamp(line)
-            if timestamp is None:
-                timestamp = time.time()  # Use current time if no timestamp found
-
-            # Try to extract log level
-            level = self._extract_log_level(line)
-
-            # Extract message (remove timestamp and level if present)
-            message = self._clean_message(line)
+            info = classify_line(line)
 
             return LogEntry(
-                timestamp=timestamp,
-                level=level,
-                message=message,
+                # Docker's own timestamp, else the current time
+                timestamp=info.timestamp or fallback_timestamp or time.time(),
+                level=LogLevel(info.level),
+                message=info.message,
                 source=container_name,
                 container=container_name,
                 project=project_name,
                 raw_line=line,
+                metadata={"timestamp_format": info.timestamp_format},
             )
 
         except Exception as e:
@@ -352,91 +463,19 @@ class LogAnalyzer:
 
     def _extract_timestamp(self, line: str) -> Optional[float]:
         """Extract timestamp from log line"""
-        # Common timestamp patterns
-        timestamp_patterns = [
-            # ISO format: 2023-12-01T10:30:45.123Z
-            r"(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d{3})?Z?)",
-            # Docker format: 2023-12-01 10:30:45
-            r"(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})",
-            # Syslog format: Dec  1 10:30:45
-            r"([A-Za-z]{3}\s+\d{1,2}\s+\d{2}:\d{2}:\d{2})",
-            # Unix timestamp: [1701427845.123]
-            r"\[(\d{10}(?:\.\d{3})?)\]",
-        ]
-
-        for pattern in timestamp_patterns:
-            match = re.search(pattern, line)
-            if match:
-                timestamp_str = match.group(1)
-                try:
-                    # Try different parsing methods
-                    if "T" in timestamp_str:
-                        # ISO format
-                        from datetime import datetime
-
-                        dt = datetime.fromisoformat(
-                            timestamp_str.replace("Z", "+00:00")
-                        )
-                        return dt.timestamp()
-                    elif "-" in timestamp_str and " " in timestamp_str:
-                        # YYYY-MM-DD HH:MM:SS format
-                        from datetime import datetime
-
-                        dt = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-                        return dt.timestamp()
-                    elif timestamp_str.replace(".", "").isdigit():
-                        # Unix timestamp
-                        return float(timestamp_str)
-                except Exception:
-                    continue
-
-        return None
+        return classify_line(line).timestamp
 
     def _extract_log_level(self, line: str) -> LogLevel:
-        """Extract log level from log line"""
-        line_upper = line.upper()
-
-        # Common log level patterns
-        if re.search(r"\b(FATAL|CRIT|CRITICAL)\b", line_upper):
-            return LogLevel.FATAL
-        elif re.search(r"\b(ERROR|ERR)\b", line_upper):
-            return LogLevel.ERROR
-        elif re.search(r"\b(WARN|WARNING)\b", line_upper):
-            return LogLevel.WARN
-        elif re.search(r"\b(INFO|INFORMATION)\b", line_upper):
-            return LogLevel.INFO
-        elif re.search(r"\b(DEBUG|DBG)\b", line_upper):
-            return LogLevel.DEBUG
-        elif re.search(r"\b(TRACE|TRC)\b", line_upper):
-            return LogLevel.TRACE
-        else:
-            # Default to INFO if no level found
-            return LogLevel.INFO
+        """Extract log level from log line (INFO if none found)"""
+        return LogLevel(classify_line(line).level)
 
     def _clean_message(self, line: str) -> str:
         """Clean log message by removing timestamp and level prefixes"""
-        # Remove common prefixes
-        cleaned = line
+        return classify_line(line).message
 
-        # Remove timestamps
-        cleaned = re.sub(
-            r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d{3})?Z?\s*", "", cleaned
-        )
-        cleaned = re.sub(r"[A-Za-z]{3}\s+\d{1,2}\s+\d{2}:\d{2}:\d{2}\s*", "", cleaned)
-        cleaned = re.sub(r"\[\d{10}(?:\.\d{3})?\]\s*", "", cleaned)
-
-        # Remove log levels
-        cleaned = re.sub(
-            r"\b(TRACE|DEBUG|INFO|WARN|WARNING|ERROR|ERR|FATAL|CRIT|CRITICAL)\b:?\s*",
-            "",
-            cleaned,
-            flags=re.IGNORECASE,
-        )
-
-        # Remove Docker container prefixes
-        cleaned = re.sub(r"^\w+\s*\|\s*", "", cleaned)
-
-        return cleaned.strip()
+    def _match_patterns(self, message: str) -> List[LogPattern]:
+        """Patterns matching a log message"""
+        return self._pattern_matcher.match(message)
 
     def _analyze_log_entries(
         self,
@@ -446,57 +485,58 @@ class LogAnalyzer:
         total_lines: int,
     ) -> LogAnalysisResult:
         """Analyze parsed log entries"""
-        parsed_lines = len(log_entries)
-        error_count = sum(1 for log in log_entries if log.level == LogLevel.ERROR)
-        warning_count = sum(1 for log in log_entries if log.level == LogLevel.WARN)
+        aggregates = LogAggregates()
+        for log_entry in log_entries:
+            aggregates.add(log_entry, self._match_patterns(log_entry.message))
 
-        # Pattern matching
-        patterns_found = defaultdict(int)
-        matched_patterns = []
+        result = self._build_result(
+            project_name, analysis_time, aggregates.window(float("-inf"))
+        )
+        result.total_lines = total_lines
+        return result
 
-        for log_entry in log_entries:
-            for pattern in self._patterns:
-                if pattern.pattern.search(log_entry.message):
-                    patterns_found[pattern.name] += 1
-                    matched_patterns.append((log_entry, pattern))
+    def _build_result(
+        self, project_name: str, analysis_time: float, buckets: List[LogBucket]
+    ) -> LogAnalysisResult:
+        """Analysis result from the aggregate buckets of a time window"""
+        levels = Counter()
+        patterns_found = Counter()
+        error_counter = Counter()
+        error_total = 0
+        total_lines = 0
+        parsed_lines = 0
+        for bucket in buckets:
+            levels.update(bucket.levels)
+            patterns_found.update(bucket.patterns)
+            error_counter.update(bucket.error_messages)
+            error_total += bucket.error_total
+            total_lines += bucket.lines
+            parsed_lines += bucket.parsed
 
         # Top errors analysis
-        error_messages = [
-            log.message
-            for log in log_entries
-            if log.level in [LogLevel.ERROR, LogLevel.FATAL]
-        ]
-        error_counter = Counter(error_messages)
         top_errors = [
             {
                 "message": msg,
                 "count": count,
-                "percentage": (
-                    (count / len(error_messages) * 100) if error_messages else 0
-                ),
+                "percentage": (count / error_total * 100) if error_total else 0,
             }
             for msg, count in error_counter.most_common(10)
         ]
 
         # Generate recommendations
-        recommendations = self._generate_recommendations(
-            patterns_found, matched_patterns
-        )
-
-        # Create timeline
-        timeline = self._create_timeline(log_entries)
+        recommendations = self._generate_recommendations(dict(patterns_found), [])
 
         return LogAnalysisResult(
             project_name=project_name,
             analysis_time=analysis_time,
             total_lines=total_lines,
             parsed_lines=parsed_lines,
-            error_count=error_count,
-            warning_count=warning_count,
+            error_count=levels[LogLevel.ERROR.value],
+            warning_count=levels[LogLevel.WARN.value],
             patterns_found=dict(patterns_found),
             top_errors=top_errors,
             recommendations=recommendations,
-            timeline=timeline,
+            timeline=self._create_timeline(buckets),
         )
 
     def _generate_recommendations(
@@ -552,52 +592,30 @@ class LogAnalyzer:
 
         return recommendations[:10]  # Limit to top 10 recommendations
 
-    def _create_timeline(self, log_entries: List[LogEntry]) -> List[Dict[str, Any]]:
+    def _create_timeline(
+        self, buckets: List[LogBucket], limit: Optional[int] = 24
+    ) -> List[Dict[str, Any]]:
         """Create timeline of significant events"""
         timeline = []
 
-        # Group logs by hour
-        hourly_stats = defaultdict(
-            lambda: {"errors": 0, "warnings": 0, "info": 0, "events": []}
-        )
-
-        for log_entry in log_entries:
-            hour_key = int(log_entry.timestamp // 3600) * 3600  # Round to hour
-
-            if log_entry.level == LogLevel.ERROR:
-                hourly_stats[hour_key]["errors"] += 1
-            elif log_entry.level == LogLevel.WARN:
-                hourly_stats[hour_key]["warnings"] += 1
-            else:
-                hourly_stats[hour_key]["info"] += 1
-
-            # Track significant events
-            for pattern in self._patterns:
-                if pattern.severity >= 7 and pattern.pattern.search(log_entry.message):
-                    hourly_stats[hour_key]["events"].append(
-                        {
-                            "pattern": pattern.name,
-                            "message": log_entry.message[:100],  # Truncate
-                            "container": log_entry.container,
-                            "timestamp": log_entry.timestamp,
-                        }
-                    )
-
-        # Convert to timeline format
-        for hour_timestamp, stats in sorted(hourly_stats.items()):
+        for bucket in buckets:
+            errors = bucket.levels[LogLevel.ERROR.value]
+            warnings = bucket.levels[LogLevel.WARN.value]
+            if not bucket.parsed:
+                continue
             timeline.append(
                 {
-                    "timestamp": hour_timestamp,
-                    "hour": time.strftime("%H:00", time.localtime(hour_timestamp)),
-                    "date": time.strftime("%Y-%m-%d", time.localtime(hour_timestamp)),
-                    "errors": stats["errors"],
-                    "warnings": stats["warnings"],
-                    "info": stats["info"],
-                    "significant_events": stats["events"][:5],  # Top 5 events per hour
+                    "timestamp": bucket.start,
+                    "hour": time.strftime("%H:00", time.localtime(bucket.start)),
+                    "date": time.strftime("%Y-%m-%d", time.localtime(bucket.start)),
+                    "errors": errors,
+                    "warnings": warnings,
+                    "info": bucket.parsed - errors - warnings,
+                    "significant_events": bucket.events[:5],  # Top 5 events per hour
                 }
             )
 
-        return timeline[-24:]  # Last 24 hours
+        return timeline[-limit:] if limit else timeline  # Last 24 hours
 
     def get_real_time_analysis(
         self, project_name: str, container_name: str = None
@@ -608,33 +626,38 @@ class LogAnalyzer:
             if container_name:
                 containers = [{"name": container_name}]
             else:
-                containers = self.docker_client.get_container_status(project_name)
-
-            recent_logs = []
+                containers = container_source(self.docker_client).get_container_status(
+                    project_name
+                )
 
-            for container in containers:
-                try:
-                    logs = self.docker_client.get_container_logs(
-                        container["name"], tail=100
-                    )
-                    if logs:
-                        log_lines = logs.strip().split("\n")[
-                            -10:
-                        ]  # Last 10 lines per container
-                        for line in log_lines:
-                            if line.strip():
-                                parsed_entry = self._parse_log_line(
-                                    line, container["name"], project_name
-                                )
-                                if parsed_entry:
-                                    recent_logs.append(parsed_entry)
-                except Exception as e:
-                    self.logger.debug(
-                        f"Failed to get recent logs for {container['name']}: {e}"
+            # Last 10 lines per container, fetched concurrently
+            fetched = self._pipeline.fetch(
+                {
+                    container["name"]: partial(
+                        self.docker_client.get_container_logs,
+                        container["name"],
+                        tail=10,
                     )
-
-            # Sort by timestamp
-            recent_logs.sort(key=lambda x: x.timestamp, reverse=True)
+                    for container in containers
+                }
+            )
+            per_container = []
+            for name, logs in fetched.items():
+                entries = []
+                for line in (logs or "").strip().split("\n"):
+                    if line.strip():
+                        parsed_entry = self._parse_log_line(line, name, project_name)
+                        if parsed_entry:
+                            entries.append(parsed_entry)
+                entries.reverse()
+                per_container.append(entries)
+
+            # Newest first
+            recent_logs = list(
+                merge_by_timestamp(
+                    per_container, key=lambda x: x.timestamp, reverse=True
+                )
+            )
 
             # Quick analysis
             error_count = sum(1 for log in recent_logs if log.level == LogLevel.ERROR)
@@ -643,10 +666,8 @@ class LogAnalyzer:
             # Check for immediate issues
             critical_patterns = []
             for log_entry in recent_logs:
-                for pattern in self._patterns:
-                    if pattern.severity >= 8 and pattern.pattern.search(
-                        log_entry.message
-                    ):
+                for pattern in self._match_patterns(log_entry.message):
+                    if pattern.severity >= 8:
                         critical_patterns.append(
                             {
                                 "pattern": pattern.name,
@@ -686,6 +707,9 @@ class LogAnalyzer:
     def add_custom_pattern(self, pattern: LogPattern):
         """Add custom log pattern"""
         self._patterns.append(pattern)
+        self._pattern_matcher = PatternMatcher(self._patterns)
+        # Aggregates were built without it
+        self.reset_streams()
         self.logger.info(f"Added custom log pattern: {pattern.name}")
 
     def export_analysis(self, result: LogAnalysisResult, format: str = "json") -> str:
@@ -0,0 +1,373 @@
+"""
+Persistent log archive for BlastDock log analysis
+
+Parsed log lines are stored per project in hourly segment files under
+``<data_dir>/logs``. A segment is a sequence of zlib-compressed blocks of
+JSON records, and its ``.idx`` sidecar lists every block with its offset,
+time range and per-level, per-container and per-pattern counts. Queries
+only read the segments overlapping the requested time range and only
+decompress blocks whose index entry can satisfy the filters.
+"""
+
+import os
+import re
+import json
+import time
+import zlib
+import heapq
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+SEGMENT_SECONDS = 3600
+SEGMENT_SUFFIX = ".seg"
+INDEX_SUFFIX = ".idx"
+
+
+class ArchivedLine(NamedTuple):
+    """One archived, parsed log line"""
+
+    timestamp: float
+    level: str
+    container: str
+    message: str
+    patterns: List[str]
+
+
+def _safe_name(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+
+
+def _count(counts: Dict[str, int], key: str):
+    counts[key] = counts.get(key, 0) + 1
+
+
+class LogArchive:
+    """Compressed, time-partitioned and indexed store of parsed log lines"""
+
+    def __init__(
+        self,
+        base_dir: str,
+        block_records: int = 2000,
+        retention_days: int = 7,
+    ):
+        self.logger = get_logger(__name__)
+        self.base_dir = base_dir
+        self.block_records = block_records
+        self.retention_days = retention_days
+        os.makedirs(self.base_dir, exist_ok=True)
+
+        self._lock = threading.RLock()
+        # (project, segment start) -> records waiting to be written
+        self._pending: Dict[Tuple[str, int], List[ArchivedLine]] = {}
+        self._pending_records = 0
+
+    # Layout
+
+    def _project_dir(self, project_name: str) -> str:
+        return os.path.join(self.base_dir, _safe_name(project_name))
+
+    def _segment_paths(self, project_name: str, start: int) -> Tuple[str, str]:
+        base = os.path.join(self._project_dir(project_name), str(start))
+        return base + SEGMENT_SUFFIX, base + INDEX_SUFFIX
+
+    def _segment_starts(
+        self, project_name: str, start: Optional[float], end: Optional[float]
+    ) -> List[int]:
+        try:
+            names = os.listdir(self._project_dir(project_name))
+        except OSError:
+            return []
+        starts = []
+        for name in names:
+            stem, suffix = os.path.splitext(name)
+            if suffix != INDEX_SUFFIX or not stem.isdigit():
+                continue
+            segment_start = int(stem)
+            if start is not None and segment_start + SEGMENT_SECONDS <= start:
+                continue
+            if end is not None and segment_start > end:
+                continue
+            starts.append(segment_start)
+        return sorted(starts)
+
+    @contextmanager
+    def _project_lock(self, project_name: str):
+        """Exclusive lock on a project's archive across processes"""
+        project_dir = self._project_dir(project_name)
+        os.makedirs(project_dir, exist_ok=True)
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(project_dir, ".lock"), "a+") as handle:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _read_index(index_path: str) -> Dict[str, Any]:
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"blocks": []}
+        except ValueError as e:
+            logger.warning(f"Ignoring corrupt log archive index {index_path}: {e}")
+            return {"blocks": []}
+
+    @staticmethod
+    def _write_json(path: str, data: Dict[str, Any]):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    # Writing
+
+    def append(self, project_name: str, lines: Iterable[ArchivedLine]):
+        """Queue parsed lines; they are written on ``flush``"""
+        with self._lock:
+            for line in lines:
+                start = int(line.timestamp // SEGMENT_SECONDS) * SEGMENT_SECONDS
+                self._pending.setdefault((project_name, start), []).append(line)
+                self._pending_records += 1
+            if self._pending_records >= self.block_records:
+                self.flush()
+
+    def flush(self):
+        """Write queued lines as compressed blocks and update the indexes"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._pending_records = 0
+            for (project_name, start), lines in sorted(pending.items()):
+                try:
+                    with self._project_lock(project_name):
+                        self._write_lines(project_name, start, lines)
+                except OSError as e:
+                    self.logger.warning(
+                        f"Failed to archive logs for {project_name}: {e}"
+                    )
+
+    def _write_lines(self, project_name: str, start: int, lines: List[ArchivedLine]):
+        segment_path, index_path = self._segment_paths(project_name, start)
+        index = self._read_index(index_path)
+        blocks = index["blocks"]
+
+        # Top up a short trailing block instead of adding another small one
+        offset = blocks[-1]["offset"] + blocks[-1]["length"] if blocks else 0
+        if blocks and blocks[-1]["count"] + len(lines) <= self.block_records:
+            last = blocks.pop()
+            offset = last["offset"]
+            lines = self._read_block(segment_path, last) + lines
+
+        with open(segment_path, "ab") as f:
+            f.truncate(offset)
+            for chunk_start in range(0, len(lines), self.block_records):
+                chunk = sorted(
+                    lines[chunk_start : chunk_start + self.block_records],
+                    key=lambda line: line.timestamp,
+                )
+                payload = zlib.compress(
+                    "".join(
+                        json.dumps(list(line), separators=(",", ":")) + "\n"
+                        for line in chunk
+                    ).encode("utf-8")
+                )
+                f.write(payload)
+                entry = {
+                    "offset": offset,
+                    "length": len(payload),
+                    "count": len(chunk),
+                    "min_ts": chunk[0].timestamp,
+                    "max_ts": chunk[-1].timestamp,
+                    "levels": {},
+                    "containers": {},
+                    "patterns": {},
+                }
+                for line in chunk:
+                    _count(entry["levels"], line.level)
+                    _count(entry["containers"], line.container)
+                    for pattern in line.patterns:
+                        _count(entry["patterns"], pattern)
+                blocks.append(entry)
+                offset += len(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._write_json(index_path, index)
+
+    def save_cursors(self, project_name: str, cursors: Dict[str, int]):
+        """Persist each container's log read position (nanoseconds)"""
+        with self._project_lock(project_name):
+            path = os.path.join(self._project_dir(project_name), "cursors.json")
+            self._write_json(path, cursors)
+
+    def load_cursors(self, project_name: str) -> Dict[str, int]:
+        path = os.path.join(self._project_dir(project_name), "cursors.json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return {name: int(ns) for name, ns in json.load(f).items()}
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    # Reading
+
+    @staticmethod
+    def _read_block(segment_path: str, block: Dict[str, Any]) -> List[ArchivedLine]:
+        with open(segment_path, "rb") as f:
+            f.seek(block["offset"])
+            payload = f.read(block["length"])
+        text = zlib.decompress(payload).decode("utf-8")
+        return [ArchivedLine(*json.loads(line)) for line in text.splitlines()]
+
+    @staticmethod
+    def _block_matches(
+        block: Dict[str, Any],
+        start: Optional[float],
+        end: Optional[float],
+        levels: Optional[set],
+        containers: Optional[set],
+        patterns: Optional[set],
+    ) -> bool:
+        if start is not None and block["max_ts"] < start:
+            return False
+        if end is not None and block["min_ts"] > end:
+            return False
+        for wanted, counts in (
+            (levels, block["levels"]),
+            (containers, block["containers"]),
+            (patterns, block["patterns"]),
+        ):
+            if wanted is not None and not wanted.intersection(counts):
+                return False
+        return True
+
+    def _segment_lines(
+        self,
+        project_name: str,
+        segment_start: int,
+        filters: Tuple,
+    ) -> Iterator[ArchivedLine]:
+        segment_path, index_path = self._segment_paths(project_name, segment_start)
+        start, end, levels, containers, patterns = filters
+        blocks = [
+            block
+            for block in self._read_index(index_path)["blocks"]
+            if self._block_matches(block, start, end, levels, containers, patterns)
+        ]
+        decoded = []
+        for block in blocks:
+            try:
+                lines = self._read_block(segment_path, block)
+            except (OSError, zlib.error, ValueError) as e:
+                # Trailing block rewritten by a concurrent flush
+                self.logger.debug(f"Skipping unreadable log archive block: {e}")
+                continue
+            decoded.append(
+                [
+                    line
+                    for line in lines
+                    if (start is None or line.timestamp >= start)
+                    and (end is None or line.timestamp <= end)
+                    and (levels is None or line.level in levels)
+                    and (containers is None or line.container in containers)
+                    and (patterns is None or patterns.intersection(line.patterns))
+                ]
+            )
+        # Blocks are each sorted; their time ranges may overlap
+        return heapq.merge(*decoded, key=lambda line: line.timestamp)
+
+    def query(
+        self,
+        project_name: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        levels: Optional[Iterable[str]] = None,
+        containers: Optional[Iterable[str]] = None,
+        patterns: Optional[Iterable[str]] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[ArchivedLine]:
+        """Archived lines in time order, filtered by time, level, container
+        and pattern name"""
+        self.flush()
+        filters = (
+            start,
+            end,
+            set(levels) if levels is not None else None,
+            set(containers) if containers is not None else None,
+            set(patterns) if patterns is not None else None,
+        )
+        returned = 0
+        for segment_start in self._segment_starts(project_name, start, end):
+            for line in self._segment_lines(project_name, segment_start, filters):
+                yield line
+                returned += 1
+                if limit is not None and returned >= limit:
+                    return
+
+    def projects(self) -> List[str]:
+        try:
+            return sorted(
+                name
+                for name in os.listdir(self.base_dir)
+                if os.path.isdir(os.path.join(self.base_dir, name))
+            )
+        except OSError:
+            return []
+
+    # Maintenance
+
+    def enforce_retention(self) -> int:
+        """Delete segments entirely older than the retention period"""
+        cutoff = time.time() - self.retention_days * 86400
+        removed = 0
+        for project_name in self.projects():
+            for segment_start in self._segment_starts(project_name, None, cutoff):
+                if segment_start + SEGMENT_SECONDS > cutoff:
+                    continue
+                with self._project_lock(project_name):
+                    for path in self._segment_paths(project_name, segment_start):
+                        try:
+                            os.unlink(path)
+                        except FileNotFoundError:
+                            pass
+                        except OSError as e:
+                            self.logger.debug(f"Could not remove {path}: {e}")
+                removed += 1
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Segment counts and sizes per project"""
+        stats: Dict[str, Any] = {"projects": {}}
+        for project_name in self.projects():
+            segments = 0
+            size = 0
+            project_dir = os.path.join(self.base_dir, project_name)
+            for name in os.listdir(project_dir):
+                if name.endswith(SEGMENT_SUFFIX):
+                    segments += 1
+                try:
+                    size += os.path.getsize(os.path.join(project_dir, name))
+                except OSError:
+                    continue
+            stats["projects"][project_name] = {
+                "segments": segments,
+                "size_bytes": size,
+            }
+        return stats
+
+    def close(self):
+        self.flush()
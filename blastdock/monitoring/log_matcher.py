@@ -0,0 +1,258 @@
+"""
+Single-pass log line classification for BlastDock log analysis
+
+One token regex finds timestamps and level keywords in a single scan of the
+line, which yields the timestamp, its format, the log level and the cleaned
+message together. Log patterns are prefiltered on literal keywords derived
+from their regexes, so the common line that contains none of a pattern's
+keywords never runs that pattern's regex.
+"""
+
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, FrozenSet, List, NamedTuple, Optional, Pattern, Sequence, Tuple
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse
+
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Timestamps and level keywords, alternatives in the order they are tried
+TOKEN_RE = re.compile(
+    # 2023-12-01T10:30:45.123Z / 2023-12-01 10:30:45
+    r"(?P<dt>(?P<dt_seconds>\d{4}-\d{2}-\d{2}(?P<sep>[T ])\d{2}:\d{2}:\d{2})"
+    r"(?P<frac>\.\d{3})?(?P<utc>Z)?)\s*"
+    # Dec  1 10:30:45
+    r"|(?P<syslog>[A-Za-z]{3}\s+\d{1,2}\s+\d{2}:\d{2}:\d{2})\s*"
+    # [1701427845.123]
+    r"|\[(?P<unix>\d{10}(?:\.\d{3})?)\]\s*"
+    r"|\b(?P<level>(?i:TRACE|TRC|DEBUG|DBG|INFORMATION|INFO|WARNING|WARN"
+    r"|ERROR|ERR|FATAL|CRITICAL|CRIT))\b(?P<level_tail>:?\s*)"
+)
+
+# Docker compose "service | " prefix, stripped after tokens are removed
+SERVICE_PREFIX_RE = re.compile(r"^\w+\s*\|\s*")
+
+# Keyword -> (level name, precedence); lower precedence wins
+LEVEL_KEYWORDS = {
+    "FATAL": ("fatal", 0),
+    "CRIT": ("fatal", 0),
+    "CRITICAL": ("fatal", 0),
+    "ERROR": ("error", 1),
+    "ERR": ("error", 1),
+    "WARN": ("warn", 2),
+    "WARNING": ("warn", 2),
+    "INFO": ("info", 3),
+    "INFORMATION": ("info", 3),
+    "DEBUG": ("debug", 4),
+    "DBG": ("debug", 4),
+    "TRACE": ("trace", 5),
+    "TRC": ("trace", 5),
+}
+
+# Level keywords that are removed from the cleaned message
+REMOVED_LEVEL_KEYWORDS = frozenset(
+    ["TRACE", "DEBUG", "INFO", "WARN", "WARNING", "ERROR", "ERR", "FATAL"]
+    + ["CRIT", "CRITICAL"]
+)
+
+# Shortest keyword worth prefiltering on
+MIN_KEYWORD_LENGTH = 2
+
+
+class LineInfo(NamedTuple):
+    """Classification of one log line"""
+
+    timestamp: Optional[float]
+    timestamp_format: Optional[str]
+    level: str
+    message: str
+
+
+@lru_cache(maxsize=4096)
+def _iso_seconds(text: str, utc: bool) -> Optional[float]:
+    try:
+        if utc:
+            return datetime.fromisoformat(text + "+00:00").timestamp()
+        return datetime.fromisoformat(text).timestamp()
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _datetime_seconds(text: str) -> Optional[float]:
+    try:
+        return datetime.strptime(text, "%Y-%m-%d %H:%M:%S").timestamp()
+    except ValueError:
+        return None
+
+
+def classify_line(line: str) -> LineInfo:
+    """Timestamp, timestamp format, level and cleaned message in one scan"""
+    iso = dt = unix = None
+    syslog = False
+    level_name = "info"
+    level_rank = 99
+    pieces = []
+    position = 0
+
+    for match in TOKEN_RE.finditer(line):
+        kind = match.lastgroup  # outermost group of the matching alternative
+        if kind == "dt":
+            if match.group("sep") == "T":
+                if iso is None:
+                    iso = match
+            elif dt is None:
+                dt = match
+        elif kind == "syslog":
+            syslog = True
+        elif kind == "unix":
+            if unix is None:
+                unix = match.group("unix")
+        else:
+            keyword = match.group("level").upper()
+            name, rank = LEVEL_KEYWORDS[keyword]
+            if rank < level_rank:
+                level_name, level_rank = name, rank
+            if keyword not in REMOVED_LEVEL_KEYWORDS:
+                continue
+        pieces.append(line[position : match.start()])
+        position = match.end()
+
+    if position:
+        pieces.append(line[position:])
+        message = "".join(pieces)
+    else:
+        message = line
+    if "|" in message:
+        message = SERVICE_PREFIX_RE.sub("", message, count=1)
+
+    timestamp = None
+    timestamp_format = None
+    if iso is not None:
+        seconds = _iso_seconds(iso.group("dt_seconds"), iso.group("utc") is not None)
+        if seconds is not None:
+            frac = iso.group("frac")
+            timestamp = seconds + float(frac) if frac else seconds
+            timestamp_format = "iso"
+    if timestamp is None and dt is not None:
+        timestamp = _datetime_seconds(dt.group("dt_seconds"))
+        if timestamp is not None:
+            timestamp_format = "datetime"
+    if timestamp is None and unix is not None:
+        timestamp = float(unix)
+        timestamp_format = "unix"
+    if timestamp_format is None and syslog:
+        # Recognised but carries no year, so no usable timestamp
+        timestamp_format = "syslog"
+
+    return LineInfo(timestamp, timestamp_format, level_name, message.strip())
+
+
+def _sequence_keywords(items) -> Optional[FrozenSet[str]]:
+    """Literals of which every match of a parsed sequence contains one
+
+    Of the candidate sets found in the sequence, the one whose shortest
+    literal is longest is the most selective and is returned.
+    """
+    best: Optional[FrozenSet[str]] = None
+
+    def consider(candidate: Optional[FrozenSet[str]]):
+        nonlocal best
+        if not candidate:
+            return
+        score = min(len(k) for k in candidate)
+        if best is None or score > min(len(k) for k in best):
+            best = candidate
+
+    run = []
+    for op, arg in items:
+        if op is sre_parse.LITERAL:
+            run.append(chr(arg))
+            continue
+        if run:
+            consider(frozenset(["".join(run)]))
+            run = []
+        if op is sre_parse.SUBPATTERN:
+            _, add_flags, del_flags, sub = arg
+            if add_flags or del_flags:
+                return None  # scoped flags change how literals match
+            consider(_sequence_keywords(sub))
+        elif op is sre_parse.BRANCH:
+            branches = [_sequence_keywords(branch) for branch in arg[1]]
+            if all(branches):
+                consider(frozenset().union(*branches))
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and arg[0] >= 1:
+            consider(_sequence_keywords(arg[2]))
+    if run:
+        consider(frozenset(["".join(run)]))
+    return best
+
+
+def pattern_keywords(compiled: Pattern) -> Optional[FrozenSet[str]]:
+    """Keywords a string must contain one of to match ``compiled``
+
+    Keywords are lower-cased for case-insensitive patterns. Returns None
+    when no selective keyword set can be derived.
+    """
+    if not isinstance(compiled.pattern, str) or compiled.flags & re.VERBOSE:
+        return None
+    try:
+        keywords = _sequence_keywords(sre_parse.parse(compiled.pattern, compiled.flags))
+    except Exception:
+        return None
+    if not keywords or min(len(k) for k in keywords) < MIN_KEYWORD_LENGTH:
+        return None
+    if compiled.flags & re.IGNORECASE:
+        if not all(k.isascii() for k in keywords):
+            return None
+        keywords = frozenset(k.lower() for k in keywords)
+    return keywords
+
+
+class PatternMatcher:
+    """All log patterns matching a message, prefiltered on literal keywords
+
+    Each pattern's full regex only runs when the message contains one of
+    the keywords every match of that pattern must contain.
+    """
+
+    def __init__(self, patterns: Sequence[Any]):
+        self.patterns = list(patterns)
+        # (pattern, keywords, case-insensitive); keywords None = always search
+        self._filters: List[Tuple[Any, Optional[FrozenSet[str]], bool]] = []
+        for pattern in self.patterns:
+            compiled = pattern.pattern
+            self._filters.append(
+                (
+                    pattern,
+                    pattern_keywords(compiled),
+                    bool(compiled.flags & re.IGNORECASE),
+                )
+            )
+
+    def match(self, message: str) -> List[Any]:
+        """Patterns matching ``message``, in pattern order"""
+        lowered = None
+        hits = []
+        for pattern, keywords, ignore_case in self._filters:
+            if keywords is not None:
+                if ignore_case:
+                    if lowered is None:
+                        lowered = message.lower()
+                    text = lowered
+                else:
+                    text = message
+                for keyword in keywords:
+                    if keyword in text:
+                        break
+                else:
+                    continue
+            if pattern.pattern.search(message):
+                hits.append(pattern)
+        return hits
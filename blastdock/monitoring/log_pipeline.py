@@ -0,0 +1,210 @@
+"""
+Parallel log fetch and parse pipeline for BlastDock log analysis
+
+Container logs are fetched concurrently over a bounded thread pool, so a
+project with many replicas pays roughly one Docker round-trip instead of
+one per container. Large batches of lines are split into shards that are
+classified and pattern-matched in worker processes, away from the GIL.
+Per-container results are combined with a k-way heap merge on timestamp.
+"""
+
+import os
+import time
+import heapq
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..utils.logging import get_logger
+from .log_matcher import PatternMatcher, classify_line
+
+logger = get_logger(__name__)
+
+# (timestamp, level, message, container, indices of matching patterns)
+ParsedLine = Tuple[float, str, str, str, List[int]]
+
+# Worker-process cache of pattern matchers, keyed by pattern definitions
+_worker_matchers: Dict[Tuple, PatternMatcher] = {}
+
+
+def _matcher_for(patterns: List[Any]) -> Tuple[PatternMatcher, Dict[int, int]]:
+    key = tuple((p.name, p.pattern.pattern, p.pattern.flags) for p in patterns)
+    matcher = _worker_matchers.get(key)
+    if matcher is None:
+        _worker_matchers.clear()
+        matcher = _worker_matchers[key] = PatternMatcher(patterns)
+    return matcher, {id(p): i for i, p in enumerate(matcher.patterns)}
+
+
+def parse_log_shard(
+    lines: List[Tuple[Optional[float], str]],
+    container_name: str,
+    patterns: List[Any],
+) -> List[Optional[ParsedLine]]:
+    """Classify and pattern-match ``(docker_timestamp, line)`` pairs
+
+    Runs in worker processes as well as in-process; lines that fail to
+    parse come back as None.
+    """
+    matcher, positions = _matcher_for(patterns)
+    now = time.time()
+    parsed: List[Optional[ParsedLine]] = []
+    for docker_ts, line in lines:
+        try:
+            info = classify_line(line)
+            hits = [positions[id(p)] for p in matcher.match(info.message)]
+        except Exception:
+            parsed.append(None)
+            continue
+        parsed.append(
+            (
+                info.timestamp or docker_ts or now,
+                info.level,
+                info.message,
+                container_name,
+                hits,
+            )
+        )
+    return parsed
+
+
+def merge_by_timestamp(
+    sources: Iterable[Iterable[Any]],
+    key: Callable[[Any], float] = lambda item: item[0],
+    reverse: bool = False,
+) -> Iterator[Any]:
+    """K-way merge of per-container streams that are each in time order"""
+    return heapq.merge(*sources, key=key, reverse=reverse)
+
+
+class LogPipeline:
+    """Bounded fetch threads plus a lazily started parse process pool"""
+
+    def __init__(
+        self,
+        max_fetch_workers: int = 8,
+        shard_threshold: int = 20000,
+        shard_size: int = 10000,
+        max_processes: Optional[int] = None,
+    ):
+        self.max_fetch_workers = max_fetch_workers
+        self.shard_threshold = shard_threshold
+        self.shard_size = shard_size
+        self.max_processes = max_processes or min(4, os.cpu_count() or 1)
+        self.sharded_batches = 0
+
+        self._fetch_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._process_pool_failed = False
+        self._lock = threading.Lock()
+
+    def _fetch_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._fetch_pool is None:
+                self._fetch_pool = ThreadPoolExecutor(
+                    max_workers=self.max_fetch_workers, thread_name_prefix="log-fetch"
+                )
+            return self._fetch_pool
+
+    def _parse_executor(self) -> Optional[ProcessPoolExecutor]:
+        with self._lock:
+            if self._process_pool is None and not self._process_pool_failed:
+                try:
+                    # spawn: the analyzer shares the process with other threads
+                    self._process_pool = ProcessPoolExecutor(
+                        max_workers=self.max_processes,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                except Exception as e:
+                    logger.debug(f"Log parse process pool unavailable: {e}")
+                    self._process_pool_failed = True
+            return self._process_pool
+
+    def fetch(self, fetchers: Dict[str, Callable[[], Any]]) -> Dict[str, Any]:
+        """Run one fetch callable per container concurrently
+
+        Containers whose fetch raises are logged and left out of the result.
+        """
+        results: Dict[str, Any] = {}
+        if len(fetchers) <= 1:
+            for name, fetch in fetchers.items():
+                try:
+                    results[name] = fetch()
+                except Exception as e:
+                    logger.warning(f"Failed to get logs for container {name}: {e}")
+            return results
+
+        executor = self._fetch_executor()
+        futures = {name: executor.submit(fetch) for name, fetch in fetchers.items()}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                logger.warning(f"Failed to get logs for container {name}: {e}")
+        return results
+
+    def parse(
+        self,
+        batches: Dict[str, List[Tuple[Optional[float], str]]],
+        patterns: List[Any],
+    ) -> Dict[str, List[Optional[ParsedLine]]]:
+        """Parse every container's lines, in worker processes when large"""
+        total = sum(len(lines) for lines in batches.values())
+        executor = self._parse_executor() if total >= self.shard_threshold else None
+        if executor is None:
+            return {
+                name: parse_log_shard(lines, name, patterns)
+                for name, lines in batches.items()
+            }
+
+        futures = {
+            name: [
+                executor.submit(
+                    parse_log_shard,
+                    lines[start : start + self.shard_size],
+                    name,
+                    patterns,
+                )
+                for start in range(0, len(lines), self.shard_size)
+            ]
+            for name, lines in batches.items()
+        }
+        self.sharded_batches += 1
+
+        parsed: Dict[str, List[Optional[ParsedLine]]] = {}
+        for name, shard_futures in futures.items():
+            lines = batches[name]
+            results: List[Optional[ParsedLine]] = []
+            for index, future in enumerate(shard_futures):
+                try:
+                    results.extend(future.result())
+                except Exception as e:
+                    # Broken pool (e.g. workers cannot start): parse here
+                    logger.debug(f"Log parse shard failed, parsing in-process: {e}")
+                    start = index * self.shard_size
+                    results.extend(
+                        parse_log_shard(
+                            lines[start : start + self.shard_size], name, patterns
+                        )
+                    )
+                    self._discard_process_pool()
+            parsed[name] = results
+        return parsed
+
+    def _discard_process_pool(self):
+        with self._lock:
+            pool, self._process_pool = self._process_pool, None
+            self._process_pool_failed = True
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    def shutdown(self):
+        """Stop the fetch threads and parse processes"""
+        with self._lock:
+            fetch_pool, self._fetch_pool = self._fetch_pool, None
+            process_pool, self._process_pool = self._process_pool, None
+        if fetch_pool is not None:
+            fetch_pool.shutdown(wait=False)
+        if process_pool is not None:
+            process_pool.shutdown(wait=False)
@@ -0,0 +1,387 @@
+"""
+Incremental log streams for BlastDock log analysis
+
+Follows each container's log output with a ``since`` cursor and folds newly
+read lines into hourly aggregate buckets (line and level counts, pattern
+hits, error message counters and significant events). A re-analysis reads
+and parses only the lines written since the previous one; the analysis
+result is assembled from the buckets inside the requested time window.
+"""
+
+import time
+import calendar
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from ..utils.logging import get_logger
+from .log_archive import ArchivedLine
+from .log_pipeline import merge_by_timestamp
+
+logger = get_logger(__name__)
+
+BUCKET_SECONDS = 3600
+MAX_BUCKET_EVENTS = 5
+MAX_BUCKET_ERROR_MESSAGES = 500
+SIGNIFICANT_SEVERITY = 7
+
+# Marker for a restored cursor's unknown set of lines at its timestamp
+_SEEN_ALL: set = set()
+
+
+def split_lines(chunks: Iterable[Any]) -> Iterator[str]:
+    """Decoded, non-blank lines from a stream of log chunks
+
+    Chunks do not have to end on line boundaries (TTY containers stream
+    arbitrary slices of output).
+    """
+    pending = ""
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode("utf-8", errors="replace")
+        pending += chunk
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            line = line.rstrip("\r")
+            if line.strip():
+                yield line
+    if pending.strip():
+        yield pending.rstrip("\r")
+
+
+def parse_docker_timestamp(value: str) -> Optional[int]:
+    """Nanoseconds since the epoch of a Docker RFC3339Nano timestamp"""
+    if len(value) < 20 or value[10] != "T" or not value.endswith("Z"):
+        return None
+    try:
+        seconds = calendar.timegm(time.strptime(value[:19], "%Y-%m-%dT%H:%M:%S"))
+    except ValueError:
+        return None
+    fraction = value[20:-1] if value[19] == "." else ""
+    if fraction and not fraction.isdigit():
+        return None
+    return seconds * 1_000_000_000 + int((fraction + "000000000")[:9])
+
+
+def split_docker_timestamp(line: str) -> Tuple[Optional[int], str]:
+    """Split the ``timestamps=True`` prefix off a log line"""
+    prefix, sep, rest = line.partition(" ")
+    if sep:
+        ts_ns = parse_docker_timestamp(prefix)
+        if ts_ns is not None:
+            return ts_ns, rest
+    return None, line
+
+
+class ContainerLogCursor:
+    """Read position in one container's log stream"""
+
+    def __init__(self, container_name: str):
+        self.container_name = container_name
+        self.last_ns = 0
+        self.lines_read = 0
+        self._seen_at_last: set = set()
+        self._since_fallback: Optional[int] = None
+
+    def restore(self, last_ns: int):
+        """Resume after a persisted position; lines at it were already read"""
+        self.last_ns = last_ns
+        # Nanosecond resolution: treat every line at the cursor as seen
+        self._seen_at_last = _SEEN_ALL
+
+    def read(
+        self, docker_client, tail: Optional[int] = None, since: Optional[float] = None
+    ) -> Iterator[Tuple[Optional[float], str]]:
+        """New ``(docker_timestamp, line)`` pairs since the previous read
+
+        The first read is bounded by ``tail``/``since``; later reads resume
+        from the last timestamp seen. Docker's ``since`` has one-second
+        granularity, so lines at or before the cursor are skipped here.
+        """
+        container = docker_client.get_container_by_name(self.container_name)
+        if container is None:
+            return
+
+        params: Dict[str, Any] = {
+            "stdout": True,
+            "stderr": True,
+            "timestamps": True,
+            "stream": True,
+            "follow": False,
+        }
+        if self.last_ns:
+            # A cursor restored from the archive may predate the window
+            params["since"] = max(self.last_ns // 1_000_000_000, int(since or 0))
+        elif self._since_fallback is not None:
+            params["since"] = self._since_fallback
+        else:
+            if tail is not None:
+                params["tail"] = max(1, int(tail))
+            if since is not None:
+                params["since"] = max(0, int(since))
+
+        fetched_at = int(time.time())
+        output = container.logs(**params)
+        if isinstance(output, (bytes, str)):
+            output = [output]
+
+        saw_timestamp = False
+        for line in split_lines(output):
+            ts_ns, text = split_docker_timestamp(line)
+            if ts_ns is None:
+                self.lines_read += 1
+                yield None, text
+                continue
+
+            saw_timestamp = True
+            if ts_ns < self.last_ns:
+                continue
+            if ts_ns == self.last_ns:
+                if self._seen_at_last is _SEEN_ALL or text in self._seen_at_last:
+                    continue
+            else:
+                self.last_ns = ts_ns
+                self._seen_at_last = set()
+            self._seen_at_last.add(text)
+            self.lines_read += 1
+            yield ts_ns / 1_000_000_000, text
+
+        if not saw_timestamp and not self.last_ns:
+            # Daemon did not prefix timestamps: resume from the fetch time
+            self._since_fallback = fetched_at
+
+
+@dataclass
+class LogBucket:
+    """Aggregates of the log lines in one hour"""
+
+    start: int
+    lines: int = 0
+    parsed: int = 0
+    levels: Counter = field(default_factory=Counter)
+    patterns: Counter = field(default_factory=Counter)
+    error_messages: Counter = field(default_factory=Counter)
+    error_total: int = 0
+    events: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class LogAggregates:
+    """Running hourly aggregates of parsed log entries"""
+
+    def __init__(self, retention_hours: int = 24):
+        self.retention_hours = retention_hours
+        self.buckets: Dict[int, LogBucket] = {}
+
+    def _bucket(self, timestamp: float) -> LogBucket:
+        start = int(timestamp // BUCKET_SECONDS) * BUCKET_SECONDS
+        bucket = self.buckets.get(start)
+        if bucket is None:
+            bucket = self.buckets[start] = LogBucket(start)
+        return bucket
+
+    def add(self, entry, matched_patterns: Iterable[Any]):
+        """Fold one parsed entry and the patterns it matched into its bucket"""
+        self.add_fields(
+            entry.timestamp,
+            entry.level.value,
+            entry.message,
+            entry.container,
+            matched_patterns,
+        )
+
+    def add_fields(
+        self,
+        timestamp: float,
+        level: str,
+        message: str,
+        container: str,
+        matched_patterns: Iterable[Any],
+    ):
+        """Fold one parsed line, given as fields, into its bucket"""
+        bucket = self._bucket(timestamp)
+        bucket.lines += 1
+        bucket.parsed += 1
+        bucket.levels[level] += 1
+
+        if level in ("error", "fatal"):
+            bucket.error_total += 1
+            messages = bucket.error_messages
+            if message in messages or len(messages) < MAX_BUCKET_ERROR_MESSAGES:
+                messages[message] += 1
+
+        for pattern in matched_patterns:
+            bucket.patterns[pattern.name] += 1
+            if (
+                pattern.severity >= SIGNIFICANT_SEVERITY
+                and len(bucket.events) < MAX_BUCKET_EVENTS
+            ):
+                bucket.events.append(
+                    {
+                        "pattern": pattern.name,
+                        "message": message[:100],
+                        "container": container,
+                        "timestamp": timestamp,
+                    }
+                )
+
+    def add_unparsed(self, timestamp: float):
+        self._bucket(timestamp).lines += 1
+
+    def window(self, cutoff: float) -> List[LogBucket]:
+        """Buckets overlapping ``[cutoff, now]``, oldest first"""
+        return [
+            self.buckets[start]
+            for start in sorted(self.buckets)
+            if start + BUCKET_SECONDS > cutoff
+        ]
+
+    def expire(self, now: Optional[float] = None):
+        """Drop buckets older than the retention period"""
+        cutoff = (now or time.time()) - self.retention_hours * BUCKET_SECONDS
+        for start in [s for s in self.buckets if s + BUCKET_SECONDS <= cutoff]:
+            del self.buckets[start]
+
+
+class ProjectLogStream:
+    """Log cursors of a project's containers feeding shared aggregates"""
+
+    def __init__(self, project_name: str, retention_hours: int = 24):
+        self.project_name = project_name
+        self.cursors: Dict[str, ContainerLogCursor] = {}
+        self.aggregates = LogAggregates(retention_hours)
+        self.updates = 0
+        self.ingested = 0
+        self.lock = threading.RLock()
+
+    def update(
+        self,
+        pipeline,
+        docker_client,
+        container_names: List[str],
+        tail_lines: int,
+        window_hours: int,
+        patterns: List[Any],
+        archive=None,
+    ) -> int:
+        """Read new lines from every container; returns the number ingested
+
+        Containers are read concurrently through ``pipeline`` (a
+        LogPipeline), and their parsed lines are folded in timestamp order.
+        With an ``archive`` (a LogArchive) the lines and cursors are also
+        persisted.
+        """
+        with self.lock:
+            if window_hours > self.aggregates.retention_hours:
+                self.aggregates.retention_hours = window_hours
+
+            for name in list(self.cursors):
+                if name not in container_names:
+                    del self.cursors[name]
+            for name in container_names:
+                if name not in self.cursors:
+                    self.cursors[name] = ContainerLogCursor(name)
+
+            since = time.time() - self.aggregates.retention_hours * BUCKET_SECONDS
+            per_container = max(1, tail_lines // max(1, len(container_names)))
+            batches = pipeline.fetch(
+                {
+                    name: partial(
+                        _read_all,
+                        self.cursors[name],
+                        docker_client,
+                        per_container,
+                        since,
+                    )
+                    for name in container_names
+                }
+            )
+            parsed = pipeline.parse(batches, patterns)
+
+            ingested = 0
+            archived: List[ArchivedLine] = []
+            unparsed_at = time.time()
+            for item in merge_by_timestamp(
+                [lines for lines in parsed.values()],
+                key=lambda item: item[0] if item is not None else unparsed_at,
+            ):
+                ingested += 1
+                if item is None:
+                    self.aggregates.add_unparsed(unparsed_at)
+                    continue
+                timestamp, level, message, container, hits = item
+                matched = [patterns[i] for i in hits]
+                self.aggregates.add_fields(
+                    timestamp, level, message, container, matched
+                )
+                if archive is not None:
+                    archived.append(
+                        ArchivedLine(
+                            timestamp,
+                            level,
+                            container,
+                            message,
+                            [pattern.name for pattern in matched],
+                        )
+                    )
+
+            if archive is not None:
+                try:
+                    archive.append(self.project_name, archived)
+                    archive.flush()
+                    archive.save_cursors(
+                        self.project_name,
+                        {
+                            name: cursor.last_ns
+                            for name, cursor in self.cursors.items()
+                            if cursor.last_ns
+                        },
+                    )
+                except OSError as e:
+                    logger.warning(
+                        f"Failed to archive logs for {self.project_name}: {e}"
+                    )
+
+            self.aggregates.expire()
+            self.updates += 1
+            self.ingested += ingested
+            return ingested
+
+    def seed(self, archive, patterns: List[Any]) -> int:
+        """Restore cursors and aggregates of the window from an archive
+
+        Returns the number of archived lines folded in.
+        """
+        with self.lock:
+            for name, last_ns in archive.load_cursors(self.project_name).items():
+                cursor = self.cursors.setdefault(name, ContainerLogCursor(name))
+                cursor.restore(last_ns)
+
+            by_name = {pattern.name: pattern for pattern in patterns}
+            since = time.time() - self.aggregates.retention_hours * BUCKET_SECONDS
+            seeded = 0
+            for line in archive.query(self.project_name, start=since):
+                self.aggregates.add_fields(
+                    line.timestamp,
+                    line.level,
+                    line.message,
+                    line.container,
+                    [
+                        by_name.get(name) or ArchivedPattern(name)
+                        for name in line.patterns
+                    ],
+                )
+                seeded += 1
+            return seeded
+
+
+class ArchivedPattern(NamedTuple):
+    """Pattern recorded in the archive that is no longer configured"""
+
+    name: str
+    severity: int = 0
+
+
+def _read_all(cursor: ContainerLogCursor, docker_client, tail, since) -> List:
+    return list(cursor.read(docker_client, tail, since))
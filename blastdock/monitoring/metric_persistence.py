@@ -0,0 +1,627 @@
+"""
+On-disk time-series persistence for BlastDock metrics
+
+Samples are appended as fixed-size binary records to time-partitioned
+segment files under ``<data_dir>/metrics``, with automatic rollup tiers
+(raw -> 1m -> 1h). Reads memory-map only the segments overlapping the
+requested range and stream records from them, so exports and dashboards
+never load a whole series into memory.
+
+Several processes may write to one store: series ids are allocated under a
+file lock, flushes re-check segment order on disk, and buffered samples and
+open rollup buckets are flushed when the process exits.
+"""
+
+import os
+import re
+import json
+import mmap
+import atexit
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from ..utils.logging import get_logger
+from .metric_store import label_key
+
+logger = get_logger(__name__)
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# timestamp, series id, value
+RAW_RECORD = struct.Struct("<dId")
+# bucket start, series id, count, sum, min, max
+ROLLUP_RECORD = struct.Struct("<dIIddd")
+
+SEGMENT_SUFFIX = ".seg"
+# Samples older than the newest record of their segment go to a side file
+# that is scanned linearly, keeping the main segment sorted for bisection
+UNORDERED_SUFFIX = ".ooo"
+
+
+@dataclass(frozen=True)
+class StorageTier:
+    """One resolution level of the metrics store"""
+
+    name: str
+    resolution: int  # bucket width in seconds, 0 for raw samples
+    segment_seconds: int
+    retention_seconds: int
+
+    @property
+    def record(self) -> struct.Struct:
+        return RAW_RECORD if self.resolution == 0 else ROLLUP_RECORD
+
+
+DEFAULT_TIERS = (
+    StorageTier("raw", 0, 3600, 2 * 86400),
+    StorageTier("1m", 60, 86400, 14 * 86400),
+    StorageTier("1h", 3600, 30 * 86400, 365 * 86400),
+)
+
+
+def _safe_name(metric_name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", metric_name)
+
+
+def _merge_bucket(
+    buckets: Dict[float, list],
+    start: float,
+    count: int,
+    total: float,
+    minimum: float,
+    maximum: float,
+):
+    """Combine a rollup record into the bucket aggregated so far"""
+    merged = buckets.get(start)
+    if merged is None:
+        buckets[start] = [count, total, minimum, maximum]
+    else:
+        merged[0] += count
+        merged[1] += total
+        merged[2] = min(merged[2], minimum)
+        merged[3] = max(merged[3], maximum)
+
+
+# Stores flushed when the interpreter exits; ``close()`` removes a store
+_open_stores: Set["MetricsDiskStore"] = set()
+
+
+@atexit.register
+def _close_open_stores():
+    for store in list(_open_stores):
+        try:
+            store.close()
+        except Exception as e:
+            logger.debug(f"Failed to flush metrics at exit: {e}")
+
+
+class MetricsDiskStore:
+    """Append-only, segment-based metrics store with rollup tiers"""
+
+    def __init__(
+        self,
+        base_dir: str,
+        tiers: Tuple[StorageTier, ...] = DEFAULT_TIERS,
+        flush_threshold: int = 2048,
+        flush_interval: float = 5.0,
+    ):
+        self.logger = get_logger(__name__)
+        self.base_dir = base_dir
+        self.tiers = tiers
+        self.flush_threshold = flush_threshold
+        self.flush_interval = flush_interval
+        os.makedirs(self.base_dir, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._series: Dict[int, Tuple[str, Dict[str, str]]] = {}
+        self._series_ids: Dict[Tuple[str, tuple], int] = {}
+        self._series_log = os.path.join(self.base_dir, "series.jsonl")
+        self._series_offset = 0
+
+        self._pending: Dict[str, bytearray] = {}
+        self._pending_records = 0
+        self._last_flush = time.time()
+        self._segment_last_ts: Dict[str, float] = {}
+        # (tier name, series id) -> [bucket start, count, sum, min, max]
+        self._open_buckets: Dict[Tuple[str, int], list] = {}
+
+        self._load_series()
+        _open_stores.add(self)
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive lock on the store across processes"""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.base_dir, ".lock"), "a+") as handle:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    # Series registry
+
+    def _load_series(self):
+        """Read registry lines other processes appended since the last read"""
+        try:
+            with open(self._series_log, "rb") as f:
+                f.seek(self._series_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            try:
+                entry = json.loads(line)
+                labels = entry.get("labels") or {}
+                self._series[entry["id"]] = (entry["metric"], labels)
+                self._series_ids[(entry["metric"], label_key(labels))] = entry["id"]
+            except (ValueError, KeyError, AttributeError) as e:
+                self.logger.debug(f"Skipping bad series registry line: {e}")
+        self._series_offset += end
+
+    def _series_id(self, metric_name: str, labels: Optional[Dict[str, str]]) -> int:
+        key = (metric_name, label_key(labels))
+        series_id = self._series_ids.get(key)
+        if series_id is not None:
+            return series_id
+        with self._file_lock():
+            # Another process may have registered the series, or taken ids
+            self._load_series()
+            series_id = self._series_ids.get(key)
+            if series_id is None:
+                series_id = max(self._series, default=0) + 1
+                stored_labels = dict(key[1])
+                line = json.dumps(
+                    {"id": series_id, "metric": metric_name, "labels": stored_labels}
+                )
+                with open(self._series_log, "ab") as f:
+                    if os.fstat(f.fileno()).st_size > self._series_offset:
+                        # Terminate a line left partial by a crashed writer
+                        line = "\n" + line
+                    f.write((line + "\n").encode("utf-8"))
+                self._load_series()
+        return series_id
+
+    def _matching_series(
+        self, metric_name: str, labels: Optional[Dict[str, str]]
+    ) -> Dict[int, Dict[str, str]]:
+        with self._lock:
+            self._load_series()
+            return {
+                series_id: series_labels
+                for series_id, (name, series_labels) in self._series.items()
+                if name == metric_name
+                and all(
+                    series_labels.get(str(k)) == str(v)
+                    for k, v in (labels or {}).items()
+                )
+            }
+
+    # Writes
+
+    def _segment_path(self, tier: StorageTier, metric_name: str, ts: float) -> str:
+        segment_start = int(ts - ts % tier.segment_seconds)
+        return os.path.join(
+            self.base_dir,
+            tier.name,
+            _safe_name(metric_name),
+            f"{segment_start:012d}{SEGMENT_SUFFIX}",
+        )
+
+    def _last_timestamp(self, path: str, record: struct.Struct) -> float:
+        last = self._segment_last_ts.get(path)
+        if last is None:
+            last = float("-inf")
+            try:
+                size = os.path.getsize(path)
+                if size >= record.size:
+                    with open(path, "rb") as f:
+                        f.seek(size - size % record.size - record.size)
+                        last = record.unpack(f.read(record.size))[0]
+            except OSError:
+                pass
+            self._segment_last_ts[path] = last
+        return last
+
+    def _queue(self, tier: StorageTier, metric_name: str, ts: float, data: bytes):
+        path = self._segment_path(tier, metric_name, ts)
+        last = self._last_timestamp(path, tier.record)
+        if ts < last:
+            path = path[: -len(SEGMENT_SUFFIX)] + UNORDERED_SUFFIX
+        else:
+            self._segment_last_ts[path] = ts
+        self._pending.setdefault(path, bytearray()).extend(data)
+        self._pending_records += 1
+
+    def append(
+        self,
+        metric_name: str,
+        value: float,
+        timestamp: float,
+        labels: Optional[Dict[str, str]] = None,
+    ):
+        """Buffer a raw sample and roll it into the aggregate tiers"""
+        with self._lock:
+            series_id = self._series_id(metric_name, labels)
+            value = float(value)
+            for tier in self.tiers:
+                if tier.resolution == 0:
+                    self._queue(
+                        tier,
+                        metric_name,
+                        timestamp,
+                        RAW_RECORD.pack(timestamp, series_id, value),
+                    )
+                else:
+                    self._roll_up(tier, metric_name, series_id, timestamp, value)
+
+            if (
+                self._pending_records >= self.flush_threshold
+                or time.time() - self._last_flush >= self.flush_interval
+            ):
+                self.flush()
+
+    def _roll_up(
+        self,
+        tier: StorageTier,
+        metric_name: str,
+        series_id: int,
+        timestamp: float,
+        value: float,
+    ):
+        bucket_start = timestamp - timestamp % tier.resolution
+        key = (tier.name, series_id)
+        bucket = self._open_buckets.get(key)
+        if bucket is not None and bucket[0] != bucket_start:
+            self._emit_bucket(tier, metric_name, series_id, bucket)
+            bucket = None
+        if bucket is None:
+            self._open_buckets[key] = [bucket_start, 1, value, value, value]
+        else:
+            bucket[1] += 1
+            bucket[2] += value
+            bucket[3] = min(bucket[3], value)
+            bucket[4] = max(bucket[4], value)
+
+    def _emit_bucket(
+        self, tier: StorageTier, metric_name: str, series_id: int, bucket: list
+    ):
+        start, count, total, minimum, maximum = bucket
+        self._queue(
+            tier,
+            metric_name,
+            start,
+            ROLLUP_RECORD.pack(start, series_id, count, total, minimum, maximum),
+        )
+
+    def flush(self, close_buckets: bool = False):
+        """Write buffered records; optionally close open rollup buckets
+
+        Closed buckets that receive more samples later are written again;
+        readers merge records sharing a bucket.
+        """
+        with self._lock:
+            if close_buckets:
+                tiers = {tier.name: tier for tier in self.tiers}
+                for (tier_name, series_id), bucket in self._open_buckets.items():
+                    metric_name = self._series[series_id][0]
+                    self._emit_bucket(tiers[tier_name], metric_name, series_id, bucket)
+                self._open_buckets.clear()
+
+            self._last_flush = time.time()
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            self._pending_records = 0
+            with self._file_lock():
+                for path, data in pending.items():
+                    try:
+                        os.makedirs(os.path.dirname(path), exist_ok=True)
+                        for target, chunk in self._place(path, data):
+                            with open(target, "ab") as f:
+                                f.write(chunk)
+                    except OSError as e:
+                        self.logger.error(
+                            f"Failed to write metrics segment {path}: {e}"
+                        )
+
+    def _place(self, path: str, data: bytearray) -> List[Tuple[str, bytes]]:
+        """Split buffered records between a segment and its unordered file
+
+        Records queued for an ordered segment are sorted among themselves,
+        but another process may have appended newer ones since; those older
+        than the segment's last record on disk go to the side file.
+        """
+        if not path.endswith(SEGMENT_SUFFIX):
+            return [(path, bytes(data))]
+        tier_name = os.path.relpath(path, self.base_dir).split(os.sep)[0]
+        record = self._tier(tier_name).record
+        self._segment_last_ts.pop(path, None)
+        last = self._last_timestamp(path, record)
+        split = 0
+        while split < len(data) and record.unpack_from(data, split)[0] < last:
+            split += record.size
+
+        placed = []
+        if split:
+            unordered = path[: -len(SEGMENT_SUFFIX)] + UNORDERED_SUFFIX
+            placed.append((unordered, bytes(data[:split])))
+        if split < len(data):
+            placed.append((path, bytes(data[split:])))
+            self._segment_last_ts[path] = record.unpack_from(
+                data, len(data) - record.size
+            )[0]
+        return placed
+
+    # Reads
+
+    def _segments(
+        self,
+        tier: StorageTier,
+        metric_name: str,
+        start_time: Optional[float],
+        end_time: Optional[float],
+    ) -> List[Tuple[str, bool]]:
+        """(path, ordered) for segments overlapping the time range"""
+        directory = os.path.join(self.base_dir, tier.name, _safe_name(metric_name))
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return []
+
+        segments = []
+        for name in names:
+            stem, suffix = os.path.splitext(name)
+            if suffix not in (SEGMENT_SUFFIX, UNORDERED_SUFFIX) or not stem.isdigit():
+                continue
+            segment_start = int(stem)
+            if end_time is not None and segment_start > end_time:
+                continue
+            if (
+                start_time is not None
+                and segment_start + tier.segment_seconds <= start_time
+            ):
+                continue
+            segments.append(
+                (
+                    segment_start,
+                    os.path.join(directory, name),
+                    suffix == SEGMENT_SUFFIX,
+                )
+            )
+        return [(path, ordered) for _, path, ordered in sorted(segments)]
+
+    def _scan_segment(
+        self,
+        path: str,
+        record: struct.Struct,
+        ordered: bool,
+        start_time: Optional[float],
+        end_time: Optional[float],
+    ) -> Iterator[tuple]:
+        """Stream records of one segment within the range via mmap"""
+        try:
+            f = open(path, "rb")
+        except OSError:
+            return
+        with f:
+            count = os.fstat(f.fileno()).st_size // record.size
+            if not count:
+                return
+            with mmap.mmap(
+                f.fileno(), count * record.size, access=mmap.ACCESS_READ
+            ) as mapped:
+                index = 0
+                if ordered and start_time is not None:
+                    lo, hi = 0, count
+                    while lo < hi:
+                        mid = (lo + hi) // 2
+                        if (
+                            record.unpack_from(mapped, mid * record.size)[0]
+                            < start_time
+                        ):
+                            lo = mid + 1
+                        else:
+                            hi = mid
+                    index = lo
+                for position in range(index, count):
+                    entry = record.unpack_from(mapped, position * record.size)
+                    if end_time is not None and entry[0] > end_time:
+                        if ordered:
+                            break
+                        continue
+                    if start_time is not None and entry[0] < start_time:
+                        continue
+                    yield entry
+
+    def _tier(self, name: str) -> StorageTier:
+        for tier in self.tiers:
+            if tier.name == name:
+                return tier
+        raise ValueError(f"Unknown metrics tier '{name}'")
+
+    def select_tier(
+        self,
+        start_time: Optional[float],
+        end_time: Optional[float] = None,
+        max_points: Optional[int] = None,
+    ) -> StorageTier:
+        """Finest tier whose retention covers start_time
+
+        With ``max_points`` the tier must also keep a series over the range
+        to at most that many records (raw samples count as one per second).
+        Without a start time that is the raw tier, or the coarsest one when
+        the points are limited, as the span is unknown.
+        """
+        if start_time is None:
+            return self.tiers[-1] if max_points is not None else self.tiers[0]
+        now = time.time()
+        span = (end_time if end_time is not None else now) - start_time
+        for tier in self.tiers:
+            if now - start_time > tier.retention_seconds:
+                continue
+            if max_points is not None and span / max(tier.resolution, 1) > max_points:
+                continue
+            return tier
+        return self.tiers[-1]
+
+    def query(
+        self,
+        metric_name: str,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        labels: Optional[Dict[str, str]] = None,
+    ) -> Iterator[Tuple[Dict[str, str], float, float]]:
+        """Stream raw (labels, timestamp, value) samples in segment order"""
+        series = self._matching_series(metric_name, labels)
+        if not series:
+            return
+        self.flush()
+        tier = self._tier("raw")
+        for path, ordered in self._segments(tier, metric_name, start_time, end_time):
+            for ts, series_id, value in self._scan_segment(
+                path, RAW_RECORD, ordered, start_time, end_time
+            ):
+                series_labels = series.get(series_id)
+                if series_labels is not None:
+                    yield series_labels, ts, value
+
+    def query_rollup(
+        self,
+        metric_name: str,
+        tier_name: str,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        labels: Optional[Dict[str, str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Aggregated buckets per series from a rollup tier"""
+        tier = self._tier(tier_name)
+        if tier.resolution == 0:
+            raise ValueError("query_rollup needs an aggregate tier")
+        series = self._matching_series(metric_name, labels)
+        if not series:
+            return []
+        self.flush()
+
+        buckets: Dict[int, Dict[float, list]] = {}
+        for path, ordered in self._segments(tier, metric_name, start_time, end_time):
+            for ts, series_id, count, total, minimum, maximum in self._scan_segment(
+                path, ROLLUP_RECORD, ordered, start_time, end_time
+            ):
+                if series_id in series:
+                    _merge_bucket(
+                        buckets.setdefault(series_id, {}),
+                        ts,
+                        count,
+                        total,
+                        minimum,
+                        maximum,
+                    )
+
+        # Include buckets still accumulating in memory
+        with self._lock:
+            for (open_tier, series_id), bucket in self._open_buckets.items():
+                if open_tier != tier.name or series_id not in series:
+                    continue
+                ts = bucket[0]
+                if (start_time is not None and ts < start_time) or (
+                    end_time is not None and ts > end_time
+                ):
+                    continue
+                _merge_bucket(buckets.setdefault(series_id, {}), *bucket)
+
+        return [
+            {
+                "labels": dict(series[series_id]),
+                "points": [
+                    {
+                        "timestamp": ts,
+                        "avg": total / count if count else 0.0,
+                        "min": minimum,
+                        "max": maximum,
+                        "count": count,
+                    }
+                    for ts, (count, total, minimum, maximum) in sorted(
+                        per_series.items()
+                    )
+                ],
+            }
+            for series_id, per_series in buckets.items()
+        ]
+
+    def latest(
+        self,
+        metric_name: str,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+    ) -> Dict[tuple, Tuple[Dict[str, str], float, float]]:
+        """Latest raw sample of each series within a range"""
+        latest: Dict[tuple, Tuple[Dict[str, str], float, float]] = {}
+        for series_labels, ts, value in self.query(metric_name, start_time, end_time):
+            key = label_key(series_labels)
+            current = latest.get(key)
+            if current is None or ts >= current[1]:
+                latest[key] = (series_labels, ts, value)
+        return latest
+
+    def metric_names(self) -> List[str]:
+        with self._lock:
+            return sorted({name for name, _ in self._series.values()})
+
+    # Maintenance
+
+    def enforce_retention(self) -> int:
+        """Delete segments entirely older than their tier's retention"""
+        removed = 0
+        now = time.time()
+        with self._lock:
+            for tier in self.tiers:
+                tier_dir = os.path.join(self.base_dir, tier.name)
+                if not os.path.isdir(tier_dir):
+                    continue
+                cutoff = now - tier.retention_seconds
+                for metric_dir in os.listdir(tier_dir):
+                    for path, _ in self._segments(
+                        tier, metric_dir, None, cutoff - tier.segment_seconds
+                    ):
+                        segment_start = int(os.path.splitext(os.path.basename(path))[0])
+                        if segment_start + tier.segment_seconds > cutoff:
+                            continue
+                        try:
+                            os.unlink(path)
+                            self._segment_last_ts.pop(path, None)
+                            removed += 1
+                        except OSError as e:
+                            self.logger.debug(f"Could not remove segment {path}: {e}")
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Segment counts and sizes per tier"""
+        stats: Dict[str, Any] = {"series": len(self._series), "tiers": {}}
+        for tier in self.tiers:
+            segments = 0
+            size = 0
+            for root, _, files in os.walk(os.path.join(self.base_dir, tier.name)):
+                for name in files:
+                    try:
+                        size += os.path.getsize(os.path.join(root, name))
+                        segments += 1
+                    except OSError:
+                        continue
+            stats["tiers"][tier.name] = {"segments": segments, "size_bytes": size}
+        return stats
+
+    def close(self):
+        self.flush(close_buckets=True)
+        _open_stores.discard(self)
@@ -0,0 +1,229 @@
+"""
+Columnar in-memory storage for BlastDock metric series
+
+Each (metric, label set) pair gets its own preallocated ring buffer of
+``array('d')`` timestamps and values, and label sets are interned so every
+sample of a series shares one labels dict. Time-window reads are bisected
+slices of the buffers rather than per-point filtering.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, List, Optional, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def label_key(labels: Optional[Dict[str, str]]) -> LabelKey:
+    """Canonical hashable form of a label set"""
+    if not labels:
+        return ()
+    return tuple(sorted((str(k), str(v)) for k, v in labels.items()))
+
+
+class LabelInterner:
+    """Shares one labels dict per distinct label set"""
+
+    def __init__(self):
+        self._labels: Dict[LabelKey, Dict[str, str]] = {}
+
+    def intern(
+        self, labels: Optional[Dict[str, str]]
+    ) -> Tuple[LabelKey, Dict[str, str]]:
+        key = label_key(labels)
+        shared = self._labels.get(key)
+        if shared is None:
+            shared = self._labels[key] = dict(key)
+        return key, shared
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+
+class RingBuffer:
+    """Fixed-capacity ring of (timestamp, value) doubles"""
+
+    __slots__ = ("capacity", "timestamps", "values", "_start", "_size", "_ordered")
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("Ring buffer capacity must be positive")
+        self.capacity = capacity
+        self.timestamps = array("d", bytes(8 * capacity))
+        self.values = array("d", bytes(8 * capacity))
+        self._start = 0
+        self._size = 0
+        # Bisected reads need timestamps in append order to be non-decreasing
+        self._ordered = True
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, timestamp: float, value: float):
+        if self._size and timestamp < self.timestamps[self._physical(self._size - 1)]:
+            self._ordered = False
+        if self._size < self.capacity:
+            index = self._physical(self._size)
+            self._size += 1
+        else:
+            index = self._start
+            self._start = (self._start + 1) % self.capacity
+        self.timestamps[index] = timestamp
+        self.values[index] = float(value)
+
+    def _physical(self, logical: int) -> int:
+        return (self._start + logical) % self.capacity
+
+    def _segments(self) -> List[Tuple[int, int]]:
+        """Physical index ranges of the contents, oldest first"""
+        end = self._start + self._size
+        if end <= self.capacity:
+            return [(self._start, end)]
+        return [(self._start, self.capacity), (0, end - self.capacity)]
+
+    def latest(self) -> Optional[Tuple[float, float]]:
+        if not self._size:
+            return None
+        index = self._physical(self._size - 1)
+        return self.timestamps[index], self.values[index]
+
+    def earliest(self) -> Optional[float]:
+        """Oldest timestamp held"""
+        if not self._size:
+            return None
+        if self._ordered:
+            return self.timestamps[self._start]
+        return min(self.window()[0])
+
+    def window(
+        self, start_time: Optional[float] = None, end_time: Optional[float] = None
+    ) -> Tuple[array, array]:
+        """Timestamps and values within [start_time, end_time], oldest first"""
+        timestamps = array("d")
+        values = array("d")
+        for lo, hi in self._segments():
+            if self._ordered:
+                if start_time is not None:
+                    lo = bisect_left(self.timestamps, start_time, lo, hi)
+                if end_time is not None:
+                    hi = bisect_right(self.timestamps, end_time, lo, hi)
+                timestamps.extend(self.timestamps[lo:hi])
+                values.extend(self.values[lo:hi])
+            else:
+                for index in range(lo, hi):
+                    ts = self.timestamps[index]
+                    if (start_time is None or ts >= start_time) and (
+                        end_time is None or ts <= end_time
+                    ):
+                        timestamps.append(ts)
+                        values.append(self.values[index])
+        return timestamps, values
+
+    def drop_before(self, cutoff: float) -> int:
+        """Discard samples older than cutoff; returns how many were dropped"""
+        if not self._ordered:
+            timestamps, values = self.window(cutoff, None)
+            dropped = self._size - len(timestamps)
+            self.resize(self.capacity, timestamps, values)
+            return dropped
+
+        dropped = 0
+        for lo, hi in self._segments():
+            position = bisect_left(self.timestamps, cutoff, lo, hi)
+            dropped += position - lo
+            if position < hi:
+                break
+        self._start = self._physical(dropped)
+        self._size -= dropped
+        return dropped
+
+    def resize(
+        self,
+        capacity: int,
+        timestamps: Optional[array] = None,
+        values: Optional[array] = None,
+    ):
+        """Change capacity, keeping the newest samples that fit"""
+        if timestamps is None or values is None:
+            timestamps, values = self.window()
+        if capacity <= 0:
+            raise ValueError("Ring buffer capacity must be positive")
+        keep = min(len(timestamps), capacity)
+        self.capacity = capacity
+        self.timestamps = array("d", bytes(8 * capacity))
+        self.values = array("d", bytes(8 * capacity))
+        self._start = 0
+        self._size = 0
+        self._ordered = True
+        for index in range(len(timestamps) - keep, len(timestamps)):
+            self.append(timestamps[index], values[index])
+
+    def clear(self):
+        self._start = 0
+        self._size = 0
+        self._ordered = True
+
+    @property
+    def nbytes(self) -> int:
+        return 16 * self.capacity
+
+
+class LabeledSeries:
+    """Samples of one metric for one interned label set"""
+
+    __slots__ = ("key", "labels", "buffer")
+
+    def __init__(self, key: LabelKey, labels: Dict[str, str], capacity: int):
+        self.key = key
+        self.labels = labels
+        self.buffer = RingBuffer(capacity)
+
+    def matches(self, labels: Optional[Dict[str, str]]) -> bool:
+        """Check that every requested label has the same value here"""
+        if not labels:
+            return True
+        return all(self.labels.get(str(k)) == str(v) for k, v in labels.items())
+
+
+def downsample(
+    timestamps: array, values: array, step: float, aggregate: str = "avg"
+) -> List[Tuple[float, float]]:
+    """Bucket ordered samples into ``step``-second bins
+
+    Returns (bucket_start, aggregated_value) pairs; ``aggregate`` is one of
+    avg, min, max, sum, last.
+    """
+    if step <= 0:
+        raise ValueError("Downsampling step must be positive")
+    reducers = {
+        "avg": lambda chunk: sum(chunk) / len(chunk),
+        "min": min,
+        "max": max,
+        "sum": sum,
+        "last": lambda chunk: chunk[-1],
+    }
+    if aggregate not in reducers:
+        raise ValueError(f"Unknown aggregate '{aggregate}'")
+    reduce = reducers[aggregate]
+
+    buckets: List[Tuple[float, float]] = []
+    index = 0
+    count = len(timestamps)
+    while index < count:
+        bucket_start = timestamps[index] - timestamps[index] % step
+        end = bisect_left(timestamps, bucket_start + step, index, count)
+        buckets.append((bucket_start, reduce(values[index:end])))
+        index = end
+    return buckets
+
+
+def iter_series(
+    series: Dict[LabelKey, LabeledSeries], labels: Optional[Dict[str, str]]
+) -> Iterator[LabeledSeries]:
+    """Series whose label set contains ``labels``
+
+    Matching is per series, not per sample.
+    """
+    for candidate in series.values():
+        if candidate.matches(labels):
+            yield candidate
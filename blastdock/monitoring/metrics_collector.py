@@ -2,16 +2,22 @@
 Metrics collection system for BlastDock deployments
 """
 
+import os
 import time
+import heapq
 import threading
 import json
-from typing import Dict, List, Any
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
-from collections import deque
 import statistics
 
 from ..utils.logging import get_logger
 from ..utils.docker_utils import DockerClient
+from .container_state import container_source
+from .stats_stream import StatsStreamEngine, parse_docker_stats
+from .metric_store import LabelInterner, LabeledSeries, downsample, iter_series
+from .metric_persistence import MetricsDiskStore
 
 logger = get_logger(__name__)
 
@@ -27,20 +33,48 @@ class MetricPoint:
 
 @dataclass
 class MetricSeries:
-    """Series of metric measurements"""
+    """Series of metric measurements, stored per label set
+
+    ``capacity`` is the ring-buffer size (memory ceiling) of each label
+    set's series.
+    """
 
     name: str
     unit: str
     description: str
-    points: deque = field(default_factory=lambda: deque(maxlen=1000))
+    capacity: int = 1000
+    series: Dict[tuple, LabeledSeries] = field(default_factory=dict)
     labels: Dict[str, str] = field(default_factory=dict)
 
+    @property
+    def point_count(self) -> int:
+        return sum(len(s.buffer) for s in self.series.values())
+
+    def window(
+        self,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        labels: Optional[Dict[str, str]] = None,
+    ) -> List[Tuple[Dict[str, str], array, array]]:
+        """(labels, timestamps, values) for each matching label set"""
+        result = []
+        for labeled in iter_series(self.series, labels):
+            timestamps, values = labeled.buffer.window(start_time, end_time)
+            if timestamps:
+                result.append((labeled.labels, timestamps, values))
+        return result
+
 
 class MetricsCollector:
     """Comprehensive metrics collection system"""
 
-    def __init__(self):
-        """Initialize metrics collector"""
+    def __init__(self, persist: bool = False, store_dir: Optional[str] = None):
+        """Initialize metrics collector
+
+        With ``persist`` every sample is also appended to the on-disk store
+        under ``<data_dir>/metrics`` (or ``store_dir``), which backs exports
+        and dashboard history beyond the in-memory ring buffers.
+        """
         self.logger = get_logger(__name__)
         self.docker_client = DockerClient()
 
@@ -53,13 +87,28 @@ class MetricsCollector:
         self._collection_thread = None
         self._collection_interval = 15.0  # 15 seconds
 
-        # Metric retention
+        # Metric retention (points kept per label set of each metric)
         self._max_points_per_metric = 1000
         self._retention_days = 7
+        self._label_interner = LabelInterner()
+
+        # Called with (metric_name, value, timestamp, labels) per sample
+        self._sample_listeners: List[Callable[..., None]] = []
+
+        # Long-lived stats streams; collection reads their latest samples
+        self.stats_engine = StatsStreamEngine(self.docker_client)
+        self._stats_wait_timeout = 2.0  # max wait for first samples per cycle
 
         # Initialize core metrics
         self._initialize_core_metrics()
 
+        # On-disk segment store with raw/1m/1h rollup tiers
+        self.store: Optional[MetricsDiskStore] = None
+        self._restore_window = 3600.0  # raw history reloaded into memory
+        self._last_retention_run = 0.0
+        if persist:
+            self._open_store(store_dir)
+
         self.logger.debug("Metrics collector initialized")
 
     def _initialize_core_metrics(self):
@@ -110,19 +159,50 @@ class MetricsCollector:
 
         for name, unit, description in core_metrics:
             self._metrics[name] = MetricSeries(
-                name=name, unit=unit, description=description
+                name=name,
+                unit=unit,
+                description=description,
+                capacity=self._max_points_per_metric,
             )
 
+    def _open_store(self, store_dir: Optional[str]):
+        """Open the disk store and reload recent raw samples into memory"""
+        if store_dir is None:
+            from ..utils.filesystem import paths
+
+            store_dir = os.path.join(str(paths.data_dir), "metrics")
+        try:
+            self.store = MetricsDiskStore(store_dir)
+        except OSError as e:
+            self.logger.warning(f"Metrics persistence disabled: {e}")
+            return
+
+        since = time.time() - self._restore_window
+        with self._metrics_lock:
+            for metric_name in self.store.metric_names():
+                for labels, ts, value in self.store.query(metric_name, since):
+                    self._append_point(metric_name, ts, value, labels)
+
     def collect_container_metrics(self, project_name: str):
         """Collect metrics for all containers in a project"""
         try:
-            containers = self.docker_client.get_container_status(project_name)
+            containers = container_source(self.docker_client).get_container_status(
+                project_name
+            )
             timestamp = time.time()
 
             project_cpu_total = 0
             project_memory_total = 0
             running_count = 0
 
+            # Keep one stats stream per running container and read the
+            # latest samples in one bounded-latency snapshot
+            running_names = [c["name"] for c in containers if c["status"] == "running"]
+            self.stats_engine.track(project_name, running_names)
+            latest_stats = self.stats_engine.snapshot(
+                running_names, wait=self._stats_wait_timeout
+            )
+
             for container in containers:
                 container_name = container["name"]
                 container_status = container["status"]
@@ -139,7 +219,11 @@ class MetricsCollector:
 
                     # Get container stats
                     try:
-                        stats = self.docker_client.get_container_stats(container_name)
+                        stats = latest_stats.get(container_name)
+                        if stats is None and not self.stats_engine.is_streaming(
+                            container_name
+                        ):
+                            stats = self._fetch_container_stats(container_name)
                         if stats:
                             cpu_percent = stats.get("cpu_percent", 0)
                             memory_usage_mb = stats.get("memory_usage_mb", 0)
@@ -247,6 +331,13 @@ class MetricsCollector:
                 f"Failed to collect container metrics for {project_name}: {e}"
             )
 
+    def _fetch_container_stats(self, container_name: str) -> Dict[str, Any]:
+        """One-shot (blocking) stats for containers without a stream"""
+        raw = self.docker_client.get_container_stats(container_name)
+        if raw and "cpu_percent" not in raw:
+            return parse_docker_stats(raw)
+        return raw
+
     def collect_system_metrics(self):
         """Collect system-wide Docker metrics"""
         try:
@@ -300,6 +391,42 @@ class MetricsCollector:
         if labels is None:
             labels = {}
 
+        with self._metrics_lock:
+            self._append_point(metric_name, timestamp, value, labels)
+            store = self.store
+            listeners = self._sample_listeners
+
+        # The store has its own lock and may flush or take a file lock; readers
+        # of the in-memory series need not wait for that
+        if store is not None:
+            store.append(metric_name, value, timestamp, labels)
+        for listener in listeners:
+            try:
+                listener(metric_name, value, timestamp, labels)
+            except Exception as e:
+                self.logger.error(f"Metric sample listener failed: {e}")
+
+    def add_sample_listener(self, listener: Callable[..., None]):
+        """Call ``listener`` with every recorded sample"""
+        with self._metrics_lock:
+            if listener not in self._sample_listeners:
+                # Copy on write: record_metric iterates without the lock
+                self._sample_listeners = self._sample_listeners + [listener]
+
+    def remove_sample_listener(self, listener: Callable[..., None]):
+        with self._metrics_lock:
+            self._sample_listeners = [
+                existing for existing in self._sample_listeners if existing != listener
+            ]
+
+    def _append_point(
+        self,
+        metric_name: str,
+        timestamp: float,
+        value: float,
+        labels: Dict[str, str],
+    ):
+        """Append a sample to the in-memory series"""
         with self._metrics_lock:
             if metric_name not in self._metrics:
                 # Create new metric series
@@ -307,10 +434,30 @@ class MetricsCollector:
                     name=metric_name,
                     unit="",
                     description=f"Custom metric: {metric_name}",
+                    capacity=self._max_points_per_metric,
                 )
 
-            point = MetricPoint(timestamp=timestamp, value=value, labels=labels)
-            self._metrics[metric_name].points.append(point)
+            metric = self._metrics[metric_name]
+            key, shared_labels = self._label_interner.intern(labels)
+            labeled = metric.series.get(key)
+            if labeled is None:
+                labeled = metric.series[key] = LabeledSeries(
+                    key, shared_labels, metric.capacity
+                )
+            labeled.buffer.append(timestamp, value)
+
+    def set_series_capacity(self, metric_name: str, capacity: int):
+        """Set the per-label-set point ceiling for a metric
+
+        Existing series are resized, keeping their newest points.
+        """
+        with self._metrics_lock:
+            metric = self._metrics.get(metric_name)
+            if metric is None:
+                raise KeyError(f"Unknown metric: {metric_name}")
+            metric.capacity = capacity
+            for labeled in metric.series.values():
+                labeled.buffer.resize(capacity)
 
     def record_health_metric(
         self, project_name: str, service_name: str, duration_ms: float, success: bool
@@ -352,28 +499,21 @@ class MetricsCollector:
         try:
             cutoff_time = time.time() - (window_hours * 3600)
 
-            # Get health check duration points for this service
-            duration_metric = self._metrics.get("health_check_duration_ms")
-            if not duration_metric:
-                return 0.0
-
-            relevant_points = [
-                p
-                for p in duration_metric.points
-                if (
-                    p.timestamp >= cutoff_time
-                    and p.labels.get("project") == project_name
-                    and p.labels.get("service") == service_name
-                )
-            ]
+            # Get health check durations for this service
+            values = self._window_values(
+                "health_check_duration_ms",
+                cutoff_time,
+                None,
+                {"project": project_name, "service": service_name},
+            )
 
-            if not relevant_points:
+            if not values:
                 return 0.0
 
             # Assume success if health check completed (has a duration)
             # In practice, you'd track success/failure separately
-            total_checks = len(relevant_points)
-            successful_checks = sum(1 for p in relevant_points if p.value > 0)
+            total_checks = len(values)
+            successful_checks = sum(1 for value in values if value > 0)
 
             return (successful_checks / total_checks * 100) if total_checks > 0 else 0.0
 
@@ -392,25 +532,107 @@ class MetricsCollector:
         with self._metrics_lock:
             if metric_name not in self._metrics:
                 return []
+            windows = self._metrics[metric_name].window(start_time, end_time, labels)
 
-            metric = self._metrics[metric_name]
-            points = list(metric.points)
+        # Merge the per-label-set series by timestamp
+        streams = [
+            [
+                MetricPoint(timestamp=ts, value=value, labels=series_labels)
+                for ts, value in zip(timestamps, values)
+            ]
+            for series_labels, timestamps, values in windows
+        ]
+        if len(streams) == 1:
+            return streams[0]
+        return list(heapq.merge(*streams, key=lambda p: p.timestamp))
 
-        # Filter by time range
-        if start_time is not None:
-            points = [p for p in points if p.timestamp >= start_time]
-        if end_time is not None:
-            points = [p for p in points if p.timestamp <= end_time]
+    def _window_values(
+        self,
+        metric_name: str,
+        start_time: float = None,
+        end_time: float = None,
+        labels: Dict[str, str] = None,
+    ) -> array:
+        """Values of all matching label sets within a time range"""
+        values = array("d")
+        with self._metrics_lock:
+            metric = self._metrics.get(metric_name)
+            if metric is None:
+                return values
+            for _, _, series_values in metric.window(start_time, end_time, labels):
+                values.extend(series_values)
+        return values
+
+    def get_metric_downsampled(
+        self,
+        metric_name: str,
+        step: float,
+        start_time: float = None,
+        end_time: float = None,
+        labels: Dict[str, str] = None,
+        aggregate: str = "avg",
+    ) -> List[Dict[str, Any]]:
+        """Per-label-set series bucketed into ``step``-second bins"""
+        with self._metrics_lock:
+            metric = self._metrics.get(metric_name)
+            if metric is None:
+                return []
+            windows = metric.window(start_time, end_time, labels)
+
+        result = []
+        for series_labels, timestamps, values in windows:
+            if any(b < a for a, b in zip(timestamps, timestamps[1:])):
+                ordered = sorted(zip(timestamps, values))
+                timestamps = array("d", (ts for ts, _ in ordered))
+                values = array("d", (value for _, value in ordered))
+            result.append(
+                {
+                    "labels": dict(series_labels),
+                    "points": [
+                        {"timestamp": ts, "value": value}
+                        for ts, value in downsample(timestamps, values, step, aggregate)
+                    ],
+                }
+            )
+        return result
 
-        # Filter by labels
-        if labels:
-            filtered_points = []
-            for point in points:
-                if all(point.labels.get(k) == v for k, v in labels.items()):
-                    filtered_points.append(point)
-            points = filtered_points
+    def get_metric_history(
+        self,
+        metric_name: str,
+        start_time: float,
+        end_time: float = None,
+        labels: Dict[str, str] = None,
+        max_points: int = 500,
+    ) -> List[Dict[str, Any]]:
+        """Per-label-set history from the disk store's coarsest fitting tier
+
+        Falls back to downsampling the in-memory series when persistence is
+        disabled.
+        """
+        if end_time is None:
+            end_time = time.time()
+        if self.store is None:
+            step = max((end_time - start_time) / max_points, 1.0)
+            return self.get_metric_downsampled(
+                metric_name, step, start_time, end_time, labels
+            )
+
+        tier = self.store.select_tier(start_time, end_time, max_points)
+        if tier.resolution:
+            return self.store.query_rollup(
+                metric_name, tier.name, start_time, end_time, labels
+            )
 
-        return points
+        history: Dict[tuple, Dict[str, Any]] = {}
+        for series_labels, ts, value in self.store.query(
+            metric_name, start_time, end_time, labels
+        ):
+            key = tuple(sorted(series_labels.items()))
+            entry = history.setdefault(
+                key, {"labels": dict(series_labels), "points": []}
+            )
+            entry["points"].append({"timestamp": ts, "value": value})
+        return list(history.values())
 
     def get_metric_summary(
         self,
@@ -420,9 +642,9 @@ class MetricsCollector:
         labels: Dict[str, str] = None,
     ) -> Dict[str, Any]:
         """Get statistical summary of metric values"""
-        points = self.get_metric_values(metric_name, start_time, end_time, labels)
+        values = self._window_values(metric_name, start_time, end_time, labels)
 
-        if not points:
+        if not values:
             return {
                 "count": 0,
                 "min": 0,
@@ -433,8 +655,6 @@ class MetricsCollector:
                 "p99": 0,
             }
 
-        values = [p.value for p in points]
-
         try:
             return {
                 "count": len(values),
@@ -503,11 +723,16 @@ class MetricsCollector:
                         {"timestamp": p.timestamp, "value": p.value}
                         for p in points[-20:]  # Last 20 points
                     ],
+                    "history": self.get_metric_history(
+                        metric_name, start_time, end_time, project_labels
+                    ),
                 }
 
             # Container-specific metrics
             container_metrics = {}
-            containers = self.docker_client.get_container_status(project_name)
+            containers = container_source(self.docker_client).get_container_status(
+                project_name
+            )
 
             for container in containers:
                 container_name = container["name"]
@@ -556,12 +781,25 @@ class MetricsCollector:
                     "name": metric.name,
                     "unit": metric.unit,
                     "description": metric.description,
-                    "point_count": len(metric.points),
+                    "point_count": metric.point_count,
+                    "series_count": len(metric.series),
+                    "capacity_per_series": metric.capacity,
                     "labels": list(
-                        set().union(*(p.labels.keys() for p in metric.points))
+                        set().union(
+                            *(
+                                s.labels.keys()
+                                for s in metric.series.values()
+                                if len(s.buffer)
+                            )
+                        )
                     ),
                     "latest_timestamp": max(
-                        (p.timestamp for p in metric.points), default=0
+                        (
+                            s.buffer.latest()[0]
+                            for s in metric.series.values()
+                            if len(s.buffer)
+                        ),
+                        default=0,
                     ),
                 }
                 for name, metric in self._metrics.items()
@@ -586,27 +824,62 @@ class MetricsCollector:
         }
 
         with self._metrics_lock:
-            for name, metric in self._metrics.items():
-                points = list(metric.points)
-
-                # Filter by time range
-                if start_time is not None:
-                    points = [p for p in points if p.timestamp >= start_time]
-                if end_time is not None:
-                    points = [p for p in points if p.timestamp <= end_time]
-
-                export_data["metrics"][name] = {
-                    "name": metric.name,
-                    "unit": metric.unit,
-                    "description": metric.description,
-                    "points": [
-                        {"timestamp": p.timestamp, "value": p.value, "labels": p.labels}
-                        for p in points
-                    ],
-                }
+            metrics = list(self._metrics.values())
+
+        for metric in metrics:
+            if self.store is not None:
+                points = self._stored_points(metric.name, start_time, end_time)
+            else:
+                with self._metrics_lock:
+                    windows = metric.window(start_time, end_time)
+                points = [
+                    {"timestamp": ts, "value": value, "labels": series_labels}
+                    for series_labels, timestamps, values in windows
+                    for ts, value in zip(timestamps, values)
+                ]
+            points.sort(key=lambda p: p["timestamp"])
+
+            export_data["metrics"][metric.name] = {
+                "name": metric.name,
+                "unit": metric.unit,
+                "description": metric.description,
+                "points": points,
+            }
 
         return json.dumps(export_data, indent=2)
 
+    def _stored_points(
+        self, metric_name: str, start_time: float = None, end_time: float = None
+    ) -> List[Dict[str, Any]]:
+        """Export points for one metric, read from the disk store
+
+        Ranges older than the raw tier's retention come from rollups, with
+        each point's value being its bucket average.
+        """
+        tier = self.store.select_tier(start_time)
+        if not tier.resolution:
+            return [
+                {"timestamp": ts, "value": value, "labels": series_labels}
+                for series_labels, ts, value in self.store.query(
+                    metric_name, start_time, end_time
+                )
+            ]
+        return [
+            {
+                "timestamp": point["timestamp"],
+                "value": point["avg"],
+                "min": point["min"],
+                "max": point["max"],
+                "count": point["count"],
+                "resolution": tier.name,
+                "labels": series["labels"],
+            }
+            for series in self.store.query_rollup(
+                metric_name, tier.name, start_time, end_time
+            )
+            for point in series["points"]
+        ]
+
     def _export_prometheus(
         self, start_time: float = None, end_time: float = None
     ) -> str:
@@ -622,38 +895,51 @@ class MetricsCollector:
                 lines.append(f"# HELP {prom_name} {metric.description}")
                 lines.append(f"# TYPE {prom_name} gauge")
 
-                points = list(metric.points)
-
-                # Filter by time range
-                if start_time is not None:
-                    points = [p for p in points if p.timestamp >= start_time]
-                if end_time is not None:
-                    points = [p for p in points if p.timestamp <= end_time]
-
-                # Get latest point for each unique label combination
-                latest_points = {}
-                for point in points:
-                    label_key = tuple(sorted(point.labels.items()))
-                    if (
-                        label_key not in latest_points
-                        or point.timestamp > latest_points[label_key].timestamp
-                    ):
-                        latest_points[label_key] = point
-
-                # Format points
-                for point in latest_points.values():
-                    if point.labels:
+                # Latest point of each label set (one series per label set)
+                for series_labels, value in self._latest_values(
+                    metric, start_time, end_time
+                ):
+                    if series_labels:
                         label_str = ",".join(
-                            f'{k}="{v}"' for k, v in sorted(point.labels.items())
+                            f'{k}="{v}"' for k, v in sorted(series_labels.items())
                         )
-                        lines.append(f"{prom_name}{{{label_str}}} {point.value}")
+                        lines.append(f"{prom_name}{{{label_str}}} {value}")
                     else:
-                        lines.append(f"{prom_name} {point.value}")
+                        lines.append(f"{prom_name} {value}")
 
                 lines.append("")  # Empty line between metrics
 
         return "\n".join(lines)
 
+    def _latest_values(
+        self,
+        metric: MetricSeries,
+        start_time: float = None,
+        end_time: float = None,
+    ) -> List[Tuple[Dict[str, str], float]]:
+        """(labels, value) of the latest sample of each label set in range
+
+        Ranges reaching past the in-memory buffers are read from the disk
+        store.
+        """
+        if self.store is not None and start_time is not None:
+            oldest = min(
+                (s.buffer.earliest() for s in metric.series.values() if len(s.buffer)),
+                default=None,
+            )
+            if oldest is None or start_time < oldest:
+                latest = self.store.latest(metric.name, start_time, end_time)
+                return [
+                    (series_labels, value)
+                    for series_labels, _, value in latest.values()
+                ]
+
+        result = []
+        for series_labels, timestamps, values in metric.window(start_time, end_time):
+            latest_index = max(range(len(timestamps)), key=timestamps.__getitem__)
+            result.append((series_labels, values[latest_index]))
+        return result
+
     def start_collection(self, interval: float = 15.0):
         """Start background metrics collection"""
         if self._collection_active:
@@ -679,6 +965,10 @@ class MetricsCollector:
         if self._collection_thread and self._collection_thread.is_alive():
             self._collection_thread.join(timeout=5)
 
+        self.stats_engine.stop()
+        if self.store is not None:
+            self.store.flush(close_buckets=True)
+
         self.logger.info("Stopped metrics collection")
 
     def _collection_loop(self):
@@ -689,11 +979,17 @@ class MetricsCollector:
                 self.collect_system_metrics()
 
                 # Collect metrics for all projects
-                projects = self.docker_client.list_projects()
+                projects = container_source(self.docker_client).list_projects()
                 for project in projects:
                     if self._collection_active:  # Check if still active
                         self.collect_container_metrics(project)
 
+                if self.store is not None:
+                    self.store.flush()
+                    if time.time() - self._last_retention_run > 3600:
+                        self.store.enforce_retention()
+                        self._last_retention_run = time.time()
+
                 # Sleep for interval
                 time.sleep(self._collection_interval)
 
@@ -707,9 +1003,11 @@ class MetricsCollector:
 
         with self._metrics_lock:
             for metric in self._metrics.values():
-                # Remove old points
-                while metric.points and metric.points[0].timestamp < cutoff_time:
-                    metric.points.popleft()
+                # Remove old points, then label sets left empty
+                for key, labeled in list(metric.series.items()):
+                    labeled.buffer.drop_before(cutoff_time)
+                    if not len(labeled.buffer):
+                        del metric.series[key]
 
         self.logger.debug(f"Cleaned up metrics older than {self._retention_days} days")
 
@@ -722,5 +1020,5 @@ def get_metrics_collector() -> MetricsCollector:
     """Get global metrics collector instance"""
     global _metrics_collector
     if _metrics_collector is None:
-        _metrics_collector = MetricsCollector()
+        _metrics_collector = MetricsCollector(persist=True)
     return _metrics_collector
@@ -0,0 +1,205 @@
+"""
+Asynchronous alert notification dispatch for BlastDock
+
+Firing or resolving an alert only enqueues a notification; delivery runs on
+per-channel worker threads, so a slow SMTP server or webhook never holds up
+rule evaluation. Each channel has a bounded queue that drops its oldest
+entries when full. Notifications that arrive within a short window are
+coalesced into one digest delivery, and failed deliveries are retried with
+exponential backoff.
+"""
+
+import time
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional
+
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class Notification(NamedTuple):
+    """One queued alert or resolution notification"""
+
+    kind: str  # 'alert' or 'resolution'
+    alert: Any
+    enqueued_at: float
+    # Object the notification was made from, e.g. to record delivery on
+    source: Any = None
+
+
+# channel name, notifications (more than one = digest); raises on failure.
+# It may remove delivered entries from the list first so a retry skips them.
+DeliverFn = Callable[[str, List[Notification]], None]
+
+
+class _ChannelQueue:
+    def __init__(self, max_size: int):
+        self.items: Deque[Notification] = deque(maxlen=max_size)
+        self.ready = threading.Condition()
+        self.workers: List[threading.Thread] = []
+        self.in_flight = 0
+
+
+class NotificationDispatcher:
+    """Bounded per-channel queues drained by per-channel worker threads"""
+
+    def __init__(
+        self,
+        deliver: DeliverFn,
+        max_queue: int = 1000,
+        workers_per_channel: int = 2,
+        coalesce_window: float = 2.0,
+        max_batch: int = 50,
+        max_attempts: int = 4,
+        retry_backoff: float = 1.0,
+    ):
+        self.deliver = deliver
+        self.max_queue = max_queue
+        self.workers_per_channel = workers_per_channel
+        self.coalesce_window = coalesce_window
+        self.max_batch = max_batch
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+
+        self._lock = threading.Lock()
+        self._channels: Dict[str, _ChannelQueue] = {}
+        self._stop_event = threading.Event()
+
+        self.stats = {
+            "enqueued": 0,
+            "delivered": 0,
+            "digests": 0,
+            "retries": 0,
+            "failed": 0,
+            "dropped": 0,
+        }
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def _channel(self, channel_name: str) -> _ChannelQueue:
+        with self._lock:
+            channel = self._channels.get(channel_name)
+            if channel is None:
+                channel = self._channels[channel_name] = _ChannelQueue(self.max_queue)
+            if not channel.workers and not self._stop_event.is_set():
+                for index in range(self.workers_per_channel):
+                    worker = threading.Thread(
+                        target=self._worker,
+                        args=(channel_name, channel),
+                        name=f"notify-{channel_name}-{index}",
+                        daemon=True,
+                    )
+                    channel.workers.append(worker)
+                    worker.start()
+            return channel
+
+    def submit(
+        self, channel_name: str, kind: str, alert: Any, source: Any = None
+    ) -> bool:
+        """Queue a notification; returns False if an older one was dropped"""
+        channel = self._channel(channel_name)
+        with channel.ready:
+            dropped = len(channel.items) == channel.items.maxlen
+            channel.items.append(Notification(kind, alert, time.time(), source))
+            channel.ready.notify_all()
+        self._count("enqueued")
+        if dropped:
+            self._count("dropped")
+            logger.warning(
+                f"Notification queue for {channel_name} is full; dropped oldest"
+            )
+        return not dropped
+
+    def _take_batch(self, channel: _ChannelQueue) -> Optional[List[Notification]]:
+        """Wait for a notification, then gather whatever else arrives within
+        the coalescing window; None once the dispatcher is shut down"""
+        with channel.ready:
+            while not channel.items:
+                if self._stop_event.is_set():
+                    return None
+                channel.ready.wait(1.0)
+            channel.in_flight += 1
+            deadline = time.time() + self.coalesce_window
+            while (
+                len(channel.items) < self.max_batch
+                and not self._stop_event.is_set()
+                and time.time() < deadline
+            ):
+                channel.ready.wait(max(0.0, deadline - time.time()))
+            return [
+                channel.items.popleft()
+                for _ in range(min(len(channel.items), self.max_batch))
+            ]
+
+    def _worker(self, channel_name: str, channel: _ChannelQueue):
+        while True:
+            batch = self._take_batch(channel)
+            if batch is None:
+                return
+            try:
+                # Empty when another worker took the coalesced notifications
+                if batch:
+                    self._deliver_with_retry(channel_name, batch)
+            finally:
+                with channel.ready:
+                    channel.in_flight -= 1
+                    channel.ready.notify_all()
+
+    def _deliver_with_retry(self, channel_name: str, batch: List[Notification]):
+        size = len(batch)
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                self.deliver(channel_name, batch)
+            except Exception as e:
+                if attempt == self.max_attempts or self._stop_event.is_set():
+                    self._count("failed", len(batch))
+                    self._count("delivered", size - len(batch))
+                    logger.error(
+                        f"Failed to notify {channel_name} after {attempt} "
+                        f"attempt(s): {e}"
+                    )
+                    return
+                self._count("retries")
+                delay = self.retry_backoff * 2 ** (attempt - 1)
+                logger.debug(f"Retrying {channel_name} notification in {delay}s: {e}")
+                self._stop_event.wait(delay)
+                continue
+            self._count("delivered", size)
+            if size > 1:
+                self._count("digests")
+            return
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until every queued notification has been handled"""
+        deadline = time.time() + timeout
+        with self._lock:
+            channels = list(self._channels.values())
+        for channel in channels:
+            with channel.ready:
+                while channel.items or channel.in_flight:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        return False
+                    channel.ready.wait(min(remaining, 0.1))
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["queued"] = sum(len(c.items) for c in self._channels.values())
+        return stats
+
+    def shutdown(self, timeout: Optional[float] = 5.0):
+        """Stop the workers; undelivered notifications are discarded"""
+        self._stop_event.set()
+        with self._lock:
+            channels = list(self._channels.values())
+        for channel in channels:
+            with channel.ready:
+                channel.ready.notify_all()
+            for worker in channel.workers:
+                worker.join(timeout=timeout)
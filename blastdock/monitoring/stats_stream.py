@@ -0,0 +1,255 @@
+"""
+Streaming container stats engine for BlastDock metrics
+
+Keeps one long-lived ``docker stats`` stream per running container on a
+background thread and caches the latest sample, so a metrics collection
+cycle reads an in-memory snapshot instead of blocking for a daemon sampling
+interval on every container.
+"""
+
+import time
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def parse_docker_stats(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Derive BlastDock stats fields from a raw Engine API stats sample
+
+    Uses the same CPU and memory formulas as ``docker stats``.
+    """
+    cpu_stats = raw.get("cpu_stats") or {}
+    precpu_stats = raw.get("precpu_stats") or {}
+    cpu_usage = cpu_stats.get("cpu_usage") or {}
+    precpu_usage = precpu_stats.get("cpu_usage") or {}
+
+    cpu_delta = cpu_usage.get("total_usage", 0) - precpu_usage.get("total_usage", 0)
+    system_delta = cpu_stats.get("system_cpu_usage", 0) - precpu_stats.get(
+        "system_cpu_usage", 0
+    )
+    online_cpus = (
+        cpu_stats.get("online_cpus") or len(cpu_usage.get("percpu_usage") or []) or 1
+    )
+    cpu_percent = 0.0
+    if system_delta > 0 and cpu_delta > 0:
+        cpu_percent = cpu_delta / system_delta * online_cpus * 100.0
+
+    memory_stats = raw.get("memory_stats") or {}
+    memory_detail = memory_stats.get("stats") or {}
+    # cgroup v2 reports inactive_file, v1 reports cache
+    memory_cache = memory_detail.get("inactive_file", memory_detail.get("cache", 0))
+    memory_usage = max(memory_stats.get("usage", 0) - memory_cache, 0)
+    memory_limit = memory_stats.get("limit", 0)
+    memory_percent = memory_usage / memory_limit * 100.0 if memory_limit else 0.0
+
+    rx_bytes = tx_bytes = 0
+    for interface in (raw.get("networks") or {}).values():
+        rx_bytes += interface.get("rx_bytes", 0)
+        tx_bytes += interface.get("tx_bytes", 0)
+
+    read_bytes = write_bytes = 0
+    blkio_entries = (raw.get("blkio_stats") or {}).get(
+        "io_service_bytes_recursive"
+    ) or []
+    for entry in blkio_entries:
+        op = str(entry.get("op", "")).lower()
+        if op == "read":
+            read_bytes += entry.get("value", 0)
+        elif op == "write":
+            write_bytes += entry.get("value", 0)
+
+    return {
+        "cpu_percent": cpu_percent,
+        "memory_usage_mb": memory_usage / 1024 / 1024,
+        "memory_limit_mb": memory_limit / 1024 / 1024,
+        "memory_percent": memory_percent,
+        "network": {"rx_bytes": rx_bytes, "tx_bytes": tx_bytes},
+        "blkio": {"read_bytes": read_bytes, "write_bytes": write_bytes},
+        "pids": (raw.get("pids_stats") or {}).get("current", 0),
+        "read_at": raw.get("read"),
+    }
+
+
+class ContainerStatsStream:
+    """Background subscription to one container's stats stream"""
+
+    def __init__(self, container_name: str, docker_client, retry_delay: float = 5.0):
+        self.container_name = container_name
+        self.docker_client = docker_client
+        self.retry_delay = retry_delay
+        self.logger = get_logger(__name__)
+
+        self.latest: Optional[Dict[str, Any]] = None
+        self.updated_at = 0.0
+        self.samples = 0
+        self.errors = 0
+
+        self._stop = threading.Event()
+        self._first_sample = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"stats-{container_name}", daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def active(self) -> bool:
+        return self._thread.is_alive() and not self._stop.is_set()
+
+    def wait_for_sample(self, timeout: float) -> bool:
+        return self._first_sample.wait(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                container = self.docker_client.get_container_by_name(
+                    self.container_name
+                )
+                if container is None:
+                    self.logger.debug(f"Container {self.container_name} not found")
+                else:
+                    for raw in container.stats(stream=True, decode=True):
+                        if self._stop.is_set():
+                            break
+                        self.latest = parse_docker_stats(raw)
+                        self.updated_at = time.time()
+                        self.samples += 1
+                        self._first_sample.set()
+            except Exception as e:
+                self.errors += 1
+                self.logger.debug(f"Stats stream for {self.container_name} failed: {e}")
+
+            # Stream ended (container stopped/restarted) or failed: retry later
+            self._stop.wait(self.retry_delay)
+
+
+class StatsStreamEngine:
+    """Fan-in of per-container stats streams with latest-sample snapshots"""
+
+    def __init__(
+        self,
+        docker_client,
+        max_streams: int = 128,
+        stale_after: float = 30.0,
+        retry_delay: float = 5.0,
+    ):
+        """Initialize stats engine
+
+        Containers beyond ``max_streams`` are not streamed; callers fall
+        back to one-shot stats for them. Samples older than ``stale_after``
+        seconds are not returned.
+        """
+        self.logger = get_logger(__name__)
+        self.docker_client = docker_client
+        self.max_streams = max_streams
+        self.stale_after = stale_after
+        self.retry_delay = retry_delay
+
+        self._streams: Dict[str, ContainerStatsStream] = {}
+        self._project_containers: Dict[str, set] = {}
+        self._lock = threading.RLock()
+
+    def subscribe(self, container_name: str) -> bool:
+        """Start streaming a container; False if the stream cap is reached"""
+        with self._lock:
+            stream = self._streams.get(container_name)
+            if stream is not None and stream.active:
+                return True
+            if stream is None and len(self._streams) >= self.max_streams:
+                return False
+
+            stream = ContainerStatsStream(
+                container_name, self.docker_client, self.retry_delay
+            )
+            self._streams[container_name] = stream
+            stream.start()
+            return True
+
+    def unsubscribe(self, container_name: str):
+        """Stop streaming a container"""
+        with self._lock:
+            stream = self._streams.pop(container_name, None)
+        if stream is not None:
+            stream.stop()
+
+    def track(self, project_name: str, container_names: Iterable[str]):
+        """Stream exactly the given containers for a project
+
+        Containers that left the project (stopped, removed, renamed) are
+        unsubscribed.
+        """
+        wanted = set(container_names)
+        with self._lock:
+            previous = self._project_containers.get(project_name, set())
+            for name in previous - wanted:
+                self.unsubscribe(name)
+            for name in wanted - previous:
+                self.subscribe(name)
+            self._project_containers[project_name] = wanted
+
+    def is_streaming(self, container_name: str) -> bool:
+        with self._lock:
+            stream = self._streams.get(container_name)
+            return stream is not None and stream.active
+
+    def get_latest(self, container_name: str) -> Optional[Dict[str, Any]]:
+        """Latest derived stats for a container, or None if missing/stale"""
+        with self._lock:
+            stream = self._streams.get(container_name)
+        if stream is None or stream.latest is None:
+            return None
+        if time.time() - stream.updated_at > self.stale_after:
+            return None
+        return stream.latest
+
+    def snapshot(
+        self, container_names: List[str], wait: float = 0.0
+    ) -> Dict[str, Dict[str, Any]]:
+        """Latest stats for several containers
+
+        Waits at most ``wait`` seconds in total for containers that have
+        not produced their first sample yet, so the call's latency is
+        bounded regardless of container count.
+        """
+        deadline = time.time() + wait
+        for name in container_names:
+            with self._lock:
+                stream = self._streams.get(name)
+            remaining = deadline - time.time()
+            if stream is None or remaining <= 0:
+                continue
+            stream.wait_for_sample(remaining)
+
+        snapshot = {}
+        for name in container_names:
+            stats = self.get_latest(name)
+            if stats is not None:
+                snapshot[name] = stats
+        return snapshot
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Engine statistics"""
+        with self._lock:
+            streams = list(self._streams.values())
+        return {
+            "streams": len(streams),
+            "active_streams": sum(1 for s in streams if s.active),
+            "max_streams": self.max_streams,
+            "samples": sum(s.samples for s in streams),
+            "errors": sum(s.errors for s in streams),
+        }
+
+    def stop(self):
+        """Stop every stream"""
+        with self._lock:
+            names = list(self._streams)
+            self._project_containers.clear()
+        for name in names:
+            self.unsubscribe(name)
@@ -5,7 +5,7 @@ High-performance caching system for BlastDock
 import os
 import json
 import time
-import hashlib
+import itertools
 import threading
 from typing import Any, Dict, Optional, Union, Callable, TypeVar
 from dataclasses import dataclass
@@ -16,6 +16,8 @@ from collections import (
 
 from ..utils.logging import get_logger
 from ..utils.filesystem import paths
+from .cache_index import CacheKeyIndex
+from .disk_cache import DiskCacheBackend, create_disk_backend
 
 logger = get_logger(__name__)
 
@@ -61,9 +63,16 @@ class CacheManager:
         max_memory_size: int = 100 * 1024 * 1024,  # 100MB
         max_disk_size: int = 1024 * 1024 * 1024,  # 1GB
         default_ttl: Optional[float] = 3600,  # 1 hour
-        cleanup_interval: float = 300,
-    ):  # 5 minutes
-        """Initialize cache manager"""
+        cleanup_interval: float = 300,  # 5 minutes
+        disk_backend: Union[str, DiskCacheBackend, None] = None,
+        cache_dir: Optional[str] = None,
+    ):
+        """Initialize cache manager
+
+        ``disk_backend`` selects the disk tier: ``"indexed"`` (default,
+        single-file SQLite store), ``"files"`` (legacy one file per key) or a
+        ``DiskCacheBackend`` instance.
+        """
         self.logger = get_logger(__name__)
 
         # PERF-001 FIX: Use OrderedDict for O(1) LRU eviction
@@ -72,11 +81,14 @@ class CacheManager:
         self._memory_lock = threading.RLock()
         self._memory_size = 0
         self.max_memory_size = max_memory_size
+        # Tag and key-prefix indexes over the memory tier
+        self._memory_index = CacheKeyIndex()
 
         # Disk cache
-        self.cache_dir = os.path.join(paths.data_dir, "cache")
+        self.cache_dir = cache_dir or os.path.join(paths.data_dir, "cache")
         os.makedirs(self.cache_dir, exist_ok=True)
         self.max_disk_size = max_disk_size
+        self.disk = create_disk_backend(disk_backend, self.cache_dir)
 
         # Configuration
         self.default_ttl = default_ttl
@@ -95,6 +107,15 @@ class CacheManager:
 
         # Thread pool for async operations
         self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache")
+        # Disk writes queued on the executor: key -> token of the latest one,
+        # indexed by tag and prefix so invalidation can cancel them. Writes
+        # and invalidations of the disk tier hold ``_disk_lock``, so a write
+        # cancelled before it runs is skipped and one already running
+        # finishes before the invalidation deletes its entry.
+        self._disk_lock = threading.Lock()
+        self._pending_writes: Dict[str, int] = {}
+        self._pending_index = CacheKeyIndex()
+        self._write_tokens = itertools.count(1)
 
         self.logger.debug(
             f"Cache manager initialized: memory={max_memory_size//1024//1024}MB, disk={max_disk_size//1024//1024}MB"
@@ -121,8 +142,10 @@ class CacheManager:
         # Try disk cache
         disk_value = self._get_from_disk(key)
         if disk_value is not None:
-            # Move back to memory cache if there's space
-            self._set_in_memory(key, disk_value, self.default_ttl)
+            # Move back to memory cache if there's space, keeping its tags
+            self._set_in_memory(
+                key, disk_value, self.default_ttl, self._get_disk_tags(key)
+            )
             self.stats["hits"] += 1
             self.stats["disk_hits"] += 1
             self.logger.debug(f"Cache hit (disk): {key}")
@@ -150,7 +173,11 @@ class CacheManager:
 
         # Optionally persist to disk
         if persist_to_disk:
-            self._executor.submit(self._set_on_disk, key, value, ttl, tags)
+            with self._disk_lock:
+                token = next(self._write_tokens)
+                self._pending_writes[key] = token
+                self._pending_index.add(key, tags)
+            self._executor.submit(self._write_to_disk, key, token, value, ttl, tags)
 
         # Periodic cleanup
         if time.time() - self._last_cleanup > self.cleanup_interval:
@@ -164,7 +191,9 @@ class CacheManager:
                 self._remove_from_memory(key)
 
         # Remove from disk
-        self._delete_from_disk(key)
+        with self._disk_lock:
+            self._cancel_writes([key])
+            self._delete_from_disk(key)
 
     def clear(self, tags: Optional[list] = None):
         """Clear cache entries, optionally by tags"""
@@ -172,43 +201,50 @@ class CacheManager:
             # Clear all
             with self._memory_lock:
                 self._memory_cache.clear()
+                self._memory_index.clear()
                 self._memory_size = 0
 
             # Clear disk cache
-            try:
-                import shutil
-
-                shutil.rmtree(self.cache_dir)
-                os.makedirs(self.cache_dir, exist_ok=True)
-            except Exception as e:
-                self.logger.error(f"Failed to clear disk cache: {e}")
+            with self._disk_lock:
+                self._cancel_writes(list(self._pending_writes))
+                try:
+                    self.disk.clear()
+                except Exception as e:
+                    self.logger.error(f"Failed to clear disk cache: {e}")
         else:
-            # Clear by tags
-            keys_to_remove = []
+            # Clear by tags in both tiers
             with self._memory_lock:
-                for key, entry in self._memory_cache.items():
-                    if any(tag in entry.tags for tag in tags):
-                        keys_to_remove.append(key)
-
-                for key in keys_to_remove:
+                for key in self._memory_index.keys_for_tags(tags):
                     self._remove_from_memory(key)
 
+            with self._disk_lock:
+                self._cancel_writes(self._pending_index.keys_for_tags(tags))
+                try:
+                    self.disk.delete_many(self.disk.keys_with_tags(tags))
+                except Exception as e:
+                    self.logger.error(f"Failed to clear disk cache tags {tags}: {e}")
+
     def invalidate_by_pattern(self, pattern: str):
         """Invalidate cache entries matching pattern"""
-        import fnmatch
-
-        keys_to_remove = []
         with self._memory_lock:
-            for key in self._memory_cache:
-                if fnmatch.fnmatch(key, pattern):
-                    keys_to_remove.append(key)
-
-            for key in keys_to_remove:
+            for key in self._memory_index.match(pattern):
                 self._remove_from_memory(key)
 
         # Also remove from disk
-        for key in keys_to_remove:
-            self._delete_from_disk(key)
+        with self._disk_lock:
+            self._cancel_writes(self._pending_index.match(pattern))
+            try:
+                self.disk.delete_many(self.disk.keys_matching(pattern))
+            except Exception as e:
+                self.logger.error(
+                    f"Failed to invalidate disk cache pattern {pattern}: {e}"
+                )
+
+    def _cancel_writes(self, keys):
+        """Drop queued disk writes of ``keys`` (caller holds ``_disk_lock``)"""
+        for key in keys:
+            if self._pending_writes.pop(key, None) is not None:
+                self._pending_index.remove(key)
 
     def _set_in_memory(
         self, key: str, value: Any, ttl: Optional[float], tags: Optional[list] = None
@@ -249,6 +285,7 @@ class CacheManager:
 
             # Add new entry
             self._memory_cache[key] = entry
+            self._memory_index.add(key, tags)
             self._memory_size += size_bytes
 
     def _remove_from_memory(self, key: str):
@@ -257,6 +294,7 @@ class CacheManager:
             entry = self._memory_cache[key]
             self._memory_size -= entry.size_bytes
             del self._memory_cache[key]
+            self._memory_index.remove(key)
 
     def _evict_lru(self):
         """Evict least recently used entry from memory (PERF-001 FIX: O(1) eviction)"""
@@ -273,69 +311,45 @@ class CacheManager:
         self.stats["size_evictions"] += 1
         self.logger.debug(f"Evicted LRU entry: {lru_key}")
 
-    def _get_cache_file_path(self, key: str) -> str:
-        """Get file path for cache key"""
-        # Hash the key to create a safe filename
-        key_hash = hashlib.sha256(key.encode()).hexdigest()
-        return os.path.join(self.cache_dir, f"{key_hash}.cache")
-
     def _get_from_disk(self, key: str) -> Any:
         """Get value from disk cache"""
-        cache_file = self._get_cache_file_path(key)
-
         try:
-            if not os.path.exists(cache_file):
-                return None
-
-            with open(cache_file, "r", encoding="utf-8") as f:
-                cache_data = json.load(f)
-
-            # Check if expired
-            if (
-                cache_data.get("ttl")
-                and time.time() - cache_data["timestamp"] > cache_data["ttl"]
-            ):
-                os.unlink(cache_file)
-                return None
-
-            return cache_data["value"]
-
+            return self.disk.get(key)
         except Exception as e:
             self.logger.debug(f"Failed to read from disk cache {key}: {e}")
-            # Clean up corrupted cache file
-            try:
-                os.unlink(cache_file)
-            except (OSError, PermissionError) as unlink_err:
-                self.logger.debug(
-                    f"Could not remove corrupted cache file: {unlink_err}"
-                )
             return None
 
+    def _get_disk_tags(self, key: str) -> list:
+        """Get tags stored with a disk cache entry"""
+        try:
+            return self.disk.tags_for(key)
+        except Exception as e:
+            self.logger.debug(f"Failed to read disk cache tags {key}: {e}")
+            return []
+
+    def _write_to_disk(
+        self,
+        key: str,
+        token: int,
+        value: Any,
+        ttl: Optional[float],
+        tags: Optional[list] = None,
+    ):
+        """Run a queued disk write unless it was cancelled or superseded"""
+        with self._disk_lock:
+            if self._pending_writes.get(key) != token:
+                return
+            self._cancel_writes([key])
+            self._set_on_disk(key, value, ttl, tags)
+
     def _set_on_disk(
         self, key: str, value: Any, ttl: Optional[float], tags: Optional[list] = None
     ):
         """Set value in disk cache"""
-        cache_file = self._get_cache_file_path(key)
-
         try:
             # Ensure value is JSON-serializable
             serialized_value = self._make_json_serializable(value)
-
-            cache_data = {
-                "key": key,
-                "value": serialized_value,
-                "timestamp": time.time(),
-                "ttl": ttl,
-                "tags": tags or [],
-            }
-
-            # Write atomically
-            temp_file = cache_file + ".tmp"
-            with open(temp_file, "w", encoding="utf-8") as f:
-                json.dump(cache_data, f, indent=2)
-
-            os.rename(temp_file, cache_file)
-
+            self.disk.set(key, serialized_value, ttl, tags)
         except Exception as e:
             self.logger.debug(f"Failed to write to disk cache {key}: {e}")
 
@@ -365,10 +379,8 @@ class CacheManager:
 
     def _delete_from_disk(self, key: str):
         """Delete key from disk cache"""
-        cache_file = self._get_cache_file_path(key)
         try:
-            if os.path.exists(cache_file):
-                os.unlink(cache_file)
+            self.disk.delete(key)
         except Exception as e:
             self.logger.debug(f"Failed to delete from disk cache {key}: {e}")
 
@@ -387,64 +399,8 @@ class CacheManager:
 
         # Cleanup disk cache
         try:
-            cache_files = []
-            total_size = 0
-
-            for filename in os.listdir(self.cache_dir):
-                if filename.endswith(".cache"):
-                    filepath = os.path.join(self.cache_dir, filename)
-                    try:
-                        stat = os.stat(filepath)
-                        cache_files.append((filepath, stat.st_mtime, stat.st_size))
-                        total_size += stat.st_size
-                    except OSError as e:
-                        self.logger.debug(f"Could not stat cache file {filepath}: {e}")
-                        continue
-
-            # Remove expired files
-            current_time = time.time()
-            for filepath, mtime, size in cache_files[:]:
-                try:
-                    with open(filepath, "r", encoding="utf-8") as f:
-                        cache_data = json.load(f)
-
-                    if (
-                        cache_data.get("ttl")
-                        and current_time - cache_data["timestamp"] > cache_data["ttl"]
-                    ):
-                        os.unlink(filepath)
-                        cache_files.remove((filepath, mtime, size))
-                        total_size -= size
-                except (
-                    json.JSONDecodeError,
-                    OSError,
-                    KeyError,
-                    UnicodeDecodeError,
-                ) as e:
-                    # Remove corrupted files
-                    self.logger.debug(f"Removing corrupted cache file {filepath}: {e}")
-                    try:
-                        os.unlink(filepath)
-                        cache_files.remove((filepath, mtime, size))
-                        total_size -= size
-                    except (OSError, ValueError) as unlink_err:
-                        self.logger.debug(
-                            f"Could not remove corrupted file: {unlink_err}"
-                        )
-
-            # Remove oldest files if over disk limit
-            if total_size > self.max_disk_size:
-                cache_files.sort(key=lambda x: x[1])  # Sort by mtime
-
-                while total_size > self.max_disk_size and cache_files:
-                    filepath, mtime, size = cache_files.pop(0)
-                    try:
-                        os.unlink(filepath)
-                        total_size -= size
-                        self.stats["evictions"] += 1
-                    except OSError as e:
-                        self.logger.debug(f"Could not evict cache file {filepath}: {e}")
-
+            result = self.disk.cleanup(self.max_disk_size)
+            self.stats["evictions"] += result.get("evicted", 0)
         except Exception as e:
             self.logger.error(f"Cache cleanup failed: {e}")
 
@@ -454,20 +410,13 @@ class CacheManager:
             memory_entries = len(self._memory_cache)
             memory_size = self._memory_size
 
-        # Count disk entries
-        disk_entries = 0
-        disk_size = 0
         try:
-            for filename in os.listdir(self.cache_dir):
-                if filename.endswith(".cache"):
-                    filepath = os.path.join(self.cache_dir, filename)
-                    try:
-                        disk_entries += 1
-                        disk_size += os.path.getsize(filepath)
-                    except OSError as e:
-                        self.logger.debug(f"Could not get size of {filepath}: {e}")
-        except OSError as e:
-            self.logger.debug(f"Could not list cache directory: {e}")
+            disk_stats = self.disk.get_stats()
+        except Exception as e:
+            self.logger.debug(f"Could not read disk cache stats: {e}")
+            disk_stats = {}
+        disk_entries = disk_stats.get("entries", 0)
+        disk_size = disk_stats.get("size_bytes", 0)
 
         total_requests = self.stats["hits"] + self.stats["misses"]
         hit_rate = (
@@ -520,9 +469,10 @@ class CacheManager:
     def close(self):
         """Close cache manager and cleanup resources"""
         try:
-            self._executor.shutdown(wait=True, timeout=10)
+            self._executor.shutdown(wait=True)
         except Exception as e:
             self.logger.error(f"Error shutting down cache executor: {e}")
+        self.disk.close()
 
 
 # Decorator for caching function results
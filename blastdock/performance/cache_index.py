@@ -0,0 +1,169 @@
+"""
+Secondary indexes for cache invalidation
+
+Keeps tag->keys and key-prefix lookups for a cache tier so that tag clears
+and ``prefix:*`` pattern invalidation touch only the matching keys.
+"""
+
+import fnmatch
+from typing import Dict, Iterable, Optional, Set
+
+GLOB_CHARS = "*?["
+
+
+class _TrieNode:
+    """Prefix trie node (one per key character)"""
+
+    __slots__ = ("children", "terminal")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.terminal = False
+
+
+class KeyPrefixTrie:
+    """Character trie over cache keys"""
+
+    def __init__(self):
+        self._root = _TrieNode()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, key: str):
+        """Insert a key"""
+        node = self._root
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _TrieNode()
+            node = child
+        if not node.terminal:
+            node.terminal = True
+            self._size += 1
+
+    def remove(self, key: str):
+        """Remove a key and prune branches left without keys"""
+        path = []
+        node = self._root
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                return
+            path.append((node, char))
+            node = child
+        if not node.terminal:
+            return
+
+        node.terminal = False
+        self._size -= 1
+        for parent, char in reversed(path):
+            child = parent.children[char]
+            if child.terminal or child.children:
+                break
+            del parent.children[char]
+
+    def _find(self, prefix: str) -> Optional[_TrieNode]:
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def keys_with_prefix(self, prefix: str) -> Set[str]:
+        """All keys starting with prefix"""
+        start = self._find(prefix)
+        if start is None:
+            return set()
+
+        found = set()
+        stack = [(start, prefix)]
+        while stack:
+            node, key = stack.pop()
+            if node.terminal:
+                found.add(key)
+            for char, child in node.children.items():
+                stack.append((child, key + char))
+        return found
+
+    def clear(self):
+        self._root = _TrieNode()
+        self._size = 0
+
+
+def literal_prefix(pattern: str) -> str:
+    """Part of a glob pattern before its first wildcard"""
+    for position, char in enumerate(pattern):
+        if char in GLOB_CHARS:
+            return pattern[:position]
+    return pattern
+
+
+class CacheKeyIndex:
+    """Tag and prefix indexes for one cache tier"""
+
+    def __init__(self):
+        self._tags: Dict[str, Set[str]] = {}
+        self._key_tags: Dict[str, tuple] = {}
+        self._trie = KeyPrefixTrie()
+
+    def __len__(self) -> int:
+        return len(self._key_tags)
+
+    def add(self, key: str, tags: Optional[Iterable[str]] = None):
+        """Index a key, replacing any tags it was indexed with before"""
+        self.remove(key)
+        tag_tuple = tuple(tags or ())
+        self._key_tags[key] = tag_tuple
+        for tag in tag_tuple:
+            self._tags.setdefault(tag, set()).add(key)
+        self._trie.add(key)
+
+    def remove(self, key: str):
+        """Drop a key from every index"""
+        tag_tuple = self._key_tags.pop(key, None)
+        if tag_tuple is None:
+            return
+        for tag in tag_tuple:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+        self._trie.remove(key)
+
+    def tags_for(self, key: str) -> tuple:
+        """Tags a key was indexed with"""
+        return self._key_tags.get(key, ())
+
+    def keys_for_tags(self, tags: Iterable[str]) -> Set[str]:
+        """Keys carrying any of the given tags"""
+        found: Set[str] = set()
+        for tag in tags:
+            found.update(self._tags.get(tag, ()))
+        return found
+
+    def keys_with_prefix(self, prefix: str) -> Set[str]:
+        """Keys starting with prefix"""
+        return self._trie.keys_with_prefix(prefix)
+
+    def match(self, pattern: str) -> Set[str]:
+        """Keys matching a glob pattern
+
+        Only keys sharing the pattern's literal prefix are tested, so
+        ``template:*`` costs time proportional to the template keys.
+        """
+        prefix = literal_prefix(pattern)
+        candidates = self._trie.keys_with_prefix(prefix)
+        if prefix == pattern:
+            return candidates & {pattern}
+        if pattern == prefix + "*":
+            return candidates
+        return {key for key in candidates if fnmatch.fnmatchcase(key, pattern)}
+
+    def clear(self):
+        self._tags.clear()
+        self._key_tags.clear()
+        self._trie.clear()
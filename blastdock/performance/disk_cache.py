@@ -0,0 +1,613 @@
+"""
+Disk tiers for the BlastDock cache manager
+
+The default tier keeps every entry in a single SQLite file and mirrors the
+per-entry metadata (expiry, tags, size, last access) in an in-memory index,
+so expiry sweeps, tag lookups and size-based eviction never have to scan the
+cache directory or parse stored values. The legacy one-JSON-file-per-key
+layout is still available and is migrated into the indexed store on first use.
+"""
+
+import os
+import json
+import fnmatch
+import time
+import sqlite3
+import hashlib
+import shutil
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
+from dataclasses import dataclass, field
+
+from ..utils.logging import get_logger
+from .cache_index import CacheKeyIndex
+
+logger = get_logger(__name__)
+
+LEGACY_SUFFIX = ".cache"
+INDEX_DB_NAME = "cache.db"
+
+
+@dataclass
+class DiskIndexEntry:
+    """In-memory index record for a disk cache entry"""
+
+    rowid: int
+    expires_at: Optional[float]
+    size: int
+    last_access: float
+    tags: tuple = field(default_factory=tuple)
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        """Check if the indexed entry is expired"""
+        if self.expires_at is None:
+            return False
+        return (now if now is not None else time.time()) > self.expires_at
+
+
+def _expires_at(timestamp: float, ttl: Optional[float]) -> Optional[float]:
+    """Absolute expiry time for a TTL, or None when the entry never expires"""
+    return timestamp + ttl if ttl else None
+
+
+class DiskCacheBackend:
+    """Interface implemented by CacheManager disk tiers
+
+    Values handed to a backend are already JSON-serializable.
+    """
+
+    def get(self, key: str) -> Any:
+        """Return the stored value, or None on miss/expiry"""
+        raise NotImplementedError
+
+    def set(
+        self, key: str, value: Any, ttl: Optional[float], tags: Optional[list] = None
+    ):
+        """Store a value"""
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        """Remove a single key"""
+        raise NotImplementedError
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """Remove several keys, returning how many were removed"""
+        removed = 0
+        for key in list(keys):
+            if self.contains(key):
+                self.delete(key)
+                removed += 1
+        return removed
+
+    def contains(self, key: str) -> bool:
+        """Check whether a key is stored (expired or not)"""
+        raise NotImplementedError
+
+    def keys(self) -> List[str]:
+        """List stored keys"""
+        raise NotImplementedError
+
+    def keys_with_tags(self, tags: Iterable[str]) -> Set[str]:
+        """Keys carrying any of the given tags"""
+        raise NotImplementedError
+
+    def keys_matching(self, pattern: str) -> Set[str]:
+        """Keys matching a glob pattern"""
+        return {key for key in self.keys() if fnmatch.fnmatchcase(key, pattern)}
+
+    def tags_for(self, key: str) -> list:
+        """Tags stored with a key"""
+        raise NotImplementedError
+
+    def clear(self):
+        """Remove every entry"""
+        raise NotImplementedError
+
+    def cleanup(self, max_size: int) -> Dict[str, int]:
+        """Drop expired entries and evict down to max_size bytes
+
+        Returns counts of ``expired`` and ``evicted`` entries.
+        """
+        raise NotImplementedError
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return ``entries`` and ``size_bytes`` for the tier"""
+        raise NotImplementedError
+
+    def close(self):
+        """Release backend resources"""
+
+
+class FileCacheBackend(DiskCacheBackend):
+    """Legacy layout: one JSON file per key, named by the key's sha256"""
+
+    def __init__(self, cache_dir: str):
+        self.logger = get_logger(__name__)
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _get_cache_file_path(self, key: str) -> str:
+        """Get file path for cache key"""
+        key_hash = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{key_hash}{LEGACY_SUFFIX}")
+
+    def _iter_files(self):
+        for filename in os.listdir(self.cache_dir):
+            if filename.endswith(LEGACY_SUFFIX):
+                yield os.path.join(self.cache_dir, filename)
+
+    def get(self, key: str) -> Any:
+        cache_file = self._get_cache_file_path(key)
+
+        try:
+            if not os.path.exists(cache_file):
+                return None
+
+            with open(cache_file, "r", encoding="utf-8") as f:
+                cache_data = json.load(f)
+
+            if (
+                cache_data.get("ttl")
+                and time.time() - cache_data["timestamp"] > cache_data["ttl"]
+            ):
+                os.unlink(cache_file)
+                return None
+
+            return cache_data["value"]
+
+        except Exception as e:
+            self.logger.debug(f"Failed to read from disk cache {key}: {e}")
+            try:
+                os.unlink(cache_file)
+            except (OSError, PermissionError) as unlink_err:
+                self.logger.debug(
+                    f"Could not remove corrupted cache file: {unlink_err}"
+                )
+            return None
+
+    def set(
+        self, key: str, value: Any, ttl: Optional[float], tags: Optional[list] = None
+    ):
+        cache_file = self._get_cache_file_path(key)
+        cache_data = {
+            "key": key,
+            "value": value,
+            "timestamp": time.time(),
+            "ttl": ttl,
+            "tags": tags or [],
+        }
+
+        # Write atomically
+        temp_file = cache_file + ".tmp"
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(cache_data, f, indent=2)
+        os.rename(temp_file, cache_file)
+
+    def delete(self, key: str):
+        cache_file = self._get_cache_file_path(key)
+        try:
+            if os.path.exists(cache_file):
+                os.unlink(cache_file)
+        except OSError as e:
+            self.logger.debug(f"Failed to delete from disk cache {key}: {e}")
+
+    def contains(self, key: str) -> bool:
+        return os.path.exists(self._get_cache_file_path(key))
+
+    def _read_all(self):
+        """Yield (path, data) for every readable cache file"""
+        for filepath in self._iter_files():
+            try:
+                with open(filepath, "r", encoding="utf-8") as f:
+                    yield filepath, json.load(f)
+            except (json.JSONDecodeError, OSError, UnicodeDecodeError) as e:
+                self.logger.debug(f"Skipping unreadable cache file {filepath}: {e}")
+
+    def keys(self) -> List[str]:
+        return [data["key"] for _, data in self._read_all() if "key" in data]
+
+    def keys_with_tags(self, tags: Iterable[str]) -> Set[str]:
+        wanted = set(tags)
+        return {
+            data["key"]
+            for _, data in self._read_all()
+            if "key" in data and wanted.intersection(data.get("tags") or [])
+        }
+
+    def tags_for(self, key: str) -> list:
+        try:
+            with open(self._get_cache_file_path(key), "r", encoding="utf-8") as f:
+                return list(json.load(f).get("tags") or [])
+        except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+            return []
+
+    def clear(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def cleanup(self, max_size: int) -> Dict[str, int]:
+        result = {"expired": 0, "evicted": 0}
+        cache_files = []
+        total_size = 0
+
+        for filepath in self._iter_files():
+            try:
+                stat = os.stat(filepath)
+                cache_files.append((filepath, stat.st_mtime, stat.st_size))
+                total_size += stat.st_size
+            except OSError as e:
+                self.logger.debug(f"Could not stat cache file {filepath}: {e}")
+
+        # Remove expired files
+        current_time = time.time()
+        for filepath, mtime, size in cache_files[:]:
+            try:
+                with open(filepath, "r", encoding="utf-8") as f:
+                    cache_data = json.load(f)
+
+                if (
+                    cache_data.get("ttl")
+                    and current_time - cache_data["timestamp"] > cache_data["ttl"]
+                ):
+                    os.unlink(filepath)
+                    cache_files.remove((filepath, mtime, size))
+                    total_size -= size
+                    result["expired"] += 1
+            except (json.JSONDecodeError, OSError, KeyError, UnicodeDecodeError) as e:
+                self.logger.debug(f"Removing corrupted cache file {filepath}: {e}")
+                try:
+                    os.unlink(filepath)
+                    cache_files.remove((filepath, mtime, size))
+                    total_size -= size
+                except (OSError, ValueError) as unlink_err:
+                    self.logger.debug(f"Could not remove corrupted file: {unlink_err}")
+
+        # Remove oldest files if over disk limit
+        if total_size > max_size:
+            cache_files.sort(key=lambda x: x[1])
+            while total_size > max_size and cache_files:
+                filepath, _, size = cache_files.pop(0)
+                try:
+                    os.unlink(filepath)
+                    total_size -= size
+                    result["evicted"] += 1
+                except OSError as e:
+                    self.logger.debug(f"Could not evict cache file {filepath}: {e}")
+
+        return result
+
+    def get_stats(self) -> Dict[str, int]:
+        entries = 0
+        size = 0
+        try:
+            for filepath in self._iter_files():
+                try:
+                    size += os.path.getsize(filepath)
+                    entries += 1
+                except OSError as e:
+                    self.logger.debug(f"Could not get size of {filepath}: {e}")
+        except OSError as e:
+            self.logger.debug(f"Could not list cache directory: {e}")
+        return {"entries": entries, "size_bytes": size}
+
+
+class IndexedDiskCacheBackend(DiskCacheBackend):
+    """Single-file SQLite store with an in-memory key index
+
+    Only the metadata columns are read when the index is built, so opening a
+    cache with tens of thousands of entries never deserializes their values.
+    """
+
+    def __init__(self, cache_dir: str, db_name: str = INDEX_DB_NAME):
+        self.logger = get_logger(__name__)
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.db_path = os.path.join(self.cache_dir, db_name)
+
+        self._lock = threading.RLock()
+        self._index: Dict[str, DiskIndexEntry] = {}
+        self._key_index = CacheKeyIndex()
+        self._total_size = 0
+        # Keys read since the last flush; their last_access is persisted lazily
+        self._touched: Set[str] = set()
+
+        self._conn = self._connect()
+        self.reload_index()
+
+        migrated = self.migrate_legacy_files()
+        if migrated:
+            self.logger.info(
+                f"Migrated {migrated} legacy cache files into {self.db_path}"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        except sqlite3.DatabaseError as e:
+            self.logger.debug(f"Could not tune cache database: {e}")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " timestamp REAL NOT NULL,"
+            " expires_at REAL,"
+            " tags TEXT NOT NULL DEFAULT '[]',"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        conn.commit()
+        return conn
+
+    def reload_index(self):
+        """Rebuild the in-memory index from the metadata columns"""
+        with self._lock:
+            self._index.clear()
+            self._key_index.clear()
+            self._total_size = 0
+            rows = self._conn.execute(
+                "SELECT rowid, key, expires_at, tags, size, last_access FROM entries"
+            )
+            for rowid, key, expires_at, tags, size, last_access in rows:
+                try:
+                    tag_tuple = tuple(json.loads(tags)) if tags else ()
+                except (TypeError, ValueError):
+                    tag_tuple = ()
+                self._index_put(
+                    key, DiskIndexEntry(rowid, expires_at, size, last_access, tag_tuple)
+                )
+
+    def _index_put(self, key: str, entry: DiskIndexEntry):
+        self._index_drop(key)
+        self._index[key] = entry
+        self._key_index.add(key, entry.tags)
+        self._total_size += entry.size
+
+    def _index_drop(self, key: str) -> Optional[DiskIndexEntry]:
+        entry = self._index.pop(key, None)
+        if entry is not None:
+            self._total_size -= entry.size
+            self._key_index.remove(key)
+        self._touched.discard(key)
+        return entry
+
+    def _write(
+        self,
+        key: str,
+        payload: str,
+        timestamp: float,
+        ttl: Optional[float],
+        tags: Optional[list],
+    ):
+        tag_list = list(tags or [])
+        size = len(payload.encode())
+        expires_at = _expires_at(timestamp, ttl)
+        cursor = self._conn.execute(
+            "INSERT OR REPLACE INTO entries"
+            " (key, value, timestamp, expires_at, tags, size, last_access)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                key,
+                payload,
+                timestamp,
+                expires_at,
+                json.dumps(tag_list),
+                size,
+                timestamp,
+            ),
+        )
+        self._index_put(
+            key,
+            DiskIndexEntry(
+                cursor.lastrowid, expires_at, size, timestamp, tuple(tag_list)
+            ),
+        )
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._index_drop(key)
+                return None
+
+            payload, expires_at = row
+            if expires_at is not None and time.time() > expires_at:
+                self._delete_keys([key])
+                return None
+
+            try:
+                value = json.loads(payload)
+            except ValueError as e:
+                self.logger.debug(f"Dropping corrupted disk cache entry {key}: {e}")
+                self._delete_keys([key])
+                return None
+
+            entry = self._index.get(key)
+            if entry is not None:
+                entry.last_access = time.time()
+                self._touched.add(key)
+            return value
+
+    def set(
+        self, key: str, value: Any, ttl: Optional[float], tags: Optional[list] = None
+    ):
+        payload = json.dumps(value, separators=(",", ":"))
+        with self._lock:
+            self._write(key, payload, time.time(), ttl, tags)
+            self._conn.commit()
+
+    def _delete_keys(self, keys: List[str]) -> int:
+        if not keys:
+            return 0
+        self._conn.executemany(
+            "DELETE FROM entries WHERE key = ?", [(key,) for key in keys]
+        )
+        self._conn.commit()
+        removed = 0
+        for key in keys:
+            if self._index_drop(key) is not None:
+                removed += 1
+        return removed
+
+    def delete(self, key: str):
+        with self._lock:
+            self._delete_keys([key])
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        with self._lock:
+            return self._delete_keys(list(keys))
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            return key in self._index
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._index)
+
+    def keys_with_tags(self, tags: Iterable[str]) -> Set[str]:
+        with self._lock:
+            return self._key_index.keys_for_tags(tags)
+
+    def keys_matching(self, pattern: str) -> Set[str]:
+        with self._lock:
+            return self._key_index.match(pattern)
+
+    def tags_for(self, key: str) -> list:
+        with self._lock:
+            return list(self._key_index.tags_for(key))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+            self._index.clear()
+            self._key_index.clear()
+            self._touched.clear()
+            self._total_size = 0
+
+    def _flush_access_times(self):
+        if not self._touched:
+            return
+        self._conn.executemany(
+            "UPDATE entries SET last_access = ? WHERE key = ?",
+            [
+                (self._index[key].last_access, key)
+                for key in self._touched
+                if key in self._index
+            ],
+        )
+        self._conn.commit()
+        self._touched.clear()
+
+    def cleanup(self, max_size: int) -> Dict[str, int]:
+        result = {"expired": 0, "evicted": 0}
+        with self._lock:
+            now = time.time()
+            expired = [
+                key for key, entry in self._index.items() if entry.is_expired(now)
+            ]
+            result["expired"] = self._delete_keys(expired)
+
+            if self._total_size > max_size:
+                victims = []
+                projected = self._total_size
+                for key, entry in sorted(
+                    self._index.items(), key=lambda item: item[1].last_access
+                ):
+                    if projected <= max_size:
+                        break
+                    victims.append(key)
+                    projected -= entry.size
+                result["evicted"] = self._delete_keys(victims)
+
+            self._flush_access_times()
+        return result
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._index), "size_bytes": self._total_size}
+
+    def migrate_legacy_files(self, legacy_dir: Optional[str] = None) -> int:
+        """Import per-file ``*.cache`` entries and remove the old files
+
+        Expired or unreadable legacy files are discarded without import.
+        """
+        legacy_dir = legacy_dir or self.cache_dir
+        try:
+            names = [
+                name
+                for name in os.listdir(legacy_dir)
+                if name.endswith(LEGACY_SUFFIX) or name.endswith(LEGACY_SUFFIX + ".tmp")
+            ]
+        except OSError as e:
+            self.logger.debug(f"Could not list legacy cache directory: {e}")
+            return 0
+        if not names:
+            return 0
+
+        migrated = 0
+        now = time.time()
+        with self._lock:
+            for name in names:
+                filepath = os.path.join(legacy_dir, name)
+                try:
+                    if name.endswith(LEGACY_SUFFIX):
+                        with open(filepath, "r", encoding="utf-8") as f:
+                            data = json.load(f)
+                        timestamp = float(data["timestamp"])
+                        ttl = data.get("ttl")
+                        expires_at = _expires_at(timestamp, ttl)
+                        if expires_at is None or expires_at > now:
+                            payload = json.dumps(data["value"], separators=(",", ":"))
+                            self._write(
+                                data["key"], payload, timestamp, ttl, data.get("tags")
+                            )
+                            migrated += 1
+                except (
+                    json.JSONDecodeError,
+                    OSError,
+                    KeyError,
+                    TypeError,
+                    ValueError,
+                    UnicodeDecodeError,
+                ) as e:
+                    self.logger.debug(f"Skipping legacy cache file {filepath}: {e}")
+                try:
+                    os.unlink(filepath)
+                except OSError as e:
+                    self.logger.debug(f"Could not remove legacy cache file: {e}")
+            self._conn.commit()
+        return migrated
+
+    def close(self):
+        with self._lock:
+            try:
+                self._flush_access_times()
+                self._conn.close()
+            except sqlite3.Error as e:
+                self.logger.debug(f"Error closing cache database: {e}")
+
+
+DISK_BACKENDS = {
+    "indexed": IndexedDiskCacheBackend,
+    "files": FileCacheBackend,
+}
+
+
+def create_disk_backend(
+    backend: Union[str, DiskCacheBackend, None], cache_dir: str
+) -> DiskCacheBackend:
+    """Resolve a backend name or instance into a disk tier"""
+    if isinstance(backend, DiskCacheBackend):
+        return backend
+    name = backend or "indexed"
+    if name not in DISK_BACKENDS:
+        raise ValueError(
+            f"Unknown cache disk backend '{name}'. "
+            f"Available: {', '.join(sorted(DISK_BACKENDS))}"
+        )
+    return DISK_BACKENDS[name](cache_dir)
@@ -1,47 +1,377 @@
-"""Parallel processing module
+"""Parallel template processing
 
-QUAL-009 WARNING: This module returns placeholder data only.
-Real parallel processing is not implemented. Templates are NOT processed in parallel.
+Templates are loaded, validated, security-scanned and pre-rendered on a
+process pool, one task per template, and results are streamed back as they
+complete. At most ``max_pending`` tasks are in flight at once, so memory
+stays bounded however large the catalog is. A run can be cancelled between
+items, and falls back to processing serially in-process for small batches,
+single-core hosts, or platforms where a process pool cannot be started.
 """
 
-import warnings
+import os
+import time
+import threading
+import dataclasses
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
 from ..utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+STAGES = ("load", "validate", "scan", "render")
+
+
+@dataclass
+class TemplateTaskResult:
+    """Outcome of processing one template; only requested stages are set"""
+
+    path: str
+    name: str
+    stage_times: Dict[str, float] = field(default_factory=dict)
+    duration: float = 0.0
+    # Stage name -> error message
+    errors: Dict[str, str] = field(default_factory=dict)
+    template: Any = None  # load: CachedTemplate
+    analysis: Any = None  # validate: TemplateAnalysis
+    security: Optional[Dict[str, Any]] = None  # scan: scan_template() result
+    rendered_services: Optional[List[str]] = None  # render
+    worker_pid: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+# Per-process tools, created on first use in each worker
+_tools: Dict[str, Any] = {}
+
+
+def _tool(name: str, directory: Optional[str] = None) -> Any:
+    key = f"{name}:{directory}" if directory else name
+    tool = _tools.get(key)
+    if tool is None:
+        if name == "cache":
+            from .template_cache import TemplateCache
+
+            tool = TemplateCache()
+        elif name == "validator":
+            from ..utils.template_validator import TemplateValidator
+
+            tool = TemplateValidator()
+        elif name == "scanner":
+            from ..security.template_scanner import TemplateSecurityScanner
+
+            # ``directory`` is the scanner's findings cache, if any
+            tool = TemplateSecurityScanner(
+                persist=directory is not None, cache_dir=directory
+            )
+        elif name == "renderer":
+            from jinja2 import FileSystemLoader
+
+            from ..core.template_manager import TemplateManager
+
+            tool = TemplateManager()
+            tool.templates_dir = directory
+            tool.jinja_env.loader = FileSystemLoader(directory)
+            tool.template_cache = _tool("cache")
+        else:
+            raise ValueError(f"Unknown tool: {name}")
+        _tools[key] = tool
+    return tool
+
+
+def preview_config(template_manager, template_name: str) -> Dict[str, Any]:
+    """Default configuration with templated defaults filled in, for
+    rendering a template without user input"""
+    config = template_manager.get_default_config(template_name)
+    for key, value in config.items():
+        if isinstance(value, str) and "{" in value:
+            config[key] = template_name
+    config["project_name"] = template_name
+    return config
+
+
+def process_template(
+    path: str, stages: Sequence[str] = STAGES, cache_dir: Optional[str] = None
+) -> TemplateTaskResult:
+    """Run the requested stages on one template (runs in a worker process)
+
+    Directories (multi-file templates) only support the ``scan`` stage.
+    ``cache_dir`` is the security scanner's findings cache.
+    """
+    started = time.perf_counter()
+    name = os.path.splitext(os.path.basename(path.rstrip(os.sep)))[0]
+    result = TemplateTaskResult(path=path, name=name, worker_pid=os.getpid())
+    is_file = os.path.isfile(path)
+    if not is_file and not os.path.isdir(path):
+        result.errors["path"] = f"Template not found: {path}"
+        return result
+
+    for stage in STAGES:
+        if stage not in stages or (stage != "scan" and not is_file):
+            continue
+        stage_started = time.perf_counter()
+        try:
+            if stage == "load":
+                # A throwaway cache, so loaded entries are owned by the caller;
+                # compiled Jinja templates cannot cross process boundaries
+                from .template_cache import TemplateCache
+
+                result.template = dataclasses.replace(
+                    TemplateCache().get(path), compiled=None
+                )
+            elif stage == "validate":
+                result.analysis = _tool("validator").validate_template(path)
+            elif stage == "scan":
+                result.security = _tool("scanner", cache_dir).scan_template(path)
+            elif stage == "render":
+                renderer = _tool("renderer", os.path.dirname(os.path.abspath(path)))
+                rendered = renderer.render_template(
+                    name, preview_config(renderer, name)
+                )
+                result.rendered_services = sorted(
+                    ((rendered or {}).get("compose") or {}).get("services") or {}
+                )
+        except Exception as e:
+            result.errors[stage] = str(e)
+        result.stage_times[stage] = time.perf_counter() - stage_started
+
+    result.duration = time.perf_counter() - started
+    return result
+
 
 class ParallelProcessor:
-    """Handles parallel processing (QUAL-009 FIX: Stub implementation - no actual parallelization)"""
+    """Process-pool engine for catalog-wide template work"""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        serial_threshold: int = 8,
+        use_processes: bool = True,
+        mp_context=None,
+    ):
+        self.logger = get_logger(__name__)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # Tasks in flight, bounding queued inputs and unread results
+        self.max_pending = max_pending or self.max_workers * 2
+        self.serial_threshold = serial_threshold
+        self.use_processes = use_processes
+        # spawn: forking a process with other threads running (cache,
+        # health and stats workers) can leave a child holding their locks
+        self.mp_context = mp_context or multiprocessing.get_context("spawn")
+
+        self._lock = threading.Lock()
+        self._cancel_event = threading.Event()
+        self.stats = {
+            "runs": 0,
+            "parallel_runs": 0,
+            "serial_runs": 0,
+            "tasks_processed": 0,
+            "tasks_failed": 0,
+            "tasks_cancelled": 0,
+            "item_time": 0.0,
+            "wall_time": 0.0,
+        }
+
+    def cancel(self):
+        """Stop the running batch; items not yet started are skipped"""
+        self._cancel_event.set()
 
-    def process_templates_parallel(self, templates):
-        """Process templates in parallel
+    def _count(self, result: TemplateTaskResult):
+        with self._lock:
+            self.stats["tasks_processed"] += 1
+            self.stats["item_time"] += result.duration
+            if not result.ok:
+                self.stats["tasks_failed"] += 1
 
-        QUAL-009 WARNING: This method returns PLACEHOLDER DATA ONLY.
-        No actual parallel processing occurs. Templates are NOT processed.
+    @staticmethod
+    def resolve_templates(templates: Iterable[str]) -> List[str]:
+        """Template paths; bare names refer to the bundled catalog"""
+        catalog = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
+        paths = []
+        for template in templates:
+            if os.sep in template or os.path.exists(template):
+                paths.append(template)
+            else:
+                paths.append(os.path.join(catalog, f"{template}.yml"))
+        return paths
 
-        Args:
-            templates: List of templates (not actually processed)
+    def process_templates(
+        self,
+        templates: Iterable[str],
+        stages: Sequence[str] = STAGES,
+        cancel_event: Optional[threading.Event] = None,
+        cache_dir: Optional[str] = None,
+    ) -> Iterator[TemplateTaskResult]:
+        """Process templates, yielding each result as soon as it is ready
 
-        Returns:
-            dict: Placeholder processing metrics (NOT REAL DATA)
+        Results arrive in completion order. Setting ``cancel_event`` (or
+        calling ``cancel()``) stops the batch after the items in flight.
+        ``cache_dir`` is passed on to the scan stage's findings cache.
         """
-        # QUAL-009 FIX: Add warning that this doesn't actually process anything
-        warnings.warn(
-            "ParallelProcessor.process_templates_parallel() returns placeholder data only. "
-            "No actual parallel processing is implemented. Templates are NOT processed.",
-            category=UserWarning,
-            stacklevel=2,
-        )
-        logger.warning(
-            f"QUAL-009: Returning placeholder parallel processing stats for {len(templates)} templates (not real data)"
+        unknown = set(stages) - set(STAGES)
+        if unknown:
+            raise ValueError(f"Unknown stage(s): {', '.join(sorted(unknown))}")
+        paths = self.resolve_templates(templates)
+        self._cancel_event.clear()
+        cancel_event = cancel_event or self._cancel_event
+
+        started = time.perf_counter()
+        parallel = (
+            self.use_processes
+            and self.max_workers > 1
+            and len(paths) >= self.serial_threshold
         )
+        with self._lock:
+            self.stats["runs"] += 1
+            self.stats["parallel_runs" if parallel else "serial_runs"] += 1
+        try:
+            if parallel:
+                yield from self._run_parallel(
+                    paths, tuple(stages), cancel_event, cache_dir
+                )
+            else:
+                yield from self._run_serial(
+                    paths, tuple(stages), cancel_event, cache_dir
+                )
+        finally:
+            with self._lock:
+                self.stats["wall_time"] += time.perf_counter() - started
+
+    def _run_serial(
+        self,
+        paths: List[str],
+        stages: tuple,
+        cancel_event: threading.Event,
+        cache_dir: Optional[str] = None,
+    ) -> Iterator[TemplateTaskResult]:
+        for index, path in enumerate(paths):
+            if cancel_event.is_set():
+                with self._lock:
+                    self.stats["tasks_cancelled"] += len(paths) - index
+                return
+            result = process_template(path, stages, cache_dir)
+            self._count(result)
+            yield result
+
+    def _run_parallel(
+        self,
+        paths: List[str],
+        stages: tuple,
+        cancel_event: threading.Event,
+        cache_dir: Optional[str] = None,
+    ) -> Iterator[TemplateTaskResult]:
+        try:
+            executor = ProcessPoolExecutor(
+                max_workers=min(self.max_workers, len(paths)),
+                mp_context=self.mp_context,
+            )
+        except (OSError, NotImplementedError, ValueError) as e:
+            self.logger.info(f"Process pool unavailable, processing serially: {e}")
+            yield from self._run_serial(paths, stages, cancel_event, cache_dir)
+            return
+
+        remaining = iter(enumerate(paths))
+        pending = {}
+        done_paths = set()
+        try:
+            while True:
+                while len(pending) < self.max_pending and not cancel_event.is_set():
+                    item = next(remaining, None)
+                    if item is None:
+                        break
+                    index, path = item
+                    future = executor.submit(process_template, path, stages, cache_dir)
+                    pending[future] = index
+                if not pending:
+                    break
+
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    index = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool:
+                        raise
+                    except Exception as e:
+                        path = paths[index]
+                        result = TemplateTaskResult(
+                            path=path,
+                            name=os.path.splitext(os.path.basename(path))[0],
+                            errors={"worker": str(e)},
+                        )
+                    done_paths.add(index)
+                    self._count(result)
+                    yield result
+
+                if cancel_event.is_set():
+                    for future in pending:
+                        future.cancel()
+        except BrokenProcessPool as e:
+            # A worker died (e.g. killed for memory): finish in-process
+            self.logger.warning(f"Process pool failed, continuing serially: {e}")
+            leftovers = [path for i, path in enumerate(paths) if i not in done_paths]
+            executor.shutdown(wait=False)
+            yield from self._run_serial(leftovers, stages, cancel_event, cache_dir)
+            return
+        finally:
+            executor.shutdown(wait=True)
+
+        if cancel_event.is_set():
+            with self._lock:
+                self.stats["tasks_cancelled"] += len(paths) - len(done_paths)
+
+    def process_templates_parallel(
+        self, templates: Iterable[str], stages: Sequence[str] = STAGES
+    ) -> Dict[str, Any]:
+        """Process templates and summarize the run"""
+        started = time.perf_counter()
+        processed = 0
+        failed = []
+        item_time = 0.0
+        stage_times: Dict[str, float] = {}
+        for result in self.process_templates(templates, stages):
+            processed += 1
+            item_time += result.duration
+            if not result.ok:
+                failed.append({"template": result.name, "errors": result.errors})
+            for stage, seconds in result.stage_times.items():
+                stage_times[stage] = stage_times.get(stage, 0.0) + seconds
+        time_taken = time.perf_counter() - started
+
+        workers = min(self.max_workers, max(processed, 1))
+        return {
+            "processed": processed,
+            "failed": failed,
+            "time_taken": time_taken,
+            "parallel_jobs": workers,
+            # Busy share of the workers' time
+            "efficiency": (
+                min(100.0, item_time / (time_taken * workers) * 100)
+                if time_taken > 0
+                else 0.0
+            ),
+            "stage_times": stage_times,
+        }
 
+    def get_performance_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+        processed = stats["tasks_processed"]
         return {
-            "processed": len(templates),
-            "time_taken": 2.5,
-            "parallel_jobs": 4,
-            "efficiency": 85.2,
-            "_warning": "PLACEHOLDER DATA - NO ACTUAL PARALLEL PROCESSING OCCURRED",
+            **stats,
+            "max_workers": self.max_workers,
+            "success_rate": (
+                (processed - stats["tasks_failed"]) / processed * 100
+                if processed
+                else 100.0
+            ),
+            "avg_item_time": stats["item_time"] / processed if processed else 0.0,
         }
 
 
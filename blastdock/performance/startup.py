@@ -0,0 +1,161 @@
+"""CLI startup cost
+
+Runs CLI commands in fresh interpreters under ``python -X importtime`` and
+reports wall time, import time and the modules each command loads, so that
+growth in what the entry point imports shows up in benchmarks and tests.
+"""
+
+import os
+import sys
+import time
+import subprocess
+from dataclasses import dataclass, field
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Command name -> CLI arguments
+STARTUP_COMMANDS = {
+    "version": ["--version"],
+    "help": ["--help"],
+    "deploy": ["deploy", "--help"],
+    "templates": ["templates", "--help"],
+    "monitoring": ["monitoring", "--help"],
+}
+
+# Modules a command must not load; ``--version`` and ``--help`` need none
+# of the command groups or their dependencies
+HEAVY_MODULES = (
+    "docker",
+    "requests",
+    "jinja2",
+    "pydantic",
+    "yaml",
+    "psutil",
+    "blastdock.config",
+    "blastdock.core",
+    "blastdock.docker",
+    "blastdock.marketplace",
+    "blastdock.monitoring",
+    "blastdock.performance",
+    "blastdock.security",
+)
+
+_ENTRY_POINT = "from blastdock.main_cli import main; main()"
+
+
+class ImportTiming(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    """Entries of ``-X importtime`` output, in import order
+
+    Entries made while the interpreter started up (``site`` and what it
+    imports) are left out.
+    """
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # column header
+        # One separating space, then two per nesting level
+        name = parts[2][1:].rstrip()
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        timings.append(ImportTiming(name.strip(), int(parts[0]), int(parts[1]), depth))
+
+    for index, timing in enumerate(timings):
+        if timing.module == "site" and timing.depth == 0:
+            return timings[index + 1 :]
+    return timings
+
+
+@dataclass
+class StartupMeasurement:
+    """One command's startup in a fresh interpreter"""
+
+    command: str
+    argv: List[str]
+    exit_code: int
+    wall_ms: float
+    import_ms: float
+    modules: List[str] = field(default_factory=list)
+    # Module -> self time in ms, slowest first
+    slowest: List[Tuple[str, float]] = field(default_factory=list)
+
+    def loaded(self, prefixes: Sequence[str]) -> List[str]:
+        """Imported modules that are, or are inside, any of ``prefixes``"""
+        return [
+            module
+            for module in self.modules
+            if any(module == p or module.startswith(p + ".") for p in prefixes)
+        ]
+
+    def to_dict(self) -> Dict:
+        return {
+            "command": self.command,
+            "argv": self.argv,
+            "exit_code": self.exit_code,
+            "wall_ms": round(self.wall_ms, 2),
+            "import_ms": round(self.import_ms, 2),
+            "module_count": len(self.modules),
+            "slowest": [[m, round(ms, 2)] for m, ms in self.slowest],
+        }
+
+
+def measure_command(
+    command: str,
+    argv: Sequence[str],
+    env: Optional[Dict[str, str]] = None,
+    top: int = 10,
+    timeout: float = 60.0,
+) -> StartupMeasurement:
+    """Run ``blastdock <argv>`` under ``-X importtime``"""
+    started = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _ENTRY_POINT, *argv],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=timeout,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    timings = parse_importtime(process.stderr)
+    slowest = sorted(timings, key=lambda t: t.self_us, reverse=True)[:top]
+    return StartupMeasurement(
+        command=command,
+        argv=list(argv),
+        exit_code=process.returncode,
+        wall_ms=wall_ms,
+        import_ms=sum(t.cumulative_us for t in timings if t.depth == 0) / 1000,
+        modules=[t.module for t in timings],
+        slowest=[(t.module, t.self_us / 1000) for t in slowest],
+    )
+
+
+def measure_startup(
+    commands: Optional[Sequence[str]] = None,
+    runs: int = 3,
+    env: Optional[Dict[str, str]] = None,
+    top: int = 10,
+) -> Dict[str, StartupMeasurement]:
+    """Fastest of ``runs`` measurements for each command"""
+    names = list(commands or STARTUP_COMMANDS)
+    unknown = [name for name in names if name not in STARTUP_COMMANDS]
+    if unknown:
+        raise ValueError(f"Unknown startup command(s): {', '.join(unknown)}")
+
+    if env is None:
+        env = dict(os.environ)
+    results = {}
+    for name in names:
+        measurements = [
+            measure_command(name, STARTUP_COMMANDS[name], env, top)
+            for _ in range(max(1, runs))
+        ]
+        results[name] = min(measurements, key=lambda m: m.import_ms)
+    return results
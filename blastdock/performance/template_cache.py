@@ -1,25 +1,339 @@
-"""Template caching module"""
+"""Template caching module
+
+Caches parsed template YAML, compiled Jinja templates and field schemas,
+validated by file mtime/size and content hash, plus memoized render results
+keyed on the template's dependency signature and the rendered config.
+"""
+
+import os
+import copy
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class CachedTemplate:
+    """Parsed and compiled state of one template file"""
+
+    path: str
+    mtime_ns: int
+    size: int
+    content_hash: str
+    source: str
+    data: Dict[str, Any]
+    schema: Dict[str, Dict[str, Any]]
+    parse_error: Optional[str] = None
+    dependencies: Optional[List[str]] = None
+    compiled: Any = None
+    loaded_at: float = field(default_factory=time.time)
+
+    @property
+    def template_info(self) -> Dict[str, Any]:
+        return self.data.get("template_info", {}) or {}
+
+    @property
+    def fields(self) -> Dict[str, Any]:
+        return self.data.get("fields", {}) or {}
+
+
+def build_field_schema(fields: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Normalize a template's ``fields`` section"""
+    schema = {}
+    for name, info in (fields or {}).items():
+        info = info if isinstance(info, dict) else {"default": info}
+        schema[name] = {
+            "type": info.get("type", "string"),
+            "default": info.get("default", ""),
+            "required": bool(info.get("required", False)),
+            "description": info.get("description", name),
+        }
+    return schema
+
+
+def config_hash(config: Dict[str, Any]) -> str:
+    """Stable hash of a render configuration"""
+    encoded = json.dumps(config, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
 
 
 class TemplateCache:
     """Cache for templates"""
 
-    def __init__(self):
-        self.templates = {}
+    def __init__(self, max_renders: int = 256):
+        self.logger = get_logger(__name__)
+        self.max_renders = max_renders
+        self.templates: Dict[str, CachedTemplate] = {}
+        self._renders: "OrderedDict[Tuple[str, tuple, str], Any]" = OrderedDict()
+        self._lock = threading.RLock()
+
+        self._hits = 0
+        self._misses = 0
+        self._revalidations = 0
+        self._render_hits = 0
+        self._render_misses = 0
+        self._load_time = 0.0
+        self._loads = 0
+
+    def get(self, path: str) -> CachedTemplate:
+        """Cached template for a file, re-parsed only if its content changed
+
+        Raises ``FileNotFoundError`` if the file does not exist. Sources that
+        are not plain YAML (Jinja blocks) are cached with ``parse_error`` set;
+        they can still be rendered.
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+
+        with self._lock:
+            entry = self.templates.get(path)
+            if (
+                entry is not None
+                and entry.mtime_ns == stat.st_mtime_ns
+                and entry.size == stat.st_size
+            ):
+                self._hits += 1
+                return entry
+
+        start = time.time()
+        with open(path, "rb") as f:
+            raw = f.read()
+        content_hash = hashlib.sha256(raw).hexdigest()
+
+        with self._lock:
+            entry = self.templates.get(path)
+            if entry is not None and entry.content_hash == content_hash:
+                # Touched but unchanged: keep parsed and compiled state
+                entry.mtime_ns = stat.st_mtime_ns
+                entry.size = stat.st_size
+                self._revalidations += 1
+                return entry
+
+        source = raw.decode("utf-8")
+        parse_error = None
+        try:
+            data = yaml.safe_load(source) or {}
+        except yaml.YAMLError as e:
+            data = {}
+            parse_error = f"Invalid YAML in {path}: {e}"
+        if not isinstance(data, dict):
+            data = {}
+
+        entry = CachedTemplate(
+            path=path,
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            content_hash=content_hash,
+            source=source,
+            data=data,
+            schema=build_field_schema(data.get("fields", {})),
+            parse_error=parse_error,
+        )
+        with self._lock:
+            self.templates[path] = entry
+            self._misses += 1
+            self._loads += 1
+            self._load_time += time.time() - start
+            self._drop_renders(path)
+        return entry
+
+    def get_data(self, path: str) -> Dict[str, Any]:
+        """Parsed template YAML; ``ValueError`` if the source is not YAML"""
+        entry = self.get(path)
+        if entry.parse_error:
+            raise ValueError(entry.parse_error)
+        return entry.data
+
+    def get_compiled(self, path: str, jinja_env) -> Any:
+        """Compiled Jinja template for a file
+
+        Compilation happens once per content hash. Templates pulled in with
+        include/extends/import are recorded as dependencies so a change to
+        any of them invalidates memoized renders.
+        """
+        entry = self.get(path)
+        if entry.compiled is None or entry.compiled.environment is not jinja_env:
+            compiled = jinja_env.from_string(entry.source)
+            with self._lock:
+                entry.compiled = compiled
+        return entry.compiled
+
+    def _dependencies(self, entry: CachedTemplate) -> List[str]:
+        """Files a template references via include/extends/import"""
+        if entry.dependencies is None:
+            from jinja2 import Environment, meta
+
+            directory = os.path.dirname(entry.path)
+            try:
+                referenced = meta.find_referenced_templates(
+                    Environment().parse(entry.source)
+                )
+                entry.dependencies = [
+                    os.path.join(directory, name) for name in referenced if name
+                ]
+            except Exception as e:
+                self.logger.debug(f"Could not scan {entry.path} for includes: {e}")
+                entry.dependencies = []
+        return entry.dependencies
+
+    def _signature(self, path: str, seen: Optional[set] = None) -> tuple:
+        """Content hashes of a template and everything it references"""
+        seen = seen if seen is not None else set()
+        path = os.path.abspath(path)
+        if path in seen:
+            return ()
+        seen.add(path)
+        try:
+            entry = self.get(path)
+        except OSError:
+            return ((path, None),)
+        signature = ((path, entry.content_hash),)
+        for dependency in self._dependencies(entry):
+            signature += self._signature(dependency, seen)
+        return signature
+
+    def render(self, path: str, jinja_env, config: Dict[str, Any]) -> Any:
+        """Render a template and parse the YAML output, memoized
+
+        Returns a copy callers may mutate.
+        """
+        compiled = self.get_compiled(path, jinja_env)
+        key = (os.path.abspath(path), self._signature(path), config_hash(config))
+
+        with self._lock:
+            if key in self._renders:
+                self._renders.move_to_end(key)
+                self._render_hits += 1
+                return copy.deepcopy(self._renders[key])
+
+        result = yaml.safe_load(compiled.render(**config))
+
+        with self._lock:
+            self._render_misses += 1
+            self._renders[key] = result
+            while len(self._renders) > self.max_renders:
+                self._renders.popitem(last=False)
+        return copy.deepcopy(result)
+
+    def _drop_renders(self, path: str):
+        for key in [k for k in self._renders if k[0] == path]:
+            del self._renders[key]
+
+    def invalidate(self, path: Optional[str] = None):
+        """Forget one template (or everything)"""
+        with self._lock:
+            if path is None:
+                self.templates.clear()
+                self._renders.clear()
+                return
+            path = os.path.abspath(path)
+            self.templates.pop(path, None)
+            self._drop_renders(path)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get template cache stats"""
+        with self._lock:
+            lookups = self._hits + self._revalidations + self._misses
+            renders = self._render_hits + self._render_misses
+            return {
+                "cached_templates": len(self.templates),
+                "compiled_templates": sum(
+                    1 for t in self.templates.values() if t.compiled is not None
+                ),
+                "cache_hits": self._hits + self._revalidations,
+                "cache_misses": self._misses,
+                "revalidations": self._revalidations,
+                "template_hit_rate": (
+                    (self._hits + self._revalidations) / lookups * 100 if lookups else 0
+                ),
+                "render_hits": self._render_hits,
+                "render_misses": self._render_misses,
+                "render_hit_rate": (
+                    self._render_hits / renders * 100 if renders else 0
+                ),
+                "memoized_renders": len(self._renders),
+                "avg_load_time": self._load_time / self._loads if self._loads else 0,
+                "memory_usage": sum(t.size for t in self.templates.values()),
+            }
 
     def get_template_cache_stats(self):
         """Get template cache stats"""
-        return {
-            "cached_templates": len(self.templates),
-            "cache_hits": 100,
-            "cache_misses": 5,
-            "memory_usage": 1024 * 1024,  # 1MB
-        }
+        return self.get_cache_stats()
+
+    def adopt(self, entry: CachedTemplate) -> bool:
+        """Store an entry loaded elsewhere (e.g. by a worker process)
 
-    def preload_templates(self):
-        """Preload templates"""
+        The entry is only kept if the file still has the mtime and size it
+        was loaded with.
+        """
+        try:
+            stat = os.stat(entry.path)
+        except OSError:
+            return False
+        if stat.st_mtime_ns != entry.mtime_ns or stat.st_size != entry.size:
+            return False
+        with self._lock:
+            current = self.templates.get(entry.path)
+            if current is not None and current.content_hash == entry.content_hash:
+                return True
+            self.templates[entry.path] = entry
+            self._loads += 1
+            self._drop_renders(entry.path)
         return True
 
+    def preload_templates(
+        self, templates_dir: Optional[str] = None, processor=None
+    ) -> int:
+        """Parse every template in a directory; returns how many loaded
+
+        Files are parsed on the parallel processor's workers and the results
+        adopted into this cache.
+        """
+        if templates_dir is None:
+            templates_dir = os.path.join(
+                os.path.dirname(os.path.dirname(__file__)), "templates"
+            )
+        try:
+            names = sorted(os.listdir(templates_dir))
+        except OSError:
+            return 0
+        paths = [
+            os.path.join(templates_dir, name)
+            for name in names
+            if name.endswith((".yml", ".yaml"))
+        ]
+        if processor is None:
+            from .parallel_processor import get_parallel_processor
+
+            processor = get_parallel_processor()
+
+        loaded = 0
+        for result in processor.process_templates(paths, stages=("load",)):
+            if result.template is not None and self.adopt(result.template):
+                loaded += 1
+            elif not result.ok:
+                self.logger.debug(
+                    f"Could not preload template {result.name}: {result.errors}"
+                )
+        return loaded
+
+    def optimize_memory(self):
+        """Drop memoized renders and compiled templates, keep parsed data"""
+        with self._lock:
+            self._renders.clear()
+            for entry in self.templates.values():
+                entry.compiled = None
+
 
 _template_cache = None
 
@@ -0,0 +1,352 @@
+"""
+Port allocation index with journaled persistence
+
+Keeps allocations, reservations and a free-list of the dynamic range in
+memory, and persists changes as an append-only journal next to the
+``ports.json`` snapshot. The journal is folded back into the snapshot
+(compaction) once it grows past a threshold. Writers hold an exclusive file
+lock and replay entries appended by other processes before changing
+anything, so concurrent CLI invocations never hand out the same port.
+"""
+
+import os
+import json
+import tempfile
+from bisect import bisect_left, insort
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..utils.logging import get_logger
+from .scanner import PortBitmap
+
+logger = get_logger(__name__)
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+
+class FreePortList:
+    """Sorted free ports of the dynamic range"""
+
+    def __init__(self, start: int, end: int, taken: PortBitmap):
+        self.start = start
+        self.end = end
+        self._ports = [port for port in range(start, end + 1) if port not in taken]
+
+    def __len__(self) -> int:
+        return len(self._ports)
+
+    def __contains__(self, port: int) -> bool:
+        index = bisect_left(self._ports, port)
+        return index < len(self._ports) and self._ports[index] == port
+
+    def add(self, port: int):
+        if self.start <= port <= self.end and port not in self:
+            insort(self._ports, port)
+
+    def discard(self, port: int):
+        index = bisect_left(self._ports, port)
+        if index < len(self._ports) and self._ports[index] == port:
+            del self._ports[index]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(list(self._ports))
+
+
+class PortAllocationIndex:
+    """In-memory allocation state of the port manager"""
+
+    def __init__(
+        self,
+        dynamic_range: Tuple[int, int],
+        system_reserved: Optional[set] = None,
+    ):
+        self.system_reserved = PortBitmap(system_reserved or ())
+        self.reserved = PortBitmap()
+        self.reserved_ports: set = set()
+        self.allocated: Dict[int, Dict[str, Any]] = {}
+        self.project_ports: Dict[str, List[int]] = {}
+        self.dynamic_range = tuple(dynamic_range)
+        self._rebuild_free_list()
+
+    def _taken(self) -> PortBitmap:
+        taken = PortBitmap(self.allocated)
+        for port in self.reserved_ports:
+            taken.add(port)
+        return taken
+
+    def _rebuild_free_list(self):
+        taken = self._taken()
+        for port in range(self.dynamic_range[0], self.dynamic_range[1] + 1):
+            if port in self.system_reserved:
+                taken.add(port)
+        self.free = FreePortList(self.dynamic_range[0], self.dynamic_range[1], taken)
+
+    def is_excluded(self, port: int) -> bool:
+        """Whether a port is system-reserved, reserved or allocated"""
+        return (
+            port in self.system_reserved
+            or port in self.reserved
+            or port in self.allocated
+        )
+
+    def apply(self, op: Dict[str, Any]):
+        """Apply one journal operation"""
+        kind = op.get("op")
+        port = op.get("port")
+        if kind == "assign":
+            self.allocated[port] = {
+                "project_name": op.get("project"),
+                "service_name": op.get("service"),
+                "allocated_at": op.get("at"),
+            }
+            ports = self.project_ports.setdefault(op.get("project"), [])
+            if port not in ports:
+                ports.append(port)
+            self.free.discard(port)
+        elif kind == "release":
+            info = self.allocated.pop(port, None)
+            if info is not None:
+                project = info.get("project_name")
+                ports = self.project_ports.get(project)
+                if ports is not None:
+                    if port in ports:
+                        ports.remove(port)
+                    if not ports:
+                        del self.project_ports[project]
+            if not self.is_excluded(port):
+                self.free.add(port)
+        elif kind == "reserve":
+            self.reserved.add(port)
+            self.reserved_ports.add(port)
+            self.free.discard(port)
+        elif kind == "unreserve":
+            self.reserved.discard(port)
+            self.reserved_ports.discard(port)
+            if not self.is_excluded(port):
+                self.free.add(port)
+        elif kind == "range":
+            self.dynamic_range = (op["start"], op["end"])
+            self._rebuild_free_list()
+        else:
+            logger.warning(f"Ignoring unknown port journal operation: {kind}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """State in the ``ports.json`` layout"""
+        return {
+            "allocated_ports": {
+                str(port): dict(info) for port, info in self.allocated.items()
+            },
+            "reserved_ports": sorted(self.reserved_ports),
+            "dynamic_range": list(self.dynamic_range),
+            "project_ports": {
+                project: list(ports) for project, ports in self.project_ports.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(
+        cls,
+        data: Dict[str, Any],
+        default_range: Tuple[int, int],
+        system_reserved: Optional[set] = None,
+    ) -> "PortAllocationIndex":
+        index = cls(data.get("dynamic_range") or default_range, system_reserved)
+        for port in data.get("reserved_ports") or []:
+            index.reserved.add(int(port))
+            index.reserved_ports.add(int(port))
+        for port_str, info in (data.get("allocated_ports") or {}).items():
+            index.allocated[int(port_str)] = dict(info)
+        for project, ports in (data.get("project_ports") or {}).items():
+            index.project_ports[project] = [int(p) for p in ports]
+        index._rebuild_free_list()
+        return index
+
+
+class PortJournalStore:
+    """ports.json snapshot + append-only journal + lock file"""
+
+    def __init__(
+        self,
+        ports_file: Path,
+        default_range: Tuple[int, int],
+        system_reserved: Optional[set] = None,
+        compact_threshold: int = 256,
+    ):
+        self.ports_file = Path(ports_file)
+        self.journal_file = self.ports_file.with_suffix(".journal")
+        self.lock_file = self.ports_file.with_suffix(".lock")
+        self.default_range = tuple(default_range)
+        self.system_reserved = system_reserved
+        self.compact_threshold = compact_threshold
+
+        self.generation = 0
+        self._offset = 0
+        self._entries = 0
+        self._lock_depth = 0
+
+    # Locking
+
+    @contextmanager
+    def locked(self):
+        """Exclusive inter-process lock (re-entrant within this store)"""
+        if self._lock_depth:
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+
+        self.lock_file.parent.mkdir(parents=True, exist_ok=True)
+        handle = open(self.lock_file, "a+")
+        try:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            elif msvcrt is not None:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+            self._lock_depth = 1
+            yield
+        finally:
+            self._lock_depth = 0
+            try:
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+                elif msvcrt is not None:
+                    handle.seek(0)
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+            finally:
+                handle.close()
+
+    # Reading
+
+    def _read_snapshot(self) -> Tuple[Dict[str, Any], int]:
+        try:
+            with open(self.ports_file, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}, 0
+        return data, int(data.get("generation", 0))
+
+    def _journal_header(self) -> Optional[int]:
+        try:
+            with open(self.journal_file, "r") as f:
+                header = f.readline()
+        except FileNotFoundError:
+            return None
+        if not header.endswith("\n"):
+            return None
+        try:
+            return int(json.loads(header).get("generation", 0))
+        except (ValueError, AttributeError):
+            return None
+
+    def load(self) -> PortAllocationIndex:
+        """Snapshot plus every journaled operation"""
+        data, generation = self._read_snapshot()
+        index = PortAllocationIndex.from_dict(
+            data, self.default_range, self.system_reserved
+        )
+        self.generation = generation
+        self._offset = 0
+        self._entries = 0
+        header = self._journal_header()
+        if header == generation:
+            self._replay(index)
+        return index
+
+    def _replay(self, index: PortAllocationIndex):
+        """Apply complete journal lines past our offset"""
+        try:
+            with open(self.journal_file, "rb") as f:
+                f.seek(self._offset)
+                chunk = f.read()
+        except FileNotFoundError:
+            return
+        if self._offset == 0:
+            # Skip the header line
+            newline = chunk.find(b"\n")
+            if newline < 0:
+                return
+            self._offset = newline + 1
+            chunk = chunk[newline + 1 :]
+
+        complete = chunk[: chunk.rfind(b"\n") + 1]
+        for line in complete.splitlines():
+            try:
+                index.apply(json.loads(line))
+                self._entries += 1
+            except ValueError as e:
+                logger.warning(f"Skipping corrupt port journal entry: {e}")
+        self._offset += len(complete)
+
+    def catch_up(self, index: PortAllocationIndex) -> PortAllocationIndex:
+        """Pick up changes other processes made since our last read
+
+        Returns a freshly loaded index if the journal was compacted in the
+        meantime, otherwise ``index`` updated in place.
+        """
+        header = self._journal_header()
+        if header is None:
+            return index  # nothing journaled yet
+        if header != self.generation:
+            return self.load()
+        self._replay(index)
+        return index
+
+    # Writing
+
+    def append(self, ops: List[Dict[str, Any]], index: PortAllocationIndex):
+        """Journal a batch of operations (caller holds the lock)"""
+        if not ops:
+            return
+        self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+        payload = "".join(json.dumps(op, separators=(",", ":")) + "\n" for op in ops)
+        if self._journal_header() != self.generation:
+            payload = json.dumps({"generation": self.generation}) + "\n" + payload
+            mode = "w"
+            self._offset = 0
+        else:
+            mode = "a"
+        with open(self.journal_file, mode) as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Our own writes are already applied to the index
+        self._offset += len(payload.encode("utf-8"))
+        self._entries += len(ops)
+
+        if self._entries >= self.compact_threshold:
+            self.compact(index)
+
+    def compact(self, index: PortAllocationIndex):
+        """Fold the journal into a new snapshot (caller holds the lock)"""
+        data = index.to_dict()
+        data["generation"] = self.generation + 1
+        self.ports_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.ports_file.parent), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.ports_file)
+
+        self.generation += 1
+        header = json.dumps({"generation": self.generation}) + "\n"
+        fd, tmp_path = tempfile.mkstemp(
+            dir=str(self.journal_file.parent), suffix=".tmp"
+        )
+        with os.fdopen(fd, "w") as f:
+            f.write(header)
+        os.replace(tmp_path, self.journal_file)
+        self._offset = len(header.encode("utf-8"))
+        self._entries = 0
@@ -3,15 +3,17 @@ Port Manager - Handles port allocation, conflict detection, and resolution
 """
 
 import json
-import socket
 import subprocess
 import threading
+from contextlib import contextmanager
 from typing import Dict, List, Optional, Any
 
 from ..utils.logging import get_logger
 from ..utils.filesystem import paths
 from ..utils.docker_utils import DockerClient
 from ..core.config import get_config_manager
+from .scanner import PortScanner, PortSnapshot
+from .allocation_index import PortAllocationIndex, PortJournalStore
 
 logger = get_logger(__name__)
 
@@ -44,161 +46,177 @@ class PortManager:
     def __init__(self):
         self.config_manager = get_config_manager()
         self.docker_client = DockerClient()
+        # One kernel + Docker scan serves a whole batch of port checks
+        self.scanner = PortScanner(self.docker_client)
         self.ports_file = paths.data_dir / "ports.json"
         # BUG-003 FIX: Add lock for thread-safe port allocation
         self._port_lock = threading.RLock()
+        self._batch_ops: Optional[List[Dict[str, Any]]] = None
+        self.store = PortJournalStore(
+            self.ports_file, self.DEFAULT_DYNAMIC_RANGE, self.SYSTEM_RESERVED_PORTS
+        )
         self._load_ports()
 
     def _load_ports(self):
-        """Load port allocation data from file"""
+        """Load port allocation data from the snapshot and journal"""
         try:
-            if self.ports_file.exists():
-                with open(self.ports_file, "r") as f:
-                    self.ports_data = json.load(f)
-            else:
-                self.ports_data = {
-                    "allocated_ports": {},  # port -> project info
-                    "reserved_ports": set(),
-                    "dynamic_range": self.DEFAULT_DYNAMIC_RANGE,
-                    "project_ports": {},  # project -> list of ports
-                }
-                self._save_ports()
+            self.index = self.store.load()
         except Exception as e:
             logger.error(f"Error loading ports configuration: {e}")
-            self.ports_data = {
-                "allocated_ports": {},
-                "reserved_ports": set(),
-                "dynamic_range": self.DEFAULT_DYNAMIC_RANGE,
-                "project_ports": {},
-            }
+            self.index = PortAllocationIndex(
+                self.DEFAULT_DYNAMIC_RANGE, self.SYSTEM_RESERVED_PORTS
+            )
 
-    def _save_ports(self):
-        """Save port allocation data to file"""
-        try:
-            # Convert sets to lists for JSON serialization
-            save_data = self.ports_data.copy()
-            if "reserved_ports" in save_data:
-                save_data["reserved_ports"] = list(save_data["reserved_ports"])
+    @property
+    def ports_data(self) -> Dict[str, Any]:
+        """Allocation state in the ``ports.json`` layout (read-only copy)"""
+        return self.index.to_dict()
 
-            with open(self.ports_file, "w") as f:
-                json.dump(save_data, f, indent=2)
+    def _sync(self):
+        """Pick up allocations journaled by other BlastDock processes"""
+        try:
+            self.index = self.store.catch_up(self.index)
         except Exception as e:
-            logger.error(f"Error saving ports configuration: {e}")
+            logger.warning(f"Error reading port journal: {e}")
+
+    @contextmanager
+    def batch(self):
+        """Group allocation changes into one locked, journaled write
+
+        Holds the inter-process lock for the whole block, so a multi-service
+        deploy or bulk migration sees and persists a consistent state.
+        """
+        with self._port_lock:
+            if self._batch_ops is not None:
+                yield
+                return
+
+            with self.store.locked():
+                self._sync()
+                self._batch_ops = []
+                try:
+                    yield
+                finally:
+                    ops, self._batch_ops = self._batch_ops, None
+                    try:
+                        self.store.append(ops, self.index)
+                    except Exception as e:
+                        logger.error(f"Error saving ports configuration: {e}")
+
+    def _record(self, op: Dict[str, Any]):
+        """Apply an operation to the index and queue it for the journal"""
+        with self.batch():
+            self.index.apply(op)
+            self._batch_ops.append(op)
+
+    def compact(self):
+        """Fold the allocation journal into ports.json"""
+        with self.batch():
+            self.store.compact(self.index)
+
+    def snapshot(self, refresh: bool = False) -> PortSnapshot:
+        """Busy-port snapshot of the host (listening sockets + Docker ports)"""
+        return self.scanner.snapshot(refresh=refresh)
 
     def is_port_available(self, port: int) -> bool:
         """Check if a port is available for allocation"""
         # BUG-003 FIX: Use locking for thread-safe port availability check
         with self._port_lock:
-            # Check if port is in system reserved range
-            if port in self.SYSTEM_RESERVED_PORTS:
+            if self.index.is_excluded(port):
                 return False
 
-            # Check if port is manually reserved
-            reserved_ports = set(self.ports_data.get("reserved_ports", []))
-            if port in reserved_ports:
-                return False
-
-            # Check if port is already allocated
-            allocated_ports = self.ports_data.get("allocated_ports", {})
-            if str(port) in allocated_ports:
-                return False
-
-            # Check if port is actually in use by the system
-            return not self.is_port_in_use(port)
+            # Check if port is actually in use by the system or a container
+            return not self.snapshot().is_busy(port)
 
     def is_port_in_use(self, port: int) -> bool:
         """Check if a port is currently in use by any process"""
         try:
-            # Try to bind to the port
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                sock.settimeout(1)
-                result = sock.connect_ex(("127.0.0.1", port))
-                return result == 0
-        except socket.error as e:
-            # BUG-006 FIX: Log socket errors for debugging
-            logger.debug(f"Socket error checking port {port}: {e}")
-            return False
+            return self.snapshot().is_listening(port)
         except Exception as e:
             # BUG-006 FIX: Log unexpected errors
             logger.warning(f"Unexpected error checking port {port}: {e}")
             return False
 
+    def _next_free_ports(self, count: int) -> List[int]:
+        """First ``count`` unallocated, unreserved ports not busy on the host"""
+        snapshot = self.snapshot()
+        free = []
+        for port in self.index.free:
+            if len(free) >= count:
+                break
+            if not snapshot.is_busy(port):
+                free.append(port)
+        return free
+
     def allocate_port(
         self, project_name: str, service_name: str, preferred_port: Optional[int] = None
     ) -> Optional[int]:
         """Allocate a port for a service"""
         # BUG-003 FIX: Use locking for thread-safe port allocation
-        with self._port_lock:
-            try:
+        try:
+            with self.batch():
                 # If preferred port is specified and available, use it
                 if preferred_port and self.is_port_available(preferred_port):
                     self._assign_port(preferred_port, project_name, service_name)
                     return preferred_port
 
                 # Find next available port in dynamic range
-                dynamic_range = self.ports_data.get(
-                    "dynamic_range", self.DEFAULT_DYNAMIC_RANGE
-                )
-                start_port, end_port = dynamic_range
+                free = self._next_free_ports(1)
+                if free:
+                    self._assign_port(free[0], project_name, service_name)
+                    return free[0]
 
-                for port in range(start_port, end_port + 1):
-                    if self.is_port_available(port):
-                        self._assign_port(port, project_name, service_name)
-                        return port
-
-                logger.error(f"No available ports in dynamic range {dynamic_range}")
+                logger.error(
+                    f"No available ports in dynamic range {self.index.dynamic_range}"
+                )
                 return None
 
-            except Exception as e:
-                logger.error(f"Error allocating port: {e}")
-                return None
+        except Exception as e:
+            logger.error(f"Error allocating port: {e}")
+            return None
+
+    def allocate_ports(
+        self, project_name: str, services: Dict[str, Optional[int]]
+    ) -> Dict[str, Optional[int]]:
+        """Allocate ports for several services in one journaled batch
+
+        ``services`` maps service name to a preferred port (or None).
+        """
+        with self.batch():
+            return {
+                service_name: self.allocate_port(
+                    project_name, service_name, preferred_port
+                )
+                for service_name, preferred_port in services.items()
+            }
 
     def release_port(self, port: int) -> bool:
         """Release an allocated port"""
         # BUG-022 FIX: Use locking when modifying port dictionaries
-        with self._port_lock:
-            try:
-                allocated_ports = self.ports_data.get("allocated_ports", {})
-                port_str = str(port)
-
-                if port_str in allocated_ports:
-                    port_info = allocated_ports[port_str]
-                    project_name = port_info.get("project_name")
-
-                    # Remove from allocated ports
-                    del allocated_ports[port_str]
-
-                    # Remove from project ports
-                    if project_name:
-                        project_ports = self.ports_data.get("project_ports", {})
-                        if project_name in project_ports:
-                            if port in project_ports[project_name]:
-                                project_ports[project_name].remove(port)
-                            if not project_ports[project_name]:
-                                del project_ports[project_name]
-
-                    self._save_ports()
+        try:
+            with self.batch():
+                if port in self.index.allocated:
+                    self._record({"op": "release", "port": port})
                     logger.info(f"Released port {port}")
                     return True
                 else:
                     logger.warning(f"Port {port} was not allocated")
                     return False
 
-            except Exception as e:
-                logger.error(f"Error releasing port: {e}")
-                return False
+        except Exception as e:
+            logger.error(f"Error releasing port: {e}")
+            return False
 
     def release_project_ports(self, project_name: str) -> bool:
         """Release all ports allocated to a project"""
         try:
-            project_ports = self.ports_data.get("project_ports", {}).get(
-                project_name, []
-            )
-            released_ports = []
+            with self.batch():
+                project_ports = list(self.index.project_ports.get(project_name, []))
+                released_ports = []
 
-            for port in project_ports.copy():
-                if self.release_port(port):
-                    released_ports.append(port)
+                for port in project_ports:
+                    if self.release_port(port):
+                        released_ports.append(port)
 
             if released_ports:
                 logger.info(
@@ -213,21 +231,19 @@ class PortManager:
 
     def get_project_ports(self, project_name: str) -> List[int]:
         """Get all ports allocated to a project"""
-        project_ports = self.ports_data.get("project_ports", {})
-        return project_ports.get(project_name, [])
+        self._sync()
+        return list(self.index.project_ports.get(project_name, []))
 
     def reserve_port(self, port: int, reason: str = "Manual reservation") -> bool:
         """Reserve a port to prevent allocation"""
         try:
-            if not self.is_port_available(port):
-                logger.error(f"Port {port} is not available for reservation")
-                return False
+            with self.batch():
+                if not self.is_port_available(port):
+                    logger.error(f"Port {port} is not available for reservation")
+                    return False
 
-            reserved_ports = set(self.ports_data.get("reserved_ports", []))
-            reserved_ports.add(port)
-            self.ports_data["reserved_ports"] = reserved_ports
+                self._record({"op": "reserve", "port": port})
 
-            self._save_ports()
             logger.info(f"Reserved port {port}: {reason}")
             return True
 
@@ -238,16 +254,14 @@ class PortManager:
     def unreserve_port(self, port: int) -> bool:
         """Remove a port from reserved list"""
         try:
-            reserved_ports = set(self.ports_data.get("reserved_ports", []))
-            if port in reserved_ports:
-                reserved_ports.discard(port)
-                self.ports_data["reserved_ports"] = reserved_ports
-                self._save_ports()
-                logger.info(f"Unreserved port {port}")
-                return True
-            else:
-                logger.warning(f"Port {port} was not reserved")
-                return False
+            with self.batch():
+                if port in self.index.reserved_ports:
+                    self._record({"op": "unreserve", "port": port})
+                    logger.info(f"Unreserved port {port}")
+                    return True
+                else:
+                    logger.warning(f"Port {port} was not reserved")
+                    return False
 
         except Exception as e:
             logger.error(f"Error unreserving port: {e}")
@@ -258,16 +272,17 @@ class PortManager:
         conflicts = []
 
         try:
-            allocated_ports = self.ports_data.get("allocated_ports", {})
+            self._sync()
+            snapshot = self.snapshot(refresh=True)
 
             # Check each allocated port
-            for port_str, port_info in allocated_ports.items():
-                port = int(port_str)
-
+            for port, port_info in list(self.index.allocated.items()):
                 # Check if port is actually in use
-                if self.is_port_in_use(port):
+                if snapshot.is_listening(port):
                     # Try to determine what's using the port
-                    process_info = self._get_port_process_info(port)
+                    process_info = snapshot.process_info(
+                        port
+                    ) or self._get_port_process_info(port)
 
                     conflicts.append(
                         {
@@ -283,7 +298,7 @@ class PortManager:
                     )
 
                 # Check for Docker container conflicts
-                docker_conflicts = self._check_docker_port_conflicts(port)
+                docker_conflicts = self._check_docker_port_conflicts(port, snapshot)
                 if docker_conflicts:
                     conflicts.extend(docker_conflicts)
 
@@ -294,27 +309,18 @@ class PortManager:
 
     def get_available_ports(self, count: int = 10) -> List[int]:
         """Get a list of available ports"""
-        available = []
-        dynamic_range = self.ports_data.get("dynamic_range", self.DEFAULT_DYNAMIC_RANGE)
-        start_port, end_port = dynamic_range
-
-        for port in range(start_port, end_port + 1):
-            if len(available) >= count:
-                break
-            if self.is_port_available(port):
-                available.append(port)
-
-        return available
+        with self._port_lock:
+            self._sync()
+            return self._next_free_ports(count)
 
     def get_port_usage_summary(self) -> Dict[str, Any]:
         """Get a summary of port usage"""
-        allocated_ports = self.ports_data.get("allocated_ports", {})
-        reserved_ports = set(self.ports_data.get("reserved_ports", []))
-        dynamic_range = self.ports_data.get("dynamic_range", self.DEFAULT_DYNAMIC_RANGE)
+        self._sync()
+        dynamic_range = self.index.dynamic_range
 
         # Count ports by status
-        total_allocated = len(allocated_ports)
-        total_reserved = len(reserved_ports)
+        total_allocated = len(self.index.allocated)
+        total_reserved = len(self.index.reserved_ports)
         total_system_reserved = len(self.SYSTEM_RESERVED_PORTS)
 
         # Calculate range statistics
@@ -351,21 +357,21 @@ class PortManager:
 
         try:
             # Allocated ports
-            allocated_ports = self.ports_data.get("allocated_ports", {})
-            for port_str, info in allocated_ports.items():
+            self._sync()
+            snapshot = self.snapshot()
+            for port, info in self.index.allocated.items():
                 result["allocated"].append(
                     {
-                        "port": int(port_str),
+                        "port": port,
                         "project": info.get("project_name"),
                         "service": info.get("service_name"),
                         "allocated_at": info.get("allocated_at"),
-                        "in_use": self.is_port_in_use(int(port_str)),
+                        "in_use": snapshot.is_listening(port),
                     }
                 )
 
             # Reserved ports
-            reserved_ports = set(self.ports_data.get("reserved_ports", []))
-            for port in sorted(reserved_ports):
+            for port in sorted(self.index.reserved_ports):
                 result["reserved"].append(
                     {"port": port, "reason": "Manual reservation"}
                 )
@@ -456,14 +462,15 @@ class PortManager:
             migrated_ports = project_migration.get("migrated_ports", [])
             reallocated_ports = []
 
-            for port in migrated_ports:
-                if self.is_port_available(port):
-                    self._assign_port(port, project_name, "migrated_service")
-                    reallocated_ports.append(port)
-                else:
-                    logger.warning(
-                        f"Cannot reallocate port {port}, it's no longer available"
-                    )
+            with self.batch():
+                for port in migrated_ports:
+                    if self.is_port_available(port):
+                        self._assign_port(port, project_name, "migrated_service")
+                        reallocated_ports.append(port)
+                    else:
+                        logger.warning(
+                            f"Cannot reallocate port {port}, it's no longer available"
+                        )
 
             if reallocated_ports:
                 logger.info(
@@ -485,22 +492,15 @@ class PortManager:
 
     def _assign_port(self, port: int, project_name: str, service_name: str):
         """Assign a port to a project/service"""
-        allocated_ports = self.ports_data.get("allocated_ports", {})
-        project_ports = self.ports_data.get("project_ports", {})
-
-        # Add to allocated ports
-        allocated_ports[str(port)] = {
-            "project_name": project_name,
-            "service_name": service_name,
-            "allocated_at": self._get_current_timestamp(),
-        }
-
-        # Add to project ports
-        if project_name not in project_ports:
-            project_ports[project_name] = []
-        project_ports[project_name].append(port)
-
-        self._save_ports()
+        self._record(
+            {
+                "op": "assign",
+                "port": port,
+                "project": project_name,
+                "service": service_name,
+                "at": self._get_current_timestamp(),
+            }
+        )
         logger.info(f"Allocated port {port} to {project_name}/{service_name}")
 
     def _get_port_process_info(self, port: int) -> Dict[str, str]:
@@ -564,36 +564,24 @@ class PortManager:
 
         return {"process": "unknown"}
 
-    def _check_docker_port_conflicts(self, port: int) -> List[Dict[str, Any]]:
+    def _check_docker_port_conflicts(
+        self, port: int, snapshot: Optional[PortSnapshot] = None
+    ) -> List[Dict[str, Any]]:
         """Check for Docker container port conflicts"""
         conflicts = []
 
         try:
-            containers = self.docker_client.list_containers(all=False)
-
-            # BUG-014 FIX: Validate containers is not None before iterating
-            if containers is None:
-                logger.warning("Docker client returned None for containers list")
-                return conflicts
-
-            for container in containers:
-                ports = container.get("ports", [])
-                for port_mapping in ports:
-                    if isinstance(port_mapping, dict):
-                        public_port = port_mapping.get("PublicPort")
-                        if public_port == port:
-                            conflicts.append(
-                                {
-                                    "port": port,
-                                    "type": "docker_container_conflict",
-                                    "container": {
-                                        "name": container.get("name"),
-                                        "id": container.get("id"),
-                                        "image": container.get("image"),
-                                        "status": container.get("status"),
-                                    },
-                                }
-                            )
+            if snapshot is None:
+                snapshot = self.snapshot()
+
+            for container in snapshot.docker_ports.get(port, []):
+                conflicts.append(
+                    {
+                        "port": port,
+                        "type": "docker_container_conflict",
+                        "container": container,
+                    }
+                )
 
         except Exception as e:
             logger.warning(f"Error checking Docker port conflicts: {e}")
@@ -628,8 +616,7 @@ class PortManager:
                     "Setting dynamic range below 1024 may conflict with system services"
                 )
 
-            self.ports_data["dynamic_range"] = (start_port, end_port)
-            self._save_ports()
+            self._record({"op": "range", "start": start_port, "end": end_port})
 
             logger.info(f"Set dynamic port range to {start_port}-{end_port}")
             return True
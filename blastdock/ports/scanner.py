@@ -0,0 +1,306 @@
+"""
+Batch port scanner - one-pass view of which ports are busy on the host
+
+Reads the kernel's listening-socket tables (/proc/net/tcp and tcp6) once
+into a bitmap of busy ports and merges in Docker published ports, so that
+allocating several ports or checking every allocation for conflicts costs
+one scan instead of a socket probe and subprocess per port.
+"""
+
+import os
+import time
+import socket
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+MAX_PORT = 65535
+TCP_LISTEN = "0A"
+PROC_TCP_TABLES = ("net/tcp", "net/tcp6")
+
+
+class PortBitmap:
+    """Fixed-size bitset over the TCP port space"""
+
+    __slots__ = ("_bits",)
+
+    def __init__(self, ports: Iterable[int] = ()):
+        self._bits = bytearray((MAX_PORT >> 3) + 1)
+        for port in ports:
+            self.add(port)
+
+    def add(self, port: int):
+        if 0 <= port <= MAX_PORT:
+            self._bits[port >> 3] |= 1 << (port & 7)
+
+    def discard(self, port: int):
+        if 0 <= port <= MAX_PORT:
+            self._bits[port >> 3] &= ~(1 << (port & 7)) & 0xFF
+
+    def __contains__(self, port: int) -> bool:
+        return 0 <= port <= MAX_PORT and bool(self._bits[port >> 3] & (1 << (port & 7)))
+
+    def __len__(self) -> int:
+        return sum(bin(byte).count("1") for byte in self._bits if byte)
+
+
+def parse_proc_net_tcp(text: str) -> Dict[int, List[Dict[str, str]]]:
+    """Listening sockets of one /proc/net/tcp{,6} table, by local port"""
+    listeners: Dict[int, List[Dict[str, str]]] = {}
+    for line in text.splitlines()[1:]:
+        fields = line.split()
+        if len(fields) < 10 or fields[3] != TCP_LISTEN:
+            continue
+        address, _, port_hex = fields[1].rpartition(":")
+        try:
+            port = int(port_hex, 16)
+        except ValueError:
+            continue
+        listeners.setdefault(port, []).append({"address": address, "inode": fields[9]})
+    return listeners
+
+
+def read_listening_ports(
+    proc_root: str = "/proc",
+) -> Optional[Dict[int, List[Dict[str, str]]]]:
+    """Listening TCP sockets from the kernel, or None if /proc is unavailable"""
+    listeners: Dict[int, List[Dict[str, str]]] = {}
+    found = False
+    for table in PROC_TCP_TABLES:
+        try:
+            with open(os.path.join(proc_root, table), "r") as f:
+                text = f.read()
+        except OSError:
+            continue
+        found = True
+        for port, sockets in parse_proc_net_tcp(text).items():
+            listeners.setdefault(port, []).extend(sockets)
+    return listeners if found else None
+
+
+def find_socket_owners(
+    inodes: Set[str], proc_root: str = "/proc"
+) -> Dict[str, Dict[str, str]]:
+    """Map socket inodes to the owning pid/command in one /proc walk"""
+    owners: Dict[str, Dict[str, str]] = {}
+    if not inodes:
+        return owners
+    targets = {f"socket:[{inode}]": inode for inode in inodes}
+    try:
+        pids = [p for p in os.listdir(proc_root) if p.isdigit()]
+    except OSError:
+        return owners
+
+    for pid in pids:
+        fd_dir = os.path.join(proc_root, pid, "fd")
+        try:
+            fds = os.listdir(fd_dir)
+        except OSError:
+            continue  # process gone or not ours to inspect
+        for fd in fds:
+            try:
+                inode = targets.get(os.readlink(os.path.join(fd_dir, fd)))
+            except OSError:
+                continue
+            if inode is None or inode in owners:
+                continue
+            try:
+                with open(os.path.join(proc_root, pid, "comm"), "r") as f:
+                    command = f.read().strip()
+            except OSError:
+                command = "unknown"
+            owners[inode] = {"pid": pid, "command": command}
+        if len(owners) == len(targets):
+            break
+    return owners
+
+
+def docker_published_ports(containers: Iterable[Any]) -> Dict[int, List[Dict]]:
+    """Host ports published by running containers
+
+    Accepts docker SDK container objects as well as plain dicts with a
+    ``ports`` list of ``{"PublicPort": ...}`` mappings.
+    """
+    published: Dict[int, List[Dict[str, Any]]] = {}
+    for container in containers or []:
+        if isinstance(container, dict):
+            info = {
+                "name": container.get("name"),
+                "id": container.get("id"),
+                "image": container.get("image"),
+                "status": container.get("status"),
+            }
+            host_ports = [
+                mapping.get("PublicPort")
+                for mapping in container.get("ports", [])
+                if isinstance(mapping, dict)
+            ]
+        else:
+            attrs = getattr(container, "attrs", {}) or {}
+            info = {
+                "name": getattr(container, "name", None),
+                "id": getattr(container, "id", None),
+                "image": (attrs.get("Config") or {}).get("Image"),
+                "status": getattr(container, "status", None),
+            }
+            bindings = (attrs.get("NetworkSettings") or {}).get("Ports") or {}
+            host_ports = [
+                binding.get("HostPort")
+                for port_bindings in bindings.values()
+                for binding in port_bindings or []
+            ]
+        for host_port in host_ports:
+            try:
+                port = int(host_port)
+            except (TypeError, ValueError):
+                continue
+            published.setdefault(port, []).append(info)
+    return published
+
+
+def probe_port(port: int, timeout: float = 1.0) -> bool:
+    """Check a single port with a TCP connect to localhost"""
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            return sock.connect_ex(("127.0.0.1", port)) == 0
+    except socket.error as e:
+        logger.debug(f"Socket error checking port {port}: {e}")
+        return False
+
+
+class PortSnapshot:
+    """Busy ports at one point in time, plus who holds them"""
+
+    def __init__(
+        self,
+        listeners: Optional[Dict[int, List[Dict[str, str]]]],
+        docker_ports: Dict[int, List[Dict[str, Any]]],
+        proc_root: str = "/proc",
+        probe: Callable[[int], bool] = probe_port,
+    ):
+        self.taken_at = time.time()
+        self.listeners = listeners
+        self.docker_ports = docker_ports
+        self.proc_root = proc_root
+        self._probe = probe
+        self._probed: Dict[int, bool] = {}
+        self._owners: Optional[Dict[str, Dict[str, str]]] = None
+
+        self.busy = PortBitmap(docker_ports)
+        if listeners is not None:
+            for port in listeners:
+                self.busy.add(port)
+
+    @property
+    def kernel_scan(self) -> bool:
+        """Whether listening sockets came from /proc (else per-port probes)"""
+        return self.listeners is not None
+
+    def is_listening(self, port: int) -> bool:
+        if self.listeners is not None:
+            return port in self.listeners
+        # No /proc (non-Linux): probe lazily, once per port per snapshot
+        if port not in self._probed:
+            self._probed[port] = self._probe(port)
+        return self._probed[port]
+
+    def is_busy(self, port: int) -> bool:
+        return port in self.busy or self.is_listening(port)
+
+    def free_ports(
+        self,
+        start: int,
+        end: int,
+        count: int,
+        excluded: Callable[[int], bool] = lambda port: False,
+    ) -> List[int]:
+        """Up to ``count`` ports in [start, end] that are neither busy nor excluded"""
+        free = []
+        for port in range(start, end + 1):
+            if len(free) >= count:
+                break
+            if not excluded(port) and not self.is_busy(port):
+                free.append(port)
+        return free
+
+    def process_info(self, port: int) -> Optional[Dict[str, str]]:
+        """Address and owning process of a listening port, if known"""
+        sockets = (self.listeners or {}).get(port)
+        if not sockets:
+            return None
+        if self._owners is None:
+            self._owners = find_socket_owners(
+                {
+                    s["inode"]
+                    for entries in self.listeners.values()
+                    for s in entries
+                    if s["inode"] != "0"
+                },
+                self.proc_root,
+            )
+        for entry in sockets:
+            owner = self._owners.get(entry["inode"])
+            if owner is not None:
+                return {
+                    "address": entry["address"],
+                    "process": f"{owner['pid']}/{owner['command']}",
+                }
+        return None
+
+
+class PortScanner:
+    """Builds port snapshots, reusing one for ``ttl`` seconds"""
+
+    def __init__(
+        self,
+        docker_client=None,
+        proc_root: str = "/proc",
+        ttl: float = 1.0,
+        probe: Callable[[int], bool] = probe_port,
+    ):
+        self.docker_client = docker_client
+        self.proc_root = proc_root
+        self.ttl = ttl
+        self.probe = probe
+        self.scans = 0
+
+        self._snapshot: Optional[PortSnapshot] = None
+        self._lock = threading.Lock()
+
+    def _docker_ports(self) -> Dict[int, List[Dict[str, Any]]]:
+        if self.docker_client is None:
+            return {}
+        try:
+            return docker_published_ports(self.docker_client.list_containers(all=False))
+        except Exception as e:
+            logger.debug(f"Could not list Docker published ports: {e}")
+            return {}
+
+    def snapshot(self, refresh: bool = False) -> PortSnapshot:
+        """Current snapshot, rescanning if it is older than ``ttl``"""
+        with self._lock:
+            current = self._snapshot
+            if (
+                not refresh
+                and current is not None
+                and time.time() - current.taken_at < self.ttl
+            ):
+                return current
+
+            self.scans += 1
+            current = PortSnapshot(
+                read_listening_ports(self.proc_root),
+                self._docker_ports(),
+                self.proc_root,
+                self.probe,
+            )
+            self._snapshot = current
+            return current
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshot = None
@@ -4,25 +4,217 @@ Template security scanner for BlastDock templates
 
 import os
 import re
+import json
+import hashlib
 import yaml
-from typing import Dict, List, Any
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 from pathlib import Path
 
+from .._version import __version__
 from ..utils.logging import get_logger
 from .validator import get_security_validator
 
-
 logger = get_logger(__name__)
 
+# Faster libyaml-backed loader when PyYAML was built with it
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Hardcoded secret rules: (pattern, description)
+SECRET_PATTERNS = [
+    (
+        r'password\s*[:=]\s*["\']?[\w@#$%^&*()_+\-=\[\]{}|;:,.<>?/~`!]+["\']?',
+        "password",
+    ),
+    (r'api_key\s*[:=]\s*["\']?[a-zA-Z0-9]{20,}["\']?', "API key"),
+    (r'secret_key\s*[:=]\s*["\']?[a-zA-Z0-9]{20,}["\']?', "secret key"),
+    (r'token\s*[:=]\s*["\']?[a-zA-Z0-9]{20,}["\']?', "token"),
+    (r'private_key\s*[:=]\s*["\']?-----BEGIN', "private key"),
+]
+
+SCANNED_EXTENSIONS = {".yml", ".yaml", ".json", ".j2", ".jinja"}
+
+
+def _fold_pattern(pattern: str) -> str:
+    """Lowercase a pattern's literal letters, leaving escapes alone"""
+    return re.sub(
+        r"\\.|[A-Z]",
+        lambda m: m.group() if len(m.group()) > 1 else m.group().lower(),
+        pattern,
+    )
+
+
+class PatternMatcher:
+    """Many regexes matched in a single pass over the content
+
+    ``findall`` returns, per pattern, exactly what ``re.findall`` would. One
+    alternation of all patterns finds every position where any of them
+    matches; only there is each pattern tried. ASCII content is lowercased
+    and matched case-sensitively, which lets the regex engine skip ahead
+    on the patterns' leading literals.
+    """
+
+    def __init__(
+        self, patterns: Sequence[str], flags: int = re.IGNORECASE | re.MULTILINE
+    ):
+        self.patterns = list(patterns)
+        self._exact = self._compile(self.patterns, flags)
+        self._folded = None
+        if flags & re.IGNORECASE:
+            try:
+                self._folded = self._compile(
+                    [_fold_pattern(p) for p in self.patterns], flags & ~re.IGNORECASE
+                )
+            except re.error:
+                pass
+
+    @staticmethod
+    def _compile(patterns: List[str], flags: int):
+        rules = [re.compile(p, flags) for p in patterns]
+        try:
+            combined = re.compile("|".join(f"(?:{p})" for p in patterns), flags)
+        except re.error:
+            # e.g. group names repeated across patterns
+            combined = None
+        return combined, rules
+
+    def findall(self, content: str) -> List[List[Any]]:
+        if self._folded is not None and content.isascii():
+            text = content.lower()
+            combined, rules = self._folded
+        else:
+            text = content
+            combined, rules = self._exact
+        if combined is None:
+            return [rule.findall(content) for rule in self._exact[1]]
+
+        found: List[List[Any]] = [[] for _ in rules]
+        # Per pattern, where its next non-overlapping match may start
+        next_start = [0] * len(rules)
+        position = 0
+        while True:
+            match = combined.search(text, position)
+            if match is None:
+                break
+            start = match.start()
+            for index, rule in enumerate(rules):
+                if next_start[index] > start:
+                    continue
+                rule_match = rule.match(text, start)
+                if rule_match is not None:
+                    found[index].append(self._item(rule, rule_match, content))
+                    next_start[index] = max(rule_match.end(), start + 1)
+            position = start + 1
+        return found
+
+    @staticmethod
+    def _item(rule, match, content: str) -> Any:
+        """What ``re.findall`` yields for a match, taken from the original"""
+
+        def span(group):
+            start, end = match.span(group)
+            return content[start:end] if start != -1 else ""
+
+        if rule.groups == 0:
+            return span(0)
+        if rule.groups == 1:
+            return span(1)
+        return tuple(span(g) for g in range(1, rule.groups + 1))
+
+
+@lru_cache(maxsize=8)
+def _pattern_matcher(patterns: Tuple[str, ...]) -> PatternMatcher:
+    return PatternMatcher(patterns)
+
+
+_scanner_version = None
+
+
+def scanner_version() -> str:
+    """Version stamp for cached findings; changes whenever the rules do"""
+    global _scanner_version
+    if _scanner_version is None:
+        try:
+            with open(__file__, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()[:16]
+        except OSError:
+            digest = "unknown"
+        _scanner_version = f"{__version__}-{digest}"
+    return _scanner_version
+
+
+class ScanCache:
+    """Per-file content findings on disk, keyed by content hash
+
+    Identical files share an entry. Entries from another scanner version
+    are ignored.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._entry_path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("scanner_version") != scanner_version():
+            return None
+        return entry.get("findings")
+
+    def put(self, key: str, findings: Dict[str, Any]):
+        path = self._entry_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"scanner_version": scanner_version(), "findings": findings},
+                    f,
+                    default=str,
+                )
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"Could not cache scan findings {key}: {e}")
+
+    def clear(self) -> int:
+        removed = 0
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.cache_dir, name))
+                removed += 1
+        return removed
+
 
 class TemplateSecurityScanner:
     """Security scanner for BlastDock templates"""
 
-    def __init__(self):
-        """Initialize template security scanner"""
+    def __init__(self, persist: bool = False, cache_dir: Optional[str] = None):
+        """Initialize template security scanner
+
+        With ``persist`` per-file findings are cached under
+        ``<cache_dir>/security`` (or ``cache_dir``), so unchanged files are
+        not rescanned.
+        """
         self.logger = get_logger(__name__)
         self.security_validator = get_security_validator()
 
+        self.cache: Optional[ScanCache] = None
+        if persist:
+            if cache_dir is None:
+                from ..utils.filesystem import paths
+
+                cache_dir = os.path.join(str(paths.cache_dir), "security")
+            try:
+                self.cache = ScanCache(cache_dir)
+            except OSError as e:
+                self.logger.warning(f"Security scan cache disabled: {e}")
+        self.cache_stats = {"hits": 0, "misses": 0}
+
         # Dangerous patterns in templates
         self.DANGEROUS_PATTERNS = [
             # Code injection
@@ -79,6 +271,8 @@ class TemplateSecurityScanner:
             "devices:",
         ]
 
+        self.SECRET_PATTERNS = list(SECRET_PATTERNS)
+
     def scan_template(self, template_path: str) -> Dict[str, Any]:
         """Scan a template for security issues"""
         if not os.path.exists(template_path):
@@ -104,30 +298,44 @@ class TemplateSecurityScanner:
 
     def _scan_template_directory(self, template_dir: str) -> Dict[str, Any]:
         """Scan all files in a template directory"""
-        security_issues = []
-        security_score = 100
-        files_scanned = 0
+        return self._summarize_directory(
+            template_dir,
+            [
+                (path, self._scan_template_file(path))
+                for path in self._template_files(template_dir)
+            ],
+        )
 
-        # Scan all YAML/template files
+    def _template_files(self, template_dir: str) -> List[str]:
+        """YAML/template files in a template directory"""
+        template_files = []
         for root, dirs, files in os.walk(template_dir):
             for file in files:
-                file_path = os.path.join(root, file)
-                file_ext = Path(file).suffix.lower()
-
                 # Only scan relevant files
-                if file_ext in {".yml", ".yaml", ".json", ".j2", ".jinja"}:
-                    files_scanned += 1
-                    file_result = self._scan_template_file(file_path)
+                if Path(file).suffix.lower() in SCANNED_EXTENSIONS:
+                    template_files.append(os.path.join(root, file))
+        return template_files
+
+    def _summarize_directory(
+        self, template_dir: str, file_results: List[Tuple[str, Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Combine per-file results into a directory result"""
+        security_issues = []
+        security_score = 100
+        files_scanned = 0
+
+        for file_path, file_result in file_results:
+            files_scanned += 1
 
-                    if file_result.get("security_issues"):
-                        for issue in file_result["security_issues"]:
-                            issue["file"] = os.path.relpath(file_path, template_dir)
-                            security_issues.append(issue)
+            if file_result.get("security_issues"):
+                for issue in file_result["security_issues"]:
+                    issue["file"] = os.path.relpath(file_path, template_dir)
+                    security_issues.append(issue)
 
-                    # Adjust score based on file results
-                    file_score = file_result.get("security_score", 100)
-                    if file_score < 100:
-                        security_score = min(security_score, file_score)
+            # Adjust score based on file results
+            file_score = file_result.get("security_score", 100)
+            if file_score < 100:
+                security_score = min(security_score, file_score)
 
         # Check for required files
         required_files = ["docker-compose.yml", "docker-compose.yaml"]
@@ -155,11 +363,28 @@ class TemplateSecurityScanner:
             "scan_type": "directory",
         }
 
+    def _read_template_file(self, file_path: str) -> Tuple[str, str]:
+        """File content and its cache key (content hash and scan kind)"""
+        with open(file_path, "r", encoding="utf-8") as f:
+            content = f.read()
+        kind = "yaml" if Path(file_path).suffix.lower() in {".yml", ".yaml"} else "text"
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        return content, f"{digest}-{kind}"
+
+    def _cached_findings(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.cache is None:
+            return None
+        findings = self.cache.get(key)
+        if findings is None:
+            self.cache_stats["misses"] += 1
+        else:
+            self.cache_stats["hits"] += 1
+        return findings
+
     def _scan_template_file(self, file_path: str) -> Dict[str, Any]:
         """Scan a single template file"""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            content, key = self._read_template_file(file_path)
         except Exception as e:
             return {
                 "template_path": file_path,
@@ -167,12 +392,28 @@ class TemplateSecurityScanner:
                 "error": f"Cannot read file: {e}",
             }
 
+        findings = self._cached_findings(key)
+        if findings is None:
+            findings = self._scan_content(content, key.endswith("-yaml"))
+            if self.cache is not None:
+                self.cache.put(key, findings)
+        return self._file_result(file_path, findings)
+
+    def _scan_content(self, content: str, is_yaml: bool) -> Dict[str, Any]:
+        """Findings that depend only on a file's content"""
         security_issues = []
         security_score = 100
 
+        # Dangerous-pattern and secret rules in one pass over the content
+        matches_by_rule = _pattern_matcher(
+            tuple(self.DANGEROUS_PATTERNS)
+            + tuple(pattern for pattern, _ in self.SECRET_PATTERNS)
+        ).findall(content)
+        dangerous_matches = matches_by_rule[: len(self.DANGEROUS_PATTERNS)]
+        secret_matches = matches_by_rule[len(self.DANGEROUS_PATTERNS) :]
+
         # Check file content for dangerous patterns
-        for pattern in self.DANGEROUS_PATTERNS:
-            matches = re.findall(pattern, content, re.IGNORECASE | re.MULTILINE)
+        for pattern, matches in zip(self.DANGEROUS_PATTERNS, dangerous_matches):
             if matches:
                 security_issues.append(
                     {
@@ -186,18 +427,24 @@ class TemplateSecurityScanner:
                 security_score -= 25
 
         # Parse as YAML if possible
-        file_ext = Path(file_path).suffix.lower()
-        if file_ext in {".yml", ".yaml"}:
+        if is_yaml:
             yaml_result = self._scan_yaml_content(content)
             security_issues.extend(yaml_result["issues"])
             security_score = min(security_score, yaml_result["score"])
 
         # Check for hardcoded secrets
-        secret_issues = self._check_hardcoded_secrets(content)
+        secret_issues = self._secret_issues(secret_matches)
         security_issues.extend(secret_issues)
         if secret_issues:
             security_score -= len(secret_issues) * 15
 
+        return {"issues": security_issues, "score": security_score}
+
+    def _file_result(self, file_path: str, findings: Dict[str, Any]) -> Dict[str, Any]:
+        """File result from content findings plus a permissions check"""
+        security_issues = list(findings["issues"])
+        security_score = findings["score"]
+
         # Check file permissions
         perm_valid, perm_error = self.security_validator.check_file_permissions(
             file_path
@@ -227,7 +474,11 @@ class TemplateSecurityScanner:
         score = 100
 
         try:
-            data = yaml.safe_load(content)
+            try:
+                data = yaml.load(content, Loader=_SafeLoader)
+            except yaml.YAMLError:
+                # Report the pure-Python parser's (more detailed) error
+                data = yaml.safe_load(content)
         except yaml.YAMLError as e:
             return {
                 "issues": [
@@ -251,9 +502,11 @@ class TemplateSecurityScanner:
             if compose_issues:
                 score -= len(compose_issues) * 10
 
-        # Check for YAML bomb patterns
-        yaml_str = yaml.dump(data)
-        if self._check_yaml_bomb(yaml_str):
+        # Check for YAML bomb patterns. The dump can only contain anchors,
+        # aliases, "*" or "&" if the source does, so skip it otherwise.
+        if ("*" in content or "&" in content) and self._check_yaml_bomb(
+            yaml.dump(data)
+        ):
             issues.append(
                 {
                     "severity": "critical",
@@ -330,22 +583,12 @@ class TemplateSecurityScanner:
 
     def _check_hardcoded_secrets(self, content: str) -> List[Dict[str, Any]]:
         """Check for hardcoded secrets in content"""
-        issues = []
+        matcher = _pattern_matcher(tuple(p for p, _ in self.SECRET_PATTERNS))
+        return self._secret_issues(matcher.findall(content))
 
-        # Common secret patterns
-        secret_patterns = [
-            (
-                r'password\s*[:=]\s*["\']?[\w@#$%^&*()_+\-=\[\]{}|;:,.<>?/~`!]+["\']?',
-                "password",
-            ),
-            (r'api_key\s*[:=]\s*["\']?[a-zA-Z0-9]{20,}["\']?', "API key"),
-            (r'secret_key\s*[:=]\s*["\']?[a-zA-Z0-9]{20,}["\']?', "secret key"),
-            (r'token\s*[:=]\s*["\']?[a-zA-Z0-9]{20,}["\']?', "token"),
-            (r'private_key\s*[:=]\s*["\']?-----BEGIN', "private key"),
-        ]
-
-        for pattern, secret_type in secret_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE | re.MULTILINE)
+    def _secret_issues(self, matches_by_rule: List[List[Any]]) -> List[Dict[str, Any]]:
+        issues = []
+        for (_, secret_type), matches in zip(self.SECRET_PATTERNS, matches_by_rule):
             if matches:
                 issues.append(
                     {
@@ -397,8 +640,12 @@ class TemplateSecurityScanner:
 
         return False
 
-    def scan_all_templates(self, templates_dir: str) -> Dict[str, Any]:
-        """Scan all templates in a directory"""
+    def scan_all_templates(self, templates_dir: str, processor=None) -> Dict[str, Any]:
+        """Scan all templates (template directories) in a directory
+
+        Work is per file rather than per template, so one large template
+        does not hold up a worker while the others sit idle.
+        """
         if not os.path.exists(templates_dir):
             return {
                 "templates_dir": templates_dir,
@@ -412,21 +659,70 @@ class TemplateSecurityScanner:
         total_score = 0
 
         try:
-            for item in os.listdir(templates_dir):
-                template_path = os.path.join(templates_dir, item)
+            template_paths = [
+                os.path.join(templates_dir, item)
+                for item in sorted(os.listdir(templates_dir))
+                if os.path.isdir(os.path.join(templates_dir, item))
+            ]
+            template_files = {
+                template_path: self._template_files(template_path)
+                for template_path in template_paths
+            }
+
+            # Files with cached findings are resolved here; the rest are
+            # sharded across the processor's workers, which fill the cache
+            file_results = {}
+            pending = []
+            for files in template_files.values():
+                for file_path in files:
+                    try:
+                        content, key = self._read_template_file(file_path)
+                    except Exception:
+                        pending.append(file_path)
+                        continue
+                    findings = self._cached_findings(key)
+                    if findings is None:
+                        pending.append(file_path)
+                    else:
+                        file_results[file_path] = self._file_result(file_path, findings)
+
+            if pending:
+                if processor is None:
+                    from ..performance.parallel_processor import (
+                        get_parallel_processor,
+                    )
+
+                    processor = get_parallel_processor()
+                cache_dir = self.cache.cache_dir if self.cache is not None else None
+                for task in processor.process_templates(
+                    pending, stages=("scan",), cache_dir=cache_dir
+                ):
+                    file_results[task.path] = (
+                        task.security
+                        if task.security is not None
+                        else self._scan_template_file(task.path)
+                    )
 
-                if os.path.isdir(template_path):
-                    templates_scanned += 1
-                    result = self.scan_template(template_path)
+            # Aggregated in name order
+            for template_path in template_paths:
+                item = os.path.basename(template_path)
+                result = self._summarize_directory(
+                    template_path,
+                    [
+                        (file_path, file_results[file_path])
+                        for file_path in template_files[template_path]
+                    ],
+                )
+                templates_scanned += 1
 
-                    if result.get("security_issues"):
-                        templates_with_issues += 1
-                        # Add template name to each issue
-                        for issue in result["security_issues"]:
-                            issue["template"] = item
-                            all_issues.append(issue)
+                if result.get("security_issues"):
+                    templates_with_issues += 1
+                    # Add template name to each issue
+                    for issue in result["security_issues"]:
+                        issue["template"] = item
+                        all_issues.append(issue)
 
-                    total_score += result.get("security_score", 0)
+                total_score += result.get("security_score", 0)
 
         except Exception as e:
             return {
@@ -460,6 +756,20 @@ class TemplateSecurityScanner:
             "summary": self._generate_security_summary(all_issues, templates_scanned),
         }
 
+    def get_scan_stats(self) -> Dict[str, Any]:
+        """Findings cache hit/miss counts"""
+        lookups = self.cache_stats["hits"] + self.cache_stats["misses"]
+        return {
+            "cache_enabled": self.cache is not None,
+            "cache_hits": self.cache_stats["hits"],
+            "cache_misses": self.cache_stats["misses"],
+            "hit_rate": (self.cache_stats["hits"] / lookups * 100 if lookups else 0.0),
+        }
+
+    def clear_cache(self) -> int:
+        """Drop cached findings; returns how many"""
+        return self.cache.clear() if self.cache is not None else 0
+
     def _generate_security_summary(
         self, issues: List[Dict[str, Any]], templates_count: int
     ) -> List[str]:
@@ -523,5 +833,5 @@ def get_template_security_scanner() -> TemplateSecurityScanner:
     """Get global template security scanner instance"""
     global _template_security_scanner
     if _template_security_scanner is None:
-        _template_security_scanner = TemplateSecurityScanner()
+        _template_security_scanner = TemplateSecurityScanner(persist=True)
     return _template_security_scanner
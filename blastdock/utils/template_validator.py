@@ -2,14 +2,22 @@
 Template validation and enhancement system for BlastDock
 """
 
-import yaml
+import os
 import re
-from typing import Dict, List, Tuple, Optional, Any
+import json
+import time
+import hashlib
+import yaml
+from typing import Callable, Dict, List, Tuple, Optional, Any
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field
 from enum import Enum
 
+from .._version import __version__
 from ..constants import DOMAIN_PATTERN
+from .logging import get_logger
+
+logger = get_logger(__name__)
 
 
 class ValidationLevel(str, Enum):
@@ -51,6 +59,30 @@ class TemplateAnalysis:
     traefik_compatibility: TraefikCompatibility
     results: List[ValidationResult]
     metadata: Dict[str, Any]
+    # Check name -> seconds spent in it
+    check_times: Dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["traefik_compatibility"] = self.traefik_compatibility.value
+        for result in data["results"]:
+            result["level"] = result["level"].value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TemplateAnalysis":
+        return cls(
+            template_name=data["template_name"],
+            file_path=data["file_path"],
+            is_valid=data["is_valid"],
+            traefik_compatibility=TraefikCompatibility(data["traefik_compatibility"]),
+            results=[
+                ValidationResult(**{**r, "level": ValidationLevel(r["level"])})
+                for r in data["results"]
+            ],
+            metadata=data.get("metadata", {}),
+            check_times=data.get("check_times", {}),
+        )
 
     @property
     def error_count(self) -> int:
@@ -87,11 +119,89 @@ class TemplateAnalysis:
         return round(score, 1)
 
 
+_validator_version = None
+
+
+def validator_version() -> str:
+    """Version stamp for cached results; changes whenever the rules do"""
+    global _validator_version
+    if _validator_version is None:
+        try:
+            with open(__file__, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()[:16]
+        except OSError:
+            digest = "unknown"
+        _validator_version = f"{__version__}-{digest}"
+    return _validator_version
+
+
+class ValidationCache:
+    """Validation results on disk, one JSON file per template
+
+    An entry is only used if both the template's content hash and the
+    validator version match the ones it was produced with.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_path(self, template_path: str) -> str:
+        key = hashlib.sha1(os.path.abspath(template_path).encode("utf-8"))
+        return os.path.join(self.cache_dir, f"{key.hexdigest()[:20]}.json")
+
+    def get(self, template_path: str, content_hash: str) -> Optional[Dict]:
+        try:
+            with open(self._entry_path(template_path), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (
+            entry.get("content_hash") != content_hash
+            or entry.get("validator_version") != validator_version()
+        ):
+            return None
+        return entry.get("analysis")
+
+    def put(self, template_path: str, content_hash: str, analysis: Dict):
+        path = self._entry_path(template_path)
+        entry = {
+            "path": os.path.abspath(template_path),
+            "content_hash": content_hash,
+            "validator_version": validator_version(),
+            "analysis": analysis,
+        }
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, default=str)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"Could not cache validation of {template_path}: {e}")
+
+    def clear(self) -> int:
+        removed = 0
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.cache_dir, name))
+                removed += 1
+        return removed
+
+
 class TemplateValidator:
     """Comprehensive template validator and enhancer"""
 
-    def __init__(self, templates_dir: str = None):
-        """Initialize validator with templates directory"""
+    def __init__(
+        self,
+        templates_dir: str = None,
+        persist: bool = False,
+        cache_dir: Optional[str] = None,
+    ):
+        """Initialize validator with templates directory
+
+        With ``persist`` results are cached under ``<cache_dir>/validation``
+        (or ``cache_dir``), so unchanged templates are not re-validated.
+        """
         if templates_dir is None:
             # Default to package templates directory
             package_dir = Path(__file__).parent.parent
@@ -101,30 +211,170 @@ class TemplateValidator:
         self.required_sections = ["template_info", "fields", "compose"]
         self.required_template_info = ["description", "version", "services"]
 
-    def validate_all_templates(self) -> Dict[str, TemplateAnalysis]:
-        """Validate all templates in the directory"""
+        self.cache: Optional[ValidationCache] = None
+        if persist:
+            if cache_dir is None:
+                from .filesystem import paths
+
+                cache_dir = os.path.join(str(paths.cache_dir), "validation")
+            try:
+                self.cache = ValidationCache(cache_dir)
+            except OSError as e:
+                logger.warning(f"Validation cache disabled: {e}")
+        self.cache_stats = {"hits": 0, "misses": 0}
+        # Check name -> [runs, seconds]
+        self.check_timings: Dict[str, List[float]] = {}
+
+    def validate_all_templates(
+        self,
+        processor=None,
+        progress: Optional[Callable[[str, int, int], None]] = None,
+    ) -> Dict[str, TemplateAnalysis]:
+        """Validate all templates in the directory
+
+        Cached results are reused for unchanged templates; the rest are
+        validated on the parallel processor's workers. Results are keyed and
+        ordered by template name. ``progress(name, done, total)`` is called
+        as each template completes.
+        """
+        paths = sorted(
+            str(template_file)
+            for template_file in self.templates_dir.glob("*.yml")
+            if template_file.is_file()
+        )
         results = {}
+        pending = {}
+        for path in paths:
+            content, content_hash = self._read(path)
+            analysis = self._cached(path, content_hash)
+            if analysis is not None:
+                results[analysis.template_name] = analysis
+                if progress:
+                    progress(analysis.template_name, len(results), len(paths))
+            else:
+                pending[path] = content_hash
+
+        if pending:
+            if processor is None:
+                from ..performance.parallel_processor import get_parallel_processor
+
+                processor = get_parallel_processor()
+            for result in processor.process_templates(
+                list(pending), stages=("validate",)
+            ):
+                # A worker failure leaves no analysis: validate in-process
+                analysis = result.analysis or self._run_checks(Path(result.path))
+                self._finish(result.path, pending.get(result.path), analysis)
+                results[result.name] = analysis
+                if progress:
+                    progress(result.name, len(results), len(paths))
+
+        return dict(sorted(results.items()))
+
+    def get_validation_stats(self) -> Dict[str, Any]:
+        """Cache hit/miss counts and per-check timings, slowest check first"""
+        lookups = self.cache_stats["hits"] + self.cache_stats["misses"]
+        checks = [
+            {
+                "check": name,
+                "runs": int(runs),
+                "total_ms": seconds * 1000,
+                "avg_ms": seconds * 1000 / runs if runs else 0.0,
+            }
+            for name, (runs, seconds) in self.check_timings.items()
+        ]
+        checks.sort(key=lambda c: c["total_ms"], reverse=True)
+        return {
+            "cache_enabled": self.cache is not None,
+            "cache_hits": self.cache_stats["hits"],
+            "cache_misses": self.cache_stats["misses"],
+            "hit_rate": (self.cache_stats["hits"] / lookups * 100 if lookups else 0.0),
+            "checks": checks,
+        }
 
-        for template_file in self.templates_dir.glob("*.yml"):
-            if template_file.is_file():
-                template_name = template_file.stem
-                analysis = self.validate_template(str(template_file))
-                results[template_name] = analysis
+    def clear_cache(self) -> int:
+        """Drop persisted validation results; returns how many"""
+        return self.cache.clear() if self.cache is not None else 0
 
-        return results
+    def _read(self, template_path: str) -> Tuple[Optional[bytes], Optional[str]]:
+        try:
+            with open(template_path, "rb") as f:
+                content = f.read()
+        except OSError:
+            return None, None
+        return content, hashlib.sha256(content).hexdigest()
+
+    def _cached(
+        self, template_path: str, content_hash: Optional[str]
+    ) -> Optional[TemplateAnalysis]:
+        if self.cache is None or content_hash is None:
+            return None
+        data = self.cache.get(template_path, content_hash)
+        if data is not None:
+            try:
+                analysis = TemplateAnalysis.from_dict(data)
+            except (KeyError, TypeError, ValueError):
+                analysis = None
+            if analysis is not None:
+                analysis.file_path = str(template_path)
+                self.cache_stats["hits"] += 1
+                return analysis
+        self.cache_stats["misses"] += 1
+        return None
+
+    def _finish(
+        self,
+        template_path: str,
+        content_hash: Optional[str],
+        analysis: TemplateAnalysis,
+    ):
+        """Account a fresh analysis's check timings and cache it"""
+        for name, seconds in analysis.check_times.items():
+            timing = self.check_timings.setdefault(name, [0, 0.0])
+            timing[0] += 1
+            timing[1] += seconds
+        if self.cache is not None and content_hash is not None:
+            self.cache.put(template_path, content_hash, analysis.to_dict())
 
     def validate_template(self, template_path: str) -> TemplateAnalysis:
-        """Validate a single template file"""
-        template_path = Path(template_path)
+        """Validate a single template file
+
+        With a cache, a result for the same content and validator version is
+        returned without re-running the checks.
+        """
+        content, content_hash = self._read(template_path)
+        analysis = self._cached(template_path, content_hash)
+        if analysis is None:
+            analysis = self._run_checks(Path(template_path), content)
+            self._finish(template_path, content_hash, analysis)
+        return analysis
+
+    def _run_checks(
+        self, template_path: Path, raw: Optional[bytes] = None
+    ) -> TemplateAnalysis:
+        """Run every check on a template, timing each one"""
         template_name = template_path.stem
         results = []
         metadata = {}
+        check_times: Dict[str, float] = {}
+
+        def timed(check: str, func, *args):
+            started = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                check_times[check] = (
+                    check_times.get(check, 0.0) + time.perf_counter() - started
+                )
+
+        def read():
+            data = raw if raw is not None else template_path.read_bytes()
+            content = data.decode("utf-8")
+            return content, yaml.safe_load(content)
 
         try:
             # Load and parse YAML
-            with open(template_path, "r", encoding="utf-8") as f:
-                content = f.read()
-                template_data = yaml.safe_load(content)
+            content, template_data = timed("parse", read)
 
             if template_data is None:
                 results.append(
@@ -141,40 +391,62 @@ class TemplateValidator:
                     traefik_compatibility=TraefikCompatibility.NONE,
                     results=results,
                     metadata=metadata,
+                    check_times=check_times,
                 )
 
             # Validate structure
-            results.extend(self._validate_structure(template_data))
+            results.extend(timed("structure", self._validate_structure, template_data))
 
             # Validate template info
             if "template_info" in template_data:
                 results.extend(
-                    self._validate_template_info(template_data["template_info"])
+                    timed(
+                        "template_info",
+                        self._validate_template_info,
+                        template_data["template_info"],
+                    )
                 )
                 metadata.update(template_data["template_info"])
 
             # Validate fields
             if "fields" in template_data:
-                results.extend(self._validate_fields(template_data["fields"]))
+                results.extend(
+                    timed("fields", self._validate_fields, template_data["fields"])
+                )
 
             # Validate compose configuration
             if "compose" in template_data:
-                results.extend(self._validate_compose(template_data["compose"]))
+                results.extend(
+                    timed("compose", self._validate_compose, template_data["compose"])
+                )
 
             # Analyze Traefik compatibility
-            traefik_compatibility = self._analyze_traefik_compatibility(template_data)
+            traefik_compatibility = timed(
+                "traefik", self._analyze_traefik_compatibility, template_data
+            )
             results.extend(
-                self._validate_traefik_config(template_data, traefik_compatibility)
+                timed(
+                    "traefik",
+                    self._validate_traefik_config,
+                    template_data,
+                    traefik_compatibility,
+                )
             )
 
             # Validate security aspects
-            results.extend(self._validate_security(template_data))
+            results.extend(timed("security", self._validate_security, template_data))
 
             # Validate performance aspects
-            results.extend(self._validate_performance(template_data))
+            results.extend(
+                timed("performance", self._validate_performance, template_data)
+            )
 
             # Check for common issues
-            results.extend(self._check_common_issues(template_data, content))
+            results.extend(
+                timed(
+                    "common_issues", self._check_common_issues, template_data, content
+                )
+            )
 
             is_valid = all(r.level != ValidationLevel.ERROR for r in results)
 
@@ -185,6 +457,7 @@ class TemplateValidator:
                 traefik_compatibility=traefik_compatibility,
                 results=results,
                 metadata=metadata,
+                check_times=check_times,
             )
 
         except yaml.YAMLError as e:
@@ -211,6 +484,7 @@ class TemplateValidator:
             traefik_compatibility=TraefikCompatibility.NONE,
             results=results,
             metadata=metadata,
+            check_times=check_times,
         )
 
     def _validate_structure(self, template_data: Dict) -> List[ValidationResult]:
@@ -242,14 +516,14 @@ class TemplateValidator:
         """Validate template_info section"""
         results = []
 
-        for field in self.required_template_info:
-            if field not in template_info:
+        for key in self.required_template_info:
+            if key not in template_info:
                 results.append(
                     ValidationResult(
                         level=ValidationLevel.ERROR,
                         category="template_info",
-                        message=f"Missing required field in template_info: {field}",
-                        suggestion=f"Add '{field}' to template_info section",
+                        message=f"Missing required field in template_info: {key}",
+                        suggestion=f"Add '{key}' to template_info section",
                     )
                 )
 
@@ -0,0 +1,134 @@
+"""Tests for lazy command loading and CLI startup cost"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+# Generous, to stay stable on slow CI hosts; the module checks are the
+# precise guard against the entry point importing too much
+IMPORT_BUDGET_MS = 500
+
+IMPORTTIME = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       900 |       1400 | site
+import time:       300 |        300 |   click.types
+import time:      1000 |       1300 | click
+import time:       200 |       1500 | blastdock.main_cli
+"""
+
+
+@pytest.fixture
+def startup_env(temp_dir):
+    """Environment isolating the CLI from the user's home and config"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")])
+    )
+    env["HOME"] = str(temp_dir)
+    for name in ("XDG_CONFIG_HOME", "XDG_DATA_HOME", "XDG_CACHE_HOME"):
+        env[name] = str(temp_dir / name.lower())
+    return env
+
+
+class TestImportTimeParsing:
+    """Parsing ``-X importtime`` output"""
+
+    def test_interpreter_startup_is_skipped(self):
+        from blastdock.performance.startup import parse_importtime
+
+        timings = parse_importtime(IMPORTTIME)
+        assert [t.module for t in timings] == [
+            "click.types",
+            "click",
+            "blastdock.main_cli",
+        ]
+        assert [t.depth for t in timings] == [1, 0, 0]
+        assert timings[1].self_us == 1000
+        assert timings[1].cumulative_us == 1300
+
+
+class TestLazyGroup:
+    """Subcommands imported on first use"""
+
+    def test_command_module_imported_only_when_invoked(
+        self, temp_dir, monkeypatch, cli_runner
+    ):
+        import click
+
+        from blastdock.cli.lazy import LazyGroup
+
+        (temp_dir / "lazy_demo_commands.py").write_text(
+            "import click\n\n\n"
+            "@click.command()\n"
+            "def hello():\n"
+            '    """Say hello"""\n'
+            '    click.echo("hello")\n'
+        )
+        monkeypatch.syspath_prepend(str(temp_dir))
+        monkeypatch.delitem(sys.modules, "lazy_demo_commands", raising=False)
+
+        @click.group(
+            cls=LazyGroup,
+            lazy_subcommands={"hello": ("lazy_demo_commands:hello", "Say hello")},
+        )
+        def cli():
+            pass
+
+        result = cli_runner.invoke(cli, ["--help"])
+        assert result.exit_code == 0
+        assert "Say hello" in result.output
+        assert "lazy_demo_commands" not in sys.modules
+
+        result = cli_runner.invoke(cli, ["hello"])
+        assert result.exit_code == 0, result.output
+        assert result.output == "hello\n"
+        assert "lazy_demo_commands" in sys.modules
+
+    def test_non_command_target_is_rejected(self):
+        import click
+
+        from blastdock.cli.lazy import LazyGroup
+
+        group = LazyGroup(lazy_subcommands={"bad": ("os.path:join", "Not a command")})
+        with pytest.raises(TypeError):
+            group.get_command(click.Context(group), "bad")
+
+
+class TestStartupBudget:
+    """``--version`` and ``--help`` load none of the command groups"""
+
+    @pytest.mark.parametrize("command", ["version", "help"])
+    def test_light_commands_stay_light(self, command, startup_env):
+        from blastdock.performance.startup import (
+            HEAVY_MODULES,
+            STARTUP_COMMANDS,
+            measure_startup,
+        )
+
+        measurement = measure_startup([command], runs=2, env=startup_env)[command]
+        assert measurement.argv == STARTUP_COMMANDS[command]
+        assert measurement.exit_code == 0
+        assert measurement.loaded(HEAVY_MODULES) == []
+        assert measurement.import_ms < IMPORT_BUDGET_MS
+
+    def test_help_lists_every_group(self, cli_runner):
+        from blastdock.main_cli import COMMAND_GROUPS, cli
+
+        result = cli_runner.invoke(cli, ["--help"])
+        assert result.exit_code == 0
+        for name in COMMAND_GROUPS:
+            assert name in result.output
+
+    def test_stored_help_matches_groups(self):
+        import click
+
+        from blastdock.main_cli import COMMAND_GROUPS, cli
+
+        for name, (_, short_help) in COMMAND_GROUPS.items():
+            group = cli.load_command(name)
+            assert isinstance(group, click.Group)
+            assert group.get_short_help_str(limit=200) == short_help
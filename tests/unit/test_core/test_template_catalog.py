@@ -0,0 +1,74 @@
+"""Tests for the template catalog index"""
+
+import os
+
+TEMPLATE = """template_info:
+  description: "{description}"
+  traefik_compatible: {traefik}
+  services:
+    - web
+fields:
+  port:
+    type: port
+    default: 8080
+compose:
+  services:
+    web:
+      image: {image}
+      ports:
+        - "8080:80"
+"""
+
+
+def _write(path, description="Demo app", image="nginx:latest", traefik="true"):
+    path.write_text(
+        TEMPLATE.format(description=description, image=image, traefik=traefik)
+    )
+
+
+class TestTemplateCatalog:
+    """TemplateCatalog index build, reuse and search"""
+
+    def test_index_reused_and_stale_entries_reparsed(self, temp_dir):
+        from blastdock.core.template_catalog import TemplateCatalog
+
+        templates = temp_dir / "templates"
+        templates.mkdir()
+        _write(templates / "web.yml")
+        _write(templates / "db.yml", "Database", "postgres:16", "false")
+        index_path = str(temp_dir / "catalog.json")
+
+        catalog = TemplateCatalog(str(templates), index_path)
+        assert catalog.names() == ["db", "web"]
+        assert catalog.reparsed == 2
+        assert os.path.exists(index_path)
+
+        web = catalog.get("web")
+        assert web["images"] == ["nginx:latest"]
+        assert web["ports"] == ["8080:80"]
+        assert web["fields"]["port"]["type"] == "port"
+
+        # A fresh catalog reads the index without parsing anything
+        reopened = TemplateCatalog(str(templates), index_path)
+        assert reopened.get("db")["template_info"]["description"] == "Database"
+        assert reopened.reparsed == 0
+
+        _write(templates / "web.yml", "Changed")
+        os.remove(templates / "db.yml")
+        refreshed = TemplateCatalog(str(templates), index_path)
+        assert refreshed.names() == ["web"]
+        assert refreshed.get("web")["template_info"]["description"] == "Changed"
+        assert refreshed.reparsed == 1
+
+    def test_search_terms_and_filters(self, temp_dir):
+        from blastdock.core.template_catalog import TemplateCatalog
+
+        _write(temp_dir / "web.yml")
+        _write(temp_dir / "db.yml", "Database", "postgres:16", "false")
+        catalog = TemplateCatalog(str(temp_dir), str(temp_dir / "index.json"))
+
+        assert [e["name"] for e in catalog.search("postgres")] == ["db"]
+        assert [e["name"] for e in catalog.search("APP nginx")] == ["web"]
+        assert [e["name"] for e in catalog.search(traefik_compatible=False)] == ["db"]
+        assert len(catalog.search(field_type="port")) == 2
+        assert catalog.search("missing") == []
@@ -0,0 +1,124 @@
+"""
+Tests for the pooled Engine API transport used by DockerClient
+"""
+
+import json
+from unittest.mock import Mock, patch
+
+
+def _client_with_transport(transport):
+    from blastdock.docker.client import DockerClient
+
+    client = DockerClient()
+    client.transport = transport
+    client._connection_verified = True
+    return client
+
+
+class TestEndpointMetrics:
+    """Per-endpoint call statistics"""
+
+    def test_records_calls_and_errors(self):
+        from blastdock.docker.transport import EndpointMetrics
+
+        metrics = EndpointMetrics()
+        metrics.record("GET /info", 0.010)
+        metrics.record("GET /info", 0.030, error=True)
+
+        stats = metrics.snapshot()["GET /info"]
+        assert stats["calls"] == 2
+        assert stats["errors"] == 1
+        assert round(stats["avg_ms"]) == 20
+        assert round(stats["max_ms"]) == 30
+
+
+class TestDockerClientApiRouting:
+    """execute_command serves supported commands from the Engine API"""
+
+    def test_inspect_served_from_api(self):
+        transport = Mock()
+        transport.inspect_container.return_value = {"Id": "abc", "State": {}}
+        client = _client_with_transport(transport)
+
+        with patch("subprocess.run") as mock_run:
+            result = client.execute_command(
+                ["docker", "inspect", "abc", "--format", "{{json .}}"]
+            )
+
+        mock_run.assert_not_called()
+        assert json.loads(result.stdout)["Id"] == "abc"
+
+    def test_logs_with_relative_since(self):
+        transport = Mock()
+        transport.container_logs.return_value = "line\n"
+        client = _client_with_transport(transport)
+
+        result = client.execute_command(
+            ["docker", "logs", "--tail", "50", "--since", "10m", "web"]
+        )
+
+        assert result.stdout == "line\n"
+        _, kwargs = transport.container_logs.call_args
+        assert kwargs["tail"] == 50
+        assert isinstance(kwargs["since"], int)
+
+    def test_logs_since_zero_fall_back_to_cli(self):
+        from docker.errors import InvalidArgument
+
+        transport = Mock()
+        transport.container_logs.side_effect = InvalidArgument("since")
+        client = _client_with_transport(transport)
+
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = Mock(returncode=0, stdout="all\n", stderr="")
+            result = client.execute_command(["docker", "logs", "--since", "0", "web"])
+            # Arguments the SDK rejects also go to the CLI
+            client.execute_command(["docker", "logs", "--since", "5", "web"])
+
+        assert result.stdout == "all\n"
+        transport.container_logs.assert_called_once()
+        assert mock_run.call_count == 2
+
+    def test_unsupported_flags_fall_back_to_cli(self):
+        transport = Mock()
+        client = _client_with_transport(transport)
+
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = Mock(returncode=0, stdout="x", stderr="")
+            client.execute_command(["docker", "logs", "--follow", "web"])
+
+        transport.container_logs.assert_not_called()
+        mock_run.assert_called_once()
+        assert client.get_endpoint_stats()["cli:docker logs"]["calls"] == 1
+
+    def test_unreachable_api_falls_back_to_cli(self):
+        from blastdock.docker.transport import TransportUnavailable
+
+        transport = Mock()
+        transport.info.side_effect = TransportUnavailable("down")
+        client = _client_with_transport(transport)
+
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = Mock(returncode=0, stdout="{}", stderr="")
+            client.execute_command(["docker", "info", "--format", "{{json .}}"])
+
+        mock_run.assert_called_once()
+
+    def test_cleanup_uses_prune_endpoints(self):
+        transport = Mock()
+        transport.is_available.return_value = True
+        transport.prune_containers.return_value = {
+            "ContainersDeleted": ["a", "b"],
+            "SpaceReclaimed": 1500000,
+        }
+        transport.prune_images.return_value = {"ImagesDeleted": None}
+        transport.prune_volumes.return_value = {"VolumesDeleted": ["v"]}
+        transport.prune_networks.return_value = {"NetworksDeleted": []}
+        client = _client_with_transport(transport)
+
+        result = client.cleanup_resources(aggressive=True)
+
+        transport.prune_images.assert_called_once_with(all_images=True)
+        assert result["containers_removed"] == 2
+        assert result["volumes_removed"] == 1
+        assert result["space_reclaimed"] == "1.5MB"
@@ -0,0 +1,102 @@
+"""
+Tests for indexed, sample-driven alert rule evaluation
+"""
+
+from unittest.mock import patch
+
+
+def _manager():
+    from blastdock.monitoring.alert_manager import AlertManager
+
+    return AlertManager()
+
+
+def _rule(name="cpu", metric="container_cpu_percent", duration=60, threshold=90.0):
+    from blastdock.monitoring.alert_manager import AlertRule, AlertSeverity
+
+    return AlertRule(
+        name=name,
+        description="CPU of {{ $labels.container }} is {{ $value }}%",
+        metric_name=metric,
+        condition="gte",
+        threshold=threshold,
+        severity=AlertSeverity.WARNING,
+        duration_seconds=duration,
+        annotations={"summary": "{{ $labels.project }} is busy"},
+    )
+
+
+class TestSampleEvaluation:
+    """Each sample evaluates only the rules indexed under its metric"""
+
+    def test_only_indexed_rules_are_evaluated(self):
+        manager = _manager()
+        before = manager.stats["rules_evaluated"]
+
+        manager.observe_sample("unrelated_metric", 99.0, 1000.0, {})
+        assert manager.stats["rules_evaluated"] == before
+
+        # high_cpu_usage and critical_cpu_usage read this metric
+        manager.observe_sample("container_cpu_percent", 10.0, 1000.0, {"c": "web"})
+        assert manager.stats["rules_evaluated"] == before + 2
+        assert manager._condition_slots.get("high_cpu_usage", {}) == {}
+
+    def test_duration_is_tracked_per_series(self):
+        manager = _manager()
+        for name in [r.name for r in manager.get_rules()]:
+            manager.remove_rule(name)
+        manager.add_rule(_rule())
+        web = {"project": "app", "container": "web"}
+        db = {"project": "app", "container": "db"}
+
+        manager.observe_sample("container_cpu_percent", 95.0, 1000.0, web)
+        manager.observe_sample("container_cpu_percent", 95.0, 1030.0, web)
+        manager.observe_sample("container_cpu_percent", 97.0, 1030.0, db)
+        assert manager.get_active_alerts() == []
+
+        manager.observe_sample("container_cpu_percent", 96.0, 1060.0, web)
+        (alert,) = manager.get_active_alerts()
+        assert alert.message == "CPU of web is 96.0%"
+        assert alert.annotations["summary"] == "app is busy"
+        assert alert.labels["container"] == "web"
+        assert (
+            alert.labels["metric_key"]
+            == "container_cpu_percent{container=web,project=app}"
+        )
+        slot = manager._condition_slots["cpu"][tuple(sorted(db.items()))]
+        assert (slot.first_time, slot.consecutive_count) == (1030.0, 1)
+
+        # Recovery resolves the series' alert and frees its slot
+        manager.observe_sample("container_cpu_percent", 20.0, 1090.0, web)
+        assert manager.get_active_alerts() == []
+        assert tuple(sorted(web.items())) not in manager._condition_slots["cpu"]
+        assert manager.stats["resolved_alerts"] == 1
+
+    def test_snapshot_evaluation_uses_the_index(self):
+        manager = _manager()
+        with patch.object(manager, "_evaluate_rule") as evaluate:
+            manager.evaluate_rules({"container_memory_percent": {}, "other": {}})
+        assert [c.args[0].name for c in evaluate.call_args_list] == [
+            "high_memory_usage"
+        ]
+
+
+class TestMetricsIntegration:
+    """Recorded samples reach the attached alert manager"""
+
+    def test_recorded_sample_fires_alert(self):
+        from blastdock.monitoring.metrics_collector import MetricsCollector
+
+        with patch("blastdock.monitoring.metrics_collector.DockerClient"):
+            collector = MetricsCollector()
+        manager = _manager()
+        manager.add_rule(_rule(name="instant_cpu", duration=0))
+
+        manager.attach_metrics_collector(collector)
+        collector.record_metric(
+            "container_cpu_percent", 99.0, labels={"container": "web"}
+        )
+        assert [a.rule_name for a in manager.get_active_alerts()] == ["instant_cpu"]
+
+        manager.detach_metrics_collector()
+        assert collector._sample_listeners == []
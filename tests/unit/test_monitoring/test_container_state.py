@@ -0,0 +1,179 @@
+"""
+Tests for the event-driven container state table
+"""
+
+import time
+import threading
+from unittest.mock import Mock, patch
+
+
+def _attrs(cid, name, project="app", status="running", health=None):
+    state = {
+        "Status": status,
+        "StartedAt": "2024-01-01T00:00:00.5Z",
+        "ExitCode": 0,
+        "OOMKilled": False,
+    }
+    if health:
+        state["Health"] = {"Status": health}
+    return {
+        "Id": cid,
+        "Name": f"/{name}",
+        "Config": {
+            "Image": "nginx",
+            "Labels": {
+                "com.docker.compose.project": project,
+                "com.docker.compose.service": name.split("-")[1],
+            },
+        },
+        "State": state,
+        "NetworkSettings": {"Ports": {"80/tcp": [{"HostPort": "8080"}]}},
+    }
+
+
+def _event(cid, action, project="app", ts=None, **attributes):
+    attributes.setdefault("com.docker.compose.project", project)
+    return {
+        "Type": "container",
+        "Action": action,
+        "Actor": {"ID": cid, "Attributes": attributes},
+        "timeNano": int((ts or time.time()) * 1e9),
+    }
+
+
+def _table(containers):
+    from blastdock.monitoring.container_state import ContainerStateTable
+
+    docker_client = Mock()
+    docker_client.client.containers.list.return_value = [
+        Mock(attrs=attrs) for attrs in containers
+    ]
+    docker_client.client.containers.get.side_effect = lambda cid: Mock(
+        attrs=next(a for a in containers if a["Id"] == cid)
+    )
+    return ContainerStateTable(docker_client)
+
+
+class TestContainerStateTable:
+    """Reconciliation and incremental event updates"""
+
+    def test_reconcile_builds_project_table(self):
+        table = _table(
+            [
+                _attrs("1", "app-web"),
+                _attrs("2", "app-db", health="healthy"),
+                _attrs("3", "other-web", project="other", status="exited"),
+            ]
+        )
+        assert table.reconcile() == 3
+
+        assert table.list_projects() == ["app", "other"]
+        db, web = table.get_container_status("app")
+        assert (web["name"], web["status"], web["service"]) == (
+            "app-web",
+            "running",
+            "web",
+        )
+        assert web["started_at"] == 1704067200.5
+        assert web["ports"] == {"80/tcp": [{"HostPort": "8080"}]}
+        assert db["health"] == "healthy"
+
+    def test_events_update_state_and_notify(self):
+        table = _table([_attrs("1", "app-web")])
+        table.reconcile()
+        seen = []
+        table.subscribe(lambda project, state, action: seen.append((project, action)))
+
+        table.apply_event(_event("1", "health_status: unhealthy"))
+        assert table.get_container_status("app")[0]["health"] == "unhealthy"
+
+        table.apply_event(_event("1", "oom"))
+        table.apply_event(_event("1", "die", exitCode="137"))
+        info = table.get_container_status("app")[0]
+        assert (info["status"], info["exit_code"], info["oom_killed"]) == (
+            "exited",
+            137,
+            True,
+        )
+        assert table.project_summary("app") == {
+            "containers": 1,
+            "running": 0,
+            "unhealthy": 1,
+            "oom_killed": 1,
+        }
+
+        # Ignored: not tracked, and older than the state already applied
+        assert table.apply_event(_event("1", "exec_start: sh -c true")) is None
+        assert table.apply_event(_event("1", "start", ts=1.0)) is None
+
+        table.apply_event(_event("1", "destroy"))
+        assert table.list_projects() == []
+        assert seen == [
+            ("app", "health_status"),
+            ("app", "oom"),
+            ("app", "die"),
+            ("app", "destroy"),
+        ]
+
+    def test_new_container_is_inspected_on_start(self):
+        containers = [_attrs("1", "app-web")]
+        table = _table(containers)
+        containers.append(_attrs("2", "app-worker"))
+
+        assert table.apply_event(_event("2", "start")) == "app"
+        assert [c["name"] for c in table.get_container_status("app")] == ["app-worker"]
+        # Containers outside compose projects are not tracked
+        assert table.apply_event(_event("9", "start", project="")) is None
+
+    def test_follows_event_stream_until_stopped(self):
+        from blastdock.monitoring import container_state
+
+        table = _table([_attrs("1", "app-web")])
+        stream_open = threading.Event()
+
+        class Stream:
+            def __init__(self):
+                self.closed = threading.Event()
+
+            def __iter__(self):
+                yield _event("1", "die", exitCode="1")
+                stream_open.set()
+                self.closed.wait(5)
+
+            def close(self):
+                self.closed.set()
+
+        table.docker_client.client.events.return_value = Stream()
+
+        with patch.object(container_state, "_container_state_table", table):
+            table.start()
+            try:
+                assert stream_open.wait(5)
+                assert container_state.container_source(Mock()) is table
+                assert table.get_container_status("app")[0]["status"] == "exited"
+            finally:
+                table.stop()
+            assert not table.is_running
+            fallback = Mock()
+            assert container_state.container_source(fallback) is fallback
+
+        _, kwargs = table.docker_client.client.events.call_args
+        assert kwargs["decode"] is True
+        assert kwargs["filters"] == {"type": "container"}
+
+
+class TestEventDrivenHealth:
+    """Container events make their project due for a health check"""
+
+    def test_event_wakes_monitoring_for_project(self):
+        from blastdock.monitoring.health_checker import HealthChecker
+
+        with patch("blastdock.monitoring.health_checker.DockerClient"):
+            checker = HealthChecker()
+        checker._project_scheduler.schedule("app", 300)
+        assert not checker._project_scheduler.is_due("app")
+
+        checker._on_container_event("app", None, "die")
+
+        assert checker._project_scheduler.is_due("app")
+        assert checker._wake_event.is_set()
@@ -0,0 +1,185 @@
+"""
+Tests for concurrent health check scheduling
+"""
+
+import time
+import threading
+from unittest.mock import Mock, patch
+
+
+class TestHealthCheckScheduler:
+    """Concurrent checks, per-check deadlines and jittered intervals"""
+
+    def test_checks_run_concurrently_with_own_deadlines(self):
+        from blastdock.monitoring.health_scheduler import HealthCheckScheduler
+
+        barrier = threading.Barrier(2, timeout=5)
+        release = threading.Event()
+
+        def meet(value):
+            barrier.wait()  # deadlocks unless both checks run at once
+            return value
+
+        def broken():
+            raise RuntimeError("boom")
+
+        scheduler = HealthCheckScheduler(max_workers=4)
+        try:
+            start = time.time()
+            outcomes = scheduler.run(
+                {
+                    "a": (lambda: meet(1), 5),
+                    "b": (lambda: meet(2), 5),
+                    "hung": (lambda: release.wait(10), 0.2),
+                    "broken": (broken, 5),
+                }
+            )
+            elapsed = time.time() - start
+        finally:
+            release.set()
+            scheduler.shutdown()
+
+        assert (outcomes["a"].value, outcomes["b"].value) == (1, 2)
+        assert isinstance(outcomes["hung"].error, TimeoutError)
+        assert isinstance(outcomes["broken"].error, RuntimeError)
+        assert scheduler.timed_out == 1
+        assert elapsed < 2
+
+    def test_hung_check_is_not_submitted_again(self):
+        from blastdock.monitoring.health_scheduler import HealthCheckScheduler
+
+        release = threading.Event()
+        calls = []
+
+        def hang():
+            calls.append(1)
+            release.wait(10)
+            return "done"
+
+        scheduler = HealthCheckScheduler(max_workers=2)
+        try:
+            assert scheduler.run({"svc": (hang, 0.1)})["svc"].error is not None
+            assert scheduler.run({"svc": (hang, 0.1)})["svc"].error is not None
+            release.set()
+            assert scheduler.run({"svc": (hang, 5)})["svc"].value == "done"
+        finally:
+            release.set()
+            scheduler.shutdown()
+        assert len(calls) == 1
+
+    def test_jittered_schedule(self):
+        from blastdock.monitoring.health_scheduler import HealthCheckScheduler
+
+        scheduler = HealthCheckScheduler(jitter=0.1)
+        assert scheduler.is_due("svc", now=1000.0)
+        assert scheduler.seconds_until_due(now=1000.0) is None
+
+        due_times = set()
+        for _ in range(20):
+            scheduler.schedule("svc", 30.0, now=1000.0)
+            due_times.add(1000.0 + scheduler.seconds_until_due(now=1000.0))
+            assert not scheduler.is_due("svc", now=1026.9)
+            assert scheduler.is_due("svc", now=1033.0)
+        assert len(due_times) > 1
+
+
+class TestConcurrentProjectHealth:
+    """Project checks take as long as their slowest check"""
+
+    def _checker(self, names):
+        from blastdock.monitoring.health_checker import HealthChecker
+
+        with patch("blastdock.monitoring.health_checker.DockerClient"):
+            checker = HealthChecker()
+        checker.docker_client = Mock()
+        checker.docker_client.get_container_status.return_value = [
+            {"name": f"app_{name}", "image": "img", "status": "running"}
+            for name in names
+        ]
+        checker.docker_client.get_container_stats.return_value = None
+        return checker
+
+    def test_service_checks_overlap_and_hung_check_times_out(self):
+        from blastdock.monitoring.health_checker import (
+            HealthCheckResult,
+            HealthStatus,
+            ServiceHealthConfig,
+        )
+
+        checker = self._checker(["web", "api", "db"])
+        for name in ("web", "api", "db"):
+            checker.register_service_health_config(
+                "app",
+                name,
+                ServiceHealthConfig(
+                    service_name=name,
+                    check_type="tcp",
+                    timeout=0.5 if name == "db" else 5,
+                ),
+            )
+        release = threading.Event()
+
+        def check(config, container_info, start_time):
+            if config.service_name == "db":
+                release.wait(10)
+            else:
+                time.sleep(0.3)
+            return HealthCheckResult(HealthStatus.HEALTHY, "ok", 1.0, time.time())
+
+        with patch.object(checker, "_check_tcp_health", side_effect=check):
+            try:
+                start = time.time()
+                result = checker.check_project_health("app")
+                elapsed = time.time() - start
+            finally:
+                release.set()
+
+        # db is abandoned at its 0.5s + grace deadline; web and api overlap
+        assert elapsed < 2.5
+        assert result["services"]["web"]["status"] == "healthy"
+        assert result["services"]["db"]["status"] == "unhealthy"
+        assert "timed out" in result["services"]["db"]["message"]
+        assert result["overall_status"] == "degraded"
+
+    def test_due_only_reuses_results_until_interval_elapses(self):
+        from blastdock.monitoring.health_checker import (
+            HealthCheckResult,
+            HealthStatus,
+            ServiceHealthConfig,
+        )
+
+        checker = self._checker(["web"])
+        checker.register_service_health_config(
+            "app",
+            "web",
+            ServiceHealthConfig(service_name="web", check_type="tcp", interval=60),
+        )
+        failing = HealthCheckResult(HealthStatus.UNHEALTHY, "down", 1.0, time.time())
+
+        with patch.object(
+            checker, "_check_tcp_health", return_value=failing
+        ) as tcp_check:
+            first = checker.check_project_health("app", due_only=True)
+            second = checker.check_project_health("app", due_only=True)
+            checker.check_project_health("app")
+
+        assert tcp_check.call_count == 2
+        assert first["services"]["web"]["message"] == "down"
+        assert second["services"]["web"]["message"] == "down"
+
+    def test_background_sweep_checks_projects_concurrently(self):
+        checker = self._checker([])
+        checker.docker_client.list_projects.return_value = ["one", "two"]
+        barrier = threading.Barrier(2, timeout=5)
+
+        def check(project, due_only=False):
+            barrier.wait()  # deadlocks unless both projects are checked at once
+            return {"overall_status": "healthy"}
+
+        with patch.object(checker, "check_project_health", side_effect=check) as hc:
+            checker._run_due_checks()
+            checker._run_due_checks()  # neither project is due again yet
+
+        assert hc.call_count == 2
+        assert 0 < checker._project_scheduler.seconds_until_due() <= 33
+        checker._project_scheduler.shutdown()
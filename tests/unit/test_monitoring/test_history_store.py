@@ -0,0 +1,216 @@
+"""
+Tests for the persistent health and alert history store
+"""
+
+import os
+from unittest.mock import patch
+
+DAY = 86400.0
+
+
+class TestHistoryStore:
+    """Fixed-size records in daily files, indexed with hourly rollups"""
+
+    def test_health_history_and_rollups(self, tmp_path):
+        from blastdock.monitoring.history_store import HEALTH_RECORD, HistoryStore
+
+        store = HistoryStore(str(tmp_path))
+        start = 10 * DAY
+        for i in range(6):
+            status = "healthy" if i % 3 else "unhealthy"
+            store.record_health("app:web", status, "ok", 10.0 * i, start + i * 600)
+        store.record_health("app:db", "degraded", "slow", 50.0, start + DAY)
+        store.record_health("other:web", "healthy", "ok", 1.0, start + DAY)
+        store.flush()
+
+        # One file per day, holding only fixed-size records
+        health_dir = tmp_path / "health"
+        assert os.path.getsize(health_dir / f"{int(start)}.rec") == (
+            6 * HEALTH_RECORD.size
+        )
+
+        history = store.health_history(["app:web"], limit=3)
+        assert [h["timestamp"] for h in history] == [
+            start + 1800,
+            start + 2400,
+            start + 3000,
+        ]
+        assert [h["status"] for h in history] == ["unhealthy", "healthy", "healthy"]
+
+        project = store.health_history(prefix="app:", limit=2)
+        assert [h["service_key"] for h in project] == ["app:web", "app:db"]
+
+        rollup = store.health_rollup("app:")
+        assert rollup["checks"] == 7
+        assert (rollup["healthy"], rollup["unhealthy"], rollup["degraded"]) == (
+            4,
+            2,
+            1,
+        )
+        assert rollup["response_time_ms"] == 200.0
+        assert store.health_rollup("app:", since=start + DAY)["checks"] == 1
+
+    def test_reopened_store_keeps_history(self, tmp_path):
+        from blastdock.monitoring.history_store import HistoryStore
+
+        store = HistoryStore(str(tmp_path))
+        store.record_health("app:web", "healthy", "ok", 5.0, 1000.0)
+        store.record_alert("cpu", "cpu{c=web}", "warning", "firing", "busy", 1000.0)
+        store.record_alert(
+            "cpu", "cpu{c=web}", "warning", "resolved", "busy", 1000.0, 1600.0
+        )
+        store.close()
+
+        reopened = HistoryStore(str(tmp_path))
+        assert reopened.health_rollup()["checks"] == 1
+        assert reopened.health_history(["app:web"])[0]["message"] == "ok"
+
+        # The resolution supersedes the firing record
+        (alert,) = reopened.alert_history(rule_name="cpu")
+        assert (alert["status"], alert["resolved_at"]) == ("resolved", 1600.0)
+        assert reopened.alert_rollup() == {
+            "cpu": {"events": 2, "fired": 1, "resolved": 1, "resolve_seconds": 600}
+        }
+        assert reopened.alert_history(rule_name="unknown") == []
+
+    def test_retention_drops_old_days(self, tmp_path):
+        from blastdock.monitoring.history_store import HistoryStore
+
+        store = HistoryStore(str(tmp_path), retention_days=1)
+        store.record_health("app:web", "healthy", "ok", 1.0, 1000.0)
+        assert store.enforce_retention() == 1
+        assert store.health_rollup()["checks"] == 0
+        # Records, index and message table are all gone; only the lock stays
+        assert os.listdir(tmp_path / "health") == [".lock"]
+
+    def test_stores_sharing_a_directory(self, tmp_path):
+        from blastdock.monitoring.history_store import HistoryStore
+
+        # Two processes' stores (the CLI and the background monitor)
+        cli = HistoryStore(str(tmp_path))
+        monitor = HistoryStore(str(tmp_path))
+        monitor.record_health("app:web", "healthy", "ok", 1.0, 1000.0)
+        cli.record_health("app:db", "unhealthy", "refused", 2.0, 1001.0)
+        monitor.flush()
+        cli.flush()
+
+        for store in (cli, monitor):
+            assert store.strings.get_id("app:web") != store.strings.get_id("app:db")
+            history = store.health_history(prefix="app:")
+            assert [(h["service_key"], h["message"]) for h in history] == [
+                ("app:web", "ok"),
+                ("app:db", "refused"),
+            ]
+            assert store.health_rollup("app:")["checks"] == 2
+
+    def test_messages_expire_with_their_day(self, tmp_path):
+        from blastdock.monitoring.history_store import HistoryStore
+
+        store = HistoryStore(str(tmp_path), retention_days=1)
+        for i in range(3):
+            store.record_alert(
+                "cpu", "cpu{c=web}", "warning", "firing", f"CPU at {i}%", 1000.0 + i
+            )
+        store.flush()
+        assert [a["message"] for a in store.alert_history()] == [
+            "CPU at 0%",
+            "CPU at 1%",
+            "CPU at 2%",
+        ]
+        assert (tmp_path / "strings.jsonl").read_text().count("CPU") == 0
+
+        store.enforce_retention()
+        assert not any(
+            name.endswith(".msg") for name in os.listdir(tmp_path / "alerts")
+        )
+
+    def test_buffered_records_flushed_at_exit(self, tmp_path):
+        import subprocess
+        import sys
+
+        from blastdock.monitoring.history_store import HistoryStore
+
+        script = (
+            "import sys\n"
+            "from blastdock.monitoring.history_store import HistoryStore\n"
+            "HistoryStore(sys.argv[1]).record_health('a:web', 'healthy', 'ok', 1, 1e3)\n"
+        )
+        repo_root = os.path.dirname(
+            os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        )
+        subprocess.run(
+            [sys.executable, "-c", script, str(tmp_path)], check=True, cwd=repo_root
+        )
+        assert HistoryStore(str(tmp_path)).health_rollup()["checks"] == 1
+
+
+class TestPersistentHistory:
+    """Health checker and alert manager answer from the shared store"""
+
+    def test_health_statistics_survive_restart(self, tmp_path):
+        from blastdock.monitoring.health_checker import (
+            HealthChecker,
+            HealthCheckResult,
+            HealthStatus,
+        )
+        from blastdock.monitoring.history_store import HistoryStore
+
+        with patch("blastdock.monitoring.health_checker.DockerClient"):
+            checker = HealthChecker(persist=True, history_dir=str(tmp_path))
+        for i, status in enumerate(
+            [HealthStatus.HEALTHY] * 3 + [HealthStatus.UNHEALTHY]
+        ):
+            checker._store_health_result(
+                "app:web", HealthCheckResult(status, "msg", 20.0, 1000.0 + i)
+            )
+        stats = checker.get_health_statistics("app")
+        assert (stats["total_checks"], stats["uptime_percentage"]) == (4, 75.0)
+        assert stats["average_response_time_ms"] == 20.0
+        checker.history_store.flush()
+
+        with patch("blastdock.monitoring.health_checker.DockerClient"):
+            restarted = HealthChecker()
+        restarted.history_store = HistoryStore(str(tmp_path))
+        assert restarted.get_health_statistics("app")["total_checks"] == 4
+        history = restarted.get_health_history("app", "web", limit=2)
+        assert [h["status"] for h in history] == ["healthy", "unhealthy"]
+
+    def test_in_memory_statistics_use_running_totals(self):
+        from blastdock.monitoring.health_checker import (
+            HealthChecker,
+            HealthCheckResult,
+            HealthStatus,
+        )
+
+        with patch("blastdock.monitoring.health_checker.DockerClient"):
+            checker = HealthChecker()
+        checker._max_history = 2
+        for i in range(5):
+            checker._store_health_result(
+                "app:web",
+                HealthCheckResult(HealthStatus.DEGRADED, "slow", 100.0, float(i)),
+            )
+        assert len(checker._health_history["app:web"]) == 2
+        stats = checker.get_health_statistics()
+        assert (stats["total_checks"], stats["degraded_checks"]) == (5, 5)
+        assert checker.get_health_statistics("other")["total_checks"] == 0
+
+    def test_alert_history_and_statistics(self, tmp_path):
+        from blastdock.monitoring.alert_manager import AlertManager
+        from blastdock.monitoring.history_store import open_history_store
+
+        manager = AlertManager(persist=True, history_dir=str(tmp_path))
+        assert manager.history_store is open_history_store(str(tmp_path))
+        manager._notifier.submit = lambda *args, **kwargs: True
+        rule = manager.get_rules()[0]
+        manager._fire_alert(rule, "m{c=web}", 99.0, 1000.0)
+        manager._resolve_alert(rule, "m{c=web}", 1300.0)
+
+        stats = manager.get_alert_statistics(rule.name)
+        assert stats[rule.name]["fired"] == 1
+        assert stats[rule.name]["mean_time_to_resolve_seconds"] == 300.0
+
+        manager._alert_history.clear()
+        (alert,) = manager.get_alert_history(10)
+        assert (alert.rule_name, alert.resolved_at) == (rule.name, 1300.0)
+        assert alert.labels == {"metric_key": "m{c=web}"}
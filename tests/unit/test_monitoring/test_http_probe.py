@@ -0,0 +1,148 @@
+"""
+Tests for pooled HTTP health probes
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+BODY = b"<html>status: ready</html>" + b"x" * (1024 * 1024)
+# Small enough for the rest of a partly read body to be drained
+SMALL_BODY = b"<html>status: ready</html>" + b"x" * 4096
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def _body(self):
+        return SMALL_BODY if self.path == "/small" else BODY
+
+    def _headers(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(self._body())))
+        self.end_headers()
+
+    def do_HEAD(self):
+        self._headers()
+
+    def do_GET(self):
+        self._headers()
+        try:
+            self.wfile.write(self._body())
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestHttpProbeClient:
+    """Keep-alive reuse, partial body reads and timing breakdown"""
+
+    def test_connection_is_reused(self, server):
+        from blastdock.monitoring.http_probe import HttpProbeClient
+
+        client = HttpProbeClient(max_body_bytes=len(BODY))
+        try:
+            first = client.probe(server, timeout=5)
+            second = client.probe(server, timeout=5)
+        finally:
+            client.close()
+
+        assert first.status_code == 200
+        assert first.bytes_read == len(BODY)
+        assert not first.connection_reused and first.connect_ms > 0
+        assert second.connection_reused and second.connect_ms == 0
+        assert 0 < second.ttfb_ms <= second.total_ms
+
+    def test_reading_stops_at_content_or_byte_limit(self, server):
+        from blastdock.monitoring.http_probe import HttpProbeClient
+
+        client = HttpProbeClient(max_body_bytes=16 * 1024, chunk_size=4)
+        try:
+            found = client.probe(server, timeout=5, expected_content="ready")
+            limited = client.probe(server, timeout=5)
+            missing = client.probe(server, timeout=5, expected_content="offline")
+            head = client.probe(server, timeout=5, method="HEAD")
+        finally:
+            client.close()
+
+        # "ready" spans a chunk boundary and is found within the first chunks
+        assert found.content_found is True and found.bytes_read <= 24
+        assert limited.content_found is None
+        assert limited.bytes_read == 16 * 1024
+        assert missing.content_found is False
+        assert head.bytes_read == 0 and head.status_code == 200
+
+    def test_connection_reused_after_head_and_partial_reads(self, server):
+        from blastdock.monitoring.http_probe import HttpProbeClient
+
+        small = server + "small"
+        client = HttpProbeClient(max_body_bytes=1024, chunk_size=16)
+        try:
+            probes = [
+                client.probe(server, timeout=5, method="HEAD"),
+                client.probe(server, timeout=5, method="HEAD"),
+                client.probe(small, timeout=5, expected_content="ready"),
+                client.probe(small, timeout=5),
+                client.probe(small, timeout=5),
+            ]
+            # Too much body left to drain: the connection is dropped
+            client.probe(server, timeout=5)
+            after_large = client.probe(small, timeout=5)
+        finally:
+            client.close()
+
+        assert probes[2].content_found is True and probes[2].bytes_read <= 32
+        assert probes[3].bytes_read == 1024
+        assert [p.connection_reused for p in probes] == [False, True, True, True, True]
+        assert not after_large.connection_reused
+
+
+class TestHttpHealthCheck:
+    """HealthChecker HTTP checks go through the probe client"""
+
+    def _check(self, url, **config):
+        import time
+        from unittest.mock import patch
+
+        from blastdock.monitoring.health_checker import (
+            HealthChecker,
+            ServiceHealthConfig,
+        )
+
+        with patch("blastdock.monitoring.health_checker.DockerClient"):
+            checker = HealthChecker()
+        health_config = ServiceHealthConfig(
+            service_name="web", check_type="http", endpoint=url, timeout=5, **config
+        )
+        return checker._check_http_health(
+            health_config, {"name": "app_web"}, time.time()
+        )
+
+    def test_healthy_probe_reports_timings(self, server):
+        result = self._check(server, expected_content="status: ready")
+
+        assert result.status.value == "healthy"
+        assert result.details["status_code"] == 200
+        assert set(result.details["timings"]) == {"connect_ms", "ttfb_ms", "total_ms"}
+        assert result.details["bytes_read"] < len(BODY)
+
+    def test_missing_content_is_degraded(self, server):
+        result = self._check(server, expected_content="offline", method="HEAD")
+
+        assert result.status.value == "degraded"
+        assert result.details["bytes_read"] > 0
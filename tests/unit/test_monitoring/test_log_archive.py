@@ -0,0 +1,132 @@
+"""
+Tests for the persistent log archive
+"""
+
+import os
+import time
+from unittest.mock import Mock, patch
+
+from .test_log_stream import FakeContainer
+
+
+def _line(ts, level="info", container="web", message="ok", patterns=()):
+    from blastdock.monitoring.log_archive import ArchivedLine
+
+    return ArchivedLine(ts, level, container, message, list(patterns))
+
+
+class TestLogArchive:
+    """Segments, block index and filtered queries"""
+
+    def test_query_filters_and_skips_blocks(self, temp_dir):
+        from blastdock.monitoring.log_archive import LogArchive
+
+        archive = LogArchive(str(temp_dir), block_records=2)
+        base = int(time.time()) // 3600 * 3600 - 3600
+        archive.append(
+            "app",
+            [
+                _line(base + 1),
+                _line(base + 2),
+                _line(base + 3, "error", "db", "disk full", ["disk_space_full"]),
+                _line(base + 4),
+                _line(base + 3601, "error", "web", "boom"),
+            ],
+        )
+        archive.flush()
+
+        # Two hourly segments, compressed blocks of at most two lines
+        names = sorted(os.listdir(os.path.join(str(temp_dir), "app")))
+        assert [n for n in names if n.endswith(".seg")] == [
+            f"{base}.seg",
+            f"{base + 3600}.seg",
+        ]
+
+        reopened = LogArchive(str(temp_dir), block_records=2)
+        with patch.object(
+            LogArchive, "_read_block", wraps=LogArchive._read_block
+        ) as read_block:
+            errors = list(reopened.query("app", start=base, levels=["error"]))
+        assert [(line.timestamp, line.message) for line in errors] == [
+            (base + 3, "disk full"),
+            (base + 3601, "boom"),
+        ]
+        # Only the blocks whose index lists errors were decompressed
+        assert read_block.call_count == 2
+
+        window = reopened.query("app", base + 2, base + 3)
+        assert [line.timestamp for line in window] == [base + 2, base + 3]
+        assert [
+            line.container
+            for line in reopened.query("app", patterns=["disk_space_full"])
+        ] == ["db"]
+        assert len(list(reopened.query("app", limit=3))) == 3
+
+    def test_short_trailing_block_is_topped_up(self, temp_dir):
+        from blastdock.monitoring.log_archive import LogArchive
+
+        archive = LogArchive(str(temp_dir), block_records=100)
+        now = time.time()
+        for i in range(3):
+            archive.append("app", [_line(now + i * 0.001)])
+            archive.flush()
+
+        index_files = [
+            n
+            for n in os.listdir(os.path.join(str(temp_dir), "app"))
+            if n.endswith(".idx")
+        ]
+        index = archive._read_index(os.path.join(str(temp_dir), "app", index_files[0]))
+        assert [block["count"] for block in index["blocks"]] == [3]
+        assert len(list(archive.query("app"))) == 3
+
+    def test_retention_removes_old_segments(self, temp_dir):
+        from blastdock.monitoring.log_archive import LogArchive
+
+        archive = LogArchive(str(temp_dir), retention_days=1)
+        archive.append("app", [_line(time.time() - 3 * 86400), _line(time.time())])
+        archive.flush()
+
+        assert archive.enforce_retention() == 1
+        assert len(list(archive.query("app"))) == 1
+        assert archive.get_stats()["projects"]["app"]["segments"] == 1
+
+
+class TestAnalyzerArchive:
+    """Archived lines seed later analyses and answer range queries"""
+
+    def _analyzer(self, temp_dir, container):
+        from blastdock.monitoring.log_analyzer import LogAnalyzer
+
+        with patch("blastdock.monitoring.log_analyzer.DockerClient"):
+            analyzer = LogAnalyzer(archive=True, archive_dir=str(temp_dir))
+        analyzer._cache_ttl = 0
+        analyzer.docker_client = Mock()
+        analyzer.docker_client.get_container_status.return_value = [{"name": "web"}]
+        analyzer.docker_client.get_container_by_name.return_value = container
+        return analyzer
+
+    def test_new_analyzer_resumes_from_archive(self, temp_dir):
+        now = int(time.time()) - 600
+        web = FakeContainer()
+        web.write(now, "ERROR out of memory")
+        web.write(now + 1, "INFO ready")
+        first = self._analyzer(temp_dir, web)
+        assert first.analyze_project_logs("app").total_lines == 2
+
+        web.write(now + 2, "WARN retrying connection")
+        second = self._analyzer(temp_dir, web)
+        result = second.analyze_project_logs("app")
+
+        # Only the new line was fetched; the rest came from the archive
+        assert web.calls[-1]["since"] >= now + 1
+        assert "tail" not in web.calls[-1]
+        assert second._streams["app"].ingested == 1
+        assert result.total_lines == 3
+        assert result.patterns_found["out_of_memory"] == 1
+
+        errors = second.search_archived_logs("app", hours=1, levels=["error"])
+        assert [e["message"] for e in errors] == ["out of memory"]
+
+        week = second.analyze_archived_logs("app", time.time() - 7 * 86400)
+        assert (week.error_count, week.warning_count) == (1, 1)
@@ -0,0 +1,213 @@
+"""
+Tests for single-pass log line classification
+"""
+
+import re
+
+import pytest
+
+BENIGN_LINES = [
+    "2023-12-01T10:30:45.123Z INFO GET /api/v1/users/42 200 12ms",
+    "2023-12-01T10:30:46.001Z DEBUG cache hit key=user:42",
+    '172.18.0.1 - - [01/Dec/2023:10:30:45 +0000] "GET /health HTTP/1.1" 200 2',
+    "web_1 | 2023-12-01 10:30:47 INFO request completed in 15 ms",
+]
+
+CORPUS_LINES = [
+    "2023-12-01T10:30:45.123Z ERROR database connection failed: timeout",
+    "2023-12-01 10:30:45 WARNING: slow query took 5200ms",
+    "web | 2023-12-01T10:30:45 INFO server listening on port 8080",
+    "Dec  1 10:30:45 host sshd[42]: permission denied for user root",
+    "[1701427845.123] DEBUG retrying request, attempt 3",
+    "critical: out of memory while allocating buffer",
+    "plain message without level or timestamp",
+    "INFORMATION ERR mixed keywords TRACE",
+    "2023-13-45T99:99:99Z fatal bad timestamp, [1701427845] fallback",
+    "worker_1  | Deprecated API used; upgrade soon",
+    "ssl certificate expired for example.com",
+    "thread pool exhausted, queue full",
+]
+
+
+class LegacyParser:
+    """Per-regex implementation the matcher replaced (reference behaviour)"""
+
+    def extract_timestamp(self, line):
+        """Extract timestamp from log line"""
+        # Common timestamp patterns
+        timestamp_patterns = [
+            # ISO format: 2023-12-01T10:30:45.123Z
+            r"(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d{3})?Z?)",
+            # Docker format: 2023-12-01 10:30:45
+            r"(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})",
+            # Syslog format: Dec  1 10:30:45
+            r"([A-Za-z]{3}\s+\d{1,2}\s+\d{2}:\d{2}:\d{2})",
+            # Unix timestamp: [1701427845.123]
+            r"\[(\d{10}(?:\.\d{3})?)\]",
+        ]
+
+        for pattern in timestamp_patterns:
+            match = re.search(pattern, line)
+            if match:
+                timestamp_str = match.group(1)
+                try:
+                    # Try different parsing methods
+                    if "T" in timestamp_str:
+                        # ISO format
+                        from datetime import datetime
+
+                        dt = datetime.fromisoformat(
+                            timestamp_str.replace("Z", "+00:00")
+                        )
+                        return dt.timestamp()
+                    elif "-" in timestamp_str and " " in timestamp_str:
+                        # YYYY-MM-DD HH:MM:SS format
+                        from datetime import datetime
+
+                        dt = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
+                        return dt.timestamp()
+                    elif timestamp_str.replace(".", "").isdigit():
+                        # Unix timestamp
+                        return float(timestamp_str)
+                except Exception:
+                    continue
+
+        return None
+
+    def extract_log_level(self, line):
+        """Extract log level from log line"""
+        line_upper = line.upper()
+
+        # Common log level patterns
+        if re.search(r"\b(FATAL|CRIT|CRITICAL)\b", line_upper):
+            return "fatal"
+        elif re.search(r"\b(ERROR|ERR)\b", line_upper):
+            return "error"
+        elif re.search(r"\b(WARN|WARNING)\b", line_upper):
+            return "warn"
+        elif re.search(r"\b(INFO|INFORMATION)\b", line_upper):
+            return "info"
+        elif re.search(r"\b(DEBUG|DBG)\b", line_upper):
+            return "debug"
+        elif re.search(r"\b(TRACE|TRC)\b", line_upper):
+            return "trace"
+        else:
+            # Default to INFO if no level found
+            return "info"
+
+    def clean_message(self, line):
+        """Clean log message by removing timestamp and level prefixes"""
+        # Remove common prefixes
+        cleaned = line
+
+        # Remove timestamps
+        cleaned = re.sub(
+            r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d{3})?Z?\s*", "", cleaned
+        )
+        cleaned = re.sub(r"[A-Za-z]{3}\s+\d{1,2}\s+\d{2}:\d{2}:\d{2}\s*", "", cleaned)
+        cleaned = re.sub(r"\[\d{10}(?:\.\d{3})?\]\s*", "", cleaned)
+
+        # Remove log levels
+        cleaned = re.sub(
+            r"\b(TRACE|DEBUG|INFO|WARN|WARNING|ERROR|ERR|FATAL|CRIT|CRITICAL)\b:?\s*",
+            "",
+            cleaned,
+            flags=re.IGNORECASE,
+        )
+
+        # Remove Docker container prefixes
+        cleaned = re.sub(r"^\w+\s*\|\s*", "", cleaned)
+
+        return cleaned.strip()
+
+
+def _patterns():
+    from blastdock.monitoring.log_analyzer import LogAnalyzer
+
+    return LogAnalyzer._initialize_patterns(None)
+
+
+class TestClassifyLine:
+    """Single scan agrees with the per-regex implementation"""
+
+    @pytest.mark.parametrize("line", CORPUS_LINES)
+    def test_matches_legacy_behaviour(self, line):
+        from blastdock.monitoring.log_matcher import classify_line
+
+        legacy = LegacyParser()
+        info = classify_line(line)
+        assert info.timestamp == pytest.approx(legacy.extract_timestamp(line))
+        assert info.level == legacy.extract_log_level(line)
+        assert info.message == legacy.clean_message(line)
+
+    def test_timestamp_format(self):
+        from blastdock.monitoring.log_matcher import classify_line
+
+        formats = [classify_line(line).timestamp_format for line in CORPUS_LINES[:5]]
+        assert formats == ["iso", "datetime", "iso", "syslog", "unix"]
+        assert classify_line(CORPUS_LINES[8]).timestamp_format == "unix"
+
+
+class TestPatternMatcher:
+    """Keyword-prefiltered matching reports every pattern hit"""
+
+    def test_keywords_from_regex(self):
+        from blastdock.monitoring.log_matcher import pattern_keywords
+
+        assert pattern_keywords(re.compile(r"(Memory|OOM)", re.I)) == {
+            "memory",
+            "oom",
+        }
+        # The most selective required literal wins
+        assert pattern_keywords(re.compile(r"(ssl|tls).*(error|invalid|expired)")) == {
+            "error",
+            "invalid",
+            "expired",
+        }
+        assert pattern_keywords(re.compile(r"\d+ms|x")) is None
+
+    def test_hits_match_individual_searches(self):
+        from blastdock.monitoring.log_matcher import PatternMatcher, classify_line
+
+        patterns = _patterns()
+        matcher = PatternMatcher(patterns)
+        for line in CORPUS_LINES:
+            message = classify_line(line).message
+            expected = [p.name for p in patterns if p.pattern.search(message)]
+            assert [p.name for p in matcher.match(message)] == expected
+
+    def test_patterns_without_keywords_are_always_searched(self):
+        from blastdock.monitoring.log_analyzer import LogLevel, LogPattern
+        from blastdock.monitoring.log_matcher import PatternMatcher
+
+        repeated = LogPattern(
+            name="repeated_word",
+            pattern=re.compile(r"\b(\w+) \1\b"),
+            level=LogLevel.WARN,
+            description="Repeated word",
+            severity=2,
+        )
+        matcher = PatternMatcher(_patterns() + [repeated])
+        assert [p.name for p in matcher.match("the the end")] == ["repeated_word"]
+        assert matcher.match("nothing to see") == []
+
+
+class TestLegacyEquivalence:
+    """Routine and notable lines come out as the per-regex path had them"""
+
+    def test_mixed_lines(self):
+        from blastdock.monitoring.log_matcher import PatternMatcher, classify_line
+
+        # Throughput against the per-regex path: the log_parse and
+        # log_parse_per_regex cases of the benchmark suite
+        patterns = _patterns()
+        legacy = LegacyParser()
+        matcher = PatternMatcher(patterns)
+        for line in BENIGN_LINES + CORPUS_LINES:
+            info = classify_line(line)
+            message = legacy.clean_message(line)
+            assert info.level == legacy.extract_log_level(line)
+            assert info.message == message
+            assert [p.name for p in matcher.match(info.message)] == [
+                p.name for p in patterns if p.pattern.search(message)
+            ]
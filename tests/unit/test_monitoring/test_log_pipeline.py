@@ -0,0 +1,110 @@
+"""
+Tests for the parallel log fetch and parse pipeline
+"""
+
+import threading
+from unittest.mock import Mock, patch
+
+
+def _patterns():
+    from blastdock.monitoring.log_analyzer import LogAnalyzer
+
+    return LogAnalyzer._initialize_patterns(None)
+
+
+class TestLogPipeline:
+    """Concurrent fetches, sharded parsing and timestamp merge"""
+
+    def test_fetches_run_concurrently(self):
+        from blastdock.monitoring.log_pipeline import LogPipeline
+
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fetch(value):
+            barrier.wait()  # deadlocks unless both fetches run at once
+            return value
+
+        def broken():
+            raise RuntimeError("container vanished")
+
+        pipeline = LogPipeline(max_fetch_workers=4)
+        try:
+            results = pipeline.fetch(
+                {"a": lambda: fetch(1), "b": lambda: fetch(2), "c": broken}
+            )
+        finally:
+            pipeline.shutdown()
+        assert results == {"a": 1, "b": 2}
+
+    def test_sharded_parse_matches_in_process_parse(self):
+        from blastdock.monitoring.log_pipeline import LogPipeline, parse_log_shard
+
+        patterns = _patterns()
+        batches = {
+            "web": [
+                (1000.0 + i, f"ERROR database connection failed #{i}")
+                for i in range(13)
+            ],
+            "db": [(1000.5 + i, "WARN slow query detected") for i in range(12)],
+        }
+        pipeline = LogPipeline(shard_threshold=10, shard_size=4, max_processes=2)
+        try:
+            parsed = pipeline.parse(batches, patterns)
+        finally:
+            pipeline.shutdown()
+
+        assert pipeline.sharded_batches == 1
+        for name, lines in batches.items():
+            assert parsed[name] == parse_log_shard(lines, name, patterns)
+        timestamp, level, message, container, hits = parsed["web"][3]
+        assert (timestamp, level, container) == (1003.0, "error", "web")
+        assert [patterns[i].name for i in hits] == ["database_connection_error"]
+
+    def test_small_batches_parse_in_process(self):
+        from blastdock.monitoring.log_pipeline import LogPipeline
+
+        pipeline = LogPipeline(shard_threshold=100)
+        with patch.object(pipeline, "_parse_executor") as executor:
+            parsed = pipeline.parse({"web": [(None, "INFO ready")]}, _patterns())
+        executor.assert_not_called()
+        assert parsed["web"][0][1:4] == ("info", "ready", "web")
+
+    def test_merge_by_timestamp(self):
+        from blastdock.monitoring.log_pipeline import merge_by_timestamp
+
+        merged = merge_by_timestamp([[(1, "a"), (4, "a")], [(2, "b")], [(3, "c")]])
+        assert [item[0] for item in merged] == [1, 2, 3, 4]
+
+
+class TestRealTimeAnalysis:
+    """Recent entries across containers, newest first"""
+
+    def test_entries_merged_newest_first(self):
+        from blastdock.monitoring.log_analyzer import LogAnalyzer
+
+        with patch("blastdock.monitoring.log_analyzer.DockerClient"):
+            analyzer = LogAnalyzer()
+        analyzer.docker_client = Mock()
+        analyzer.docker_client.get_container_status.return_value = [
+            {"name": "web"},
+            {"name": "db"},
+        ]
+        logs = {
+            "web": "[1700000001] INFO a\n[1700000004] ERROR out of memory\n",
+            "db": "[1700000002] WARN b\n[1700000003] INFO c\n",
+        }
+        analyzer.docker_client.get_container_logs.side_effect = lambda name, tail: logs[
+            name
+        ]
+
+        result = analyzer.get_real_time_analysis("app")
+
+        assert [e["timestamp"] for e in result["latest_entries"]] == [
+            1700000004.0,
+            1700000003.0,
+            1700000002.0,
+            1700000001.0,
+        ]
+        assert result["recent_errors"] == 1
+        assert result["critical_issues"][0]["pattern"] == "out_of_memory"
+        assert analyzer.docker_client.get_container_logs.call_args[1] == {"tail": 10}
@@ -0,0 +1,125 @@
+"""
+Tests for incremental log streams and log analysis
+"""
+
+import time
+from unittest.mock import Mock, patch
+
+
+def _docker_ts(ts: float) -> str:
+    seconds = int(ts)
+    nanos = int(round((ts - seconds) * 1e9))
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds)) + f".{nanos:09d}Z"
+
+
+class FakeContainer:
+    """Container whose log output grows between reads"""
+
+    def __init__(self):
+        self.lines = []
+        self.calls = []
+
+    def write(self, ts: float, text: str):
+        self.lines.append((ts, text))
+
+    def logs(self, **params):
+        self.calls.append(params)
+        selected = self.lines
+        if "since" in params:
+            selected = [line for line in selected if line[0] >= params["since"]]
+        if "tail" in params:
+            selected = selected[-params["tail"] :]
+        payload = "".join(f"{_docker_ts(ts)} {text}\n" for ts, text in selected)
+        # Split mid-line to exercise chunk reassembly
+        data = payload.encode()
+        return iter([data[:7], data[7:]])
+
+
+def _analyzer(containers):
+    from blastdock.monitoring.log_analyzer import LogAnalyzer
+
+    with patch("blastdock.monitoring.log_analyzer.DockerClient"):
+        analyzer = LogAnalyzer()
+    analyzer._cache_ttl = 0
+    analyzer.docker_client = Mock()
+    analyzer.docker_client.get_container_status.return_value = [
+        {"name": name} for name in containers
+    ]
+    analyzer.docker_client.get_container_by_name.side_effect = containers.get
+    return analyzer
+
+
+class TestLogStreamHelpers:
+    """Line splitting and Docker timestamp parsing"""
+
+    def test_split_lines_reassembles_chunks(self):
+        from blastdock.monitoring.log_stream import split_lines
+
+        chunks = [b"first li", b"ne\r\n\nsecond", b" line\nlast"]
+        assert list(split_lines(chunks)) == ["first line", "second line", "last"]
+
+    def test_docker_timestamp_prefix(self):
+        from blastdock.monitoring.log_stream import split_docker_timestamp
+
+        ts_ns, text = split_docker_timestamp(
+            "2024-01-02T03:04:05.123456789Z ERROR boom"
+        )
+        assert ts_ns == 1704164645123456789
+        assert text == "ERROR boom"
+        assert split_docker_timestamp("no timestamp here") == (
+            None,
+            "no timestamp here",
+        )
+
+
+class TestIncrementalLogAnalysis:
+    """Re-analysis only reads and parses new lines"""
+
+    def test_second_analysis_ingests_only_new_lines(self):
+        now = int(time.time()) - 120
+        web = FakeContainer()
+        web.write(now, "ERROR database connection failed")
+        web.write(now + 0.5, "INFO server listening on port 80")
+        db = FakeContainer()
+        db.write(now + 0.25, "WARN slow query detected")
+        analyzer = _analyzer({"web": web, "db": db})
+
+        first = analyzer.analyze_project_logs("app", tail_lines=100)
+        assert first.total_lines == 3
+        assert first.error_count == 1
+        assert first.warning_count == 1
+        assert first.patterns_found["database_connection_error"] == 1
+        assert first.top_errors[0]["message"] == "database connection failed"
+        assert web.calls[0]["tail"] == 50
+
+        stream = analyzer._streams["app"]
+        assert stream.ingested == 3
+
+        web.write(now + 0.75, "ERROR database connection failed")
+        second = analyzer.analyze_project_logs("app", tail_lines=100)
+
+        # Only the new line is parsed even though Docker's one-second
+        # ``since`` resends the older lines of that second
+        assert stream.ingested == 4
+        assert "tail" not in web.calls[1]
+        assert web.calls[1]["since"] == int(now)
+        assert second.total_lines == 4
+        assert second.error_count == 2
+        assert second.top_errors[0]["count"] == 2
+        assert second.timeline[-1]["significant_events"][0]["container"] == "web"
+
+    def test_window_excludes_old_buckets(self):
+        web = FakeContainer()
+        web.write(time.time() - 5 * 3600, "ERROR old failure")
+        web.write(time.time() - 60, "ERROR new failure")
+        analyzer = _analyzer({"web": web})
+
+        recent = analyzer.analyze_project_logs("app", time_window_hours=1)
+        assert [e["message"] for e in recent.top_errors] == ["new failure"]
+
+        wider = analyzer.analyze_project_logs("app", time_window_hours=24)
+        assert wider.error_count == 1  # older lines were never fetched
+
+        analyzer.reset_streams("app")
+        wider = analyzer.analyze_project_logs("app", time_window_hours=24)
+        assert wider.error_count == 2
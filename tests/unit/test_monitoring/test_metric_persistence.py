@@ -0,0 +1,198 @@
+"""Tests for the on-disk metrics segment store"""
+
+import os
+import json
+import time
+
+
+class TestMetricsDiskStore:
+    """MetricsDiskStore persistence, rollups and range queries"""
+
+    def test_raw_samples_survive_reopen(self, temp_dir):
+        from blastdock.monitoring.metric_persistence import MetricsDiskStore
+
+        store = MetricsDiskStore(str(temp_dir))
+        base = time.time() - 600
+        for i in range(100):
+            store.append("cpu", i, base + i, {"container": "web"})
+            store.append("cpu", -i, base + i, {"container": "db"})
+        store.close()
+
+        reopened = MetricsDiskStore(str(temp_dir))
+        samples = list(
+            reopened.query("cpu", base + 10, base + 19, {"container": "web"})
+        )
+        assert [value for _, _, value in samples] == list(range(10, 20))
+        assert all(labels == {"container": "web"} for labels, _, _ in samples)
+        assert len(list(reopened.query("cpu"))) == 200
+
+    def test_out_of_order_samples_are_kept(self, temp_dir):
+        from blastdock.monitoring.metric_persistence import MetricsDiskStore
+
+        store = MetricsDiskStore(str(temp_dir))
+        now = int(time.time())
+        base = now - now % 3600
+        store.append("m", 1, base + 50)
+        store.append("m", 2, base + 10)
+        store.flush()
+
+        segment_dir = os.path.join(str(temp_dir), "raw", "m")
+        assert sorted(os.path.splitext(n)[1] for n in os.listdir(segment_dir)) == [
+            ".ooo",
+            ".seg",
+        ]
+        assert sorted(ts for _, ts, _ in store.query("m", base, base + 60)) == [
+            base + 10,
+            base + 50,
+        ]
+
+    def test_rollups_aggregate_per_bucket(self, temp_dir):
+        from blastdock.monitoring.metric_persistence import MetricsDiskStore
+
+        store = MetricsDiskStore(str(temp_dir))
+        now = int(time.time())
+        base = now - now % 3600 - 3600
+        for i in range(180):
+            store.append("mem", i % 60, base + i)
+
+        # Open buckets are visible before they are closed
+        minutes = store.query_rollup("mem", "1m", base, base + 3600)
+        points = minutes[0]["points"]
+        assert [p["count"] for p in points] == [60, 60, 60]
+        assert points[0]["min"] == 0 and points[0]["max"] == 59
+        assert points[0]["avg"] == 29.5
+
+        store.close()
+        hours = MetricsDiskStore(str(temp_dir)).query_rollup("mem", "1h", base)
+        assert hours[0]["points"][0]["count"] == 180
+
+    def test_select_tier_by_age_and_points(self, temp_dir):
+        from blastdock.monitoring.metric_persistence import MetricsDiskStore
+
+        store = MetricsDiskStore(str(temp_dir))
+        now = time.time()
+        assert store.select_tier(now - 3600).name == "raw"
+        assert store.select_tier(now - 3600, max_points=500).name == "1m"
+        assert store.select_tier(now - 86400, max_points=500).name == "1h"
+        assert store.select_tier(now - 5 * 86400).name == "1m"
+        assert store.select_tier(None).name == "raw"
+        assert store.select_tier(None, max_points=500).name == "1h"
+
+    def test_stores_sharing_a_directory(self, temp_dir):
+        from blastdock.monitoring.metric_persistence import MetricsDiskStore
+
+        # Two processes' stores (the CLI and the background collector)
+        cli = MetricsDiskStore(str(temp_dir))
+        collector = MetricsDiskStore(str(temp_dir))
+        now = time.time()
+        collector.append("cpu", 1, now - 2, {"container": "web"})
+        cli.append("cpu", 2, now - 1, {"container": "db"})
+        collector.append("cpu", 3, now - 3, {"container": "web"})
+        cli.flush()
+        collector.flush()
+
+        for store in (cli, collector):
+            samples = sorted(store.query("cpu"), key=lambda s: s[1])
+            assert [(labels["container"], value) for labels, _, value in samples] == [
+                ("web", 3),
+                ("web", 1),
+                ("db", 2),
+            ]
+            # The collector's late sample went to the side file, so the
+            # segment stays sorted for bisection
+            assert [value for _, _, value in store.query("cpu", now - 1.5)] == [2]
+
+    def test_buffered_samples_flushed_at_exit(self, temp_dir):
+        import subprocess
+        import sys
+
+        from blastdock.monitoring.metric_persistence import MetricsDiskStore
+
+        script = (
+            "import sys, time\n"
+            "from blastdock.monitoring.metric_persistence import MetricsDiskStore\n"
+            "MetricsDiskStore(sys.argv[1]).append('cpu', 5, time.time())\n"
+        )
+        repo_root = os.path.dirname(
+            os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        )
+        subprocess.run(
+            [sys.executable, "-c", script, str(temp_dir)], check=True, cwd=repo_root
+        )
+
+        store = MetricsDiskStore(str(temp_dir))
+        assert [value for _, _, value in store.query("cpu")] == [5]
+        assert store.query_rollup("cpu", "1m")[0]["points"][0]["count"] == 1
+
+    def test_retention_removes_whole_segments(self, temp_dir):
+        from blastdock.monitoring.metric_persistence import MetricsDiskStore
+
+        store = MetricsDiskStore(str(temp_dir))
+        store.append("old", 1, time.time() - 5 * 86400)
+        store.append("old", 2, time.time())
+        store.flush()
+
+        assert store.enforce_retention() == 1
+        assert [value for _, _, value in store.query("old")] == [2]
+
+
+class TestMetricsCollectorPersistence:
+    """MetricsCollector backed by the disk store"""
+
+    def test_export_and_restore_from_store(self, temp_dir):
+        from blastdock.monitoring.metrics_collector import MetricsCollector
+
+        collector = MetricsCollector(persist=True, store_dir=str(temp_dir))
+        now = time.time()
+        for i in range(5):
+            collector.record_metric(
+                "template_load_duration_ms", i, now - 10 + i, {"template": "x"}
+            )
+        collector.store.close()
+
+        restored = MetricsCollector(persist=True, store_dir=str(temp_dir))
+        assert len(restored.get_metric_values("template_load_duration_ms")) == 5
+
+        exported = json.loads(restored.export_metrics(start_time=now - 60))
+        points = exported["metrics"]["template_load_duration_ms"]["points"]
+        assert [p["value"] for p in points] == [0, 1, 2, 3, 4]
+
+        # Without a range the export holds samples, not rollups
+        everything = json.loads(restored.export_metrics())
+        points = everything["metrics"]["template_load_duration_ms"]["points"]
+        assert [p["value"] for p in points] == [0, 1, 2, 3, 4]
+        assert "resolution" not in points[0]
+
+        prometheus = restored.export_metrics("prometheus", start_time=now - 60)
+        assert 'blastdock_template_load_duration_ms{template="x"} 4.0' in prometheus
+
+        history = restored.get_metric_history(
+            "template_load_duration_ms", now - 3600, max_points=100
+        )
+        assert history[0]["points"][-1]["max"] == 4
+
+    def test_store_writes_do_not_block_readers(self, temp_dir):
+        import threading
+
+        from blastdock.monitoring.metrics_collector import MetricsCollector
+
+        collector = MetricsCollector(persist=True, store_dir=str(temp_dir))
+        store_append = collector.store.append
+        read_during_append = []
+
+        def slow_append(*args, **kwargs):
+            # A reader on another thread gets through while the store writes
+            reader = threading.Thread(
+                target=lambda: read_during_append.append(
+                    collector.get_metric_values("system_cpu_percent")
+                )
+            )
+            reader.start()
+            reader.join(timeout=5)
+            store_append(*args, **kwargs)
+
+        collector.store.append = slow_append
+        collector.record_metric("system_cpu_percent", 10.0)
+        assert len(read_during_append) == 1
+        assert len(read_during_append[0]) == 1
+        collector.store.close()
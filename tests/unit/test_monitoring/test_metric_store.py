@@ -0,0 +1,101 @@
+"""
+Tests for columnar metric storage
+"""
+
+import pytest
+
+
+class TestRingBuffer:
+    """Fixed-capacity timestamp/value ring"""
+
+    def test_wraps_and_windows(self):
+        from blastdock.monitoring.metric_store import RingBuffer
+
+        buffer = RingBuffer(4)
+        for ts in range(1, 7):
+            buffer.append(float(ts), ts * 10)
+
+        timestamps, values = buffer.window()
+        assert list(timestamps) == [3.0, 4.0, 5.0, 6.0]
+        assert list(buffer.window(4, 5)[1]) == [40.0, 50.0]
+        assert buffer.latest() == (6.0, 60.0)
+
+    def test_drop_before_and_resize(self):
+        from blastdock.monitoring.metric_store import RingBuffer
+
+        buffer = RingBuffer(4)
+        for ts in range(1, 7):
+            buffer.append(float(ts), ts)
+
+        assert buffer.drop_before(5) == 2
+        assert list(buffer.window()[0]) == [5.0, 6.0]
+
+        buffer.resize(1)
+        assert list(buffer.window()[0]) == [6.0]
+
+    def test_out_of_order_appends(self):
+        from blastdock.monitoring.metric_store import RingBuffer
+
+        buffer = RingBuffer(8)
+        for ts in [1.0, 5.0, 3.0]:
+            buffer.append(ts, ts)
+        assert sorted(buffer.window(2, 6)[0]) == [3.0, 5.0]
+
+    def test_downsample(self):
+        from array import array
+        from blastdock.monitoring.metric_store import downsample
+
+        timestamps = array("d", [0, 10, 59, 60, 61, 130])
+        values = array("d", [1, 2, 3, 4, 6, 9])
+        assert downsample(timestamps, values, 60) == [
+            (0.0, 2.0),
+            (60.0, 5.0),
+            (120.0, 9.0),
+        ]
+        with pytest.raises(ValueError):
+            downsample(timestamps, values, 60, aggregate="median")
+
+
+class TestMetricsCollectorStorage:
+    """MetricsCollector keeps one series per label set"""
+
+    def test_label_sets_stored_separately(self):
+        from blastdock.monitoring.metrics_collector import MetricsCollector
+
+        collector = MetricsCollector()
+        web = {"project": "p", "container": "web"}
+        db = {"project": "p", "container": "db"}
+        for ts in range(10):
+            collector.record_metric("container_cpu_percent", ts, float(ts), web)
+            collector.record_metric("container_cpu_percent", 100, float(ts), db)
+
+        metric = collector._metrics["container_cpu_percent"]
+        assert len(metric.series) == 2
+        assert (
+            collector._label_interner.intern(web)[1]
+            is next(iter(metric.series.values())).labels
+        )
+
+        points = collector.get_metric_values(
+            "container_cpu_percent", labels={"project": "p"}
+        )
+        assert len(points) == 20
+        assert [p.timestamp for p in points] == sorted(p.timestamp for p in points)
+
+        summary = collector.get_metric_summary(
+            "container_cpu_percent", start_time=5, labels=web
+        )
+        assert summary["count"] == 5
+        assert summary["max"] == 9
+
+    def test_series_capacity_is_configurable(self):
+        from blastdock.monitoring.metrics_collector import MetricsCollector
+
+        collector = MetricsCollector()
+        collector.set_series_capacity("template_load_duration_ms", 3)
+        for ts in range(10):
+            collector.record_metric("template_load_duration_ms", ts, float(ts))
+
+        assert (
+            collector.get_all_metrics()["template_load_duration_ms"]["point_count"] == 3
+        )
@@ -0,0 +1,155 @@
+"""
+Tests for asynchronous alert notification dispatch
+"""
+
+import time
+import threading
+from unittest.mock import Mock, patch
+
+
+class TestNotificationDispatcher:
+    """Per-channel queues, coalescing, retries and overflow"""
+
+    def test_burst_is_coalesced_into_one_delivery(self):
+        from blastdock.monitoring.notification_dispatch import NotificationDispatcher
+
+        batches = []
+        dispatcher = NotificationDispatcher(
+            lambda channel, batch: batches.append((channel, list(batch))),
+            coalesce_window=0.3,
+        )
+        try:
+            for i in range(3):
+                dispatcher.submit("ops", "alert", i)
+            assert dispatcher.flush(5)
+        finally:
+            dispatcher.shutdown()
+
+        assert [(c, [n.alert for n in b]) for c, b in batches] == [("ops", [0, 1, 2])]
+        stats = dispatcher.get_stats()
+        assert (stats["delivered"], stats["digests"], stats["queued"]) == (3, 1, 0)
+
+    def test_failed_delivery_is_retried_with_backoff(self):
+        from blastdock.monitoring.notification_dispatch import NotificationDispatcher
+
+        attempts = []
+
+        def deliver(channel, batch):
+            attempts.append(time.time())
+            if len(attempts) < 3:
+                raise ConnectionError("smtp down")
+
+        dispatcher = NotificationDispatcher(
+            deliver, coalesce_window=0, retry_backoff=0.05
+        )
+        try:
+            dispatcher.submit("mail", "alert", "a")
+            assert dispatcher.flush(5)
+        finally:
+            dispatcher.shutdown()
+
+        assert len(attempts) == 3
+        assert attempts[2] - attempts[1] >= 0.09  # backoff doubled
+        stats = dispatcher.get_stats()
+        assert (stats["retries"], stats["delivered"], stats["failed"]) == (2, 1, 0)
+
+    def test_full_queue_drops_oldest(self):
+        from blastdock.monitoring.notification_dispatch import NotificationDispatcher
+
+        release = threading.Event()
+        delivered = []
+
+        def deliver(channel, batch):
+            release.wait(5)
+            delivered.extend(n.alert for n in batch)
+
+        dispatcher = NotificationDispatcher(
+            deliver, max_queue=2, workers_per_channel=1, coalesce_window=0
+        )
+        try:
+            dispatcher.submit("hook", "alert", 0)
+            time.sleep(0.2)  # worker now blocked delivering 0
+            results = [dispatcher.submit("hook", "alert", i) for i in (1, 2, 3)]
+            release.set()
+            assert dispatcher.flush(5)
+        finally:
+            release.set()
+            dispatcher.shutdown()
+
+        assert results == [True, True, False]
+        assert delivered == [0, 2, 3]
+        assert dispatcher.get_stats()["dropped"] == 1
+
+
+class TestAlertManagerDispatch:
+    """Firing alerts never waits on notification delivery"""
+
+    def _manager(self):
+        from blastdock.monitoring.alert_manager import (
+            AlertManager,
+            AlertRule,
+            AlertSeverity,
+            NotificationChannel,
+        )
+
+        manager = AlertManager()
+        manager._notifier.coalesce_window = 0.2
+        manager.add_rule(
+            AlertRule(
+                name="cpu",
+                description="CPU is {{ $value }}%",
+                metric_name="container_cpu_percent",
+                condition="gte",
+                threshold=90.0,
+                severity=AlertSeverity.WARNING,
+                duration_seconds=0,
+            )
+        )
+        manager.add_notification_channel(
+            NotificationChannel(
+                name="hook", type="webhook", config={"url": "http://hooks.test/"}
+            )
+        )
+        return manager
+
+    def test_slow_channel_does_not_block_evaluation(self):
+        manager = self._manager()
+        release = threading.Event()
+
+        with patch.object(
+            manager,
+            "_send_notification_to_channel",
+            side_effect=lambda alert, channel: release.wait(5),
+        ):
+            start = time.time()
+            manager.observe_sample("container_cpu_percent", 99.0, start, {"c": "web"})
+            assert time.time() - start < 0.5
+
+            (alert,) = manager.get_active_alerts()
+            assert not alert.notification_sent
+            release.set()
+            assert manager.flush_notifications(5)
+
+        assert alert.notification_sent
+        assert manager.get_statistics()["notifications_sent"] == 1
+
+    def test_burst_is_sent_as_one_webhook_digest(self):
+        manager = self._manager()
+        session = Mock()
+
+        with patch.object(manager, "_http_session", return_value=session):
+            for name in ("web", "db", "cache"):
+                manager.observe_sample(
+                    "container_cpu_percent", 95.0, time.time(), {"container": name}
+                )
+            assert manager.flush_notifications(5)
+
+        session.post.assert_called_once()
+        payload = session.post.call_args.kwargs["json"]
+        assert payload["count"] == 3
+        assert {a["labels"]["container"] for a in payload["alerts"]} == {
+            "web",
+            "db",
+            "cache",
+        }
+        assert manager.get_statistics()["notification_queue"]["digests"] == 1
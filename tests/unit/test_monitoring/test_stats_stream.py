@@ -0,0 +1,93 @@
+"""
+Tests for the streaming container stats engine
+"""
+
+import threading
+from unittest.mock import Mock
+
+RAW_SAMPLE = {
+    "read": "2025-01-01T00:00:00Z",
+    "cpu_stats": {
+        "cpu_usage": {"total_usage": 400},
+        "system_cpu_usage": 2000,
+        "online_cpus": 2,
+    },
+    "precpu_stats": {"cpu_usage": {"total_usage": 200}, "system_cpu_usage": 1000},
+    "memory_stats": {
+        "usage": 300 * 1024 * 1024,
+        "limit": 1000 * 1024 * 1024,
+        "stats": {"inactive_file": 100 * 1024 * 1024},
+    },
+    "networks": {"eth0": {"rx_bytes": 10, "tx_bytes": 20}},
+    "blkio_stats": {
+        "io_service_bytes_recursive": [
+            {"op": "Read", "value": 5},
+            {"op": "Write", "value": 7},
+        ]
+    },
+}
+
+
+def _streaming_client(release: threading.Event):
+    """Docker client whose containers emit one sample then block"""
+
+    def stats(stream, decode):
+        yield RAW_SAMPLE
+        release.wait(5)
+
+    container = Mock()
+    container.stats.side_effect = stats
+    client = Mock()
+    client.get_container_by_name.return_value = container
+    return client
+
+
+class TestParseDockerStats:
+    """Derived stats use docker's CPU and memory formulas"""
+
+    def test_parse(self):
+        from blastdock.monitoring.stats_stream import parse_docker_stats
+
+        stats = parse_docker_stats(RAW_SAMPLE)
+
+        assert stats["cpu_percent"] == 40.0
+        assert stats["memory_usage_mb"] == 200
+        assert stats["memory_percent"] == 20.0
+        assert stats["network"] == {"rx_bytes": 10, "tx_bytes": 20}
+        assert stats["blkio"] == {"read_bytes": 5, "write_bytes": 7}
+
+
+class TestStatsStreamEngine:
+    """Per-container subscriptions and snapshots"""
+
+    def test_snapshot_reads_latest_samples(self):
+        from blastdock.monitoring.stats_stream import StatsStreamEngine
+
+        release = threading.Event()
+        engine = StatsStreamEngine(_streaming_client(release))
+        try:
+            engine.track("proj", ["web", "db"])
+            snapshot = engine.snapshot(["web", "db"], wait=2.0)
+
+            assert set(snapshot) == {"web", "db"}
+            assert snapshot["web"]["cpu_percent"] == 40.0
+            assert engine.get_stats()["active_streams"] == 2
+
+            engine.track("proj", ["web"])
+            assert not engine.is_streaming("db")
+        finally:
+            engine.stop()
+            release.set()
+
+    def test_stream_cap(self):
+        from blastdock.monitoring.stats_stream import StatsStreamEngine
+
+        release = threading.Event()
+        engine = StatsStreamEngine(_streaming_client(release), max_streams=1)
+        try:
+            assert engine.subscribe("a") is True
+            assert engine.subscribe("b") is False
+            assert not engine.is_streaming("b")
+        finally:
+            engine.stop()
+            release.set()
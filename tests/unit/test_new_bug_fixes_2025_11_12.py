@@ -263,34 +263,24 @@ class TestQUAL007008009StubImplementations:
         assert '_warning' in result, "QUAL-008: Result should contain _warning key"
         assert 'PLACEHOLDER' in result['_warning'], "QUAL-008: Warning message should indicate placeholder data"
 
-    def test_parallel_processor_returns_warning(self):
-        """QUAL-009: Verify ParallelProcessor returns warning about placeholder data"""
+    def test_parallel_processor_processes_templates(self):
+        """QUAL-009: ParallelProcessor now does real work instead of placeholder data"""
         from blastdock.performance.parallel_processor import ParallelProcessor
 
-        processor = ParallelProcessor()
+        processor = ParallelProcessor(max_workers=1)
+        result = processor.process_templates_parallel(['wordpress', 'missing-template'], stages=('load',))
 
-        with warnings.catch_warnings(record=True) as w:
-            warnings.simplefilter("always")
-            result = processor.process_templates_parallel(['template1', 'template2'])
-
-            # Check that a warning was issued
-            assert len(w) > 0, "QUAL-009: Should issue UserWarning"
-            assert issubclass(w[0].category, UserWarning), "QUAL-009: Should be UserWarning"
-            assert "placeholder" in str(w[0].message).lower(), "QUAL-009: Warning should mention placeholder data"
-
-        # Check that result contains warning key
-        assert '_warning' in result, "QUAL-009: Result should contain _warning key"
-        assert 'PLACEHOLDER' in result['_warning'], "QUAL-009: Warning message should indicate placeholder data"
+        assert '_warning' not in result, "QUAL-009: Result should no longer be placeholder data"
+        assert result['processed'] == 2
+        assert [f['template'] for f in result['failed']] == ['missing-template']
 
     def test_stub_modules_have_warning_docstrings(self):
-        """QUAL-007/008/009: Verify stub modules have warning docstrings"""
+        """QUAL-007/008: Verify stub modules have warning docstrings"""
         import blastdock.performance.memory_optimizer as mem_opt
         import blastdock.performance.deployment_optimizer as deploy_opt
-        import blastdock.performance.parallel_processor as par_proc
 
         assert "QUAL-007 WARNING" in mem_opt.__doc__, "QUAL-007: Module docstring should have warning"
         assert "QUAL-008 WARNING" in deploy_opt.__doc__, "QUAL-008: Module docstring should have warning"
-        assert "QUAL-009 WARNING" in par_proc.__doc__, "QUAL-009: Module docstring should have warning"
 
 
 class TestBugFixIntegration:
@@ -0,0 +1,125 @@
+"""Tests for the performance benchmark suite"""
+
+import pytest
+
+
+def _counting_case(name="counting", calls=None, errors=0):
+    from blastdock.performance.benchmarks import BenchmarkCase, Workload
+
+    calls = calls if calls is not None else []
+
+    def setup(workdir):
+        def run():
+            calls.append(workdir)
+            return errors
+
+        return Workload(run, 10)
+
+    return BenchmarkCase(name, "Counts its runs", setup)
+
+
+class TestBenchmarkRunner:
+    """Warm-up, timing, percentiles and skipped benchmarks"""
+
+    def test_percentiles_interpolate(self):
+        from blastdock.performance.benchmarks import percentile
+
+        values = [1.0, 2.0, 3.0, 4.0, 5.0]
+        assert percentile(values, 50) == 3.0
+        assert percentile(values, 90) == pytest.approx(4.6)
+        assert percentile([7.0], 99) == 7.0
+        assert percentile([], 50) == 0.0
+
+    def test_warmup_is_not_timed(self):
+        from blastdock.performance.benchmarks import PerformanceBenchmarks
+
+        calls = []
+        benchmarks = PerformanceBenchmarks()
+        result = benchmarks.run_benchmark(
+            _counting_case(calls=calls, errors=1), iterations=4, warmup=2
+        )
+
+        # Two warm-up, four timed and one memory-traced run
+        assert len(calls) == 7
+        assert (result.iterations, result.warmup) == (4, 2)
+        assert result.min_ms <= result.p50_ms <= result.p95_ms <= result.max_ms
+        assert result.throughput > 0
+        assert (result.errors, result.error_rate) == (4, 0.1)
+        assert benchmarks.get_all_profiles()["counting"].sample_count == 4
+
+    def test_failing_setup_is_skipped(self):
+        from blastdock.performance.benchmarks import (
+            BenchmarkCase,
+            PerformanceBenchmarks,
+        )
+
+        def setup(workdir):
+            raise ImportError("docker SDK missing\nmore detail")
+
+        result = PerformanceBenchmarks().run_benchmark(
+            BenchmarkCase("broken", "Cannot set up", setup), iterations=2, warmup=0
+        )
+        assert result.skipped == "docker SDK missing"
+        assert result.iterations == 0
+
+    def test_suite_selection(self):
+        from blastdock.performance.benchmarks import PerformanceBenchmarks
+
+        benchmarks = PerformanceBenchmarks()
+        results = benchmarks.run_suite(
+            "quick", iterations=2, warmup=0, only=["log_parse", "metric_ingest"]
+        )
+        assert list(results) == ["log_parse", "metric_ingest"]
+        assert all(r.skipped is None and r.errors == 0 for r in results.values())
+        assert results["log_parse"].ops_per_iteration == 5000
+
+        with pytest.raises(ValueError):
+            benchmarks.run_suite("quick", only=["missing"])
+
+
+class TestBaselines:
+    """Saved baselines and regression comparison"""
+
+    def test_compare_with_saved_baseline(self, tmp_path):
+        from blastdock.performance.benchmarks import (
+            BenchmarkResult,
+            PerformanceBenchmarks,
+        )
+
+        benchmarks = PerformanceBenchmarks(baseline_dir=str(tmp_path))
+        path = benchmarks.baseline_path("quick")
+        assert path == str(tmp_path / "baseline-quick.json")
+
+        before = {
+            name: BenchmarkResult.from_timings(name, [0.010] * 3, 10, 1)
+            for name in ("fast", "slow", "same")
+        }
+        benchmarks.save_baseline(before, path)
+        baseline = benchmarks.load_baseline(path)
+        assert baseline["fast"].p50_ms == pytest.approx(10.0)
+
+        after = {
+            "fast": BenchmarkResult.from_timings("fast", [0.005] * 3, 10, 1),
+            "slow": BenchmarkResult.from_timings("slow", [0.015] * 3, 10, 1),
+            "same": BenchmarkResult.from_timings("same", [0.0105] * 3, 10, 1),
+            "new": BenchmarkResult.from_timings("new", [0.001], 1, 0),
+        }
+        comparison = benchmarks.compare_with_baseline(after, baseline, 0.10)
+        assert {name: c["status"] for name, c in comparison.items()} == {
+            "fast": "improved",
+            "slow": "regressed",
+            "same": "unchanged",
+            "new": "no_baseline",
+        }
+        assert comparison["slow"]["p50_change_percent"] == pytest.approx(50.0)
+
+    def test_thresholds_use_latest_results(self):
+        from blastdock.performance.benchmarks import PerformanceBenchmarks
+
+        benchmarks = PerformanceBenchmarks(
+            thresholds={"p95_ms_warning": 0.0, "p95_ms_violation": 1e9}
+        )
+        benchmarks.run_benchmark(_counting_case(), iterations=2, warmup=0)
+        check = benchmarks.check_performance_thresholds()
+        assert [w["type"] for w in check["warnings"]] == ["p95_ms"]
+        assert check["total_issues"] == 1
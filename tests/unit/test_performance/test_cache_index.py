@@ -0,0 +1,103 @@
+"""
+Tests for cache tag/prefix indexes and tier-wide invalidation
+"""
+
+
+class TestCacheKeyIndex:
+    """Tag and prefix secondary indexes"""
+
+    def test_tag_lookup_and_removal(self):
+        from blastdock.performance.cache_index import CacheKeyIndex
+
+        index = CacheKeyIndex()
+        index.add("a", ["project:web", "tpl"])
+        index.add("b", ["project:web"])
+        index.add("c", ["tpl"])
+
+        assert index.keys_for_tags(["project:web"]) == {"a", "b"}
+        index.remove("a")
+        assert index.keys_for_tags(["project:web", "tpl"]) == {"b", "c"}
+
+        # Re-adding replaces previous tags
+        index.add("b", ["other"])
+        assert index.keys_for_tags(["project:web"]) == set()
+
+    def test_pattern_match_uses_prefix(self):
+        from blastdock.performance.cache_index import CacheKeyIndex
+
+        index = CacheKeyIndex()
+        for key in ["template:nginx", "template:mysql", "templates", "status:web"]:
+            index.add(key)
+
+        assert index.match("template:*") == {"template:nginx", "template:mysql"}
+        assert index.match("template:?ginx") == {"template:nginx"}
+        assert index.match("*:web") == {"status:web"}
+        assert index.match("templates") == {"templates"}
+
+        index.remove("template:nginx")
+        assert index.keys_with_prefix("template") == {"template:mysql", "templates"}
+
+
+class TestCacheManagerInvalidation:
+    """Invalidation reaches both memory and disk tiers"""
+
+    def test_tag_clear_removes_disk_entries(self, temp_dir):
+        from blastdock.performance.cache import CacheManager
+
+        manager = CacheManager(cache_dir=str(temp_dir))
+        manager._set_in_memory("a", 1, 60, ["proj"])
+        manager._set_on_disk("a", 1, 60, ["proj"])
+        manager._set_on_disk("b", 2, 60, ["other"])
+
+        manager.clear(tags=["proj"])
+
+        assert manager.get("a") is None
+        assert manager.get("b") == 2
+        manager.close()
+
+    def test_disk_hit_keeps_tags(self, temp_dir):
+        from blastdock.performance.cache import CacheManager
+
+        manager = CacheManager(cache_dir=str(temp_dir))
+        manager._set_on_disk("a", 1, 60, ["proj"])
+        assert manager.get("a") == 1
+        assert manager._memory_cache["a"].tags == ["proj"]
+        manager.close()
+
+    def test_pattern_invalidation_reaches_disk(self, temp_dir):
+        from blastdock.performance.cache import CacheManager
+
+        manager = CacheManager(cache_dir=str(temp_dir))
+        manager._set_on_disk("async_template:nginx", {}, 60)
+        manager._set_on_disk("status:web", {}, 60)
+
+        manager.invalidate_by_pattern("async_template:*")
+
+        assert manager.disk.keys() == ["status:web"]
+        manager.close()
+
+    def test_invalidation_cancels_queued_disk_writes(self, temp_dir):
+        import threading
+
+        from blastdock.performance.cache import CacheManager
+
+        manager = CacheManager(cache_dir=str(temp_dir))
+        # Occupy both executor workers so the disk writes stay queued
+        release = threading.Event()
+        blockers = [manager._executor.submit(release.wait) for _ in range(2)]
+
+        manager.set("async_template:nginx", {"v": 1}, tags=["proj"])
+        manager.set("status:web", {"v": 2}, tags=["proj"])
+        manager.set("status:db", {"v": 3})
+        manager.set("other", {"v": 4})
+        manager.invalidate_by_pattern("async_template:*")
+        manager.clear(tags=["proj"])
+        manager.delete("other")
+
+        release.set()
+        for blocker in blockers:
+            blocker.result()
+        manager.close()
+
+        # Only the write no invalidation covered reached the disk
+        assert manager.disk.keys() == ["status:db"]
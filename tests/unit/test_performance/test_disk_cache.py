@@ -0,0 +1,101 @@
+"""
+Tests for the CacheManager disk tiers
+"""
+
+import json
+import time
+import hashlib
+
+import pytest
+
+
+class TestIndexedDiskCacheBackend:
+    """Indexed single-file disk tier"""
+
+    def test_set_get_roundtrip(self, temp_dir):
+        from blastdock.performance.disk_cache import IndexedDiskCacheBackend
+
+        backend = IndexedDiskCacheBackend(str(temp_dir))
+        backend.set("template:nginx", {"ports": [80, 443]}, ttl=60, tags=["tpl"])
+
+        assert backend.get("template:nginx") == {"ports": [80, 443]}
+        assert backend.get("missing") is None
+        assert backend.get_stats()["entries"] == 1
+        backend.close()
+
+    def test_index_survives_reopen(self, temp_dir):
+        from blastdock.performance.disk_cache import IndexedDiskCacheBackend
+
+        backend = IndexedDiskCacheBackend(str(temp_dir))
+        backend.set("a", "1", ttl=None, tags=["x"])
+        backend.close()
+
+        reopened = IndexedDiskCacheBackend(str(temp_dir))
+        assert reopened.keys() == ["a"]
+        assert reopened.keys_with_tags(["x"]) == {"a"}
+        assert reopened.get("a") == "1"
+        reopened.close()
+
+    def test_cleanup_sweeps_expired_and_evicts_lru(self, temp_dir):
+        from blastdock.performance.disk_cache import IndexedDiskCacheBackend
+
+        backend = IndexedDiskCacheBackend(str(temp_dir))
+        backend.set("expired", "x", ttl=0.01)
+        backend.set("old", "y" * 100, ttl=None)
+        backend.set("new", "z" * 100, ttl=None)
+        backend.get("new")
+        time.sleep(0.02)
+
+        result = backend.cleanup(max_size=150)
+
+        assert result == {"expired": 1, "evicted": 1}
+        assert backend.keys() == ["new"]
+        backend.close()
+
+    def test_migrates_legacy_files(self, temp_dir):
+        from blastdock.performance.disk_cache import IndexedDiskCacheBackend
+
+        def write_legacy(key, ttl, timestamp):
+            name = hashlib.sha256(key.encode()).hexdigest() + ".cache"
+            data = {
+                "key": key,
+                "value": key.upper(),
+                "timestamp": timestamp,
+                "ttl": ttl,
+                "tags": ["legacy"],
+            }
+            (temp_dir / name).write_text(json.dumps(data, indent=2))
+
+        write_legacy("fresh", 3600, time.time())
+        write_legacy("stale", 1, time.time() - 10)
+        (temp_dir / "broken.cache").write_text("{not json")
+
+        backend = IndexedDiskCacheBackend(str(temp_dir))
+
+        assert backend.keys() == ["fresh"]
+        assert backend.get("fresh") == "FRESH"
+        assert not list(temp_dir.glob("*.cache"))
+        backend.close()
+
+
+class TestCacheManagerDiskBackend:
+    """CacheManager wiring of the disk tier"""
+
+    @pytest.mark.parametrize("backend", ["indexed", "files"])
+    def test_disk_hit_after_memory_eviction(self, temp_dir, backend):
+        from blastdock.performance.cache import CacheManager
+
+        manager = CacheManager(cache_dir=str(temp_dir), disk_backend=backend)
+        manager._set_on_disk("key", {"v": 1}, ttl=60)
+        manager._memory_cache.clear()
+
+        assert manager.get("key") == {"v": 1}
+        assert manager.stats["disk_hits"] == 1
+        assert manager.get_stats()["disk_entries"] == 1
+        manager.close()
+
+    def test_unknown_backend_rejected(self, temp_dir):
+        from blastdock.performance.cache import CacheManager
+
+        with pytest.raises(ValueError, match="Unknown cache disk backend"):
+            CacheManager(cache_dir=str(temp_dir), disk_backend="redis")
@@ -0,0 +1,117 @@
+"""Tests for the parallel template processing engine"""
+
+import os
+import threading
+
+import pytest
+
+TEMPLATE = """template_info:
+  description: Demo {n}
+fields:
+  port:
+    type: port
+    default: 80{n:02d}
+compose:
+  version: '3.8'
+  services:
+    web:
+      image: nginx:latest
+      ports:
+        - "{{{{ port }}}}:80"
+"""
+
+
+def _write_templates(directory, count):
+    paths = []
+    for n in range(count):
+        path = directory / f"demo{n}.yml"
+        path.write_text(TEMPLATE.format(n=n))
+        paths.append(str(path))
+    return paths
+
+
+class TestParallelProcessor:
+    """Streaming, bounded, cancellable processing with a serial fallback"""
+
+    def test_serial_and_parallel_agree(self, temp_dir):
+        from blastdock.performance.parallel_processor import ParallelProcessor
+
+        paths = _write_templates(temp_dir, 4)
+        stages = ("load", "validate", "render")
+        serial = ParallelProcessor(max_workers=1)
+        parallel = ParallelProcessor(max_workers=2, serial_threshold=1)
+
+        serial_results = {r.name: r for r in serial.process_templates(paths, stages)}
+        parallel_results = {
+            r.name: r for r in parallel.process_templates(paths, stages)
+        }
+
+        assert sorted(parallel_results) == sorted(serial_results)
+        for name, result in parallel_results.items():
+            assert result.ok, result.errors
+            assert result.template.compiled is None
+            assert result.template.data == serial_results[name].template.data
+            assert result.analysis.is_valid == serial_results[name].analysis.is_valid
+            assert result.rendered_services == ["web"]
+            assert set(result.stage_times) == set(stages)
+        assert parallel.get_performance_metrics()["parallel_runs"] == 1
+        # Workers are spawned, not forked from this threaded process
+        assert parallel.mp_context.get_start_method() == "spawn"
+        assert os.getpid() not in {r.worker_pid for r in parallel_results.values()}
+        assert serial.get_performance_metrics()["serial_runs"] == 1
+
+    def test_errors_are_reported_per_item(self, temp_dir):
+        from blastdock.performance.parallel_processor import ParallelProcessor
+
+        paths = _write_templates(temp_dir, 1) + [str(temp_dir / "missing.yml")]
+        summary = ParallelProcessor(max_workers=1).process_templates_parallel(
+            paths, stages=("load",)
+        )
+
+        assert summary["processed"] == 2
+        assert [f["template"] for f in summary["failed"]] == ["missing"]
+        assert "not found" in summary["failed"][0]["errors"]["path"]
+
+        with pytest.raises(ValueError):
+            list(ParallelProcessor().process_templates(paths, stages=("bogus",)))
+
+    def test_bounded_pending_and_cancellation(self, temp_dir):
+        from blastdock.performance.parallel_processor import ParallelProcessor
+
+        paths = _write_templates(temp_dir, 6)
+        processor = ParallelProcessor(max_workers=2, max_pending=2, serial_threshold=1)
+        cancel = threading.Event()
+
+        results = []
+        for result in processor.process_templates(paths, ("load",), cancel):
+            results.append(result)
+            cancel.set()
+
+        # Only the items already in flight complete once cancelled
+        assert 1 <= len(results) <= 2
+        metrics = processor.get_performance_metrics()
+        assert metrics["tasks_cancelled"] == len(paths) - len(results)
+
+        # Serially, cancellation takes effect before the next item
+        processor = ParallelProcessor(max_workers=1)
+        stream = processor.process_templates(paths, ("load",))
+        next(stream)
+        processor.cancel()
+        assert list(stream) == []
+
+    def test_catalog_integrations(self, temp_dir):
+        from blastdock.performance.parallel_processor import ParallelProcessor
+        from blastdock.performance.template_cache import TemplateCache
+        from blastdock.utils.template_validator import TemplateValidator
+
+        _write_templates(temp_dir, 3)
+        processor = ParallelProcessor(max_workers=2, serial_threshold=1)
+
+        analyses = TemplateValidator(str(temp_dir)).validate_all_templates(processor)
+        assert list(analyses) == ["demo0", "demo1", "demo2"]
+
+        cache = TemplateCache()
+        assert cache.preload_templates(str(temp_dir), processor) == 3
+        path = str(temp_dir / "demo1.yml")
+        assert cache.templates[path].schema["port"]["default"] == 8001
+        assert cache.get(path) is cache.templates[path]
@@ -0,0 +1,108 @@
+"""Tests for the compiled template cache"""
+
+import os
+
+import pytest
+
+TEMPLATE = """template_info:
+  description: Demo
+fields:
+  port:
+    type: port
+    default: 8080
+services:
+  web:
+    image: "nginx:{{ version }}"
+"""
+
+
+class TestTemplateCache:
+    """TemplateCache parse, compile and render memoization"""
+
+    def test_parse_once_until_content_changes(self, temp_dir):
+        from blastdock.performance.template_cache import TemplateCache
+
+        cache = TemplateCache()
+        path = temp_dir / "demo.yml"
+        path.write_text(TEMPLATE)
+
+        first = cache.get(str(path))
+        assert cache.get(str(path)) is first
+        assert first.schema["port"] == {
+            "type": "port",
+            "default": 8080,
+            "required": False,
+            "description": "port",
+        }
+
+        # Touched but identical content keeps the parsed entry
+        os.utime(path, ns=(first.mtime_ns + 10**9, first.mtime_ns + 10**9))
+        assert cache.get(str(path)) is first
+
+        path.write_text(TEMPLATE.replace("Demo", "Changed"))
+        assert cache.get(str(path)).template_info["description"] == "Changed"
+        stats = cache.get_cache_stats()
+        assert stats["cache_misses"] == 2
+        assert stats["revalidations"] == 1
+
+    def test_render_is_memoized_per_config(self, temp_dir):
+        from jinja2.sandbox import SandboxedEnvironment
+        from blastdock.performance.template_cache import TemplateCache
+
+        cache = TemplateCache()
+        env = SandboxedEnvironment()
+        path = str(temp_dir / "demo.yml")
+        with open(path, "w") as f:
+            f.write(TEMPLATE)
+
+        first = cache.render(path, env, {"version": "1"})
+        first["services"]["web"]["image"] = "mutated"
+        again = cache.render(path, env, {"version": "1"})
+        other = cache.render(path, env, {"version": "2"})
+
+        assert again["services"]["web"]["image"] == "nginx:1"
+        assert other["services"]["web"]["image"] == "nginx:2"
+        stats = cache.get_cache_stats()
+        assert stats["render_hits"] == 1
+        assert stats["render_misses"] == 2
+
+    def test_included_template_change_invalidates_render(self, temp_dir):
+        from jinja2 import FileSystemLoader
+        from jinja2.sandbox import SandboxedEnvironment
+        from blastdock.performance.template_cache import TemplateCache
+
+        cache = TemplateCache()
+        env = SandboxedEnvironment(loader=FileSystemLoader(str(temp_dir)))
+        (temp_dir / "part.yml").write_text("image: a")
+        (temp_dir / "main.yml").write_text('web:\n  {% include "part.yml" %}\n')
+
+        main = str(temp_dir / "main.yml")
+        assert cache.render(main, env, {}) == {"web": {"image": "a"}}
+        (temp_dir / "part.yml").write_text("image: bb")
+        assert cache.render(main, env, {}) == {"web": {"image": "bb"}}
+
+    def test_invalid_yaml_raises_value_error(self, temp_dir):
+        from blastdock.performance.template_cache import TemplateCache
+
+        cache = TemplateCache()
+        path = temp_dir / "bad.yml"
+        path.write_text("a: [unclosed")
+        assert cache.get(str(path)).parse_error
+        with pytest.raises(ValueError):
+            cache.get_data(str(path))
+
+
+class TestTemplateManagerCaching:
+    """TemplateManager reads bundled templates through the cache"""
+
+    def test_bundled_template_info_is_copied(self):
+        from blastdock.core.template_manager import TemplateManager
+
+        manager = TemplateManager()
+        name = manager.list_templates()[0]
+        info = manager.get_template_info(name)
+        info["mutated"] = True
+        assert "mutated" not in manager.get_template_info(name)
+
+        stats = manager.template_cache.get_cache_stats()
+        assert stats["cache_hits"] >= 1
@@ -0,0 +1 @@
+"""Port management tests"""
@@ -0,0 +1,151 @@
+"""Tests for the port allocation index and journal"""
+
+import json
+from unittest.mock import patch
+
+
+def _assign(port, project="app", service="web"):
+    return {"op": "assign", "port": port, "project": project, "service": service}
+
+
+class TestPortAllocationIndex:
+    """Free-list and operation replay"""
+
+    def test_free_list_tracks_operations(self):
+        from blastdock.ports.allocation_index import PortAllocationIndex
+
+        index = PortAllocationIndex((8000, 8005), system_reserved={8002})
+        assert list(index.free) == [8000, 8001, 8003, 8004, 8005]
+
+        index.apply(_assign(8000))
+        index.apply({"op": "reserve", "port": 8001})
+        assert list(index.free) == [8003, 8004, 8005]
+        assert index.project_ports == {"app": [8000]}
+
+        index.apply({"op": "release", "port": 8000})
+        index.apply({"op": "unreserve", "port": 8001})
+        assert list(index.free) == [8000, 8001, 8003, 8004, 8005]
+        assert index.project_ports == {}
+
+        index.apply({"op": "range", "start": 9000, "end": 9001})
+        assert list(index.free) == [9000, 9001]
+
+    def test_round_trips_ports_json_layout(self):
+        from blastdock.ports.allocation_index import PortAllocationIndex
+
+        index = PortAllocationIndex((8000, 8010))
+        index.apply(_assign(8004))
+        index.apply({"op": "reserve", "port": 8005})
+
+        restored = PortAllocationIndex.from_dict(index.to_dict(), (1, 2))
+        assert restored.to_dict() == index.to_dict()
+        assert restored.is_excluded(8004) and restored.is_excluded(8005)
+        assert 8004 not in restored.free
+
+
+class TestPortJournalStore:
+    """Journaled persistence shared between processes"""
+
+    def test_other_writers_are_picked_up(self, temp_dir):
+        from blastdock.ports.allocation_index import PortJournalStore
+
+        ports_file = temp_dir / "ports.json"
+        first = PortJournalStore(ports_file, (8000, 8010))
+        second = PortJournalStore(ports_file, (8000, 8010))
+        index_a = first.load()
+        index_b = second.load()
+
+        with first.locked():
+            index_a = first.catch_up(index_a)
+            index_a.apply(_assign(8000))
+            first.append([_assign(8000)], index_a)
+
+        with second.locked():
+            index_b = second.catch_up(index_b)
+            assert 8000 in index_b.allocated
+            index_b.apply(_assign(8001, service="db"))
+            second.append([_assign(8001, service="db")], index_b)
+
+        assert sorted(first.catch_up(index_a).allocated) == [8000, 8001]
+        # Nothing was compacted yet: ports.json is never rewritten per op
+        assert not ports_file.exists()
+
+    def test_compaction_folds_journal_into_snapshot(self, temp_dir):
+        from blastdock.ports.allocation_index import PortJournalStore
+
+        ports_file = temp_dir / "ports.json"
+        store = PortJournalStore(ports_file, (8000, 8100), compact_threshold=3)
+        reader = PortJournalStore(ports_file, (8000, 8100))
+        stale = reader.load()
+
+        index = store.load()
+        for port in (8000, 8001, 8002):
+            with store.locked():
+                index.apply(_assign(port))
+                store.append([_assign(port)], index)
+
+        snapshot = json.loads(ports_file.read_text())
+        assert snapshot["generation"] == 1
+        assert sorted(snapshot["allocated_ports"]) == ["8000", "8001", "8002"]
+        assert len(store.journal_file.read_text().splitlines()) == 1
+
+        # A reader holding the pre-compaction generation reloads
+        assert sorted(reader.catch_up(stale).allocated) == [8000, 8001, 8002]
+
+    def test_legacy_ports_json_is_loaded(self, temp_dir):
+        from blastdock.ports.allocation_index import PortJournalStore
+
+        ports_file = temp_dir / "ports.json"
+        ports_file.write_text(
+            json.dumps(
+                {
+                    "allocated_ports": {"8003": {"project_name": "old"}},
+                    "reserved_ports": [8004],
+                    "dynamic_range": [8000, 8005],
+                    "project_ports": {"old": [8003]},
+                }
+            )
+        )
+        index = PortJournalStore(ports_file, (1, 2)).load()
+        assert list(index.free) == [8000, 8001, 8002, 8005]
+
+
+class TestPortManagerJournal:
+    """PortManager persists through the journal"""
+
+    def _manager(self, temp_dir):
+        from blastdock.ports.manager import PortManager
+        from blastdock.ports.scanner import PortScanner
+
+        with patch("blastdock.ports.manager.get_config_manager"), patch(
+            "blastdock.ports.manager.DockerClient"
+        ), patch("blastdock.ports.manager.paths") as mock_paths:
+            mock_paths.data_dir = temp_dir
+            manager = PortManager()
+        manager.scanner = PortScanner(proc_root=str(temp_dir / "no-proc"), ttl=60)
+        manager.scanner.probe = lambda port: False
+        return manager
+
+    def test_batch_allocation_is_one_journal_write(self, temp_dir):
+        manager = self._manager(temp_dir)
+        manager.set_dynamic_range(8000, 8100)
+
+        with patch.object(
+            manager.store, "append", wraps=manager.store.append
+        ) as append:
+            ports = manager.allocate_ports(
+                "stack", {"web": None, "db": None, "cache": 8050}
+            )
+
+        assert ports == {"web": 8000, "db": 8001, "cache": 8050}
+        assert append.call_count == 1
+        assert len(append.call_args[0][0]) == 3
+
+        other = self._manager(temp_dir)
+        assert sorted(other.get_project_ports("stack")) == [8000, 8001, 8050]
+        assert other.allocate_port("next", "web") == 8002
+
+        # The first manager sees the other process's allocation
+        assert manager.allocate_port("later", "web") == 8003
+        assert manager.release_project_ports("stack")
+        assert other.get_project_ports("stack") == []
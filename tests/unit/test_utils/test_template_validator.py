@@ -0,0 +1,92 @@
+"""Tests for incremental, cached template validation"""
+
+TEMPLATE = """template_info:
+  description: Demo {n}
+  version: '1.0'
+  services:
+    - web
+fields:
+  port:
+    type: port
+    default: 80{n:02d}
+compose:
+  version: '3.8'
+  services:
+    web:
+      image: nginx:1.25
+"""
+
+
+def _write_templates(directory, count):
+    for n in range(count):
+        (directory / f"demo{n}.yml").write_text(TEMPLATE.format(n=n))
+
+
+class TestValidationCache:
+    """Results keyed by content hash and validator version"""
+
+    def test_only_changed_templates_are_revalidated(self, temp_dir):
+        from blastdock.performance.parallel_processor import ParallelProcessor
+        from blastdock.utils.template_validator import TemplateValidator
+
+        templates_dir = temp_dir / "templates"
+        templates_dir.mkdir()
+        _write_templates(templates_dir, 3)
+        cache_dir = str(temp_dir / "cache")
+        processor = ParallelProcessor(max_workers=1)
+
+        first = TemplateValidator(templates_dir, persist=True, cache_dir=cache_dir)
+        fresh = first.validate_all_templates(processor)
+        stats = first.get_validation_stats()
+        assert (stats["cache_hits"], stats["cache_misses"]) == (0, 3)
+        assert {c["check"] for c in stats["checks"]} >= {"parse", "compose"}
+        assert all(c["runs"] == 3 for c in stats["checks"])
+
+        (templates_dir / "demo1.yml").write_text(TEMPLATE.format(n=42))
+        second = TemplateValidator(templates_dir, persist=True, cache_dir=cache_dir)
+        cached = second.validate_all_templates(processor)
+        stats = second.get_validation_stats()
+        assert (stats["cache_hits"], stats["cache_misses"]) == (2, 1)
+        assert {c["runs"] for c in stats["checks"]} == {1}
+
+        assert list(cached) == ["demo0", "demo1", "demo2"]
+        for name in ("demo0", "demo2"):
+            assert cached[name].results == fresh[name].results
+            assert cached[name].score == fresh[name].score
+            assert cached[name].traefik_compatibility is (
+                fresh[name].traefik_compatibility
+            )
+        assert cached["demo1"].metadata["description"] == "Demo 42"
+
+    def test_validator_version_invalidates(self, temp_dir):
+        from unittest.mock import patch
+
+        from blastdock.utils.template_validator import TemplateValidator
+
+        _write_templates(temp_dir, 1)
+        path = str(temp_dir / "demo0.yml")
+        cache_dir = str(temp_dir / "cache")
+        TemplateValidator(
+            temp_dir, persist=True, cache_dir=cache_dir
+        ).validate_template(path)
+
+        validator = TemplateValidator(temp_dir, persist=True, cache_dir=cache_dir)
+        with patch(
+            "blastdock.utils.template_validator.validator_version",
+            return_value="other",
+        ):
+            validator.validate_template(path)
+        # Re-cached under the other version, so the real one misses once more
+        validator.validate_template(path)
+        validator.validate_template(path)
+        assert validator.cache_stats == {"hits": 1, "misses": 2}
+        assert validator.clear_cache() == 1
+
+    def test_uncached_validator_reports_errors(self, temp_dir):
+        from blastdock.utils.template_validator import TemplateValidator
+
+        validator = TemplateValidator(temp_dir)
+        analysis = validator.validate_template(str(temp_dir / "missing.yml"))
+        assert not analysis.is_valid
+        assert analysis.results[0].category == "general"
+        assert validator.get_validation_stats()["cache_enabled"] is False